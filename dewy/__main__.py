@@ -4,9 +4,12 @@ from argparse import ArgumentParser, REMAINDER
 from .reporting import SrcFile
 from .targets import TARGETS, identify_host_target
 from .backend.udewy import codegen
+from .parser import cache
+from .semantic import check_profile
 from udewy.frontend import entry_point, EntryPointOptions
 from udewy.backend import BackendName
 from typing import cast
+import os
 import sys
 import pdb
 
@@ -21,6 +24,9 @@ parser.add_argument('file', nargs='?', help='.dewy file to run. If not provided,
 parser.add_argument('-t', '--target', choices=TARGETS, help='backend target the program should compile to.')
 parser.add_argument('-v', '--version', action='version', version=f'dewy {get_version()}', help='Print version information and exit')
 parser.add_argument('-c', '--compile', action='store_true', help="compile only, don't run")
+parser.add_argument('-j', '--jobs', type=int, default=1, help='number of processes to type check imported modules with (0 = one per CPU)')
+parser.add_argument('--profile-check', action='store_true', help='report time, calls and type system queries per type checker handler and source span. Checks every module in one process, without caches')
+parser.add_argument('--profile-check-out', type=Path, metavar='PATH', help='also write the type checker profile to PATH (speedscope JSON). Implies --profile-check')
 parser.add_argument('remainder', nargs=REMAINDER, default=[], help='arguments to pass to the program')
 args = parser.parse_args()
 
@@ -34,7 +40,18 @@ if args.file is None:
 # compile the program and output udewy source code
 path = Path(args.file)
 srcfile = SrcFile.from_path(path)
-udewy_src = codegen(srcfile)
+profile_from_env, profile_out_from_env = check_profile.requested_by_env()
+profile_out = args.profile_check_out or profile_out_from_env
+jobs = args.jobs or os.process_cpu_count() or 1
+if args.profile_check or profile_out is not None or profile_from_env:
+    # worker processes and cache hits skip the profiled handlers, so check every module here and from source
+    if jobs != 1:
+        print('--profile-check: type checking in one process', file=sys.stderr)
+    jobs = 1
+    os.environ[cache.ENV_VAR] = 'off'
+    check_profile.enable()
+udewy_src = codegen(srcfile, jobs=jobs)
+check_profile.finish(check_profile.disable(), profile_out)
 
 # set up udewy options, and save the udewy source code to a cache file
 options = EntryPointOptions(
@@ -4,7 +4,8 @@ from dataclasses import dataclass
 from textwrap import indent
 
 from ...reporting import SrcFile
-from ...semantic import builtins, check, hir, ty
+from ...semantic import builtins, hir, modules, ty
+from ...semantic.analyze import bounds
 from ...semantic.hir_display import type_to_dewy
 from . import lower
 
@@ -37,6 +38,9 @@ UDEWY_PREFIX_DUNDERS = {
     '__not__': 'not',
 }
 
+# the udewy escape of every byte value, for string literals
+BYTE_ESCAPES = tuple(f'\\x{byte:02x}' for byte in range(256))
+
 LOWERED_RAW_SHIFT_DUNDERS = {
     '__dewy_raw_lshift__': '<<',
     '__dewy_raw_rshift__': '>>',
@@ -97,23 +101,29 @@ class EmitContext:
 
 
 
-def codegen(srcfile:SrcFile) -> str:
-    """Type-check Dewy source and emit equivalent udewy source."""
-    ast = check.typecheck_and_resolve(srcfile, include_prelude=True)
-    return codegen_inner(ast, srcfile)
+def codegen(srcfile:SrcFile, *, jobs:int=1) -> str:
+    """Type-check Dewy source (imported modules in up to `jobs` processes) and emit equivalent udewy source."""
+    ast, intervals = modules.typecheck_program_with_intervals(srcfile, jobs=jobs)
+    return codegen_inner(ast, srcfile, intervals)
 
-def codegen_inner(ast: hir.AST, srcfile: SrcFile | None = None) -> str:
+def codegen_inner(
+    ast: hir.AST,
+    srcfile: SrcFile | None = None,
+    intervals: bounds.Intervals | None = None,
+) -> str:
     """Emit checked HIR after legalizing Dewy callable constructs.
 
     ``lower_for_udewy`` supplies concrete module-level function units, global
-    storage, and the ordered items for module startup.
+    storage, and the ordered items for module startup. ``intervals`` are the
+    bounds pass's facts about ``ast``; without them every narrow operation
+    keeps its width handling.
     """
     if not isinstance(ast, hir.Block):
         raise TypeError(f"Expected Block, got {type(ast)}")
 
     if srcfile is None:
         srcfile = SrcFile(None, ' ' * ast.loc.stop)
-    program = lower.lower_for_udewy(ast, srcfile)
+    program = lower.lower_for_udewy(ast, srcfile, intervals)
     functions: dict[str, hir.FunctionLiteral] = {}
     for function in program.functions:
         functions[function.symbol] = function.literal
@@ -306,7 +316,7 @@ def emit_loop_exit(ast: hir.Break | hir.Continue, keyword: str) -> str:
 def emit_string(string: hir.String) -> str:
     """Emit decoded Dewy text as an exact UTF-8 byte literal for udewy."""
 
-    content = ''.join(f'\\x{byte:02x}' for byte in string.content.encode('utf-8'))
+    content = ''.join(map(BYTE_ESCAPES.__getitem__, string.content.encode('utf-8')))
     return f'"{content}"'
 
 
@@ -19,7 +19,10 @@ but cannot be represented directly by udewy:
   intrinsics;
 - finite static range iterators become counted loops with scaled offsets,
   while semantically unbounded integer iterators remain blocked on bigint
-  target support.
+  target support;
+- narrow integer operations and fixed-width shifts drop their wrapping and
+  width guards where the intervals proven by the bounds pass show them to be
+  redundant.
 
 Lowering has two phases. Discovery replays lexical scope resolution, records
 function units and captures, and preserves the type checker's forward-function
@@ -40,6 +43,7 @@ from typing import Literal, NoReturn
 from ...parser import t0
 from ...reporting import Error, Pointer, Span, SrcFile
 from ...semantic import builtins, hir, ty
+from ...semantic.analyze import bounds
 from ...semantic.errors import NotImplementedYet
 from ...semantic.hir_display import type_to_dewy
 from .runtime_unicode import (
@@ -117,6 +121,9 @@ FIXED_INTEGER_WIDTHS = {
     'uint64': 64,
 }
 SIGNED_FIXED_INTS = {'int8', 'int16', 'int32', 'int64'}
+NARROW_FIXED_INTS = {'int8', 'int16', 'int32', 'uint8', 'uint16', 'uint32'}
+# the narrow operations the bounds pass can prove to stay within their width
+NARROW_WRAPPED_DUNDERS = {'__add__', '__sub__', '__mul__', '__mod__', '__unary_sub__'}
 
 
 @dataclass
@@ -235,10 +242,16 @@ class ArrayCallBoundaryAnalysis:
 class _Lowerer:
     """Discover callable units, validate captures, and rewrite them for udewy."""
 
-    def __init__(self, root: hir.Block, srcfile: SrcFile):
+    def __init__(
+        self,
+        root: hir.Block,
+        srcfile: SrcFile,
+        intervals: bounds.Intervals | None = None,
+    ):
         """Initialize per-program identity maps and deterministic counters."""
         self.root = root
         self.srcfile = srcfile
+        self.intervals = {} if intervals is None else intervals
         self.preserve_raw_udewy_shifts = bool(re.search(
             r'(?m)^\s*\$no_prelude\s*=\s*true\b',
             srcfile.body,
@@ -250,6 +263,8 @@ class _Lowerer:
         self.function_by_literal: dict[int, _FunctionDef] = {}
         self.declare_bindings: dict[int, _Binding] = {}
         self.binding_by_semantic_id: dict[int, _Binding] = {}
+        # module-level declarations by binding id
+        self.module_declarations: dict[int, hir.Declare] = {}
         self.identifier_bindings: dict[int, _Binding | None] = {}
         self.captures: dict[int, list[tuple[hir.ExpressedIdentifier, _Binding]]] = defaultdict(list)
         self.source_names: set[str] = set()
@@ -275,6 +290,9 @@ class _Lowerer:
         self.object_globals_initialized: set[int] = set()
         self.call_optional_args: dict[int, list[ty.TypeExpr | None]] = {}
         self.call_optional_kwargs: dict[int, dict[str, ty.TypeExpr]] = {}
+        # transformed fixed-width shift id -> (count proven below the width,
+        # result proven within the type)
+        self.shift_bounds: dict[int, tuple[bool, bool]] = {}
         self.array_representations: dict[int, ArrayRepresentation] = {}
         self.array_declarations: dict[int, hir.Declare] = {}
         self.array_uses: dict[int, set[ArrayUse]] = defaultdict(set)
@@ -1016,6 +1034,8 @@ class _Lowerer:
                     item.binding_id,
                 )
                 self.declare_bindings[id(item)] = binding
+                if block is self.root and item.binding_id is not None:
+                    self.module_declarations.setdefault(item.binding_id, item)
                 if (
                     item.binding_id is not None
                     and isinstance(item.annotation or item.expr.type, ty.ArrayType)
@@ -1924,15 +1944,7 @@ class _Lowerer:
         return source if nested is not None else None
 
     def _declaration_for_binding(self, semantic_id: int) -> hir.Declare | None:
-        return next(
-            (
-                node
-                for node in self.root.items
-                if isinstance(node, hir.Declare)
-                and node.binding_id == semantic_id
-            ),
-            None,
-        )
+        return self.module_declarations.get(semantic_id)
 
     def _check_captures(self) -> None:
         """Reject function units that require an udewy closure environment."""
@@ -2431,6 +2443,10 @@ class _Lowerer:
                 kw_args={},
                 selected_method_index=None,
             )
+            if self._is_narrow_operation(transformed) and self._proven_in_type(node):
+                transformed = self._widen_narrow_operation(transformed)
+            elif self._is_fixed_width_shift(transformed):
+                self._record_shift_bounds(node, transformed)
             for index, (argument, source_position) in enumerate(zip(
                 transformed.pos_args,
                 source_positions,
@@ -8994,6 +9010,78 @@ class _Lowerer:
             return False
         return node.func.type.pos_or_kw[0].type in FIXED_INTEGER_WIDTHS
 
+    @staticmethod
+    def _is_narrow_operation(node: hir.FunctionCall) -> bool:
+        """Whether emission wraps the result of ``node`` to a narrow width."""
+        return (
+            isinstance(node.func, hir.ExpressedIdentifier)
+            and node.func.name in NARROW_WRAPPED_DUNDERS
+            and isinstance(node.func.type, ty.FunctionType)
+            and bool(node.func.type.pos_or_kw)
+            and node.func.type.pos_or_kw[0].type in NARROW_FIXED_INTS
+        )
+
+    def _proven_in_type(self, node: hir.AST) -> bool:
+        """Whether the bounds pass proved ``node`` within its fixed-width type."""
+        interval = self.intervals.get(id(node))
+        layout = ty.fixed_integer_layout(node.type)
+        if (
+            interval is None
+            or layout is None
+            or interval.lower is None
+            or interval.upper is None
+        ):
+            return False
+        width, signed = layout
+        minimum = -(1 << (width - 1)) if signed else 0
+        maximum = (1 << (width - (1 if signed else 0))) - 1
+        return minimum <= interval.lower and interval.upper <= maximum
+
+    def _proven_below(self, node: hir.AST, limit: int) -> bool:
+        """Whether the bounds pass proved ``node`` within ``0..limit - 1``."""
+        interval = self.intervals.get(id(node))
+        return (
+            interval is not None
+            and interval.lower is not None
+            and interval.upper is not None
+            and 0 <= interval.lower
+            and interval.upper < limit
+        )
+
+    @staticmethod
+    def _widen_narrow_operation(call: hir.FunctionCall) -> hir.FunctionCall:
+        """Select the word-width operation for a call that cannot leave its width.
+
+        Narrow values are kept normalized in machine words, so a result already
+        known to fit the narrow type needs no wrap after the word operation.
+        """
+        assert isinstance(call.func, hir.ExpressedIdentifier)
+        assert isinstance(call.func.type, ty.FunctionType)
+        operand_type = call.func.type.pos_or_kw[0].type
+        wide_type = 'int64' if operand_type in SIGNED_FIXED_INTS else 'uint64'
+        function_type = replace(
+            call.func.type,
+            pos_or_kw=tuple(
+                replace(param, type=wide_type)
+                for param in call.func.type.pos_or_kw
+            ),
+        )
+        return replace(call, func=replace(call.func, type=function_type))
+
+    def _record_shift_bounds(
+        self,
+        source: hir.FunctionCall,
+        transformed: hir.FunctionCall,
+    ) -> None:
+        """Carry the bounds facts about a source shift to its transformed call."""
+        assert isinstance(transformed.func, hir.ExpressedIdentifier)
+        assert isinstance(transformed.func.type, ty.FunctionType)
+        width = FIXED_INTEGER_WIDTHS[transformed.func.type.pos_or_kw[0].type]
+        self.shift_bounds[id(transformed)] = (
+            self._proven_below(source.pos_args[1], width),
+            self._proven_in_type(source),
+        )
+
     def _extract_fixed_width_shift(
         self,
         node: hir.FunctionCall,
@@ -9003,7 +9091,9 @@ class _Lowerer:
         udewy's machine-word shifts mask their count modulo 64. Dewy instead
         accepts only unsigned counts and continues the source shift beyond its
         width, including sign extension for signed right shifts, so this guard
-        must be represented before source emission.
+        must be represented before source emission. The guard is omitted when
+        the bounds pass proved the count below the width, and the wrap of a
+        narrow left shift when it proved the result within the type.
         """
         assert isinstance(node.func, hir.ExpressedIdentifier)
         assert isinstance(node.func.type, ty.FunctionType)
@@ -9033,31 +9123,6 @@ class _Lowerer:
             hir.ValueCast(count.loc, 'uint64', count),
         )
 
-        width_count = hir.Integer(node.loc, 'uint64', t0.base10, width)
-        count_reaches_width = self._intrinsic_call(
-            '__unsigned_gte__',
-            [count_temp, width_count],
-            'bool',
-            node.loc,
-        )
-
-        zero_result = hir.Integer(node.loc, node.type, t0.base10, 0)
-        overshift_result: hir.AST = zero_result
-        if node.func.name == '__rshift__' and operand_type in SIGNED_FIXED_INTS:
-            overshift_result = hir.ValueCast(
-                node.loc,
-                node.type,
-                self._intrinsic_call(
-                    '__signed_shr__',
-                    [
-                        replace(left_temp, type='int64'),
-                        self._int64_literal(node.loc, 63),
-                    ],
-                    'int64',
-                    node.loc,
-                ),
-            )
-
         wide_type = 'int64' if operand_type in SIGNED_FIXED_INTS else 'uint64'
         wide_left = replace(left_temp, type=wide_type)
         if node.func.name == '__rshift__' and wide_type == 'int64':
@@ -9083,7 +9148,11 @@ class _Lowerer:
                 node.loc,
             )
 
-        if node.func.name == '__lshift__' and width < 64:
+        count_in_width, result_in_type = self.shift_bounds.get(
+            id(node),
+            (False, False),
+        )
+        if node.func.name == '__lshift__' and width < 64 and not result_in_type:
             if wide_type == 'uint64':
                 mask = hir.Integer(
                     node.loc,
@@ -9120,6 +9189,41 @@ class _Lowerer:
                     node.loc,
                 )
 
+        operands: list[hir.AST] = [
+            *left_prelude,
+            left_declaration,
+            *count_prelude,
+            count_declaration,
+        ]
+        shifted = hir.ValueCast(node.loc, node.type, safe_shift)
+        if count_in_width:
+            return operands, shifted
+
+        width_count = hir.Integer(node.loc, 'uint64', t0.base10, width)
+        count_reaches_width = self._intrinsic_call(
+            '__unsigned_gte__',
+            [count_temp, width_count],
+            'bool',
+            node.loc,
+        )
+
+        zero_result = hir.Integer(node.loc, node.type, t0.base10, 0)
+        overshift_result: hir.AST = zero_result
+        if node.func.name == '__rshift__' and operand_type in SIGNED_FIXED_INTS:
+            overshift_result = hir.ValueCast(
+                node.loc,
+                node.type,
+                self._intrinsic_call(
+                    '__signed_shr__',
+                    [
+                        replace(left_temp, type='int64'),
+                        self._int64_literal(node.loc, 63),
+                    ],
+                    'int64',
+                    node.loc,
+                ),
+            )
+
         guarded = hir.Flow(
             node.loc,
             node.type,
@@ -9131,16 +9235,10 @@ class _Lowerer:
                     overshift_result,
                 ),
             ],
-            hir.ValueCast(node.loc, node.type, safe_shift),
+            shifted,
         )
         shift_prelude, result = self._extract_expression(guarded)
-        return [
-            *left_prelude,
-            left_declaration,
-            *count_prelude,
-            count_declaration,
-            *shift_prelude,
-        ], result
+        return [*operands, *shift_prelude], result
 
     @staticmethod
     def _typed_binary(
@@ -9500,8 +9598,16 @@ class _Lowerer:
         return node
 
 
-def lower_for_udewy(root: hir.AST, srcfile: SrcFile) -> LoweredProgram:
-    """Legalize checked HIR function constructs for udewy source emission."""
+def lower_for_udewy(
+    root: hir.AST,
+    srcfile: SrcFile,
+    intervals: bounds.Intervals | None = None,
+) -> LoweredProgram:
+    """Legalize checked HIR function constructs for udewy source emission.
+
+    ``intervals`` are the bounds pass's facts about ``root``, used to omit
+    width handling they prove redundant.
+    """
     if not isinstance(root, hir.Block):
         raise TypeError(f'expected Block, got {type(root).__name__}')
-    return _Lowerer(root, srcfile).lower()
+    return _Lowerer(root, srcfile, intervals).lower()
@@ -0,0 +1,115 @@
+"""
+On-disk cache of parsed (p0) modules
+
+Each source file gets a `__dewycache__/<name>.p0` entry next to it, holding a key followed by the pickled `p0.Block`
+and the warnings reported while parsing it, which are reported again on every cache hit. The key hashes the file
+contents together with the compiler version (`VERSION`) and the source of the front end itself, so editing either the
+file or the parser invalidates the entry.
+
+Setting `DEWY_CACHE_DIR` keeps the caches of every kind under that directory instead, mirroring the source tree, and
+`DEWY_CACHE_DIR=off` turns them off (e.g. so test runs neither leave cache files behind nor depend on old ones).
+"""
+import pickle
+from hashlib import sha256
+from os import environ, getpid
+from os import replace as atomic_replace
+from pathlib import Path
+
+from ..reporting import Report, SrcFile, collect_warnings
+from . import p0
+
+CACHE_DIR = '__dewycache__'
+ENV_VAR = 'DEWY_CACHE_DIR'
+SUFFIX = '.p0'
+
+# what a stale or foreign cache file can raise while being unpickled
+LOAD_ERRORS = (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, ValueError)
+
+_front_end_digest: bytes | None = None
+
+
+def _front_end_fingerprint() -> bytes:
+    """hash of the compiler version and the modules that produce p0 ASTs"""
+    global _front_end_digest
+    if _front_end_digest is None:
+        package_root = Path(__file__).parent
+        hasher = sha256((package_root.parents[1] / 'VERSION').read_bytes())
+        for name in ('t0.py', 't1.py', 't2.py', 'p0.py', '../reporting.py'):
+            hasher.update((package_root / name).read_bytes())
+        _front_end_digest = hasher.digest()
+    return _front_end_digest
+
+
+def cache_key(srcfile: SrcFile) -> bytes:
+    return sha256(_front_end_fingerprint() + srcfile.body.encode()).digest()
+
+
+def cache_dir(directory: Path) -> Path | None:
+    """where the cache files for sources in `directory` go, or None if caching is turned off (see `ENV_VAR`)"""
+    root = environ.get(ENV_VAR)
+    if not root:
+        return directory / CACHE_DIR
+    if root == 'off':
+        return None
+    directory = directory.resolve()
+    return Path(root) / directory.relative_to(directory.anchor)
+
+
+def cache_path(path: Path) -> Path | None:
+    directory = cache_dir(path.parent)
+    return directory / (path.name + SUFFIX) if directory is not None else None
+
+
+def load(srcfile: SrcFile) -> tuple[p0.Block, list[Report]] | None:
+    """the cached parse of `srcfile` and its warnings, or None if there isn't an up to date one"""
+    assert srcfile.path is not None, 'INTERNAL ERROR: only files on disk can be cached'
+    path = cache_path(Path(srcfile.path))
+    if path is None:
+        return None
+    try:
+        with path.open('rb') as f:
+            if pickle.load(f) != cache_key(srcfile):
+                return None
+            block, warnings = pickle.load(f)
+    except LOAD_ERRORS:
+        return None  # missing, truncated or written by an incompatible interpreter
+    return (block, warnings) if isinstance(block, p0.Block) else None
+
+
+def store(srcfile: SrcFile, block: p0.Block, warnings: list[Report]) -> None:
+    """write the parse of `srcfile` to the cache. Failures (e.g. read-only directories) just leave the cache cold"""
+    assert srcfile.path is not None, 'INTERNAL ERROR: only files on disk can be cached'
+    path = cache_path(Path(srcfile.path))
+    if path is not None:
+        write_pickles(path, cache_key(srcfile), (block, warnings))
+
+
+def write_pickles(path: Path, *objects: object) -> bool:
+    """pickle `objects` one after the other into `path`. False (and nothing written) if that isn't possible"""
+    # write then rename so concurrent compiles never see a partial file
+    tmp = path.with_name(f'{path.name}.{getpid()}.tmp')
+    try:
+        data = b''.join(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL) for obj in objects)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_bytes(data)
+        atomic_replace(tmp, path)
+    except (OSError, RecursionError, pickle.PicklingError):
+        tmp.unlink(missing_ok=True)
+        return False
+    return True
+
+
+def parse(srcfile: SrcFile) -> p0.Block:
+    """`p0.parse`, reusing the cached result if the file hasn't changed since it was last parsed"""
+    if srcfile.path is None:
+        return p0.parse(srcfile)
+    cached = load(srcfile)
+    if cached is not None:
+        block, warnings = cached
+        for warning in warnings:
+            warning.warn()
+        return block
+    with collect_warnings() as warnings:
+        block = p0.parse(srcfile)
+    store(srcfile, block, warnings)
+    return block
@@ -4,9 +4,10 @@ Initial parsing pass. A simple pratt-style parser
 
 from textwrap import dedent
 from typing import NoReturn, Sequence, Callable, TypeAlias, Literal, cast, overload, Never
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum, auto
-from collections import defaultdict
+from collections.abc import Hashable
+from itertools import combinations, product
 
 from . import t0
 from . import t1
@@ -223,65 +224,68 @@ def get_associativity(op: t2.Operator) -> Associativity | list[Associativity]:
 class Context:
     srcfile: SrcFile
 
-@dataclass
+@dataclass(slots=True)
 class AST:
     loc: Span
 
-@dataclass
+@dataclass(slots=True)
 class BinOp(AST):
     """either a binary node, a prefix node, or a postfix node"""
     op: t2.Operator
     left: AST
     right: AST
 
-@dataclass
+@dataclass(slots=True)
 class Prefix(AST):
     op: t1.Operator|t2.BroadcastOp
     item: AST
 
-@dataclass
+@dataclass(slots=True)
 class Postfix(AST):
     op: t1.Operator|t2.BroadcastOp
     item: AST
 
 # used for operators that are flat rather than have an associativity (namely comma separated expressions)
-@dataclass
+@dataclass(slots=True)
 class Flat(AST):
     """node for flat operators that all combine to a single operation rather than a tree (e.g. comma separated expressions)"""
     op: t2.Operator
     items: list[AST]
 
 
-# TBD how to set this up since don't have a whole AST when we see ambiguity, just reductions in a list
-# perhaps instead keep the reductions + AST/tokens they tend over
-# also ideally there would be maximal sharing when dealing with ambiguous cases.
-@dataclass
+@dataclass(slots=True)
 class Ambiguous(AST):
+    """
+    alternative parses of the same span (node of a packed parse forest, see `juxtapose_forest`)
+
+    Candidates share subtrees with each other and may contain further Ambiguous nodes, so the ambiguity stays
+    local to where it occurs and each candidate can be pruned on its own. Use `hoist_ambiguity` to get whole readings
+    """
     candidates: list[AST]
 
 # ASTs that represent whole expressions that can be used as operands
 # most of these are just thin rewrites of their t1/t2 counterparts
-@dataclass
+@dataclass(slots=True)
 class Block(AST):
     inner: list[AST]
     kind: Literal['{}', '[]', '()', '[)', '(]', '<>']
     base: t0.BasePrefix | None
 
-@dataclass
+@dataclass(slots=True)
 class ParametricEscape(AST):
     inner: list[AST]
-@dataclass
+@dataclass(slots=True)
 class IString(AST):
     content: list[str | ParametricEscape | Block]
-@dataclass
+@dataclass(slots=True)
 class KeywordExpr(AST):
     parts: list[t1.Keyword | AST]
-@dataclass
+@dataclass(slots=True)
 class Flow(AST):
     arms: list[KeywordExpr]
     default: AST|None=None
 
-@dataclass
+@dataclass(slots=True)
 class Atom(AST):
     """all non-container Tokens just get wrapped up into an Atom AST"""
     item: t1.Token
@@ -493,43 +497,29 @@ def parse_flow(flow: t2.Flow, ctx: Context) -> Flow:
 
 def reduce_loop(chain: ProtoAST, ctx: Context) -> AST:
     """
-    repeatedly apply shunting reductions until no more occur. modifies `tokens` in place
-    
-    Each chain in the list is an ambiguous alternative parse (initially there should only be one, but the list can grow if ambiguous operators are present)
-    If multiple chains are present at the end, an Ambiguous node is returned containing all the candidates
-    Otherwise the parsed AST is returned
+    repeatedly apply shunting reductions until no more occur. modifies `chain` in place
+
+    Juxtaposes that could be read at more than one precedence are first packed into shared parse forests
+    (see `pack_juxtapose_runs`), so the shunting itself never has to consider alternative parses.
+    If the chain was ambiguous, the result contains Ambiguous nodes
     """
     _chain_items = chain.items.copy()  # used for reporting
+    num_parses = 1
+    if any(is_ambiguous_juxtapose(item) for item in chain.items):
+        num_parses = pack_juxtapose_runs(chain, ctx)
 
-    chains: list[ProtoAST] = [chain]
-
-    while True:
-        initial_lengths = [len(chain.items) for chain in chains]
-        initial_num_chains = len(chains)
-        shunt_pass(chains, ctx)
+    shunt(chain, ctx)
 
-        # exit loop if no reductions occurred
-        if all(len(chain.items) == initial_length for initial_length, chain in zip(initial_lengths, chains)) and len(chains) == initial_num_chains:
-            break
-    
     # during development, this might also be hit due to internal errors, e.g. bugs where something is not properly reducing
     # TODO: this could be a user error, e.g. `A&;b&c`. Do full error reporting
     # perhaps do: for each item in list, if is op, determine what kinds of reductions it could participate in and show error listing them vs what was present
-    candidates: list[AST] = []
-    for chain in chains:
-        if not len(chain.items) == 1:
-            raise ValueError(f"INTERNAL ERROR: reduce_loop produced {len(chain.items)} items, expected 1")
-        item = chain.items[0]
-        if not isinstance(item, AST):
-            raise ValueError(f"INTERNAL ERROR: shunt-loop produced non-AST item. got {item=}")
-        candidates.append(item)
-    
-    # unambiguous case
-    if len(candidates) == 1:
-        return candidates[0]
-    
-    # multiple alternate parses means an ambiguous node
-    if len(candidates) > 50:
+    if not len(chain.items) == 1:
+        raise ValueError(f"INTERNAL ERROR: reduce_loop produced {len(chain.items)} items, expected 1")
+    item = chain.items[0]
+    if not isinstance(item, AST):
+        raise ValueError(f"INTERNAL ERROR: shunt-loop produced non-AST item. got {item=}")
+
+    if num_parses > 50:
         qjuxs = [item for item in _chain_items if isinstance(item, t2.QJuxtapose)]
         groups = concrete_groupby(_chain_items, key=lambda x: isinstance(x, t2.QJuxtapose))
         unambiguous_src_template = "".join([
@@ -544,9 +534,9 @@ def reduce_loop(chain: ProtoAST, ctx: Context) -> AST:
         report = Warning(
             srcfile=ctx.srcfile,
             title="Highly ambiguous expressions",
-            message=f"Expression has {len(candidates)} possible parses (before type checking/disambiguation)",
+            message=f"Expression has {num_parses} possible parses (before type checking/disambiguation)",
             pointer_messages=[
-                Pointer(span=candidates[0].loc, message="highly ambiguous expression", placement='below'),
+                Pointer(span=item.loc, message="highly ambiguous expression", placement='below'),
                 *[  Pointer(span=op.loc, message=f"this juxtapose could be any of <{"> | <".join(map(lambda x: x.__class__.__name__, op.options))}>", placement='above')
                     for op in qjuxs
                 ]
@@ -568,182 +558,260 @@ def reduce_loop(chain: ProtoAST, ctx: Context) -> AST:
         )
         report.warn()
 
+    return item
 
-    return Ambiguous(candidates[0].loc, candidates)
 
+multiply_precedence = cast(int, precedence_table[t2.MultiplyJuxtapose])
 
+def is_ambiguous_juxtapose(item: AST|t2.Operator) -> bool:
+    """a juxtapose whose options don't all share a precedence (e.g. call vs multiply)"""
+    return isinstance(item, t2.QJuxtapose) and isinstance(get_precedence(item), qint)
 
-def shunt_pass(chains: list[ProtoAST], ctx: Context) -> None:
-    """apply a shunting reduction. modifies `chains` in place (potentially adding new lists in the case of ambiguities)"""
-    new_chains: list[ProtoAST] = []
-    for chain_idx, chain in enumerate(chains):
-        raw_shift_dirs, raw_candidate_operator_idxs, reverse_ast_idxs_map = identify_shifts(chain, ctx)
+def binds_at_least_as_multiply(op: t2.Operator) -> bool:
+    """if every reading of the operator (e.g. prefix and binary `-`) binds at least as tightly as multiply juxtapose"""
+    precedence = get_precedence(op)
+    return min(precedence.values if isinstance(precedence, qint) else [precedence]) >= multiply_precedence
 
-        if all(isinstance(shift_dir, int) for shift_dir in raw_shift_dirs):
-            # simple case, just directly take the shift_dirs and candidate_operator_idxs
-            all_shift_dir_lists: list[list[ShiftDir]] = [raw_shift_dirs]
-            all_candidate_operator_idxs_sets: list[set[int]] = [raw_candidate_operator_idxs]
-            chain_copies = [chain]
-        else:
-            # break out variations for each possible candidate shift meta
-            
-            all_shift_dir_lists: list[list[ShiftDir]] = [[]]
-            all_candidate_operator_idxs_sets: list[set[int]] = [raw_candidate_operator_idxs]
-            chain_copies: list[ProtoAST] = [chain]
-
-            for shift_dir in raw_shift_dirs:
-                if isinstance(shift_dir, int):
-                    # simple case, just directly take the shift_dir since it's an int
-                    for shift_dir_list in all_shift_dir_lists:
-                        shift_dir_list.append(shift_dir)
-                        # don't need to add to candidate_operator_idxs because unambiguous operators were already included in identify_shifts()
-                        # don't need to add a chain copy because unambiguous operators don't fan out any alternative cases over the existing ones
-                    continue
+def pack_juxtapose_runs(chain: ProtoAST, ctx: Context) -> int:
+    """
+    replace each run of items containing ambiguous juxtaposes with its packed parse forest. modifies `chain` in place
 
-                # otherwise, we'll add variations for every option in the current shift dir
-                
-                # collect out all the shift candidate metas
-                shift_candidates: list[tuple[ShiftDir, ShiftMeta]] = []
-                for unambiguous_shift_dir, meta_list in shift_dir.values.items():
-                    shift_candidates.extend([(unambiguous_shift_dir, meta) for meta in meta_list])
-
-
-                # make copies of the current chains/shift_dir_lists/candidate_operator_idxs_sets for each of the extra ambiguous shift direction sets
-                initial_len_alternatives = len(all_shift_dir_lists)
-                all_shift_dir_lists = [shift_dir_list.copy() for _ in shift_candidates for shift_dir_list in all_shift_dir_lists]
-                all_candidate_operator_idxs_sets = [candidate_operator_idxs_set.copy() for _ in shift_candidates for candidate_operator_idxs_set in all_candidate_operator_idxs_sets]
-                chain_copies = [ProtoAST(chain_copy.items.copy()) for _ in shift_candidates for chain_copy in chain_copies]
-                for i, (unambiguous_shift_dir, meta) in enumerate(shift_candidates):
-                    offset = i * initial_len_alternatives
-                    for j in range(initial_len_alternatives):
-                        all_shift_dir_lists[offset + j].append(unambiguous_shift_dir)
-                        all_candidate_operator_idxs_sets[offset + j].add(meta.superior_op_idx)
-                        # replace the existing operators in the chain with the ones from the meta
-                        chain_copies[offset + j].items[meta.superior_op_idx] = meta.superior_op
-                        chain_copies[offset + j].items[meta.subordinate_op_idx] = meta.subordinate_op
-
-
-        # for ambiguous cases, basically make cartesian product over ambiguous shift dirs, and then identify reductions for each one
-        for shift_dirs, candidate_operator_idxs, chain_copy in zip(all_shift_dir_lists, all_candidate_operator_idxs_sets, chain_copies):
-            reductions = identify_reductions(chain_copy, shift_dirs, candidate_operator_idxs, reverse_ast_idxs_map, ctx)
-
-            # apply reductions in reverse order to avoid index shifting issues
-            for reduction, (left_bound, right_bound), _ in reversed(reductions):
-                chain_copy.items[left_bound:right_bound] = [reduction]
-        
-        # bookkeeping to make sure chain updated in place and propogated to outer functions calling this
-        chains[chain_idx] = chain_copies[0]
-        new_chains.extend(chain_copies[1:])
-    
-    # include the new cases in the list of chains
-    chains.extend(new_chains)
+    Every reading of a juxtapose binds at least as tightly as multiply, so a maximal run of items with
+    no operators looser than multiply is a complete subtree under every reading, and the chain outside
+    of the runs reduces the same way regardless of how the juxtaposes are read.
 
+    Returns the number of parses of the whole chain
+    """
+    items: list[AST|t2.Operator] = []
+    num_parses = 1
+    for is_loose_op, group in concrete_groupby(chain.items, key=lambda item: isinstance(item, t2.Operator) and not binds_at_least_as_multiply(item)):
+        if is_loose_op or not any(is_ambiguous_juxtapose(item) for item in group):
+            items.extend(group)
+            continue
+        forest, num_run_parses = juxtapose_forest(group, ctx)
+        items.append(forest)
+        num_parses *= num_run_parses
+    chain.items[:] = items
+    return num_parses
 
-ShiftDir: TypeAlias = Literal[-1, 0, 1]
-NonZeroShiftDir: TypeAlias = Literal[-1, 1]
+def juxtapose_forest(items: list[AST|t2.Operator], ctx: Context) -> tuple[AST, int]:
+    """
+    parse a run of items (with no operators looser than multiply) into a packed parse forest
 
-@dataclass
-class ShiftMeta:
-    superior_op: t2.Operator
-    subordinate_op: t2.Operator
-    superior_op_idx: int
-    subordinate_op_idx: int
-
-def identify_shifts(chain: ProtoAST, ctx: Context) -> tuple[list[ShiftDir|qint[list[ShiftMeta]]], set[int], dict[int, int]]:
-    # identify items that could shift
-    ast_idxs = [i for i, item in enumerate(chain.items) if isinstance(item, AST)]
-    asts = cast(list[AST], [chain.items[i] for i in ast_idxs])
-    reverse_ast_idxs_map = {idx: i for i, idx in enumerate(ast_idxs)} # so we can look up the index of an ast's shift dir in the shift_dirs list
-    candidate_operator_idxs: set[int] = set()
-    
-    # determine the direction items would shift according to operator binding power of the adjacent operators
-    shift_dirs: list[ShiftDir|qint[list[ShiftMeta]]] = [0] * len(ast_idxs)
-    for i, (ast, ast_idx) in enumerate(zip(asts, ast_idxs)):
-        # get left and/or right operators if present
-        left_op = chain.items[ast_idx - 1] if ast_idx > 0 else None
-        right_op = chain.items[ast_idx + 1] if ast_idx < len(chain.items) - 1 else None
-
-        # semicolon is a special case that can only shift left if left is SemicolonJuxtapose
-        if isinstance(ast, Atom) and isinstance(ast.item, t1.Semicolon) and not isinstance(left_op, t2.SemicolonJuxtapose):
-            continue
-        
-        # get binding power of left and right (if they are operators)
-        left_bp, right_bp = NO_BIND, NO_BIND
-        if isinstance(left_op, t2.Operator):
-            _, left_bp = get_bind_power(left_op)
-        if isinstance(right_op, t2.Operator):
-            right_bp, _ = get_bind_power(right_op)
-        
-        if left_bp == NO_BIND and right_bp == NO_BIND:
+    Multiply is the loosest operator in the run, so every parse is a left fold of multiplies over pieces where each
+    ambiguous juxtapose takes its tighter (call/index) reading. The forest for `items[:stop]` is an Ambiguous over
+    which juxtapose is the last multiply (if any), with the forests of the shorter prefixes shared as the left operands.
+    Alternatives that differ only in how one juxtapose is read are merged back into a single QJuxtapose, which the
+    type checker resolves locally.
+
+    Returns the forest, and the number of parses it packs
+    """
+    tight_ops: dict[int, t2.Operator] = {}
+    loose_ops: dict[int, t2.Operator] = {}
+    for i, item in enumerate(items):
+        if is_ambiguous_juxtapose(item):
+            assert isinstance(item, t2.QJuxtapose)
+            tight_ops[i] = _narrow_juxtapose(item, tight=True)
+            loose_ops[i] = _narrow_juxtapose(item, tight=False)
+    juxtapose_idxs = {id(op): i for ops in (tight_ops, loose_ops) for i, op in ops.items()} | {id(items[i]): i for i in tight_ops}
+
+    def piece(start: int, stop: int) -> AST:
+        return reduce_loop(ProtoAST([tight_ops.get(i, items[i]) for i in range(start, stop)]), ctx)
+
+    # forests for each prefix of the run that could be the left operand of a multiply (shortest first)
+    cut_idxs = [i for i, item in enumerate(items) if i in loose_ops or isinstance(item, t2.MultiplyJuxtapose)]
+    forests: dict[int, tuple[AST, int]] = {}
+    for stop in [*cut_idxs, len(items)]:
+        # an explicit multiply is always a cut, so the last multiply can't be before it
+        last_multiply_idx = max((i for i in cut_idxs if i < stop and i not in loose_ops), default=None)
+        alternatives: list[tuple[AST, int]] = []
+        if last_multiply_idx is None:
+            alternatives.append((piece(0, stop), 1))
+        for i in cut_idxs:
+            if i >= stop or (last_multiply_idx is not None and i < last_multiply_idx):
+                continue
+            left, num_parses = forests[i]
+            right = piece(i + 1, stop)
+            alternatives.append((BinOp(Span(left.loc.start, right.loc.stop), loose_ops.get(i, items[i]), left, right), num_parses))
+        forests[stop] = _pack_alternatives(alternatives, items, juxtapose_idxs)
+
+    return forests[len(items)]
+
+def _narrow_juxtapose(op: t2.QJuxtapose, *, tight: bool) -> t2.Operator:
+    """the options of an ambiguous juxtapose that bind tighter than multiply (or the ones that don't)"""
+    options = [o for o in op.options if (get_precedence(o) > multiply_precedence) == tight]
+    return t2.QJuxtapose(op.loc, _option_types=list(map(type, options))) if len(options) > 1 else options[0]
+
+def _pack_alternatives(alternatives: list[tuple[AST, int]], items: list[AST|t2.Operator], juxtapose_idxs: dict[int, int]) -> tuple[AST, int]:
+    """merge alternatives that differ only in the reading of one juxtapose, and wrap the rest in an Ambiguous"""
+    shapes = [_juxtapose_shape(ast, juxtapose_idxs) for ast, _ in alternatives]
+    merged = True
+    while merged:
+        merged = False
+        for (i, (shape_i, readings_i)), (j, (shape_j, readings_j)) in combinations(enumerate(shapes), 2):
+            if shape_i != shape_j:
+                continue
+            differing = [idx for idx, op in readings_i.items() if readings_j[idx] is not op]
+            if len(differing) != 1:
+                continue
+            [idx] = differing
+            ast = _replace_op(alternatives[i][0], readings_i[idx], items[idx])
+            alternatives[i] = (ast, alternatives[i][1])
+            shapes[i] = _juxtapose_shape(ast, juxtapose_idxs)
+            del alternatives[j], shapes[j]
+            merged = True
+            break
+
+    if len(alternatives) == 1:
+        return alternatives[0]
+    asts = [ast for ast, _ in alternatives]
+    return Ambiguous(asts[0].loc, asts), sum(num_parses for _, num_parses in alternatives)
+
+def _juxtapose_shape(ast: AST, juxtapose_idxs: dict[int, int]) -> tuple[Hashable, dict[int, t2.Operator]]:
+    """structure of `ast` ignoring how the juxtaposes in it are read, and the reading of each juxtapose (by index in the run)"""
+    readings: dict[int, t2.Operator] = {}
+    def shape(node: AST) -> Hashable:
+        match node:
+            case BinOp(op=op, left=left, right=right):
+                idx = juxtapose_idxs.get(id(op))
+                if idx is not None:
+                    readings[idx] = op
+                return (BinOp, id(op) if idx is None else idx, shape(left), shape(right))
+            case Prefix(op=op, item=item) | Postfix(op=op, item=item):
+                return (type(node), id(op), shape(item))
+        return id(node)  # leaves and nested Ambiguous forests are shared between alternatives
+    return shape(ast), readings
+
+def _replace_op(ast: AST, old: t2.Operator, new: t2.Operator) -> AST:
+    """copy of `ast` (sharing untouched subtrees) with the node using operator `old` using `new` instead"""
+    match ast:
+        case BinOp(op=op, left=left, right=right):
+            if op is old:
+                return replace(ast, op=new)
+            new_left, new_right = _replace_op(left, old, new), _replace_op(right, old, new)
+            return ast if new_left is left and new_right is right else replace(ast, left=new_left, right=new_right)
+        case Prefix(item=item) | Postfix(item=item):
+            new_item = _replace_op(item, old, new)
+            return ast if new_item is item else replace(ast, item=new_item)
+    return ast
+
+def hoist_ambiguity(ast: AST) -> AST:
+    """
+    move the Ambiguous nodes nested in the operators of `ast` up to a single Ambiguous over whole readings.
+    For consumers that destructure an expression rather than evaluate it (e.g. assignment targets)
+    """
+    def readings(node: AST) -> list[AST]:
+        match node:
+            case Ambiguous(candidates=candidates):
+                return [reading for candidate in candidates for reading in readings(candidate)]
+            case BinOp(left=left, right=right):
+                lefts, rights = readings(left), readings(right)
+                if len(lefts) == len(rights) == 1: return [node]
+                return [replace(node, left=lhs, right=rhs) for lhs in lefts for rhs in rights]
+            case Prefix(item=item) | Postfix(item=item):
+                items = readings(item)
+                return [node] if len(items) == 1 else [replace(node, item=i) for i in items]
+            case Flat(items=items):
+                item_readings = [readings(item) for item in items]
+                if all(len(r) == 1 for r in item_readings): return [node]
+                return [replace(node, items=list(reading)) for reading in product(*item_readings)]
+        return [node]
+
+    candidates = readings(ast)
+    return candidates[0] if len(candidates) == 1 else Ambiguous(ast.loc, candidates)
+
+
+def shunt(chain: ProtoAST, ctx: Context) -> None:
+    """
+    apply shunting reductions until no more occur. modifies `chain` in place
+
+    Reductions are applied in passes, but whether an operator can reduce only depends on the items around it,
+    so after the first pass only the operators next to the previous pass's reductions are revisited.
+    This keeps long operator chains (which reduce one operator per pass) linear rather than quadratic
+    """
+    shift_dirs = [identify_shift(chain, i) for i in range(len(chain.items))]
+    dirty_idxs = {i for i, item in enumerate(chain.items) if isinstance(item, t2.Operator)}
+    while dirty_idxs:
+        candidate_operator_idxs = expand_flat_runs(chain, dirty_idxs)
+        reductions = identify_reductions(chain, shift_dirs, candidate_operator_idxs, ctx)
+
+        # apply reductions in reverse order to avoid index shifting issues
+        for reduction, (left_bound, right_bound), _ in reversed(reductions):
+            chain.items[left_bound:right_bound] = [reduction]
+            shift_dirs[left_bound:right_bound] = [0]
+
+        # only the new ASTs have new neighbors, so only their shifts (and the operators around them) can change
+        dirty_idxs = set()
+        num_removed = 0
+        for _, (left_bound, right_bound), _ in reductions:
+            idx = left_bound - num_removed
+            num_removed += right_bound - left_bound - 1
+            shift_dirs[idx] = identify_shift(chain, idx)
+            if idx > 0:
+                dirty_idxs.add(idx - 1)
+            # operators to the right may now be able to attach to the new AST (see `could_be_binop`)
+            i = idx + 1
+            while i < len(chain.items) and isinstance(chain.items[i], t2.Operator):
+                dirty_idxs.add(i)
+                i += 1
+
+
+def expand_flat_runs(chain: ProtoAST, operator_idxs: set[int]) -> set[int]:
+    """add every operator in the runs of flat operators (e.g. `a, b, c`) that `operator_idxs` touch, since a flat reduction depends on all of its operands"""
+    expanded = set(operator_idxs)
+    for idx in operator_idxs:
+        op = chain.items[idx]
+        if Associativity.flat not in _as_list(get_associativity(op)):
             continue
-        
-        # determine direction of shift
-        if left_bp > right_bp:
-            shift_dirs[i] = -1
-            candidate_operator_idxs.add(ast_idx - 1)
-        elif left_bp < right_bp:
-            shift_dirs[i] = 1
-            candidate_operator_idxs.add(ast_idx + 1)
-        elif left_bp == right_bp:
-            raise ValueError(f"INTERNAL ERROR: left and right have identical binding power. this shouldn't be possible. got {left_bp=} and {right_bp=} for {left_op=} and {right_op=}")
-        else:
-            assert left_op is not None and right_op is not None, f'INTERNAL ERROR: left and right operators are not present. got {left_op=} and {right_op=}'
-            assert not isinstance(left_op, AST) and not isinstance(right_op, AST), f'INTERNAL ERROR: left and right operators are not operators. got {left_op=} and {right_op=}'
-            possible_left_ops = [left_op] if not isinstance(left_op, t2.QJuxtapose) else left_op.options
-            possible_right_ops = [right_op] if not isinstance(right_op, t2.QJuxtapose) else right_op.options
-            assert len(possible_left_ops) > 1 or len(possible_right_ops) > 1, f"INTERNAL ERROR: ambiguous binding powers didn't have multiple operator candidates. got {possible_left_ops=} and {possible_right_ops=}"
+        for step in (-2, 2):
+            i = idx + step
+            while 0 <= i < len(chain.items) and i not in expanded and isinstance(chain.items[i], t2.Operator) and t2.op_equals(chain.items[i], op):
+                expanded.add(i)
+                i += step
+    return expanded
 
 
-            # algorithm to partition out unambiguous groups from the whole set
-            # 1. rank all operators by their binding power (careful to set binding power depending on if the op is on the left or right)
-            op_shift_ranks: list[tuple[t2.Operator, NonZeroShiftDir, int]] = [
-                (left_op, -1, get_bind_power(left_op)[1]) for left_op in possible_left_ops
-            ] + [
-                (right_op, 1, get_bind_power(right_op)[0]) for right_op in possible_right_ops
-            ]
-            op_shift_ranks.sort(key=lambda x: x[2], reverse=True)
-
-            # 2. group the operators by their shift direction. This should partition out sets of binding powers that are unambiguous
-            op_shift_groups = concrete_groupby(op_shift_ranks, key=lambda x: x[1])
-            
-            # 3. for each operator group, all following groups that go in the other direction are subordinate to it
-            quantum_shift_dirs: dict[NonZeroShiftDir, list[ShiftMeta]] = defaultdict(list)
-            is_dir_qjux: dict[NonZeroShiftDir, bool] = {-1: isinstance(left_op, t2.QJuxtapose), 1: isinstance(right_op, t2.QJuxtapose)}
-            for j, (shift_dir, group) in enumerate(op_shift_groups):
-                shift_dir = cast(NonZeroShiftDir, shift_dir) # for some reason, concrete_groupby won't propagate the type of the key
-                if is_dir_qjux[shift_dir]:
-                    superior_ops = [op for op, _, _ in group]
-                    assert all(isinstance(op, t2.Juxtapose) for op in superior_ops), f"INTERNAL ERROR: Superior operators should all be juxtaposes. got {superior_ops=}"
-                    superior_op = t2.QJuxtapose(superior_ops[0].loc, _option_types=list(map(type, superior_ops))) if len(superior_ops) > 1 else superior_ops[0]
-                else:
-                    assert len(group) == 1, f"INTERNAL ERROR: Non-juxtapose operator has multiple ambiguous alternatives. got {group=}"
-                    superior_op = group[0][0]
-                
-                #  collect the subordinate ops which are all operators strictly lower in precedence than the current superior ops group
-                subordinate_ops: list[t2.Operator] = []
-                for (_, subordinate_op_group) in op_shift_groups[j+1::2]:  # alternating groups after the current one for all groups that are the opposite direction and have strictly lower precedence
-                    subordinate_ops.extend([op for op, _, _ in subordinate_op_group])
-                if len(subordinate_ops) == 0:
-                    continue # superior ops are not superior to anything, so they always lose
-                if is_dir_qjux[shift_dir*-1]:
-                    assert all(isinstance(op, t2.Juxtapose) for op in subordinate_ops), f"INTERNAL ERROR: Subordinate operators should all be juxtaposes. got {subordinate_ops=}"
-                    subordinate_op = t2.QJuxtapose(subordinate_ops[0].loc, _option_types=list(map(type, subordinate_ops))) if len(subordinate_ops) > 1 else subordinate_ops[0]
-                else:
-                    assert len(subordinate_ops) == 1, f"INTERNAL ERROR: Non-juxtapose operator has multiple ambiguous alternatives. got {subordinate_ops=}"
-                    subordinate_op = subordinate_ops[0]
-                
-                # add the shift meta to the list of shift metas for this shift direction
-                quantum_shift_dirs[shift_dir].append(ShiftMeta(superior_op, subordinate_op, ast_idx+shift_dir, ast_idx+shift_dir*-1))
+def _as_list(associativity: Associativity | list[Associativity]) -> list[Associativity]:
+    return associativity if isinstance(associativity, list) else [associativity]
+
+
+ShiftDir: TypeAlias = Literal[-1, 0, 1]
+
+def identify_shift(chain: ProtoAST, idx: int) -> ShiftDir:
+    """the direction the item at `idx` would shift according to the binding power of the adjacent operators (0 for operators and items that don't shift)"""
+    ast = chain.items[idx]
+    if not isinstance(ast, AST):
+        return 0
+
+    # get left and/or right operators if present
+    left_op = chain.items[idx - 1] if idx > 0 else None
+    right_op = chain.items[idx + 1] if idx < len(chain.items) - 1 else None
+
+    # semicolon is a special case that can only shift left if left is SemicolonJuxtapose
+    if isinstance(ast, Atom) and isinstance(ast.item, t1.Semicolon) and not isinstance(left_op, t2.SemicolonJuxtapose):
+        return 0
+
+    # get binding power of left and right (if they are operators)
+    left_bp, right_bp = NO_BIND, NO_BIND
+    if isinstance(left_op, t2.Operator):
+        _, left_bp = get_bind_power(left_op)
+    if isinstance(right_op, t2.Operator):
+        right_bp, _ = get_bind_power(right_op)
+
+    if left_bp == NO_BIND and right_bp == NO_BIND:
+        return 0
+
+    # determine direction of shift
+    if left_bp > right_bp:
+        return -1
+    if left_bp < right_bp:
+        return 1
+    # ambiguous juxtaposes are packed into forests before shunting, so neither side can be ambiguous here
+    raise ValueError(f"INTERNAL ERROR: left and right have identical or ambiguous binding power. got {left_bp=} and {right_bp=} for {left_op=} and {right_op=}")
 
-            # insert the ambiguous set of shift directions into the shift_dirs list
-            shift_dirs[i] = qint(quantum_shift_dirs)
-            
-            
-    
-    return shift_dirs, candidate_operator_idxs, reverse_ast_idxs_map
 
 Reduction: TypeAlias = tuple[AST, tuple[int, int], Associativity]
-def identify_reductions(chain: ProtoAST, shift_dirs: list[ShiftDir], candidate_operator_idxs: set[int], reverse_ast_idxs_map: dict[int, int], ctx: Context) -> list[Reduction]:
+def identify_reductions(chain: ProtoAST, shift_dirs: list[ShiftDir], candidate_operator_idxs: set[int], ctx: Context) -> list[Reduction]:
     # identify reductions
     all_reductions: list[tuple[AST, tuple(int, int)]] = []
     for candidate_operator_idx in sorted(candidate_operator_idxs):
@@ -751,10 +819,8 @@ def identify_reductions(chain: ProtoAST, shift_dirs: list[ShiftDir], candidate_o
         right_ast_idx = candidate_operator_idx + 1
         left_ast = chain.items[left_ast_idx] if left_ast_idx >= 0 else None
         right_ast = chain.items[right_ast_idx] if right_ast_idx < len(chain.items) else None
-        left_ast_shift_dir_idx = reverse_ast_idxs_map.get(left_ast_idx)  # index of the ast in the shift_dirs list
-        right_ast_shift_dir_idx = reverse_ast_idxs_map.get(right_ast_idx)  # index of the ast in the shift_dirs list
-        left_ast_shift_dir = shift_dirs[left_ast_shift_dir_idx] if left_ast_shift_dir_idx is not None else 0
-        right_ast_shift_dir = shift_dirs[right_ast_shift_dir_idx] if right_ast_shift_dir_idx is not None else 0
+        left_ast_shift_dir = shift_dirs[left_ast_idx] if left_ast_idx >= 0 else 0
+        right_ast_shift_dir = shift_dirs[right_ast_idx] if right_ast_idx < len(chain.items) else 0
 
         op = chain.items[candidate_operator_idx]
         assert isinstance(op, t2.Operator), f'INTERNAL ERROR: candidate operator is not an operator. got {op=}'
@@ -775,7 +841,7 @@ def identify_reductions(chain: ProtoAST, shift_dirs: list[ShiftDir], candidate_o
                 reductions.append((Postfix(Span(left_ast.loc.start, op.loc.stop), op, left_ast), (left_ast_idx, candidate_operator_idx+1), a))
             elif (a == Associativity.flat) and (left_ast_shift_dir == 1 and right_ast_shift_dir == -1):
                 # check for the whole flat chain
-                res = collect_flat_operands(left_ast_idx, right_ast_idx, op, chain, reverse_ast_idxs_map, shift_dirs)
+                res = collect_flat_operands(left_ast_idx, right_ast_idx, op, chain, shift_dirs)
                 if res is None:
                     continue
                 operands, bounds = res
@@ -924,7 +990,7 @@ def could_be_postfix(op_idx: int, chain: ProtoAST) -> bool:
     # no items to right that could attach
     return False
 
-def collect_flat_operands(left_ast_idx: int, right_ast_idx: int, op: t2.Operator, chain: ProtoAST, reverse_ast_idxs_map: dict[int, int], shift_dirs: list[Literal[-1, 0, 1]]) -> tuple[list[AST], tuple[int, int]]|None:
+def collect_flat_operands(left_ast_idx: int, right_ast_idx: int, op: t2.Operator, chain: ProtoAST, shift_dirs: list[ShiftDir]) -> tuple[list[AST], tuple[int, int]]|None:
     # check for the whole flat chain
     left_ast, right_ast = chain.items[left_ast_idx], chain.items[right_ast_idx]
     operands: list[AST] = [left_ast, right_ast]
@@ -938,10 +1004,9 @@ def collect_flat_operands(left_ast_idx: int, right_ast_idx: int, op: t2.Operator
         if prev_ast_idx < 0:
             # shouldn't be possible to get here because we insert void into comma expressions that are missing operands
             raise ValueError(f'INTERNAL ERROR: missing operand for flat operator {op}. got {operands=}')
-        prev_ast_i = reverse_ast_idxs_map.get(prev_ast_idx)
-        if prev_ast_i is None:
+        if not isinstance(chain.items[prev_ast_idx], AST):
             raise ValueError("INTERNAL ERROR: item didn't shift, indicating something is probably wrong...")
-        prev_ast_shift_dir = shift_dirs[prev_ast_i]
+        prev_ast_shift_dir = shift_dirs[prev_ast_idx]
         if prev_ast_shift_dir == 0:
             raise ValueError(f"INTERNAL ERROR: item didn't shift, indicating something is probably wrong... got {prev_ast_shift_dir=} for {prev_ast_idx=}")
         if prev_ast_shift_dir == -1:
@@ -957,10 +1022,9 @@ def collect_flat_operands(left_ast_idx: int, right_ast_idx: int, op: t2.Operator
         if next_ast_idx >= len(chain.items):
             # shouldn't be possible to get here because we insert void into comma expressions that are missing operands
             raise ValueError(f'INTERNAL ERROR: missing operand for flat operator {op}. got {operands=}')
-        next_ast_i = reverse_ast_idxs_map.get(next_ast_idx)
-        if next_ast_i is None:
+        if not isinstance(chain.items[next_ast_idx], AST):
             raise ValueError("INTERNAL ERROR: item didn't shift, indicating something is probably wrong...")
-        next_ast_shift_dir = shift_dirs[next_ast_i]
+        next_ast_shift_dir = shift_dirs[next_ast_idx]
         if next_ast_shift_dir == 0:
             raise ValueError(f"INTERNAL ERROR: item didn't shift, indicating something is probably wrong... got {next_ast_shift_dir=} for {next_ast_idx=}")
         if next_ast_shift_dir == 1:
@@ -11,26 +11,39 @@ During `tokenize`, we never hard-code a list of token types.
 Instead, we dynamically (with caching) determine which tokens are allowed in a given context:
 - look up all subclasses of `Token` via `descendants(Token)`,
 - filter them by whether the current context type appears in their `valid_contexts`,
-- then call `eat(src[i:], ctx)` on each allowed token class remaining.
+- narrow them down to the ones whose `first_chars` admit the current character (via a per-context dispatch table),
+- then call `eat(src, ctx, i)` on each candidate token class remaining.
 
 Any token whose `eat` method returns a non-`None` length is considered a match.
 We keep only the longest matches, then resolve any remaining ambiguities via `token_precedence`.
 
+The hottest token classes additionally provide a `fast_eat`, which matches the same
+thing as `eat` but scans whole runs with a compiled regex (i.e. a single C-level call)
+rather than a character at a time in Python. The regexes are generated from the same
+character sets `eat` uses, so `eat` stays the source of truth (see `tokenize(..., fast_eat=False)`).
+
 Each token class can also return a `Push` or `Pop` action from `action_on_eat`,
 which updates a stack of `Context` objects (for example when entering or
 leaving a block or string). This context stack controls which tokens are
 eligible to match at each position, and lets the tokenizer enforce context-
 sensitive rules (e.g. different tokens allowed inside strings vs. at the top
 level) in a purely declarative way.
+
+Since the context stack is the only state carried between tokens, `tokenize_editable` keeps a snapshot of it at
+every token boundary, and `retokenize` uses them to update the tokens after an edit: it restarts just before the
+edit and stops once the stack (and token boundaries) line up with the old ones again.
 """
 
-from ..reporting import Span, Info, Warning, Error, SrcFile, Pointer, ReportException
+from ..reporting import Span, Info, Warning, Error, SrcFile, Pointer, Report, ReportException
 from ..utils import truncate, descendants, ordinalize, first_line
 from typing import NoReturn, TypeAlias, ClassVar, get_origin, get_args, Union, Protocol, Literal
+from collections.abc import Callable, Generator
 from types import UnionType
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 from functools import cache
+from bisect import bisect_left
+import re
 
 
 import pdb
@@ -61,6 +74,7 @@ primes = set('′″‴⁗')
 start_characters = alpha | greek | math | misc # | latin | units
 continue_characters = start_characters | digits
 decoration_characters = superscripts | subscripts | misc_decorations | primes
+identifier_characters = continue_characters | decoration_characters
 
 # note that the prefix is case insensitive, so call .casefold() when matching the prefix
 # numbers may have _ as a separator (if _ is not in the set of digits)
@@ -125,6 +139,11 @@ def parse_integer(s:str, prefix:BasePrefix) -> int:
     return value
 
 
+def charclass(chars: set[str]|frozenset[str], negate: bool = False) -> str:
+    """build a regex character class matching any of the given characters (or any character not given, if `negate`)"""
+    return f"[{'^' if negate else ''}{''.join(re.escape(c) for c in sorted(chars))}]"
+
+
 # Mostly operators, but also some special identifiers
 # Symbols are case-insensitive (mainly relevant for `in?`, `is?`, `isnt?`)
 symbols = sorted([
@@ -144,6 +163,11 @@ symbols = sorted([
 ], key=len, reverse=True)
 LEN_LONGEST_SYMBOL = len(symbols[0])
 
+# symbols grouped by their first character (still longest first within each group)
+symbols_by_first_char: dict[str, list[str]] = {}
+for op in symbols:
+    symbols_by_first_char.setdefault(op[0], []).append(op)
+
 # shift operators are not allowed in type groups, so deal with them separately
 shift_operators = sorted(['<<', '>>', '<<<', '>>>', '<<!', '!>>'], key=len, reverse=True)
 
@@ -171,6 +195,10 @@ class Context(ABC):
         if len(self.tokens_so_far) == 0: return 0
         return self.tokens_so_far[-1].loc.stop
 
+    def digits_base(self) -> BasePrefix:
+        """The base that bare digits are read in within this context. Along with the context type, this keys the dispatch tables (see `get_dispatch_table`)"""
+        return base10
+
 @dataclass
 class Root(Context):
     default_base: BasePrefix = base10
@@ -192,10 +220,14 @@ class BasedStringBody(Context):
     opening_quote: BasedStringQuoteOpener
     base: BasePrefix
 
+    def digits_base(self) -> BasePrefix: return self.base
+
 @dataclass
 class BlockBody(Context):
     opening_delim: LeftSquareBracket | LeftParenthesis | LeftCurlyBrace | TemplateLeftCurlyBrace | ParametricStringEscape
     default_base: BasePrefix = base10
+
+    def digits_base(self) -> BasePrefix: return self.default_base
  
 
 @dataclass
@@ -222,6 +254,8 @@ class Pop: ...
 
 ContextAction: TypeAlias = Push | Pop | None
 
+type EatFn = Callable[[str, Context, int], int|None]
+
 ##### TOKEN CLASSES AND EATING LOGIC #####
 
 @dataclass
@@ -247,39 +281,56 @@ class Token[T:Context](ABC):
     The main `tokenize` loop discovers token classes dynamically via
     `descendants(Token)` and caches, for each `Context` type, the list of token
     classes whose `valid_contexts` contains that context type. For each token
-    class allowed in the current context, it calls its `eat(src[i:], ctx)` method;
+    class allowed in the current context, it calls its `eat(src, ctx, i)` method;
     eat methods return an integer length
     to indicate a match (and how many characters it is) or `None` if no match. 
     The tokenizer uses the longest match strategy to break ties, and may further
     break ties using `token_precedence` if multiple longest matches have the same length.
 
+    Subclasses may also declare `first_chars` (or override `get_first_chars` if it
+    depends on the number base), the set of characters a match can start with. The tokenizer uses these to build a per-context dispatch table
+    (see `get_dispatch_table`) so that at each position only the token classes
+    that could possibly match the current character are tried.
+
     After a token is instantiated, its `action_on_eat` result (`Push`, `Pop`,
     or `None`) updates the context stack (if needed). This design lets token
     classes declare both where they are legal and how they affect nesting
     structure, without having to be manually registered in the tokenizer.
+
+    Tokens are slotted to keep them small (there is one per lexeme). Subclasses must declare `__slots__`,
+    listing any instance attributes they set (e.g. `matching_right`), or they silently get a `__dict__` again.
     """
+    __slots__ = ('idx', 'loc', 'src')
     src: str
     loc: Span
     idx: int
     valid_contexts: ClassVar[set[type[Context]]] = None # must be defined by subclass type parameters
+    first_chars: ClassVar[frozenset[str]|None] = None   # characters a match can start with (None if any character). Used to build the dispatch tables
+    fast_eat: ClassVar[EatFn|None] = None                 # optional regex-backed equivalent of `eat`. Must return exactly what `eat` would
 
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__}: {self.src}>"
 
     @staticmethod
     @abstractmethod
-    def eat(src:str, ctx:T) -> int|None:
+    def eat(src:str, ctx:T, start:int) -> int|None:
         """
         Try to match a token
         
         Args:
-            src (str): the source string to match against, starting at the current position
+            src (str): the full source string being tokenized
             ctx (Context): the current context mode the tokenizer is in
+            start (int): the position in `src` to match from. Implementations index from `start` rather than slicing `src[start:]`, which would copy the rest of the file
         
         Returns: 
             int | None: The number of characters eaten if successful, or `None` if no match.
         """
 
+    @classmethod
+    def get_first_chars(cls, base: BasePrefix) -> frozenset[str]|None:
+        """The characters a match can start with in a context whose `digits_base()` is `base`. Only needs to be overridden by tokens that depend on the base"""
+        return cls.first_chars
+
     def action_on_eat(self, ctx:T) -> ContextAction:
         """
         If overridden, indicates actions to perform on the context stack when a token is eaten.
@@ -292,6 +343,12 @@ class Token[T:Context](ABC):
         """
         return None
 
+    def shift(self, offset:int, idx_offset:int) -> None:
+        """Move the token (in place) by `offset` characters in the source and `idx_offset` places in the token list (i.e. when reusing it after an earlier edit, see `retokenize`)"""
+        self.loc.start += offset
+        self.loc.stop += offset
+        self.idx += idx_offset
+
     def __init_subclass__(cls: type[Token], **kwargs):
         """verify that subclasses parameterize Token with a context argument and set the valid_contexts class variable"""
         super().__init_subclass__(**kwargs)
@@ -323,15 +380,31 @@ class Token[T:Context](ABC):
 
 # TODO: want a warning if there is a lone \r not followed by \n
 class Whitespace(Token[WhitespaceOrCommentContexts]):
+    __slots__ = ()
+    first_chars = frozenset(whitespace)
     @staticmethod
-    def eat(src:str, ctx:WhitespaceOrCommentContexts) -> int|None:
+    def eat(src:str, ctx:WhitespaceOrCommentContexts, start:int) -> int|None:
         """white space is any sequence of whitespace characters"""
-        i = 0
+        i = start
         while i < len(src) and src[i] in whitespace:
-            if src[i] == '\r' and not src[i+1:].startswith('\n'):
+            if src[i] == '\r' and not src.startswith('\n', i+1):
                 Whitespace.warning_lone_carriage_return(src, i, ctx)
             i += 1
-        return i or None
+        return (i - start) or None
+
+    pattern: ClassVar[re.Pattern] = re.compile(f'{charclass(whitespace - {'\r'})}*+')
+
+    @staticmethod
+    def fast_eat(src:str, ctx:WhitespaceOrCommentContexts, start:int) -> int|None:
+        # single characters are cheaper to check directly than to hand to the regex engine
+        if src[start:start+1] not in whitespace:
+            return None
+        if src[start] != '\r' and (start + 1 == len(src) or src[start+1] not in whitespace):
+            return 1
+        stop = Whitespace.pattern.match(src, start).end()
+        if stop < len(src) and src[stop] == '\r':
+            return Whitespace.eat(src, ctx, start) # let the reference path emit any lone carriage return warnings
+        return (stop - start) or None
     
     @staticmethod
     def warning_lone_carriage_return(src: str, i: int, ctx: WhitespaceOrCommentContexts):
@@ -341,65 +414,66 @@ class Whitespace(Token[WhitespaceOrCommentContexts]):
             pointer_messages=[Pointer(span=Span(i, i+1), message="\\r without \\n")],
             hint="\\r should always be followed by \\n in Dewy source code. Recommend either removing the \\r or adding newline (\\r\\n)"
         )
-        print(warning)
+        warning.warn()
 
 
 class LineComment(Token[WhitespaceOrCommentContexts]):
+    __slots__ = ()
+    first_chars = frozenset(line_comment_start)
     @staticmethod
-    def eat(src:str, ctx:WhitespaceOrCommentContexts) -> int|None:
+    def eat(src:str, ctx:WhitespaceOrCommentContexts, start:int) -> int|None:
         """line comments are any sequence of characters after a # until the end of the line"""
-        if not src.startswith(line_comment_start):
+        if not src.startswith(line_comment_start, start):
             return None
-        if src.startswith(block_comment_start):
+        if src.startswith(block_comment_start, start):
             return None # don't start a line comment if it is actually a block comment
         
-        # consume until the end of the line
-        i = 1
-        while i < len(src) and src[i] != '\n':
-            i += 1
-        if i < len(src): # include the newline in the comment (if we're not EOF)
-            i += 1
-        return i
+        # consume until the end of the line (including the newline if we're not EOF)
+        i = src.find('\n', start + 1)
+        if i == -1:
+            return len(src) - start
+        return i + 1 - start
 
 
 class BlockComment(Token[WhitespaceOrCommentContexts]):
+    __slots__ = ()
+    first_chars = frozenset(block_comment_start[0])
     @staticmethod
-    def eat(src: str, ctx:WhitespaceOrCommentContexts) -> int | None:
+    def eat(src: str, ctx:WhitespaceOrCommentContexts, start:int) -> int | None:
         """
         Block comments are of the form #{ ... }# and can be nested.
         """
-        if not src.startswith(block_comment_start):
+        if not src.startswith(block_comment_start, start):
             return None
 
         openers: list[Span] = []
-        i = 0
+        i = start
 
         while i < len(src):
-            if src[i:].startswith(block_comment_start):
+            if src.startswith(block_comment_start, i):
                 openers.append(Span(i, i + len(block_comment_start)))
                 i += len(block_comment_start)
-            elif src[i:].startswith(block_comment_end):
+            elif src.startswith(block_comment_end, i):
                 openers.pop()
                 i += len(block_comment_end)
 
                 if len(openers) == 0:
-                    return i
+                    return i - start
             else:
                 i += 1
 
         # error, unterminated block comment(s)
-        span_offset = ctx.current_tokenization_position()
         plural = 's' if len(openers) > 1 else ''
         error = Error(ctx.srcfile, title=f"{len(openers)} unterminated block comment{plural}", pointer_messages=[
-            *(Pointer(Span(opener.start + span_offset, opener.stop + span_offset), message=f"{ordinalize(i+1)} unterminated block comment opened here{f' (inside {ordinalize(i)})' if i > 0 else ''}")
+            *(Pointer(opener, message=f"{ordinalize(i+1)} unterminated block comment opened here{f' (inside {ordinalize(i)})' if i > 0 else ''}")
                 for i, opener in enumerate(openers)
             ),
             Pointer(span=[
                 *(
-                    Span(o1.stop + span_offset, o2.start + span_offset)
+                    Span(o1.stop, o2.start)
                     for o1, o2 in zip(openers, openers[1:]) if o2.start >= o1.stop
                 ),
-                Span(openers[-1].stop + span_offset, len(src) + span_offset)
+                Span(openers[-1].stop, len(src))
             ], message=f"Unbound block comment{plural}")
         ], hint=f"Did you forget {len(openers)} closing `{block_comment_end}`?\nBlock comments start with `{block_comment_start}` and end with `{block_comment_end}` and can be nested")
         error.throw()
@@ -409,15 +483,17 @@ class BlockComment(Token[WhitespaceOrCommentContexts]):
 # Identifier-like things: plain identifiers and variants such as hashtags.
 
 class Identifier(Token[GeneralBodyContexts]):
+    __slots__ = ()
+    first_chars = frozenset(start_characters | decoration_characters)
     @staticmethod
-    def eat(src:str, ctx:GeneralBodyContexts) -> int|None:
+    def eat(src:str, ctx:GeneralBodyContexts, start:int) -> int|None:
         """
         Identifiers:
         - may not start with a number
         - may not be an operator (handled by longest match + token precedence)
         - may contain decorator characters (superscripts/subscripts) anywhere (but must include at least one start character)
         """
-        i = 0
+        i = start
         
         # Skip leading decorator characters
         while i < len(src) and src[i] in decoration_characters:
@@ -431,39 +507,57 @@ class Identifier(Token[GeneralBodyContexts]):
         i += 1
         
         # Continue consuming continue_characters or decorator characters
-        while i < len(src) and (src[i] in continue_characters or src[i] in decoration_characters):
+        while i < len(src) and src[i] in identifier_characters:
             i += 1
         
-        return i
+        return i - start
+
+    pattern: ClassVar[re.Pattern] = re.compile(f'{charclass(decoration_characters)}*+{charclass(start_characters)}{charclass(identifier_characters)}*+')
+
+    @staticmethod
+    def fast_eat(src:str, ctx:GeneralBodyContexts, start:int) -> int|None:
+        # single characters are cheaper to check directly than to hand to the regex engine
+        if src[start:start+1] in start_characters and (start + 1 == len(src) or src[start+1] not in identifier_characters):
+            return 1
+        match = Identifier.pattern.match(src, start)
+        if match is None:
+            return None
+        return match.end() - start
 
 
 class Symbol(Token[GeneralBodyContexts]):
+    __slots__ = ()
+    first_chars = frozenset(c for op in symbols for c in (op[0], op[0].upper()))  # symbols are matched case-insensitively
     @staticmethod
-    def eat(src:str, ctx:GeneralBodyContexts) -> int|None:
+    def eat(src:str, ctx:GeneralBodyContexts, start:int) -> int|None:
         """symbolic operators are any sequence of characters in the symbolic_operators set"""
-        chunk = src[:LEN_LONGEST_SYMBOL].casefold()
-        for op in symbols:
+        chunk = src[start:start+LEN_LONGEST_SYMBOL].casefold()
+        for op in symbols_by_first_char.get(chunk[:1], ()):
             if chunk.startswith(op):
                 return len(op)
         return None
 
 
 class ShiftSymbol(Token[BodyWithoutTypeContexts]):
+    __slots__ = ()
+    first_chars = frozenset(op[0] for op in shift_operators)
     @staticmethod
-    def eat(src:str, ctx:BodyWithoutTypeContexts) -> int|None:
+    def eat(src:str, ctx:BodyWithoutTypeContexts, start:int) -> int|None:
         """shift operators are any sequence of characters in the shift_operators set"""
         for op in shift_operators:
-            if src.startswith(op):
+            if src.startswith(op, start):
                 return len(op)
         return None
 
 
 class Metatag(Token[GeneralBodyContexts]):
+    __slots__ = ()
+    first_chars = frozenset('$')
     @staticmethod
-    def eat(src: str, ctx:GeneralBodyContexts) -> int | None:
+    def eat(src: str, ctx:GeneralBodyContexts, start:int) -> int | None:
         """metatags are just special identifiers that start with $"""
-        if src.startswith('$'):
-            i = Identifier.eat(src[1:], ctx)
+        if src.startswith('$', start):
+            i = Identifier.eat(src, ctx, start + 1)
             if i is not None:
                 return i + 1
 
@@ -477,11 +571,13 @@ class Metatag(Token[GeneralBodyContexts]):
 
 # NOTE: square brackets and parenthesis can mix and match for range syntax, e.g. `[1..10)`
 class LeftSquareBracket(Token[GeneralBodyContexts]):
-    matching_right: 'RightSquareBracket|RightParenthesis' = None
+    __slots__ = ('matching_right',)
+    first_chars = frozenset('[')
+    matching_right: 'RightSquareBracket|RightParenthesis'
     
     @staticmethod
-    def eat(src:str, ctx:GeneralBodyContexts) -> int|None:
-        if src.startswith('['):
+    def eat(src:str, ctx:GeneralBodyContexts, start:int) -> int|None:
+        if src.startswith('[', start):
             return 1
         return None
     
@@ -489,11 +585,13 @@ class LeftSquareBracket(Token[GeneralBodyContexts]):
 
 
 class RightSquareBracket(Token[BlockBody]):
-    matching_left: 'LeftSquareBracket|LeftParenthesis|BasedBlockOpener' = None
+    __slots__ = ('matching_left',)
+    first_chars = frozenset(']')
+    matching_left: 'LeftSquareBracket|LeftParenthesis|BasedBlockOpener'
     
     @staticmethod
-    def eat(src:str, ctx:BlockBody) -> int|None:
-        if src.startswith(']'):
+    def eat(src:str, ctx:BlockBody, start:int) -> int|None:
+        if src.startswith(']', start):
             return 1
         return None
     
@@ -520,11 +618,13 @@ class RightSquareBracket(Token[BlockBody]):
 
 
 class LeftParenthesis(Token[GeneralBodyContexts]):
-    matching_right: 'RightParenthesis|RightSquareBracket' = None
+    __slots__ = ('matching_right',)
+    first_chars = frozenset('(')
+    matching_right: 'RightParenthesis|RightSquareBracket'
     
     @staticmethod
-    def eat(src:str, ctx:GeneralBodyContexts) -> int|None:
-        if src.startswith('('):
+    def eat(src:str, ctx:GeneralBodyContexts, start:int) -> int|None:
+        if src.startswith('(', start):
             return 1
         return None
     
@@ -532,11 +632,13 @@ class LeftParenthesis(Token[GeneralBodyContexts]):
 
 
 class RightParenthesis(Token[BlockBody]):
-    matching_left: 'LeftParenthesis|LeftSquareBracket' = None
+    __slots__ = ('matching_left',)
+    first_chars = frozenset(')')
+    matching_left: 'LeftParenthesis|LeftSquareBracket'
     
     @staticmethod
-    def eat(src:str, ctx:BlockBody) -> int|None:
-        if src.startswith(')'):
+    def eat(src:str, ctx:BlockBody, start:int) -> int|None:
+        if src.startswith(')', start):
             return 1
         return None
     
@@ -563,11 +665,13 @@ class RightParenthesis(Token[BlockBody]):
 
 
 class LeftCurlyBrace(Token[Root|BlockBody|TypeBody|StringBody]):
-    matching_right: 'RightCurlyBrace' = None
+    __slots__ = ('matching_right',)
+    first_chars = frozenset('{')
+    matching_right: 'RightCurlyBrace'
     
     @staticmethod
-    def eat(src:str, ctx:Root|BlockBody|TypeBody|StringBody) -> int|None:
-        if src.startswith('{'):
+    def eat(src:str, ctx:Root|BlockBody|TypeBody|StringBody, start:int) -> int|None:
+        if src.startswith('{', start):
             return 1
         return None
     
@@ -575,11 +679,13 @@ class LeftCurlyBrace(Token[Root|BlockBody|TypeBody|StringBody]):
 
 
 class TemplateLeftCurlyBrace(Token[TemplateStringBody]):
-    matching_right: 'RightCurlyBrace' = None
+    __slots__ = ('matching_right',)
+    first_chars = frozenset('$')
+    matching_right: 'RightCurlyBrace'
 
     @staticmethod
-    def eat(src:str, ctx:TemplateStringBody) -> int|None:
-        if src.startswith('${'):
+    def eat(src:str, ctx:TemplateStringBody, start:int) -> int|None:
+        if src.startswith('${', start):
             return 2
         return None
     
@@ -587,11 +693,13 @@ class TemplateLeftCurlyBrace(Token[TemplateStringBody]):
 
 
 class RightCurlyBrace(Token[BlockBody]):
-    matching_left: 'LeftCurlyBrace|TemplateLeftCurlyBrace' = None
+    __slots__ = ('matching_left',)
+    first_chars = frozenset('}')
+    matching_left: 'LeftCurlyBrace|TemplateLeftCurlyBrace'
     
     @staticmethod
-    def eat(src:str, ctx:BlockBody) -> int|None:
-        if src.startswith('}'):
+    def eat(src:str, ctx:BlockBody, start:int) -> int|None:
+        if src.startswith('}', start):
             return 1
         return None
     
@@ -618,11 +726,13 @@ class RightCurlyBrace(Token[BlockBody]):
 
 
 class LeftAngleBracket(Token[GeneralBodyContexts]):
-    matching_right: 'RightAngleBracket' = None
+    __slots__ = ('matching_right',)
+    first_chars = frozenset('<')
+    matching_right: 'RightAngleBracket'
     
     @staticmethod
-    def eat(src:str, ctx:GeneralBodyContexts) -> int|None:
-        if src.startswith('<'):
+    def eat(src:str, ctx:GeneralBodyContexts, start:int) -> int|None:
+        if src.startswith('<', start):
             return 1
         return None
     
@@ -630,11 +740,13 @@ class LeftAngleBracket(Token[GeneralBodyContexts]):
 
 
 class RightAngleBracket(Token[TypeBody]):
-    matching_left: 'LeftAngleBracket' = None
+    __slots__ = ('matching_left',)
+    first_chars = frozenset('>')
+    matching_left: 'LeftAngleBracket'
     
     @staticmethod
-    def eat(src:str, ctx:TypeBody) -> int|None:
-        if src.startswith('>'):
+    def eat(src:str, ctx:TypeBody, start:int) -> int|None:
+        if src.startswith('>', start):
             return 1
         return None
     
@@ -645,16 +757,18 @@ class RightAngleBracket(Token[TypeBody]):
 
 
 class BasedBlockOpener(Token[GeneralBodyContexts]):
+    __slots__ = ('base', 'matching_right')
+    first_chars = frozenset(c for prefix in base_prefixes for c in (prefix[0], prefix[0].upper()))
     matching_right: 'RightSquareBracket'
     base: BasePrefix
 
     @staticmethod
-    def eat(src:str, ctx:GeneralBodyContexts) -> int|None:
-        if len(src) < 3:
+    def eat(src:str, ctx:GeneralBodyContexts, start:int) -> int|None:
+        if len(src) - start < 3:
             return None
-        if src[:2].casefold() not in base_radixes:
+        if src[start:start+2].casefold() not in base_radixes:
             return None
-        if not src[2] == '[':
+        if not src[start+2] == '[':
             return None
         return 3
     
@@ -668,19 +782,21 @@ class BasedBlockOpener(Token[GeneralBodyContexts]):
 # strings, raw strings, heredocs, and "rest-of-file" strings.
 
 class StringQuoteOpener(Token[GeneralBodyContexts]):
-    matching_quote: 'StringQuoteCloser' = None
+    __slots__ = ('matching_quote',)
+    first_chars = frozenset('\'"')
+    matching_quote: 'StringQuoteCloser'
 
     @staticmethod
-    def eat(src:str, ctx:GeneralBodyContexts) -> int|None:
+    def eat(src:str, ctx:GeneralBodyContexts, start:int) -> int|None:
         """string quotes are any odd-length sequence of either all single or all double quotes"""
         # only match if the first character is a quote
-        if src[0] not in '\'"':
+        if src[start] not in '\'"':
             return None
         
         # match opening quotes
         i = 1
-        quote = src[0]
-        while src[i:].startswith(quote):
+        quote = src[start]
+        while src.startswith(quote, start + i):
             i += 1
         
         # if total is an even, this indicates empty string, so only eat the first half
@@ -694,18 +810,20 @@ class StringQuoteOpener(Token[GeneralBodyContexts]):
 
 
 class StringQuoteCloser(Token[StringBody|RawStringBody|TemplateStringBody|BasedStringBody]):
-    matching_quote: 'StringQuoteOpener|RawStringQuoteOpener|TemplateStringQuoteOpener|BasedStringQuoteOpener' = None
+    __slots__ = ('matching_quote',)
+    first_chars = frozenset('\'"')
+    matching_quote: 'StringQuoteOpener|RawStringQuoteOpener|TemplateStringQuoteOpener|BasedStringQuoteOpener'
 
     @staticmethod
-    def eat(src:str, ctx:StringBody|RawStringBody|TemplateStringBody|BasedStringBody) -> int|None:
+    def eat(src:str, ctx:StringBody|RawStringBody|TemplateStringBody|BasedStringBody, start:int) -> int|None:
         """a string quote closer is a matching opening quote"""
-        if isinstance(ctx.opening_quote, StringQuoteOpener) and src.startswith(ctx.opening_quote.src):
+        if isinstance(ctx.opening_quote, StringQuoteOpener) and src.startswith(ctx.opening_quote.src, start):
             return len(ctx.opening_quote.src)
-        if isinstance(ctx.opening_quote, RawStringQuoteOpener) and src.startswith(ctx.opening_quote.src[1:]):
+        if isinstance(ctx.opening_quote, RawStringQuoteOpener) and src.startswith(ctx.opening_quote.src[1:], start):
             return len(ctx.opening_quote.src[1:])
-        if isinstance(ctx.opening_quote, TemplateStringQuoteOpener) and src.startswith(ctx.opening_quote.src[1:]):
+        if isinstance(ctx.opening_quote, TemplateStringQuoteOpener) and src.startswith(ctx.opening_quote.src[1:], start):
             return len(ctx.opening_quote.src[1:])
-        if isinstance(ctx.opening_quote, BasedStringQuoteOpener) and src.startswith(ctx.opening_quote.src[2:]):
+        if isinstance(ctx.opening_quote, BasedStringQuoteOpener) and src.startswith(ctx.opening_quote.src[2:], start):
             return len(ctx.opening_quote.src[2:])
         # Heredoc delimiters can't match here, and rest-of-file strings don't have a closing quote
         return None
@@ -718,11 +836,27 @@ class StringQuoteCloser(Token[StringBody|RawStringBody|TemplateStringBody|BasedS
 
 
 class StringChars(Token[StringBody|TemplateStringBody]):
+    __slots__ = ()
     @staticmethod
-    def eat(src:str, ctx:StringBody|TemplateStringBody) -> int|None:
+    def eat(src:str, ctx:StringBody|TemplateStringBody, start:int) -> int|None:
         """regular characters are anything except for the delimiter, an escape sequence, or a block opening"""
+        closing_quote, interpolation_block_opener = StringChars.get_stops(ctx)
 
-        # determine possible delimiters that wouldn't be part of string chars
+        # collect string characters until the closing delim, escape sequence, interpolation block, or EOF
+        i = start
+        while (
+            i < len(src)
+            and (closing_quote is None or not src.startswith(closing_quote, i))    # closing delim of the string 
+            and not src.startswith(interpolation_block_opener, i)                  # start an interpolation block
+            and src[i] != '\\'                                                     # start an escape sequence
+        ):
+            i += 1
+        
+        return (i - start) or None
+
+    @staticmethod
+    def get_stops(ctx:StringBody|TemplateStringBody) -> tuple[str|None, str]:
+        """determine the closing delimiter (if any) and interpolation block opener, which (along with escapes) end a run of string chars"""
         if isinstance(ctx.opening_quote, StringQuoteOpener):
             closing_quote = ctx.opening_quote.src
         elif isinstance(ctx.opening_quote, TemplateStringQuoteOpener):
@@ -734,23 +868,33 @@ class StringChars(Token[StringBody|TemplateStringBody]):
         else:
             raise ValueError(f"INTERNAL ERROR: attempted to eat StringChars for unrecognized opening quote: {ctx.opening_quote=}")
         interpolation_block_opener = '${' if isinstance(ctx, TemplateStringBody) else '{'
+        return closing_quote, interpolation_block_opener
 
-        # collect string characters until the closing delim, escape sequence, interpolation block, or EOF
-        i = 0
-        while (
-            i < len(src)
-            and (closing_quote is None or not src[i:].startswith(closing_quote))    # closing delim of the string 
-            and not src[i:].startswith(interpolation_block_opener)                  # start an interpolation block
-            and src[i] != '\\'                                                      # start an escape sequence
-        ):
-            i += 1
-        
-        return i or None
+    @staticmethod
+    @cache
+    def get_pattern(closing_quote:str|None, interpolation_block_opener:str) -> re.Pattern:
+        """
+        Characters that can't begin a stop are consumed in bulk. A character that begins
+        a stop (other than `\\` which always stops) is only consumed if the stop doesn't actually start there
+        """
+        stops = [stop for stop in (closing_quote, interpolation_block_opener) if stop]
+        stop_starts = {stop[0] for stop in stops} - {'\\'}
+        not_a_stop = '|'.join(re.escape(stop) for stop in stops)
+        if not stop_starts:
+            return re.compile(f'{charclass({'\\'}, negate=True)}*+')
+        return re.compile(f'(?:{charclass(stop_starts | {'\\'}, negate=True)}++|(?!{not_a_stop}){charclass(stop_starts)})*+')
+
+    @staticmethod
+    def fast_eat(src:str, ctx:StringBody|TemplateStringBody, start:int) -> int|None:
+        match = StringChars.get_pattern(*StringChars.get_stops(ctx)).match(src, start)
+        return (match.end() - start) or None
 
 
 class StringEscape(Token[StringBody|TemplateStringBody]):
+    __slots__ = ()
+    first_chars = frozenset('\\')
     @staticmethod
-    def eat(src:str, ctx:StringBody|TemplateStringBody) -> int|None:
+    def eat(src:str, ctx:StringBody|TemplateStringBody, start:int) -> int|None:
         r"""
         Eat an escape sequence, return the number of characters eaten
         
@@ -777,37 +921,37 @@ class StringEscape(Token[StringBody|TemplateStringBody]):
         - \<space> converts to just a single <space> character
         - etc.
         """
-        if not src.startswith('\\'):
+        if not src.startswith('\\', start):
             return None
 
-        if len(src) == 1:
-            StringEscape.error_incomplete_string_escape(src, ctx)
+        if len(src) - start == 1:
+            StringEscape.error_incomplete_string_escape(src, ctx, start)
         
         prefix_len = 2
 
         # hex/unicode
-        if src[1] in 'uU' and not src[2:3] == '{':
+        if src[start+1] in 'uU' and not src[start+2:start+3] == '{':
             expected_digits = 4
             actual_digits = 0
             while (
                 actual_digits < expected_digits
-                and prefix_len + actual_digits < len(src)
-                and is_based_digit(src[2 + actual_digits], base16)
+                and start + prefix_len + actual_digits < len(src)
+                and is_based_digit(src[start + 2 + actual_digits], base16)
             ):
                 actual_digits += 1
             if actual_digits < expected_digits:
-                StringEscape.error_invalid_width_hex_escape(src, ctx, expected_digits, actual_digits)
+                StringEscape.error_invalid_width_hex_escape(src, ctx, start, expected_digits, actual_digits)
             return prefix_len + actual_digits
 
-        if src[1].lower() == 'x':
-            StringEscape.error_unsupported_hex_byte_escape(src, ctx)
+        if src[start+1].lower() == 'x':
+            StringEscape.error_unsupported_hex_byte_escape(src, ctx, start)
 
         # all other escape sequences (known or catch all) are just a single escape code
         return 2
     
     @staticmethod
-    def error_unsupported_hex_byte_escape(src: str, ctx: StringBody|TemplateStringBody) -> NoReturn:
-        offset = ctx.current_tokenization_position()
+    def error_unsupported_hex_byte_escape(src: str, ctx: StringBody|TemplateStringBody, start: int) -> NoReturn:
+        offset = start
         error = Error(
             srcfile=ctx.srcfile,
             title="Hex byte escapes are not supported in Dewy strings",
@@ -817,9 +961,9 @@ class StringEscape(Token[StringBody|TemplateStringBody]):
         error.throw()
 
     @staticmethod
-    def error_incomplete_string_escape(src: str, ctx: StringBody|TemplateStringBody) -> NoReturn:
+    def error_incomplete_string_escape(src: str, ctx: StringBody|TemplateStringBody, start: int) -> NoReturn:
         """Helper for when a string escape is incomplete"""
-        offset = ctx.current_tokenization_position()
+        offset = start
         error = Error(
             srcfile=ctx.srcfile,
             title="Incomplete escape sequence at end of string",
@@ -830,9 +974,9 @@ class StringEscape(Token[StringBody|TemplateStringBody]):
 
 
     @staticmethod
-    def error_invalid_width_hex_escape(src: str, ctx: StringBody|TemplateStringBody, expected_digits: int, actual_digits: int) -> NoReturn:
+    def error_invalid_width_hex_escape(src: str, ctx: StringBody|TemplateStringBody, start: int, expected_digits: int, actual_digits: int) -> NoReturn:
         """Helper for when a hex or unicode escape doesn't have enough digits"""
-        offset = ctx.current_tokenization_position()
+        offset = start
         
         # build up error message
         name = 'unicode'
@@ -841,7 +985,7 @@ class StringEscape(Token[StringBody|TemplateStringBody]):
         expected_plural = 's' if remaining_digits_expected > 1 else ''
         example_digits = 'ff83' # just a random example of hex digits
         prefix_len = 2
-        example_code = src[:prefix_len+actual_digits] + example_digits[:expected_digits-actual_digits]
+        example_code = src[start:start+prefix_len+actual_digits] + example_digits[:expected_digits-actual_digits]
         
         error = Error(
             srcfile=ctx.srcfile,
@@ -857,83 +1001,94 @@ class StringEscape(Token[StringBody|TemplateStringBody]):
 
 
 class ParametricStringEscape(Token[StringBody|TemplateStringBody]):
-    matching_right: 'RightCurlyBrace' = None
+    __slots__ = ('matching_right',)
+    first_chars = frozenset('\\')
+    matching_right: 'RightCurlyBrace'
     @staticmethod
-    def eat(src:str, ctx:StringBody|TemplateStringBody) -> int|None:
+    def eat(src:str, ctx:StringBody|TemplateStringBody, start:int) -> int|None:
         r"""
         \u{##..##} or \U{##..##} for an arbitrary unicode character. Inside the braces defaults to hex, and users can get decimal by using the 0d prefix
         
         The block can also be an arbitrary expression, so long as it evaluates to an integer
         """
-        if not src[:3].lower() == '\\u{':
+        if not src[start:start+3].lower() == '\\u{':
             return None
         return 3
     
     def action_on_eat(self, ctx:StringBody|TemplateStringBody): return Push(BlockBody(ctx.srcfile, ctx.tokens_so_far, self, base16))
 
 class RawStringQuoteOpener(Token[GeneralBodyContexts]):
-    matching_quote: 'StringQuoteCloser' = None  # raw strings are closed by regular quotes
+    __slots__ = ('matching_quote',)
+    first_chars = frozenset('r')
+    matching_quote: 'StringQuoteCloser'  # raw strings are closed by regular quotes
     
     @staticmethod
-    def eat(src:str, ctx:GeneralBodyContexts) -> int|None:
+    def eat(src:str, ctx:GeneralBodyContexts, start:int) -> int|None:
         """raw string quotes are r followed by any odd-length sequence of either all single or all double quotes"""
-        if not src.startswith('r"') and not src.startswith("r'"):
+        if not src.startswith('r"', start) and not src.startswith("r'", start):
             return None
-        i = StringQuoteOpener.eat(src[1:], ctx)  # eat the quote without the r prefix
-        assert i is not None, f"INTERNAL ERROR: failed to get quote part of raw string opener when already verified its presence. {ctx=}, {src=}"
+        i = StringQuoteOpener.eat(src, ctx, start + 1)  # eat the quote without the r prefix
+        assert i is not None, f"INTERNAL ERROR: failed to get quote part of raw string opener when already verified its presence. {ctx=}, {start=}"
         return i + 1
     
     def action_on_eat(self, ctx:GeneralBodyContexts): return Push(RawStringBody(ctx.srcfile, ctx.tokens_so_far, self))
 
 
 class RawStringChars(Token[RawStringBody]):
+    __slots__ = ()
     @staticmethod
-    def eat(src:str, ctx:RawStringBody) -> int|None:
+    def eat(src:str, ctx:RawStringBody, start:int) -> int|None:
         """regular characters are anything except for the delimiter"""
-        i = 0
+        i = start
         while (
             i < len(src)
-            and not (isinstance(ctx.opening_quote, RawStringQuoteOpener) and src[i:].startswith(ctx.opening_quote.src[1:]))  # matches just the quote part of the opener without the `r` prefix
-            and not (isinstance(ctx.opening_quote, RawHeredocStringOpener) and src[i:].startswith(ctx.opening_quote.get_delim()))
+            and not (isinstance(ctx.opening_quote, RawStringQuoteOpener) and src.startswith(ctx.opening_quote.src[1:], i))  # matches just the quote part of the opener without the `r` prefix
+            and not (isinstance(ctx.opening_quote, RawHeredocStringOpener) and src.startswith(ctx.opening_quote.get_delim(), i))
         ):
             i += 1
         
-        return i or None
+        return (i - start) or None
 
 
 class TemplateStringQuoteOpener(Token[GeneralBodyContexts]):
-    matching_quote: 'StringQuoteCloser' = None  # template strings are closed by regular quotes
+    __slots__ = ('matching_quote',)
+    first_chars = frozenset('t')
+    matching_quote: 'StringQuoteCloser'  # template strings are closed by regular quotes
     @staticmethod
-    def eat(src:str, ctx:GeneralBodyContexts) -> int|None:
+    def eat(src:str, ctx:GeneralBodyContexts, start:int) -> int|None:
         """dollar string quotes are t followed by any odd-length sequence of either all single or all double quotes"""
-        if not src.startswith('t"') and not src.startswith("t'"):
+        if not src.startswith('t"', start) and not src.startswith("t'", start):
             return None
-        i = StringQuoteOpener.eat(src[1:], ctx)  # eat the quote without the r prefix
-        assert i is not None, f"INTERNAL ERROR: failed to get quote part of raw string opener when already verified its presence. {ctx=}, {src=}"
+        i = StringQuoteOpener.eat(src, ctx, start + 1)  # eat the quote without the r prefix
+        assert i is not None, f"INTERNAL ERROR: failed to get quote part of raw string opener when already verified its presence. {ctx=}, {start=}"
         return i + 1
     
     def action_on_eat(self, ctx:GeneralBodyContexts): return Push(TemplateStringBody(ctx.srcfile, ctx.tokens_so_far, self))
 
 
 class RestOfFileStringQuote(Token[Root]):
+    __slots__ = ()
+    first_chars = frozenset('$')
     @staticmethod
-    def eat(src:str, ctx:Root) -> int|None:
+    def eat(src:str, ctx:Root, start:int) -> int|None:
         """a string that has an opening delimiter but no closing delimiter (consumes until EOF)
         Opening delimiters $\""" $'''
         """
-        if not src.startswith('$"""') and not src.startswith("$'''"):
+        if not src.startswith('$"""', start) and not src.startswith("$'''", start):
             return None
         return 4
     
     def action_on_eat(self, ctx:Root): return Push(StringBody(ctx.srcfile, ctx.tokens_so_far, self))
 
 class RawRestOfFileStringQuote(Token[Root]):
+    __slots__ = ()
+    first_chars = frozenset('$')
     @staticmethod
-    def eat(src:str, ctx:Root) -> int|None:
+    def eat(src:str, ctx:Root, start:int) -> int|None:
         """a raw string that has an opening delimiter but no closing delimiter (consumes until EOF)
         Opening delimiters $r\""" $r'''
         """
-        if not src.startswith('$r"""') and not src.startswith("$r'''"):
+        if not src.startswith('$r"""', start) and not src.startswith("$r'''", start):
             return None
         return 5
     
@@ -941,12 +1096,14 @@ class RawRestOfFileStringQuote(Token[Root]):
 
 
 class TemplateRestOfFileStringQuote(Token[Root]):
+    __slots__ = ()
+    first_chars = frozenset('$')
     @staticmethod
-    def eat(src:str, ctx:Root) -> int|None:
+    def eat(src:str, ctx:Root, start:int) -> int|None:
         """a template string that has an opening delimiter but no closing delimiter (consumes until EOF)
         Opening delimiters t\""" t'''
         """
-        if not src.startswith('$t"""') and not src.startswith("$t'''"):
+        if not src.startswith('$t"""', start) and not src.startswith("$t'''", start):
             return None
         return 5
 
@@ -954,32 +1111,38 @@ class TemplateRestOfFileStringQuote(Token[Root]):
 
 
 class HeredocStringOpener(Token[GeneralBodyContexts]):
-    matching_quote: 'HeredocStringCloser' = None
+    __slots__ = ('matching_quote',)
+    first_chars = frozenset('$')
+    matching_quote: 'HeredocStringCloser'
 
     @staticmethod
-    def eat(src:str, ctx:GeneralBodyContexts) -> int|None:
+    def eat(src:str, ctx:GeneralBodyContexts, start:int) -> int|None:
         """heredoc string opening and closing quotes are `$"<delim>"` and `<delim>` respectively
         <delim> is an arbitrary user-defined delimiter. May use any identifier or symbol characters in the language except for quotes `"`, `'`
         """
-        if not src.startswith('$"') and not src.startswith("$'"):
+        if not src.startswith('$"', start) and not src.startswith("$'", start):
             return None
-        
+        return HeredocStringOpener.eat_quoted_delimiter(src, ctx, start, start + 1)
+
+    @staticmethod
+    def eat_quoted_delimiter(src:str, ctx:GeneralBodyContexts, start:int, quote_idx:int) -> int|None:
+        """eat the `"<delim>"` part of a heredoc opener (whose opening quote is at `quote_idx`). Returns the length of the whole opener starting from `start`"""
         # consume the delimiter
-        i = 2
+        i = quote_idx + 1
         while i < len(src) and src[i] in legal_heredoc_delim_chars:
             i += 1
-        if i == 2:
+        if i == quote_idx + 1:
             return None # probably an end-of-file string quote #""" or #''', or reached EOF. probably don't emit error here
 
         # must have ended the delimiter with a matching quote
-        quote = src[1]
-        if not src[i:].startswith(quote):
-            HeredocStringOpener.error_incomplete_heredoc_delimiter(src, ctx, i)
+        quote = src[quote_idx]
+        if not src.startswith(quote, i):
+            HeredocStringOpener.error_incomplete_heredoc_delimiter(src, ctx, start, quote_idx, i)
 
         # ensure delimiter doesn't start or end with space
-        HeredocStringOpener.check_error_heredoc_delimiter_space(src, ctx, i)
+        HeredocStringOpener.check_error_heredoc_delimiter_space(src, ctx, quote_idx, i)
 
-        return i + 1
+        return i + 1 - start
     
     def action_on_eat(self, ctx:GeneralBodyContexts): return Push(StringBody(ctx.srcfile, ctx.tokens_so_far, self))
 
@@ -988,22 +1151,21 @@ class HeredocStringOpener(Token[GeneralBodyContexts]):
         return self.src[2:-1]
     
     @staticmethod
-    def error_incomplete_heredoc_delimiter(src: str, ctx: GeneralBodyContexts, i: int) -> NoReturn:
+    def error_incomplete_heredoc_delimiter(src: str, ctx: GeneralBodyContexts, start: int, quote_idx: int, i: int) -> NoReturn:
         """Helper for when a heredoc delimiter is incomplete"""
-        offset = ctx.current_tokenization_position()
-        quote = src[1]
+        quote = src[quote_idx]
         wrong_quote = '"' if quote == "'" else "'"
-        wrong_quoted = src[i:].startswith(wrong_quote)
-        delim = src[2:i]
+        wrong_quoted = src.startswith(wrong_quote, i)
+        delim = src[quote_idx+1:i]
         example = f"#{quote}{delim}{quote}"
         error = Error(
             srcfile=ctx.srcfile,
             title="Incomplete heredoc delimiter",
             pointer_messages=[
-                Pointer(span=Span(offset, offset+1), message="heredoc start"),
-                Pointer(span=Span(offset+1, offset+2), message="heredoc delimiter opening quote"),
-                *([Pointer(span=Span(offset+2, offset+2+len(delim)), message="delimiter")] if len(delim) > 0 else []),
-                Pointer(span=Span(offset+2+len(delim), offset+2+len(delim)+1), message=f"Expected closing quote {quote} for heredoc delimiter"),
+                Pointer(span=Span(start, quote_idx), message="heredoc start"),
+                Pointer(span=Span(quote_idx, quote_idx+1), message="heredoc delimiter opening quote"),
+                *([Pointer(span=Span(quote_idx+1, i), message="delimiter")] if len(delim) > 0 else []),
+                Pointer(span=Span(i, i+1), message=f"Expected closing quote {quote} for heredoc delimiter"),
             ],
             hint=f'Did you mean to use {quote} to close instead of {wrong_quote} e.g. {example} not {example[:-1] + wrong_quote}' if wrong_quoted else f"Finish the heredoc delimiter (e.g. {example})",
         )
@@ -1011,14 +1173,14 @@ class HeredocStringOpener(Token[GeneralBodyContexts]):
     
     
     @staticmethod
-    def check_error_heredoc_delimiter_space(src: str, ctx: GeneralBodyContexts, i: int) -> NoReturn|None:
+    def check_error_heredoc_delimiter_space(src: str, ctx: GeneralBodyContexts, quote_idx: int, i: int) -> NoReturn|None:
         """Helper to check if a heredoc delimiter starts or ends with space"""
-        delim = src[2:i]
-        quote = src[1]
+        delim = src[quote_idx+1:i]
+        quote = src[quote_idx]
 
         # ensure the delimiter isn't all space, and also may not start or end with space
-        if src[2:i].strip() == '':
-            offset = ctx.current_tokenization_position()
+        if delim.strip() == '':
+            offset = quote_idx - 1
             error = Error(
                 srcfile=ctx.srcfile,
                 title="Heredoc delimiter cannot be all space",
@@ -1028,7 +1190,7 @@ class HeredocStringOpener(Token[GeneralBodyContexts]):
             error.throw()
         # ensure the delimiter doesn't start or end with space
         if delim.startswith(' ') or delim.endswith(' '):
-            offset = ctx.current_tokenization_position()
+            offset = quote_idx - 1
             leading_space_length = len(delim) - len(delim.lstrip())
             trailing_space_length = len(delim) - len(delim.rstrip())
             pointer_messages=[
@@ -1046,15 +1208,16 @@ class HeredocStringOpener(Token[GeneralBodyContexts]):
 
 
 class HeredocStringCloser(Token[StringBody|RawStringBody|TemplateStringBody]):
-    matching_quote: 'HeredocStringOpener|RawHeredocStringOpener|TemplateHeredocStringOpener' = None
+    __slots__ = ('matching_quote',)
+    matching_quote: 'HeredocStringOpener|RawHeredocStringOpener|TemplateHeredocStringOpener'
 
     @staticmethod
-    def eat(src:str, ctx:StringBody|RawStringBody|TemplateStringBody) -> int|None:
+    def eat(src:str, ctx:StringBody|RawStringBody|TemplateStringBody, start:int) -> int|None:
         """a heredoc string closer is a matching opening quote"""
         if not isinstance(ctx.opening_quote, (HeredocStringOpener, RawHeredocStringOpener, TemplateHeredocStringOpener)):
             return None
         delimiter = ctx.opening_quote.get_delim()
-        if not src.startswith(delimiter):
+        if not src.startswith(delimiter, start):
             return None
         return len(delimiter)
     
@@ -1065,19 +1228,18 @@ class HeredocStringCloser(Token[StringBody|RawStringBody|TemplateStringBody]):
 
 
 class RawHeredocStringOpener(Token[GeneralBodyContexts]):
-    matching_quote: 'HeredocStringCloser' = None
+    __slots__ = ('matching_quote',)
+    first_chars = frozenset('$')
+    matching_quote: 'HeredocStringCloser'
 
     @staticmethod
-    def eat(src:str, ctx:GeneralBodyContexts) -> int|None:
+    def eat(src:str, ctx:GeneralBodyContexts, start:int) -> int|None:
         """raw heredoc string opening and closing quotes are `$r"<delim>"` and `<delim>` respectively
         <delim> is an arbitrary user-defined delimiter. May use any identifier or symbol characters in the language except for quotes `"`, `'`
         """
-        if not src.startswith('$r"') and not src.startswith("$r'"):
-            return None
-        i = HeredocStringOpener.eat('$'+src[2:], ctx)
-        if i is None:
+        if not src.startswith('$r"', start) and not src.startswith("$r'", start):
             return None
-        return i + 1  # +1 for the `r` in the prefix
+        return HeredocStringOpener.eat_quoted_delimiter(src, ctx, start, start + 2)  # +2 to skip the `$r` prefix
     
     def action_on_eat(self, ctx:GeneralBodyContexts): return Push(RawStringBody(ctx.srcfile, ctx.tokens_so_far, self))
 
@@ -1087,19 +1249,18 @@ class RawHeredocStringOpener(Token[GeneralBodyContexts]):
 
 
 class TemplateHeredocStringOpener(Token[GeneralBodyContexts]):
-    matching_quote: 'HeredocStringCloser' = None
+    __slots__ = ('matching_quote',)
+    first_chars = frozenset('$')
+    matching_quote: 'HeredocStringCloser'
 
     @staticmethod
-    def eat(src:str, ctx:GeneralBodyContexts) -> int|None:
+    def eat(src:str, ctx:GeneralBodyContexts, start:int) -> int|None:
         """template heredoc string opening and closing quotes are `$t"<delim>"` and `<delim>` respectively
         <delim> is an arbitrary user-defined delimiter. May use any identifier or symbol characters in the language except for quotes `"`, `'`
         """
-        if not src.startswith('$t"') and not src.startswith("$t'"):
+        if not src.startswith('$t"', start) and not src.startswith("$t'", start):
             return None
-        i = HeredocStringOpener.eat('$'+src[2:], ctx)
-        if i is None:
-            return None
-        return i + 1  # +1 for the `t` in the prefix
+        return HeredocStringOpener.eat_quoted_delimiter(src, ctx, start, start + 2)  # +2 to skip the `$t` prefix
     
     def action_on_eat(self, ctx:GeneralBodyContexts): return Push(TemplateStringBody(ctx.srcfile, ctx.tokens_so_far, self))
 
@@ -1110,17 +1271,19 @@ class TemplateHeredocStringOpener(Token[GeneralBodyContexts]):
 
 
 class BasedStringQuoteOpener(Token[GeneralBodyContexts]):
+    __slots__ = ('base', 'matching_quote')
+    first_chars = frozenset(c for prefix in base_prefixes for c in (prefix[0], prefix[0].upper()))
     matching_quote: 'StringQuoteCloser'
     base: BasePrefix
 
     @staticmethod
-    def eat(src:str, ctx:GeneralBodyContexts) -> int|None:
-        if len(src) < 3:
+    def eat(src:str, ctx:GeneralBodyContexts, start:int) -> int|None:
+        if len(src) - start < 3:
             return None
-        if src[:2].casefold() not in base_radixes:
+        if src[start:start+2].casefold() not in base_radixes:
             return None
         # eat an opening quote
-        i = StringQuoteOpener.eat(src[2:], ctx)  # eat the quote without the r prefix
+        i = StringQuoteOpener.eat(src, ctx, start + 2)  # eat the quote without the base prefix
         if i is None: return None
         return i + 2
 
@@ -1129,14 +1292,20 @@ class BasedStringQuoteOpener(Token[GeneralBodyContexts]):
         return Push(BasedStringBody(ctx.srcfile, ctx.tokens_so_far, self, self.base))
 
 class BasedStringChars(Token[BasedStringBody]):
+    __slots__ = ()
+
+    @classmethod
+    def get_first_chars(cls, base: BasePrefix) -> frozenset[str]:
+        return frozenset(base_digits[base] | {'_'})
+
     @staticmethod
-    def eat(src:str, ctx:BasedStringBody) -> int|None:
+    def eat(src:str, ctx:BasedStringBody, start:int) -> int|None:
         # eat any digit in the base or whitespace or underscore
-        i = 0
+        i = start
         digits = base_digits[ctx.base]
         while i < len(src) and (src[i] in digits or src[i] == '_'):
             i += 1
-        return i or None
+        return (i - start) or None
 
 ##### TOKEN CLASSES: NUMBERS #####
 # Based integer literals. The base may be given explicitly via a prefix or
@@ -1144,19 +1313,30 @@ class BasedStringChars(Token[BasedStringBody]):
 # blocks). We record the resolved base prefix on the token in `action_on_eat`.
 
 class Number(Token[GeneralBodyContexts]):
+    __slots__ = ('prefix',)
     prefix: BasePrefix
+
+    @classmethod
+    def get_first_chars(cls, base: BasePrefix) -> frozenset[str]:
+        return frozenset(base_digits[base] | {'0'}) # digits in the current base, or a base prefix
+
+    # bare (unprefixed) digits in each base
+    patterns: ClassVar[dict[BasePrefix, re.Pattern]] = {
+        base: re.compile(f'{charclass(digits)}{charclass(digits | {'_'})}*+')
+        for base, digits in base_digits.items()
+    }
     
     @staticmethod
-    def eat(src:str, ctx:GeneralBodyContexts) -> int|None:
+    def eat(src:str, ctx:GeneralBodyContexts, start:int) -> int|None:
         """a based number is a sequence of 1 or more digits, optionally preceded by a (case-insensitive) base prefix (up to base-16)"""
         
         # try a number with a base prefix
-        if src[:2].casefold() in base_prefixes:
-            base = src[:2].casefold()
+        if src.startswith('0', start) and src[start:start+2].casefold() in base_prefixes:
+            base = src[start:start+2].casefold()
             digits = base_digits[base]
-            if base_radixes[base] > MAX_NUMBER_BASE and len(src) > 2 and src[2] in digits: # skip if not a based number literal (e.g. based string)
-                Number.error_too_high_number_base(src, ctx, base)
-            i = 2
+            if base_radixes[base] > MAX_NUMBER_BASE and len(src) > start + 2 and src[start+2] in digits: # skip if not a based number literal (e.g. based string)
+                Number.error_too_high_number_base(src, ctx, start, base)
+            i = start + 2
             # Require at least one digit
             if not (i < len(src) and src[i] in digits):
                 # TODO: have error here if not a based string literal or based array literal
@@ -1164,19 +1344,28 @@ class Number(Token[GeneralBodyContexts]):
             # consume digits or underscores
             while i < len(src) and (src[i] in digits or src[i] == '_'):
                 i += 1
-            return i
+            return i - start
         
         # try number with no prefix
         base = ctx.default_base if isinstance(ctx, BlockBody) else base10
         digits = base_digits[base]
-        i = 0
+        i = start
         if not (i < len(src) and src[i] in digits):
             return None
         # consume digits or underscores
         while i < len(src) and (src[i] in digits or src[i] == '_'):
             i += 1
         
-        return i or None
+        return (i - start) or None
+
+    @staticmethod
+    def fast_eat(src:str, ctx:GeneralBodyContexts, start:int) -> int|None:
+        if src.startswith('0', start) and src[start:start+2].casefold() in base_prefixes:
+            return Number.eat(src, ctx, start) # prefixed numbers (and their errors) go through the reference path
+        match = Number.patterns[ctx.default_base if isinstance(ctx, BlockBody) else base10].match(src, start)
+        if match is None:
+            return None
+        return match.end() - start
     
     def action_on_eat(self, ctx:GeneralBodyContexts):
         if self.src[:2].casefold() in base_digits:
@@ -1189,27 +1378,29 @@ class Number(Token[GeneralBodyContexts]):
     
 
     @staticmethod
-    def error_too_high_number_base(src: str, ctx:GeneralBodyContexts, base:BasePrefix):
+    def error_too_high_number_base(src: str, ctx:GeneralBodyContexts, start:int, base:BasePrefix):
         radix = base_radixes[base]
-        digits_len = BasedStringChars.eat(src[2:], BasedStringBody(ctx.srcfile, ctx.tokens_so_far, None, base))
+        digits_len = BasedStringChars.eat(src, BasedStringBody(ctx.srcfile, ctx.tokens_so_far, None, base), start + 2)
         assert digits_len is not None, "INTERNAL ERROR: based string chars should have been eaten"
-        digits_str = src[2:2+digits_len]
+        digits_str = src[start+2:start+2+digits_len]
         error = Error(
             srcfile=ctx.srcfile,
             title="number base too high",
             pointer_messages=[
-                Pointer(span=Span(ctx.current_tokenization_position(), ctx.current_tokenization_position()+len(base)), message=f"base-{radix} prefix"),
-                *([Pointer(span=Span(ctx.current_tokenization_position()+2, ctx.current_tokenization_position()+2+digits_len), message="unquoted digits", color='red')] if digits_len is not None else [])
+                Pointer(span=Span(start, start+len(base)), message=f"base-{radix} prefix"),
+                *([Pointer(span=Span(start+2, start+2+digits_len), message="unquoted digits", color='red')] if digits_len is not None else [])
             ],
             hint=f"Numeric literals only support up to base-{MAX_NUMBER_BASE} (Got base-{radix})\nTo represent larger bases, use a based string e.g. {base}'{digits_str}'"
         )
         error.throw()
 
 class ExponentMarker(Token[GeneralBodyContexts]):
+    __slots__ = ('power',)
+    first_chars = frozenset('eEpP')
     power: Number
 
     @staticmethod
-    def eat(src:str, ctx:GeneralBodyContexts) -> int|None:
+    def eat(src:str, ctx:GeneralBodyContexts, start:int) -> int|None:
         """
         an exponent marker is a single character `eE` or `pP` with a number before and a number after
         This is specifically to disambiguate for floats where the exponent part is read as an identifier
@@ -1217,18 +1408,22 @@ class ExponentMarker(Token[GeneralBodyContexts]):
         """
         if len(ctx.tokens_so_far) == 0 or not isinstance(ctx.tokens_so_far[-1], Number):
             return None
-        if len(src) < 2:
+        if len(src) - start < 2:
             return None
-        if src[0] not in 'eEpP':
+        if src[start] not in 'eEpP':
             return None
         # don't check for +/- because it's not part of what we're trying to disambiguate
-        if (i:=Number.eat(src[1:], ctx)) is None:
+        if (i:=Number.eat(src, ctx, start + 1)) is None:
             return None
         return i + 1
     def action_on_eat(self, ctx:GeneralBodyContexts):
         self.power = Number(self.src[1:], Span(self.loc.start+1, self.loc.stop), self.idx)
         self.power.action_on_eat(ctx)
         return None
+
+    def shift(self, offset:int, idx_offset:int) -> None:
+        super().shift(offset, idx_offset)
+        self.power.shift(offset, idx_offset)
         
 
 ##### TOKEN CLASS PRECEDENCE #####
@@ -1255,7 +1450,7 @@ class MultipleMatchedErrorCase(Protocol):
     def __call__(self, src: str, i: int, tokens: list[Token], ctx_stack: list[Context], ctx_history: list[Context], matches: list[tuple[int, type[Token]]]) -> Error|None: ...
 
 def shift_operator_inside_type_param(src: str, i: int, tokens: list[Token], ctx_stack: list[Context], ctx_history: list[Context]) -> Error|None:
-    if len(ctx_history) > 0 and isinstance(ctx_history[-1], TypeBody) and isinstance(tokens[-1], RightAngleBracket) and src[i:].startswith('>'):
+    if len(ctx_history) > 0 and isinstance(ctx_history[-1], TypeBody) and isinstance(tokens[-1], RightAngleBracket) and src.startswith('>', i):
         return Error(
             srcfile=ctx_stack[0].srcfile,
             title="Shift operator inside type parameter",
@@ -1380,33 +1575,268 @@ def get_allowed_tokens(ctx_type: type[Context]) -> list[type[Token]]:
     """
     return [t for t in descendants(Token) if ctx_type in t.valid_contexts]
 
-def tokenize(srcfile: SrcFile) -> list[Token]:
+
+@dataclass(frozen=True)
+class DispatchEntry:
+    """The token classes to try for a given leading character, along with the `token_precedence` pairs that can apply between them"""
+    candidates: tuple[type[Token], ...]
+    eaters: tuple[EatFn, ...]  # the eat function to call for each candidate
+    precedence: tuple[tuple[type[Token], type[Token]], ...]
+
+    @staticmethod
+    def from_candidates(candidates: list[type[Token]], fast_eat: bool = True) -> DispatchEntry:
+        return DispatchEntry(
+            tuple(candidates),
+            tuple(t.fast_eat if fast_eat and t.fast_eat is not None else t.eat for t in candidates),
+            tuple((Higher, Lower) for Higher, Lower in token_precedence if Higher in candidates and Lower in candidates)
+        )
+
+@dataclass(frozen=True)
+class DispatchTable:
+    """Per-context lookup from the character at the current position to the token classes that could match there"""
+    by_char: dict[str, DispatchEntry]
+    default: DispatchEntry # for characters that only tokens without `first_chars` (i.e. that can start with anything) can match
+
+    def __getitem__(self, c: str) -> DispatchEntry:
+        return self.by_char.get(c, self.default)
+
+@cache
+def get_dispatch_table(ctx_type: type[Context], base: BasePrefix, fast_eat: bool = True) -> DispatchTable:
+    """
+    Build the dispatch table for a context type (and the base bare digits are read in, see `Context.digits_base`).
+    If `fast_eat`, candidates that provide a `fast_eat` are matched with it instead of `eat`.
+    Cached, so each table is only built once (with the same caveat as `get_allowed_tokens`)
+    """
+    allowed_tokens = get_allowed_tokens(ctx_type)
+    first_chars = {t: t.get_first_chars(base) for t in allowed_tokens}
+    any_char_tokens = [t for t in allowed_tokens if first_chars[t] is None]
+    chars: set[str] = set().union(*(fc for fc in first_chars.values() if fc is not None))
+    by_char = {c: DispatchEntry.from_candidates([t for t in allowed_tokens if first_chars[t] is None or c in first_chars[t]], fast_eat) for c in chars}
+    return DispatchTable(by_char, DispatchEntry.from_candidates(any_char_tokens, fast_eat))
+
+
+type ContextSnapshot = tuple[Context, ...]
+
+@dataclass
+class Tokenization:
+    """
+    The tokens of a source along with the context stack at every token boundary, i.e. everything `retokenize` needs to update the tokens after an edit.
+    Consecutive entries of `stacks` share the same tuple until a token pushes or pops a context
+    """
+    srcfile: SrcFile
+    tokens: list[Token]
+    stacks: list[ContextSnapshot]   # stacks[k] is the context stack before tokens[k]. The last entry is the stack after the last token
+
+
+class TokenizeError(ReportException):
+    """
+    Raised when the source doesn't tokenize. `report` is the first error, `errors` all of them, and `consumed` the report of the
+    tokens eaten so far when contexts were left unclosed. `retokenize` leaves the tokenization as it was before the edit
+    """
+    def __init__(self, report: Report, errors: list[Report]|None = None, consumed: Info|None = None) -> None:
+        super().__init__(report)
+        self.errors = errors if errors is not None else [report]
+        self.consumed = consumed
+
+    def __reduce__(self):
+        return (type(self), (self.report, self.errors, self.consumed))
+
+    def exit(self) -> NoReturn:
+        """print the error reports and exit with an error code"""
+        for error in self.errors:
+            print(error)
+        if self.consumed is not None:
+            print("-"*80)
+            print(self.consumed)
+        exit(1)
+
+
+@dataclass
+class TextEdit:
+    """Replace the characters in `span` with `text`"""
+    span: Span
+    text: str
+
+
+@dataclass
+class Resync:
+    """
+    The tokens and context stacks from before an edit that `retokenize` can rejoin once re-tokenizing gets past the edit.
+    The streams have converged at a token boundary when the old stream also has a boundary there, the context stack is
+    made of the very same `Context` objects (so nothing opened or closed inside the edited region is still open),
+    and the previous token is the same kind (since some tokens, e.g. `ExponentMarker`, depend on the previous token)
+    """
+    old_tokens: list[Token]             # the old tokens from the restart point on
+    old_stacks: list[ContextSnapshot]   # old_stacks[j] is the context stack before old_tokens[j]
+    old_prev: Token|None                # the old token before old_tokens[0] (which the re-tokenized ones start after)
+    offset: int                         # change in source length from the edit
+    after: int                          # end of the edit in the new source. The streams can't converge before it
+    j: int = 0                          # index into `old_tokens` of the next candidate boundary
+    rejoined_at: int|None = None        # number of tokens before the reused old ones, once converged
+
+    def converged(self, i:int, tokens:list[Token], ctx_stack:list[Context]) -> bool:
+        """check if the new stream (currently at `i`) has rejoined the old one at a token boundary"""
+        if i < self.after:
+            return False
+        old_i = i - self.offset
+        while self.j < len(self.old_tokens) and self.old_tokens[self.j].loc.start < old_i:
+            self.j += 1
+        if self.j == len(self.old_tokens) or self.old_tokens[self.j].loc.start != old_i:
+            return False
+        old_stack = self.old_stacks[self.j]
+        if len(old_stack) != len(ctx_stack) or any(old is not new for old, new in zip(old_stack, ctx_stack)):
+            return False
+        old_prev = self.old_tokens[self.j-1] if self.j > 0 else self.old_prev
+        return type(old_prev) is type(tokens[-1])
+
+    def rejoin(self, tokens:list[Token], stacks:list[ContextSnapshot]) -> None:
+        """splice the rest of the old stream onto the new one, moving the old tokens to their new positions"""
+        rest = self.old_tokens[self.j:]
+        self.rejoined_at = len(tokens)
+        idx_offset = len(tokens) - rest[0].idx
+        if self.offset != 0 or idx_offset != 0:
+            for token in rest:
+                token.shift(self.offset, idx_offset)
+        tokens.extend(rest)
+        stacks.extend(self.old_stacks[self.j+1:])
+
+
+def tokenize(srcfile: SrcFile, *, fast_eat: bool = True) -> list[Token]:
+    """
+    Tokenize a source file.
+
+    Args:
+        srcfile (SrcFile): the source to tokenize
+        fast_eat (bool): use the regex-backed `fast_eat` of token classes that provide one. `fast_eat=False` only uses the reference `eat` methods
+
+    If the source doesn't tokenize, prints the error reports and exits
+    """
+    try:
+        return tokenize_editable(srcfile, fast_eat=fast_eat).tokens
+    except TokenizeError as e:
+        e.exit()
+
+
+def tokenize_editable(srcfile: SrcFile, *, fast_eat: bool = True) -> Tokenization:
+    """
+    Tokenize a source file, keeping the context stacks so the tokens can later be updated by `retokenize`.
+    Raises `TokenizeError` if the source doesn't tokenize
+    """
     tokens: list[Token] = []
-    ctx_stack: list[Context] = [Root(srcfile, tokens_so_far=tokens)]
+    stacks: list[ContextSnapshot] = [(Root(srcfile, tokens_so_far=tokens),)]
+    for _ in eat_tokens(srcfile, tokens, stacks, [], 0, fast_eat): pass
+    return Tokenization(srcfile, tokens, stacks)
+
+
+def retokenize(tokenization: Tokenization, edit: TextEdit, *, fast_eat: bool = True) -> range:
+    """
+    Apply `edit` to the source of `tokenization` and update its tokens in place.
+
+    Tokenizing restarts from the token boundary just before the edit (one token earlier than strictly
+    needed, since a token can look a few characters past its own end, e.g. `ExponentMarker`, or `StringChars`
+    checking for a multi-character delimiter), and stops as soon as the new tokens converge with the old
+    ones again (see `Resync`). Old tokens after that are reused, just moved to their new positions.
+
+    Returns:
+        range: indices in `tokenization.tokens` of the tokens that were (re)created. All other tokens are the same objects as before
+
+    Raises:
+        TokenizeError: if the edited source doesn't tokenize, e.g. while an opening quote is typed before its closing one
+    """
+    srcfile, tokens, stacks = tokenization.srcfile, tokenization.tokens, tokenization.stacks
+    replaced = srcfile.body[edit.span.start:edit.span.stop]
+    srcfile.edit(edit.span, edit.text)
+
+    # restart from the boundary before the first token that touches the edit
+    k = bisect_left(tokens, edit.span.start, key=lambda token: token.loc.stop)
+    k = max(k - 1, 0)
+    i = tokens[k].loc.start if k < len(tokens) else 0
+    resync = Resync(
+        old_tokens=tokens[k:],
+        old_stacks=stacks[k:],
+        old_prev=tokens[k-1] if k > 0 else None,
+        offset=len(edit.text) - (edit.span.stop - edit.span.start),
+        after=edit.span.start + len(edit.text),
+    )
+    old_stacks_after = stacks[k+1:]
+    del tokens[k:]
+    del stacks[k+1:]
+
+    # the error cases only look at the most recently closed context
+    ctx_history = [stacks[k-1][-1]] if k > 0 and len(stacks[k]) < len(stacks[k-1]) else []
+
+    try:
+        for _ in eat_tokens(srcfile, tokens, stacks, ctx_history, i, fast_eat, resync): pass
+    except TokenizeError:
+        # the old tokens are only moved once the streams rejoin, so they can be put back as they were
+        srcfile.edit(Span(edit.span.start, edit.span.start + len(edit.text)), replaced)
+        tokens[k:] = resync.old_tokens
+        stacks[k+1:] = old_stacks_after
+        raise
+    return range(k, resync.rejoined_at if resync.rejoined_at is not None else len(tokens))
+
+
+def tokenize_groups(srcfile: SrcFile, *, fast_eat: bool = True) -> Generator[list[Token]]:
+    """
+    Tokenize a source file lazily, yielding the tokens in top level groups: runs of tokens that start and end with just the root
+    context on the stack. Every delimiter in a group is matched within it (e.g. a whole block, or string), so each group can be
+    handled on its own. A rest-of-file string is one group that runs to the end of the source.
+
+    Only the current group is kept in memory, so memory is proportional to the largest top level group rather than the whole file.
+    Raises `TokenizeError` at the group with the error
+    """
+    tokens: list[Token] = []
+    stacks: list[ContextSnapshot] = [(Root(srcfile, tokens_so_far=tokens),)]
     ctx_history: list[Context] = []
-    src = srcfile.body
+    start = 0
+    for _ in eat_tokens(srcfile, tokens, stacks, ctx_history, 0, fast_eat):
+        yield tokens[start:]
+        # the tokenizer only ever looks back at the last token/stack/closed context
+        del tokens[:-1], stacks[:-1], ctx_history[:-1]
+        start = 1
+    if len(tokens) > start:
+        yield tokens[start:]
 
-    i = 0
-    error_count = 0
-    while i < len(src):
-        # try to eat all allowed tokens at the current position
-        ctx = ctx_stack[-1]
-        allowed_tokens = get_allowed_tokens(type(ctx))
-        matches = [(token_cls.eat(src[i:], ctx), token_cls) for token_cls in allowed_tokens]                
 
-        # filter out matches that didn't eat anything
-        matches = [(length, token_cls) for length, token_cls in matches if length is not None]
+def eat_tokens(srcfile: SrcFile, tokens: list[Token], stacks: list[ContextSnapshot], ctx_history: list[Context], i: int, fast_eat: bool, resync: Resync|None = None) -> Generator[None]:
+    """
+    The main tokenizer loop. Eats tokens from position `i` (with the context stack `stacks[-1]`) to the end of the source,
+    or, if `resync` is given, until the tokens converge with the ones from before an edit.
+    `tokens` and `stacks` are extended in place.
+
+    Yields whenever the context stack is back to just the root, i.e. at the end of every top level group of tokens
+    (see `tokenize_groups`). Between yields, the caller may drop all but the last of `tokens`, `stacks` and `ctx_history`
+    (the only parts the loop looks back at)
 
-        # filter matches shorter than the longest match
-        matches = sorted(matches, key=lambda x: x[0], reverse=True)
-        longest_match_length = matches[0][0] if len(matches) > 0 else 0
-        matches = [match for match in matches if match[0] == longest_match_length]
+    On an error, raises `TokenizeError` with the error reports. When `resync` is given, the caller can then undo the edit
+    """
+    ctx_stack: list[Context] = list(stacks[-1])
+    stack = stacks[-1]
+    src = srcfile.body
+    idx = tokens[-1].idx + 1 if tokens else 0
+
+    errors: list[Error] = []
+    ctx = ctx_stack[-1]
+    table = get_dispatch_table(type(ctx), ctx.digits_base(), fast_eat)
+    while i < len(src):
+        # try to eat every token that could start with the current character, keeping only the longest matches
+        entry = table.by_char.get(src[i], table.default)
+        matches: list[tuple[int, type[Token]]] = []
+        longest_match_length = 0
+        for token_cls, eat in zip(entry.candidates, entry.eaters):
+            length = eat(src, ctx, i)
+            if length is None or length < longest_match_length:
+                continue
+            if length > longest_match_length:
+                longest_match_length = length
+                matches = []
+            matches.append((length, token_cls))
 
         # filter matches by precedence if any precedence rules apply
-        match_types = [match[1] for match in matches]
-        if len(matches) > 1:
+        if len(matches) > 1 and entry.precedence:
+            match_types = [match[1] for match in matches]
             to_filter: set[type[Token]] = set()
-            for Higher, Lower in token_precedence:
+            for Higher, Lower in entry.precedence:
                 if Higher in match_types and Lower in match_types:
                     to_filter.add(Lower)
             matches = [match for match in matches if match[1] not in to_filter]
@@ -1417,13 +1847,9 @@ def tokenize(srcfile: SrcFile) -> list[Token]:
             errors = [error_case(src, i, tokens, ctx_stack, ctx_history, matches) for error_case in known_multiple_matched_error_cases]
             errors = list(filter(None, errors))
             if len(errors) > 0:
-                error_count += len(errors)
-                for error in errors:
-                    print(error)
                 break
             
             # fallback generic error
-            error_count += 1
             match_names = ', '.join([match[1].__name__ for match in matches])
             error = Error(
                 srcfile=srcfile,
@@ -1431,7 +1857,7 @@ def tokenize(srcfile: SrcFile) -> list[Token]:
                 pointer_messages=Pointer(span=Span(i, i+longest_match_length), message=f"multiple tokens matched at span [{i}..{i+longest_match_length}): {match_names}"),
                 hint="disambiguation rules currently can't handle this case.\n1) Please manually disambiguate\n2) Probably this case should get a dedicated error function\n   consider opening an issue https://github.com/david-andrew/dewy-lang/issues"
             )
-            print(error)    
+            errors.append(error)
             break
         
         # if there are no matches, it's an error
@@ -1440,26 +1866,23 @@ def tokenize(srcfile: SrcFile) -> list[Token]:
             errors = [error_case(src, i, tokens, ctx_stack, ctx_history) for error_case in known_no_match_error_cases]
             errors = list(filter(None, errors))
             if len(errors) > 0:
-                error_count += len(errors)
-                for error in errors:
-                    print(error)
                 break     
             # TODO: probably a better way to handle would be for checking if any upper contexts support the next token
             # potentially could use as a trick to recover/resynchronize and parse more tokens
             # TBD: what about the other way around, e.g. if the user didn't open a context they are trying to close?
             # could check what contexts support the next token--starts to get pretty heavy / complex
-            error_count += 1
             error = Error(
                 srcfile=srcfile,
                 title=f"no valid token matched. Context={ctx.__class__.__name__}",
                 pointer_messages=Pointer(span=Span(i, i), message=f"no valid token at position {i}: {truncate(first_line(src[i:]))}"),
             )
-            print(error)
+            errors.append(error)
             break
 
         # add the token to the list of tokens
         length, token_cls = matches[0]
-        token = token_cls(src[i:i+length], Span(i, i+length), len(tokens))
+        stop = i + length # shared by this token's span and the next one's, rather than two equal int objects
+        token = token_cls(src[i:stop], Span(i, stop), idx)
         action = token.action_on_eat(ctx)
         if action is not None:
             if isinstance(action, Push):
@@ -1469,8 +1892,21 @@ def tokenize(srcfile: SrcFile) -> list[Token]:
             else:
                 # unreachable
                 raise ValueError(f"INTERNAL ERROR: invalid context action: {action=}. Expected Push or Pop")
+            ctx = ctx_stack[-1]
+            table = get_dispatch_table(type(ctx), ctx.digits_base(), fast_eat)
+            stack = tuple(ctx_stack)
         tokens.append(token)
-        i += length
+        stacks.append(stack)
+        idx += 1
+        i = stop
+
+        if resync is not None and resync.converged(i, tokens, ctx_stack):
+            resync.rejoin(tokens, stacks)
+            ctx_stack = list(stacks[-1])
+            break
+
+        if len(stack) == 1:
+            yield
     
     # pop any remaining rest-of-file string if present
     if len(ctx_stack) == 2 and isinstance(ctx_stack[-1], StringBody) and isinstance(ctx_stack[-1].opening_quote, RestOfFileStringQuote):
@@ -1481,19 +1917,11 @@ def tokenize(srcfile: SrcFile) -> list[Token]:
         ctx_stack.pop()
 
     # ensure that the final context is a root 
-    if not isinstance(ctx_stack[-1], Root):
-        error_stack = collect_remaining_context_errors(ctx_stack)
-        error_count += len(error_stack)
-        for error in error_stack:
-            print(error)
-        print("-"*80)
-        print(tokens_to_report(tokens, srcfile, {Whitespace}))
-
-    # if there were errors, exit with an error code
-    if error_count > 0:
-        exit(1)
-    
-    return tokens
+    unclosed = not isinstance(ctx_stack[-1], Root)
+    if unclosed:
+        errors.extend(collect_remaining_context_errors(ctx_stack))
+    if errors:
+        raise TokenizeError(errors[0], errors, tokens_to_report(tokens, srcfile, {Whitespace}) if unclosed else None)
 
 def tokens_to_report(tokens: list[Token], srcfile: SrcFile, blacklist: set[type[Token]] = set()) -> Info:
     """Convert a list of tokens to a report of the tokens consumed so far."""
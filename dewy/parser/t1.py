@@ -14,7 +14,7 @@ from itertools import groupby
 from ..reporting import Span, SrcFile, Error, Pointer, ReportException
 from . import t0
 from ..utils import JumpableIterator
-from typing import Literal, Generator
+from typing import Literal, Generator, Iterator
 
 
 # These are case insensitive
@@ -57,7 +57,7 @@ class Context:
     srcfile: SrcFile
 
 
-@dataclass
+@dataclass(slots=True)
 class Token(ABC):
     loc: Span
 
@@ -66,20 +66,20 @@ class Token(ABC):
     def eat(tokens:list[t0.Token], ctx:Context, start:int) -> tuple[int, Token]|None: ...
 
 
-@dataclass
+@dataclass(slots=True)
 class InedibleToken(Token):
     """For Token2's that are not constructed via the normal .eat() method. instead other tokens may construct them directly"""
     @classmethod
     def eat(cls, tokens:list[t0.Token], ctx:Context, start:int) -> tuple[int, InedibleToken]|None:
         raise NotImplementedError(f'{cls.__name__} should not be constructed via .eat(). Instead some other token should construct it directly via {cls.__name__}(...)')
 
-@dataclass
+@dataclass(slots=True)
 class Exponent:
     value: t0.Number
     positive: bool=True # true for positive, false for negative, e.g. 1e-2 is positive=False
     binary: bool=False  # true when the exponent is a power of 2 (e.g. 0x1.0x8p10)
 
-@dataclass
+@dataclass(slots=True)
 class Real(Token):
     whole: t0.Number
     fraction: t0.Number|None
@@ -128,7 +128,7 @@ class Real(Token):
     """
     @staticmethod
     def eat(tokens:list[t0.Token], ctx:Context, start:int) -> tuple[int, Real]|None:
-        if start + 2 >= len(tokens):
+        if not has_token(tokens, start + 2):
             return None
         ########## Whole number part ##########
         if not isinstance(tokens[start], t0.Number):
@@ -139,7 +139,7 @@ class Real(Token):
         i = 1
         fraction = None
         if (
-            start + i + 1 < len(tokens)
+            has_token(tokens, start + i + 1)
             and isinstance((dot:=tokens[start + i]), t0.Symbol) and dot.src == '.'
             and isinstance(tokens[start + i + 1], t0.Number)
         ):
@@ -149,12 +149,12 @@ class Real(Token):
         ########## Exponent part ##########
         exponent = None
         # weird disambiguation case where the exponent part looked like an identifier
-        if start + i < len(tokens) and isinstance(marker:=tokens[start + i], t0.ExponentMarker):
+        if has_token(tokens, start + i) and isinstance(marker:=tokens[start + i], t0.ExponentMarker):
             exponent = Exponent(marker.power)
             i += 1
         # <eEpP><number>
         elif (
-            start + i + 1 < len(tokens)
+            has_token(tokens, start + i + 1)
             and isinstance((e:=tokens[start + i]), t0.Identifier) and e.src in 'eEpP'
             and isinstance(tokens[start + i + 1], t0.Number)
         ):
@@ -162,7 +162,7 @@ class Real(Token):
             i += 2
         # <eEpP><+-><number>
         elif (
-            start + i + 2 < len(tokens)
+            has_token(tokens, start + i + 2)
             and isinstance((e:=tokens[start + i]), t0.Identifier) and e.src in 'eEpP'
             and isinstance((sign:=tokens[start + i + 1]), t0.Symbol) and sign.src in '+-'
             and isinstance(tokens[start + i + 2], t0.Number)
@@ -180,7 +180,7 @@ class Real(Token):
         return i, Real(span, whole, fraction, exponent)
         
 
-@dataclass
+@dataclass(slots=True)
 class String(Token):
     content: str
 
@@ -283,16 +283,16 @@ class String(Token):
         
         return combined
 
-@dataclass
+@dataclass(slots=True)
 class ParametricEscape(InedibleToken):
     inner: list[Token]
 
-@dataclass
+@dataclass(slots=True)
 class IString(InedibleToken):
     """Any string that contains an expression or interpolation (includes parametric unicode+hex escapes)"""
     content: list[str | ParametricEscape | Block]
 
-@dataclass
+@dataclass(slots=True)
 class Block(Token):
     inner: list[Token]
     kind: Literal['{}', '[]', '()', '[)', '(]', '<>']
@@ -316,7 +316,7 @@ class Block(Token):
         assert delims in ['{}', '[]', '()', '[)', '(]', '<>'], f'INTERNAL ERROR: invalid block delimiter: {delims}'
         return closer.idx - start + 1, Block(span, inner, delims, base)
 
-@dataclass
+@dataclass(slots=True)
 class BasedString(Token):
     digits: list[t0.BasedStringChars]
     base: t0.BasePrefix
@@ -333,7 +333,7 @@ class BasedString(Token):
         return closer.idx - start + 1, BasedString(span, digits, opener.base)
 
 
-@dataclass
+@dataclass(slots=True)
 class Identifier(Token):
     name: str
 
@@ -347,7 +347,7 @@ class Identifier(Token):
         
         return None
 
-@dataclass
+@dataclass(slots=True)
 class Semicolon(Token):
     @staticmethod
     def eat(tokens:list[t0.Token], ctx:Context, start:int) -> tuple[int, Semicolon]|None:
@@ -356,7 +356,7 @@ class Semicolon(Token):
             return 1, Semicolon(token.loc)
         return None
 
-@dataclass
+@dataclass(slots=True)
 class Operator(Token):
     symbol: str
 
@@ -376,7 +376,7 @@ class Operator(Token):
         return 1, Operator(token.loc, token.src.casefold())
             
 
-@dataclass
+@dataclass(slots=True)
 class Keyword(Token): # e.g. if, loop, import, let, etc. any keyword that behaves differently syntactically e.g. `<keyword> <expr>`. Ignore keywords that can go in identifiers, e.g. `void`, `intrinsic`/`extern`, etc.
     name: str
 
@@ -387,7 +387,7 @@ class Keyword(Token): # e.g. if, loop, import, let, etc. any keyword that behave
             return 1, Keyword(token.loc, token.src.casefold())
         return None
 
-@dataclass
+@dataclass(slots=True)
 class Metatag(Token):
     name: str
     @staticmethod
@@ -397,7 +397,7 @@ class Metatag(Token):
             return 1, Metatag(token.loc, token.src[1:])
         return None
 
-@dataclass
+@dataclass(slots=True)
 class Bool(Token):
     value: bool
     @staticmethod
@@ -407,7 +407,7 @@ class Bool(Token):
             return 1, Bool(token.loc, token.src.casefold() == 'true')
         return None
 
-@dataclass
+@dataclass(slots=True)
 class Integer(Token):
     value: t0.Number
     @staticmethod
@@ -417,12 +417,12 @@ class Integer(Token):
             return 1, Integer(token.loc, token)
         return None
 
-@dataclass
+@dataclass(slots=True)
 class Whitespace(Token): # so we can invert later for juxtapose
     @staticmethod
     def eat(tokens:list[t0.Token], ctx:Context, start:int) -> tuple[int, Whitespace]|None:
         i = 0
-        while start + i < len(tokens) and isinstance(tokens[start + i], (t0.Whitespace, t0.LineComment, t0.BlockComment)):
+        while has_token(tokens, start + i) and isinstance(tokens[start + i], (t0.Whitespace, t0.LineComment, t0.BlockComment)):
             i += 1
         if i == 0: return None
         return i, Whitespace(Span(tokens[start].loc.start, tokens[start + i - 1].loc.stop))
@@ -444,49 +444,137 @@ top_level_tokens: list[type[Token]] = [
     Whitespace,
 ]
 
-def tokenize(srcfile: SrcFile) -> list[Token]:
-    """Public API for second tokenization stage"""
+# sources at least this long are streamed by `tokenize`
+STREAM_THRESHOLD = 1 << 20
+
+def tokenize(srcfile: SrcFile, *, stream: bool|None = None) -> list[Token]:
+    """
+    Public API for second tokenization stage
+
+    Args:
+        srcfile (SrcFile): the source to tokenize
+        stream (bool|None): make the tokens with `tokenize_iter`, so the whole list of t0 tokens is never held at once.
+            That takes less memory but is slower, so by default only sources of at least `STREAM_THRESHOLD` characters are streamed
+    """
+    if stream is None:
+        stream = len(srcfile.body) >= STREAM_THRESHOLD
+    if stream:
+        try:
+            return list(tokenize_iter(srcfile))
+        except t0.TokenizeError as e:
+            e.exit()
     tokens = t0.tokenize(srcfile)
     ctx = Context(srcfile)
     return list(tokenize_gen(tokens, ctx))
 
+def tokenize_iter(srcfile: SrcFile) -> Generator[Token]:
+    """
+    Streaming version of `tokenize`. Yields the top level tokens as they are made, with `t0` tokenizing lazily underneath (see `TokenWindow`).
+    Memory is proportional to the largest top level token (e.g. a block and everything in it) rather than the whole file.
+    Raises `t0.TokenizeError` when the source doesn't tokenize, once the tokens are pulled up to the error
+    """
+    tokens = TokenWindow(t0.tokenize_groups(srcfile))
+    ctx = Context(srcfile)
+    start = 0
+    while has_token(tokens, start):
+        length, token = eat_next(tokens, ctx, start)
+        yield token
+        start += length
+        tokens.release(start)
+
 def tokenize_gen(tokens:list[t0.Token], ctx:Context, start:int=0, stop:int=None) -> Generator[Token]:
     if stop is None: stop = len(tokens)
     if stop > len(tokens): raise ValueError(f"INTERNAL ERROR: stop index out of range: {stop} > {len(tokens)}")
     while start < stop:
-        matches = [token_cls.eat(tokens, ctx, start) for token_cls in top_level_tokens]
-        matches = list(filter(None, matches))
-        if len(matches) == 0:
+        match_length, token = eat_next(tokens, ctx, start)
+        yield token
+        start += match_length
+
+def eat_next(tokens:list[t0.Token], ctx:Context, start:int) -> tuple[int, Token]:
+    """eat the next token starting at `start`. Returns the number of t0 tokens eaten and the token"""
+    matches = [token_cls.eat(tokens, ctx, start) for token_cls in top_level_tokens]
+    matches = list(filter(None, matches))
+    if len(matches) == 0:
+        # TODO: more specific error reporting based on the case
+        error = Error(
+            srcfile=ctx.srcfile,
+            title='No token found',
+            pointer_messages=[
+                Pointer(span=Span(tokens[start].loc.start, tokens[start].loc.start), message='Unrecognized starting here'),
+            ],
+            hint='TODO: better error analysis'
+        )
+        error.throw()
+    if len(matches) > 1:
+        # try for longest match, otherwise probably ambiguous error
+        longest_match_length = max(length for length, _ in matches)
+        matches = [(match_length, token) for match_length, token in matches if match_length == longest_match_length]
+        if len(matches) > 1:
             # TODO: more specific error reporting based on the case
             error = Error(
                 srcfile=ctx.srcfile,
-                title='No token found',
+                title='Multiple tokens matched',
                 pointer_messages=[
-                    Pointer(span=Span(tokens[start].loc.start, tokens[start].loc.start), message='Unrecognized starting here'),
+                    Pointer(span=Span(tokens[start].loc.start, tokens[start].loc.start), message='Multiple tokens matched'),
                 ],
-                hint='TODO: better error analysis'
+                hint=f'The following tokens matched: {matches}\nTODO: provide better explanation for how to disambiguate'
             )
             error.throw()
-        if len(matches) > 1:
-            # try for longest match, otherwise probably ambiguous error
-            longest_match_length = max(length for length, _ in matches)
-            matches = [(match_length, token) for match_length, token in matches if match_length == longest_match_length]
-            if len(matches) > 1:
-                # TODO: more specific error reporting based on the case
-                error = Error(
-                    srcfile=ctx.srcfile,
-                    title='Multiple tokens matched',
-                    pointer_messages=[
-                        Pointer(span=Span(tokens[start].loc.start, tokens[start].loc.start), message='Multiple tokens matched'),
-                    ],
-                    hint=f'The following tokens matched: {matches}\nTODO: provide better explanation for how to disambiguate'
-                )
-                error.throw()
-    
-        match_length, token = matches[0]
-        yield token
-        start += match_length
 
+    return matches[0]
+
+
+class TokenWindow:
+    """
+    Stands in for the full list of t0 tokens when streaming (see `tokenize_iter`). Tokens are indexed by their `idx` (i.e. their
+    index in the full list), and pulled in from `t0.tokenize_groups` as they're needed. Whole top level groups are pulled in at a
+    time, so a block or string opener's matching closer (and everything in between) is always available along with it.
+    `len()` is the number of tokens pulled in so far, so bounds checks should use `has_token`
+    """
+    def __init__(self, groups: Iterator[list[t0.Token]]) -> None:
+        self.groups = groups
+        self.tokens: list[t0.Token] = []
+        self.offset = 0  # idx of self.tokens[0]
+
+    def __len__(self) -> int:
+        return self.offset + len(self.tokens)
+
+    def __getitem__(self, key: int|slice) -> t0.Token|list[t0.Token]:
+        i = key - self.offset if type(key) is int else -1
+        if 0 <= i < len(self.tokens):
+            return self.tokens[i]  # already pulled in, by far the most common case
+        if isinstance(key, slice):
+            assert key.step is None, f'INTERNAL ERROR: TokenWindow does not support slice steps: {key}'
+            self.fill(key.stop - 1)
+            return self.tokens[key.start - self.offset:key.stop - self.offset]
+        if key < 0:
+            return self.tokens[key]
+        if key < self.offset:
+            raise IndexError(f'INTERNAL ERROR: token {key} was already released from the window (which starts at {self.offset})')
+        if not self.fill(key):
+            raise IndexError(f'token index out of range: {key}')
+        return self.tokens[key - self.offset]
+
+    def fill(self, idx: int) -> bool:
+        """pull in groups until there is a token at `idx` (or the tokens run out). Returns whether there is a token at `idx`"""
+        while idx >= len(self):
+            group = next(self.groups, None)
+            if group is None:
+                return False
+            self.tokens.extend(group)
+        return True
+
+    def release(self, idx: int) -> None:
+        """drop the tokens before `idx`. Only actually done once they're most of the window, so dropping is amortized O(1) per token"""
+        released = idx - self.offset
+        if released > len(self.tokens) // 2:
+            del self.tokens[:released]
+            self.offset = idx
+
+
+def has_token(tokens:list[t0.Token]|TokenWindow, idx:int) -> bool:
+    """check if there is a token at `idx`, pulling in more tokens if streaming"""
+    return idx < len(tokens) or (isinstance(tokens, TokenWindow) and tokens.fill(idx))
 
 
 def peek_next_token(tokens:list[t0.Token], ctx:Context, start:int) -> Token | t0.Token | None:
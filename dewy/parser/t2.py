@@ -2,7 +2,7 @@
 Post processing steps on tokens to prepare them for expression parsing
 """
 from textwrap import dedent
-from typing import Callable, Literal, cast, get_args, TypeAlias
+from typing import Callable, Generator, Iterable, Literal, cast, get_args, TypeAlias
 from dataclasses import dataclass, field
 from functools import partial
 from ..reporting import SrcFile, ReportException, Span, Error, Pointer, Warning
@@ -15,58 +15,59 @@ import pdb
 @dataclass
 class Juxtapose(t1.InedibleToken):
     """abstract base class for all juxtapose operators"""
+    __slots__ = () # not @dataclass(slots=True), which would recreate the class and break the zero-argument super() below
     def __new__(cls, *args, **kwargs):
         if cls is Juxtapose:
             raise TypeError("Juxtapose is abstract; instantiate a specific subclass instead")
         return super().__new__(cls)
 
-@dataclass
+@dataclass(slots=True)
 class CallJuxtapose(Juxtapose): ...
 
-@dataclass
+@dataclass(slots=True)
 class IndexJuxtapose(Juxtapose): ...
 
-@dataclass
+@dataclass(slots=True)
 class MultiplyJuxtapose(Juxtapose): ...
 
-@dataclass
+@dataclass(slots=True)
 class RangeJuxtapose(Juxtapose): ...
 
-@dataclass
+@dataclass(slots=True)
 class EllipsisJuxtapose(Juxtapose): ...
 
-@dataclass
+@dataclass(slots=True)
 class TypeParamJuxtapose(Juxtapose): ...
 
-@dataclass
+@dataclass(slots=True)
 class SemicolonJuxtapose(Juxtapose): ...
 
 ComparisonOp: TypeAlias = Literal['=?', '>?', '<?', '>=?', '<=?', 'in?', 'is?', 'isnt?', 'istype?', '@?']
 INVERTABLE_COMPARISON_OPS: set[ComparisonOp] = set(get_args(ComparisonOp))
-@dataclass
+@dataclass(slots=True)
 class InvertedComparisonOp(t1.InedibleToken):
     op: ComparisonOp
 
-@dataclass
+@dataclass(slots=True)
 class BroadcastOp(t1.InedibleToken):
     op: t1.Operator
 
-@dataclass
+@dataclass(slots=True)
 class CombinedAssignmentOp(t1.InedibleToken):
     op: t1.Operator|BroadcastOp
     # special case of = operator to the right of another operator
 
 
-@dataclass
+@dataclass(slots=True)
 class OpFn(t1.InedibleToken):
     op: t1.Operator|BroadcastOp|CombinedAssignmentOp
 
-@dataclass
+@dataclass(slots=True)
 class Placeholder(t1.InedibleToken):
     """`$` used for constructing predicate functions, e.g. `x => x >? 10` can be constructed as `$ >? 10`"""
     ...
 
-@dataclass
+@dataclass(slots=True)
 class QJuxtapose(t1.InedibleToken):
     """
     Quantum Juxtapose: represents operator ambiguity at a given point. Mainly for vanilla juxtapose.
@@ -159,18 +160,18 @@ flows # note that if-else-if/if-else-loop/etc. should all be bundled up into one
 
 """
 
-@dataclass
+@dataclass(slots=True)
 class KeywordExpr(t1.InedibleToken):
     parts: list[t1.Keyword | Chain]
 
 
-@dataclass
+@dataclass(slots=True)
 class Flow(t1.InedibleToken):
     arms: list[KeywordExpr]
     default: Chain|None=None
 
 
-@dataclass
+@dataclass(slots=True)
 class Chain(t1.InedibleToken):
     items: list[t1.Token]
 
@@ -459,125 +460,139 @@ def recurse_into(token: t1.Token, func: Callable[[list[t1.Token]], None]) -> Non
     # else no inner tokens. TODO: would be nice if we could error if there were any unhandled cases with inner tokens...
 
 
-def remove_whitespace(tokens: list[t1.Token]) -> None:
-    """Remove whitespace tokens from the tokens list (recursively)"""
-    tokens[:] = [token for token in tokens if not isinstance(token, t1.Whitespace)]
-    for token in tokens:
-        recurse_into(token, remove_whitespace)
-
-
-def insert_juxtapose(tokens: list[t1.Token], *, ctx: Context) -> None:
+def rewrite_tokens(tokens: list[t1.Token], *, ctx: Context) -> None:
     """
-    Insert juxtapose tokens between adjacent (atom) tokens if their spans touch (which indicates there was no whitespace between them)
-    TODO: this is vaguely inefficient with all the insertions. If this is a performance bottleneck, consider some type of e.g. heap or rope or etc. data structure
-          alternatively, just do 1 pass to find where juxtaposes go, and then insert them all at once.
+    Apply the token rewriting stages to `tokens` (and recursively to any inner tokens), replacing the contents of `tokens` in place.
 
-    Note: this function is idempotent, so it can be called multiple times, e.g. before andafter grouping up tokens to the token list
+    Each stage is a generator over the output of the stage before it, so this is a single forward pass that builds the new
+    list once, rather than a pass over the whole token tree per stage (with list inserts/slice assignments along the way).
+    Each stage only sees the output of the stages before it, exactly as if the stages were run one after another
     """
-    i = 0
-    while i < len(tokens):
-        # recursively handle inserting juxtaposes for blocks
-        recurse_into(tokens[i], lambda inner: insert_juxtapose(inner, ctx=ctx))
+    stages = remove_whitespace(tokens)
+    stages = insert_juxtapose(stages, ctx=ctx)
+    # insert void between any instances of `,,` or comma at the beginning or end of a context
+    stages = insert_comma_voids(stages)
+    # combine not with comparison operators into a single token
+    stages = make_inverted_comparisons(stages)
+    # convert any . operator next to a binary operator (e.g. .+ .^/-) into a broadcast operator
+    stages = make_broadcast_operators(stages)
+    # convert any combined assignment operators (e.g. += -= etc.) into a single token
+    stages = make_combined_assignment_operators(stages)
+    # convert any (op) into an identifier token for that operator (e.g. (+=) -> +=)
+    stages = make_op_functions(stages)
+    # convert any `$` identifiers into placeholder tokens
+    stages = make_placeholders(stages)
+    tokens[:] = list(stages)
+
+
+def merge_pairs(tokens: Iterable[t1.Token], merge: Callable[[t1.Token, t1.Token], t1.Token|None]) -> Generator[t1.Token]:
+    """Replace any pair of adjacent tokens that `merge` combines (i.e. returns a token for) with the combined token. Combined tokens are not merged again"""
+    tokens = iter(tokens)
+    token = next(tokens, None)
+    while token is not None:
+        following = next(tokens, None)
+        if following is not None and (merged := merge(token, following)) is not None:
+            yield merged
+            token = next(tokens, None)
+        else:
+            yield token
+            token = following
 
-        # insert juxtapose if adjacent (atom) tokens' spans touch
-        if i + 1 < len(tokens) and tokens[i].loc.stop == tokens[i+1].loc.start:
-            jux_type = get_jux_type(tokens[i], tokens[i+1], tokens[i-1] if i > 0 else None, ctx=ctx)
-            if jux_type is not None:
-                tokens.insert(i+1, jux_type(t1.Span(tokens[i].loc.stop, tokens[i].loc.stop)))
-                i += 1
 
-        # move to next token
-        i += 1
+def remove_whitespace(tokens: Iterable[t1.Token]) -> Generator[t1.Token]:
+    """Remove whitespace tokens"""
+    for token in tokens:
+        if not isinstance(token, t1.Whitespace):
+            yield token
 
 
-def insert_comma_voids(tokens: list[t1.Token]) -> None:
+def insert_juxtapose(tokens: Iterable[t1.Token], *, ctx: Context) -> Generator[t1.Token]:
+    """
+    Insert juxtapose tokens between adjacent (atom) tokens if their spans touch (which indicates there was no whitespace between them)
+
+    This is also where the inner tokens of each token get rewritten (see `rewrite_tokens`), right before checking if it juxtaposes
+    with the next token, so juxtapose warnings are reported in source order
+    """
+    tokens = iter(tokens)
+    prev: t1.Token|None = None  # the last token yielded (which may be an inserted juxtapose)
+    token = next(tokens, None)
+    while token is not None:
+        recurse_into(token, lambda inner: rewrite_tokens(inner, ctx=ctx))
+        following = next(tokens, None)
+        jux_type = None
+        if following is not None and token.loc.stop == following.loc.start:
+            jux_type = get_jux_type(token, following, prev, ctx=ctx)
+        yield token
+        prev = token
+        if jux_type is not None:
+            prev = jux_type(Span(token.loc.stop, token.loc.stop))
+            yield prev
+        token = following
+
+
+def insert_comma_voids(tokens: Iterable[t1.Token]) -> Generator[t1.Token]:
     """Insert void tokens between any instances of `,,` or comma at the beginning or end of a context"""
-    if len(tokens) == 0:
-        return
-    
-    i = 0
-    if is_comma(tokens[0]):
-        tokens.insert(0, t1.Identifier(Span(tokens[0].loc.start, tokens[0].loc.start), 'void'))
-        i += 1
-    
-    while i < len(tokens):
-        token = tokens[i]
-        recurse_into(token, insert_comma_voids)
-        
-        if i+1 < len(tokens) and is_comma(token) and is_comma(tokens[i+1]):
-            tokens.insert(i+1, t1.Identifier(Span(token.loc.stop, token.loc.stop), 'void'))
-            i += 1
-        i += 1
-    
-    if is_comma(tokens[-1]):
-        tokens.append(t1.Identifier(Span(tokens[-1].loc.stop, tokens[-1].loc.stop), 'void'))
+    prev: t1.Token|None = None
+    for token in tokens:
+        if is_comma(token) and (prev is None or is_comma(prev)):
+            at = token.loc.start if prev is None else prev.loc.stop
+            yield t1.Identifier(Span(at, at), 'void')
+        yield token
+        prev = token
+    if prev is not None and is_comma(prev):
+        yield t1.Identifier(Span(prev.loc.stop, prev.loc.stop), 'void')
 
 
-def make_inverted_comparisons(tokens: list[t1.Token]) -> None:
+def make_inverted_comparisons(tokens: Iterable[t1.Token]) -> Generator[t1.Token]:
     """`not` followed by a comparison operator becomes an inverted comparison operator"""
-    i = 0
-    while i < len(tokens):
-        token = tokens[i]
-        recurse_into(token, make_inverted_comparisons)
-        
+    def merge(token: t1.Token, following: t1.Token) -> InvertedComparisonOp|None:
         if isinstance(token, t1.Operator) and token.symbol == 'not':
-            if len(tokens) > i+1 and is_binary_op(tokens[i+1]) and tokens[i+1].symbol in INVERTABLE_COMPARISON_OPS:
-                tokens[i:i+2] = [InvertedComparisonOp(Span(token.loc.start, tokens[i+1].loc.stop), tokens[i+1].symbol)]
-        i += 1
-
+            if is_binary_op(following) and following.symbol in INVERTABLE_COMPARISON_OPS:
+                return InvertedComparisonOp(Span(token.loc.start, following.loc.stop), following.symbol)
+        return None
+    return merge_pairs(tokens, merge)
 
 
-def make_broadcast_operators(tokens: list[t1.Token]) -> None:
+def make_broadcast_operators(tokens: Iterable[t1.Token]) -> Generator[t1.Token]:
     """Convert any . operator next to a unary or binary operator into a broadcast operator"""
-    i = 0
-    while i < len(tokens):
-        token = tokens[i]
-        recurse_into(token, make_broadcast_operators)
-        
+    def merge(token: t1.Token, following: t1.Token) -> BroadcastOp|None:
         if isinstance(token, t1.Operator) and token.symbol == '.':
-            if len(tokens) > i+1 and (is_binary_op(tokens[i+1]) or is_prefix_op(tokens[i+1])):
-                tokens[i:i+2] = [BroadcastOp(Span(token.loc.start, tokens[i+1].loc.stop), tokens[i+1])]
-        i += 1
+            if is_binary_op(following) or is_prefix_op(following):
+                return BroadcastOp(Span(token.loc.start, following.loc.stop), following)
+        return None
+    return merge_pairs(tokens, merge)
 
 
-def make_combined_assignment_operators(tokens: list[t1.Token]) -> None:
+def make_combined_assignment_operators(tokens: Iterable[t1.Token]) -> Generator[t1.Token]:
     """Convert any combined assignment operators into a single token"""
-    i = 0
-    while i < len(tokens):
-        token = tokens[i]
-        recurse_into(token, make_combined_assignment_operators)
-        
+    def merge(token: t1.Token, following: t1.Token) -> CombinedAssignmentOp|None:
         if is_binary_op(token) or isinstance(token, BroadcastOp):
-            if len(tokens) > i+1 and isinstance(tokens[i+1], t1.Operator) and tokens[i+1].symbol == '=':
-                tokens[i:i+2] = [CombinedAssignmentOp(Span(token.loc.start, tokens[i+1].loc.stop), token)]
-        i += 1
+            if isinstance(following, t1.Operator) and following.symbol == '=':
+                return CombinedAssignmentOp(Span(token.loc.start, following.loc.stop), token)
+        return None
+    return merge_pairs(tokens, merge)
 
 
-def make_op_functions(tokens: list[t1.Token]) -> None:
+def make_op_functions(tokens: Iterable[t1.Token]) -> Generator[t1.Token]:
     """convert (op) into an identifier token for that operator"""
-    i = 0
-    while i < len(tokens):
-        token = tokens[i]
-        recurse_into(token, make_op_functions)
-        
+    for token in tokens:
         if (isinstance(token, t1.Block) 
             and token.kind == '()' 
             and len(token.inner) == 1 
             and isinstance(token.inner[0], (t1.Operator, BroadcastOp, CombinedAssignmentOp))
         ):
-            tokens[i] = OpFn(token.loc, token.inner[0])
-        i += 1
+            yield OpFn(token.loc, token.inner[0])
+        else:
+            yield token
 
 
-def make_placeholders(tokens: list[t1.Token]) -> None:
+def make_placeholders(tokens: Iterable[t1.Token]) -> Generator[t1.Token]:
     """convert any `$` identifiers into placeholder tokens"""
-    i = 0
-    while i < len(tokens):
-        token = tokens[i]
-        recurse_into(token, make_placeholders)
+    for token in tokens:
         if isinstance(token, t1.Identifier) and token.name == '$':
-            tokens[i] = Placeholder(token.loc)
-        i += 1
+            yield Placeholder(token.loc)
+        else:
+            yield token
 
 def is_stop_keyword(token: t1.Token, stop: set[str]) -> bool:
     """
@@ -980,23 +995,8 @@ def postok(srcfile: SrcFile) -> list[Chain]:
 
 def postok_inner(tokens: list[t1.Token], *, ctx: Context) -> None:
     """apply postprocessing steps to the tokens. Converts list[Token] into list[Chain] in place"""
-    # remove whitespace and insert juxtapose tokens
-    remove_whitespace(tokens)
-    insert_juxtapose(tokens, ctx=ctx)
-
-    # insert void between any instances of `,,` or comma at the beginning or end of a context
-    insert_comma_voids(tokens)
-
-    # combine not with comparison operators into a single token
-    make_inverted_comparisons(tokens)
-    # convert any . operator next to a binary operator (e.g. .+ .^/-) into a broadcast operator
-    make_broadcast_operators(tokens)
-    # convert any combined assignment operators (e.g. += -= etc.) into a single token
-    make_combined_assignment_operators(tokens)
-    # convert any (op) into an identifier token for that operator (e.g. (+=) -> +=)
-    make_op_functions(tokens)
-    # convert any `$` identifiers into placeholder tokens
-    make_placeholders(tokens)
+    # remove whitespace, insert juxtapose tokens, and combine/convert special operators (in a single pass)
+    rewrite_tokens(tokens, ctx=ctx)
 
     # bundle up keyword expressions and flows into single atom tokens
     bundle_keyword_exprs(tokens, ctx=ctx)
@@ -41,6 +41,8 @@ TODO features:
 [.] for unknown identifiers, look up possible similar identifiers for help message (handled by higher level process)
 """
 from __future__ import annotations  # so older python versions (>=3.10) can use this module
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
 from bisect import bisect_right
@@ -145,7 +147,7 @@ class ColorTheme:
 PointerPlacement = Literal["above", "below"]
 
 
-@dataclass
+@dataclass(slots=True)
 class Span:
     """
     python range rules, i.e. [start,stop), indices are in between items, not the indices of actual items. 
@@ -205,6 +207,16 @@ class SrcFile:
         path = Path(path)
         return cls(path=path, body=path.read_text())
 
+    def edit(self, span:Span, text:str) -> None:
+        """Replace `span` of the body with `text` in place. Line starts are only recomputed for the replaced text"""
+        delta = len(text) - (span.stop - span.start)
+        first = bisect_right(self._line_starts, span.start)  # line starts up to the edit are unaffected
+        last = bisect_right(self._line_starts, span.stop)    # line starts inside the replaced span are dropped
+        inserted = [span.start + i + 1 for i, ch in enumerate(text) if ch == "\n"]
+        shifted = [start + delta for start in self._line_starts[last:]]
+        self._line_starts[first:] = inserted + shifted
+        self.body = self.body[:span.start] + text + self.body[span.stop:]
+
     def offset_to_row_col(self, index:int) -> tuple[int, int]:
         index = max(0, min(index, len(self.body)))
         line_idx = bisect_right(self._line_starts, index) - 1
@@ -966,6 +978,8 @@ class Report:
     
     def warn(self) -> None:
         sys.stderr.write(str(self) + "\n\n")
+        for warnings in _warning_collectors:
+            warnings.append(self)
 
 @dataclass
 class Error(Report):
@@ -984,6 +998,19 @@ class Hint(Report):
     severity:Literal["hint"] = field(default="hint", init=False)
 
 
+# the lists of the `collect_warnings` blocks currently running
+_warning_collectors: list[list[Report]] = []
+
+@contextmanager
+def collect_warnings() -> Iterator[list[Report]]:
+    """collect the reports `warn`ed within the block, e.g. to report them again later. They are still written out as usual"""
+    warnings: list[Report] = []
+    _warning_collectors.append(warnings)
+    try:
+        yield warnings
+    finally:
+        _warning_collectors.pop()
+
 
 class ReportException(Exception):
     """Exception raised when a Report is thrown. Contains the report for handling."""
@@ -991,6 +1018,10 @@ class ReportException(Exception):
         self.report = report
         super().__init__(str(report))
 
+    def __reduce__(self):
+        # rebuild from the report rather than the rendered message, e.g. when raised in a worker process
+        return (type(self), (self.report,))
+
     def _render_traceback_(self) -> list[str]:
         return str(self.report).splitlines()
 
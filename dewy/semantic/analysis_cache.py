@@ -0,0 +1,45 @@
+"""
+Analysis cache files (`.dewya`)
+
+The bounds facts of a compiled program are saved as `__dewycache__/<name>.dewya` next to its entry module: the
+compiler fingerprint, followed by the facts of each top-level function, keyed by the function's own tree and what it
+reads from outside (see `bounds.UnitCache`). The next compile of the program validates only the functions whose key
+changed, whichever module they come from, prelude functions included. Like the other caches, `DEWY_CACHE_DIR` can
+move or turn them off.
+"""
+import pickle
+from pathlib import Path
+
+from ..parser.cache import LOAD_ERRORS, cache_dir, write_pickles
+from ..reporting import SrcFile
+from .analyze import bounds
+from .interface import compiler_fingerprint
+
+SUFFIX = '.dewya'
+
+
+def cache_path(path: Path) -> Path | None:
+    directory = cache_dir(path.parent)
+    return directory / (path.name + SUFFIX) if directory is not None else None
+
+
+def load(srcfile: SrcFile) -> bounds.UnitCache:
+    """the facts stored for the program with entry `srcfile`; empty if there are none from this compiler"""
+    path = cache_path(Path(srcfile.path)) if srcfile.path is not None else None
+    if path is None:
+        return {}
+    try:
+        with path.open('rb') as f:
+            if pickle.load(f) != compiler_fingerprint():
+                return {}
+            units = pickle.load(f)
+    except LOAD_ERRORS:
+        return {}  # missing, truncated or written by an incompatible compiler
+    return units if isinstance(units, dict) else {}
+
+
+def store(srcfile: SrcFile, units: bounds.UnitCache) -> None:
+    """write the facts of the program with entry `srcfile`. Failures just leave them to be found again next time"""
+    path = cache_path(Path(srcfile.path)) if srcfile.path is not None else None
+    if path is not None:
+        write_pickles(path, compiler_fingerprint(), units)
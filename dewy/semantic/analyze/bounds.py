@@ -1,13 +1,35 @@
-"""Flow-sensitive integer bounds validation for checked HIR."""
+"""
+Flow-sensitive integer bounds validation for checked HIR.
+
+The analysis is sparse: HIR is first translated into a value graph in SSA
+form, built while walking the control flow graph of each body in source
+order (Braun et al., "Simple and Efficient Construction of Static Single
+Assignment Form"). Every integer
+value is one node: a constant, an operation on other nodes, a phi where
+control flow joins, or a pi where a branch condition narrows a binding on
+one edge. Intervals are then propagated with the shared worklist only along
+def-use edges, together with the reachability of blocks: a block is reachable when
+one of its predecessors is and none of the pis guarding its entry is empty.
+Phis at loop heads are widened, so every cycle of the graph converges.
+Index and slice checks are recorded while building the graph and validated
+once the intervals are stable, in reachable blocks only. The intervals proven
+for the expressions themselves are returned as a side table for code
+generation, which uses them to drop width handling the facts make redundant.
+"""
 
 from __future__ import annotations
 
+import pickle
+from collections.abc import Callable
 from dataclasses import dataclass
+from hashlib import sha256
+from itertools import count
 
 from ...reporting import Pointer, SrcFile
 from .. import bindings as sb
-from .. import hir, ty
+from .. import hir, hir_walk, ty
 from ..errors import user_error
+from . import cfg, dataflow
 
 
 @dataclass(frozen=True)
@@ -67,14 +89,6 @@ class Interval:
 
 UNKNOWN_INTERVAL = Interval(None, None)
 EMPTY_INTERVAL = Interval(1, 0)
-State = dict[int, Interval]
-
-
-@dataclass
-class _LoopTransfer:
-    normal: State | None
-    breaks: dict[int, list[State]]
-    continues: dict[int, list[State]]
 
 
 def _maximum_lower(left: int | None, right: int | None) -> int | None:
@@ -93,6 +107,28 @@ def _minimum_upper(left: int | None, right: int | None) -> int | None:
     return min(left, right)
 
 
+def _type_range(type_: ty.Type) -> Interval:
+    """the values of a fixed-width integer type; unknown for any other type"""
+    layout = ty.fixed_integer_layout(type_) if isinstance(type_, str) else None
+    if layout is None:
+        return UNKNOWN_INTERVAL
+    width, signed = layout
+    if signed:
+        return Interval(-(1 << (width - 1)), (1 << (width - 1)) - 1)
+    return Interval(0, (1 << width) - 1)
+
+
+def _exclude(previous: Interval, excluded: Interval) -> Interval:
+    """`previous` without the exact value `excluded`, where that value is one of its ends"""
+    if excluded.lower is None or excluded.lower != excluded.upper:
+        return previous
+    if previous.lower == excluded.lower:
+        return _narrow(previous, Interval(excluded.lower + 1, None))
+    if previous.upper == excluded.upper:
+        return _narrow(previous, Interval(None, excluded.upper - 1))
+    return previous
+
+
 def _add(left: int | None, right: int | None) -> int | None:
     return None if left is None or right is None else left + right
 
@@ -118,6 +154,157 @@ def _multiply(interval: Interval, other: Interval) -> Interval:
     return Interval(min(products), max(products))
 
 
+class _Value:
+    """A value graph node; ``interval`` stays ``None`` until it is reached."""
+
+    __slots__ = ('interval', 'order', 'users')
+
+    def __init__(self, order: int) -> None:
+        self.order = order
+        self.interval: Interval | None = None
+        self.users: list[_Value | _Block] = []
+
+
+class _Leaf(_Value):
+    __slots__ = ('fixed',)
+
+    def __init__(self, order: int, fixed: Interval) -> None:
+        super().__init__(order)
+        self.fixed = fixed
+
+
+class _Expr(_Value):
+    """``compute`` applied to the intervals of ``operands``."""
+
+    __slots__ = ('compute', 'operands')
+
+    def __init__(
+        self,
+        order: int,
+        operands: list[_Value],
+        compute: Callable[..., Interval],
+    ) -> None:
+        super().__init__(order)
+        self.operands = operands
+        self.compute = compute
+
+
+class _Phi(_Value):
+    """The join of one binding over the predecessors of ``block``."""
+
+    __slots__ = ('binding_id', 'block', 'forward', 'operands', 'phi_users')
+
+    def __init__(self, block: _Block, binding_id: int) -> None:
+        super().__init__(block.order)
+        self.block = block
+        self.binding_id = binding_id
+        self.operands: list[_Value] = []
+        self.forward: _Value | None = None
+        self.phi_users: list[_Phi] = []
+
+
+class _Block:
+    """A straight-line region; the unit of reachability."""
+
+    __slots__ = (
+        'clobbers',
+        'defs',
+        'executable',
+        'feasible',
+        'guards',
+        'incomplete',
+        'loop_head',
+        'order',
+        'parent',
+        'phis',
+        'preds',
+        'sealed',
+        'succs',
+    )
+
+    def __init__(self, order: int, preds: list[_Block], *, sealed: bool) -> None:
+        self.order = order
+        self.preds = preds
+        self.succs: list[_Block] = []
+        self.defs: dict[int, _Value] = {}
+        self.sealed = sealed
+        self.incomplete: list[_Phi] = []
+        self.phis: list[_Phi] = []
+        self.guards: list[_Value] = []
+        self.feasible = True
+        self.loop_head = False
+        self.clobbers = False
+        # a function body's entry: reachable when the block declaring it is
+        self.parent: _Block | None = None
+        self.executable = False
+
+
+@dataclass
+class _Check:
+    block: _Block
+    node: hir.Index | hir.StringIndex | hir.StringSlice
+    values: list[_Value]
+    length: int | None = None
+
+
+# the operators _binary_interval can bound
+_BINARY_OPERATORS = {
+    '__add__',
+    '__sub__',
+    '__mul__',
+    '__mod__',
+    '__lshift__',
+    '__rshift__',
+}
+
+# larger shift counts are left unbounded, so intervals stay small numbers
+_MAX_SHIFT = 128
+
+# leaves that never hold an integer interval
+_OPAQUE_LEAVES = (
+    hir.String,
+    hir.BasedString,
+    hir.Bool,
+    hir.Void,
+    hir.Undefined,
+    hir.TypeValue,
+    hir.ScopeMetatag,
+)
+
+
+def _known(interval: Interval | None) -> Interval | None:
+    return None if interval is None or interval == UNKNOWN_INTERVAL else interval
+
+
+def _interval(interval: Interval | None) -> Interval:
+    return UNKNOWN_INTERVAL if interval is None else interval
+
+
+def _narrow(previous: Interval, constraint: Interval) -> Interval:
+    narrowed = previous.intersect(constraint)
+    return EMPTY_INTERVAL if narrowed.is_empty else narrowed
+
+
+# proven intervals by the `id` of the HIR expression they hold for; the ids are
+# only meaningful while the validated tree is alive
+type Intervals = dict[int, Interval]
+
+
+@dataclass(frozen=True)
+class UnitFacts:
+    """What validating one top-level function established.
+
+    Nodes are identified by their position in `hir_walk.walk` of the function.
+    """
+
+    intervals: tuple[tuple[int, Interval], ...]
+    constant_indices: tuple[tuple[int, int], ...]
+
+
+# the facts of validated top-level functions, by `_BoundsValidator._unit_key`
+type UnitCache = dict[bytes, UnitFacts]
+
+
 class _BoundsValidator:
     def __init__(
         self,
@@ -128,6 +315,7 @@ class _BoundsValidator:
         self.registry = registry
         self.srcfile = srcfile
         self.checked_functions: set[int] = set()
+        self.function_entries: dict[int, _Block] = {}
         self.mutable_globals = {
             item.binding_id
             for item in root.items
@@ -135,241 +323,424 @@ class _BoundsValidator:
             and item.decltype == 'let'
             and item.binding_id is not None
         }
+        self.orders = count()
+        self.values: list[_Value] = []
+        self.phis: list[_Phi] = []
+        self.blocks: list[_Block] = []
+        self.checks: list[_Check] = []
+        self.evaluated: list[tuple[hir.AST, _Value]] = []
+        self.leaves: dict[tuple[int | None, int | None], _Value] = {}
+        self.fallbacks: dict[int | None, _Value] = {}
+        self.unknown = self._leaf(UNKNOWN_INTERVAL)
+        # bindings given a value in the function being analyzed so far;
+        # anything else reads as its declaration (see _read)
+        self.written: set[int] = set()
+        self.written_globals: set[int] = set()
+        # the block being extended
+        self.block: _Block | None = None
+
+    def validate(self, root: hir.Block, units: UnitCache | None) -> Intervals:
+        """Validate `root`; reuse and record the facts of its functions in `units`."""
+        missed: list[tuple[bytes, hir.FunctionLiteral]] = []
+        reused: list[tuple[bytes, hir.FunctionLiteral, UnitFacts]] = []
+        if units is not None:
+            for item in root.items:
+                if not (
+                    isinstance(item, hir.Declare)
+                    and isinstance(item.expr, hir.FunctionLiteral)
+                ):
+                    continue
+                key = self._unit_key(item.expr)
+                facts = units.get(key)
+                if facts is None:
+                    missed.append((key, item.expr))
+                else:
+                    reused.append((key, item.expr, facts))
+                    self.checked_functions.add(id(item.expr))
+        self.block = self._new_block([])
+        self.block.executable = True
+        self._analyze_graph(cfg.build(root))
+        self._link()
+        self._solve()
+        for check in self.checks:
+            if not check.block.executable:
+                continue
+            intervals = [_known(value.interval) for value in check.values]
+            if isinstance(check.node, hir.StringSlice):
+                self._validate_string_slice(check.node, *intervals, check.length)
+            else:
+                self._validate_index(check.node, intervals[0])
+        intervals = self._intervals()
+        if units is None:
+            return intervals
+        units.clear()
+        for key, function in missed:
+            # facts of a body that is never reached were never validated
+            if self.function_entries[id(function)].executable:
+                units[key] = self._unit_facts(function, intervals)
+        for key, function, facts in reused:
+            nodes = list(hir_walk.walk(function))
+            for position, interval in facts.intervals:
+                intervals[id(nodes[position])] = interval
+            for position, index in facts.constant_indices:
+                node = nodes[position]
+                assert isinstance(node, (hir.Index, hir.StringIndex))
+                node.constant_index = index
+            units[key] = facts
+        return intervals
+
+    def _unit_key(self, function: hir.FunctionLiteral) -> bytes:
+        """Everything validating `function` depends on.
+
+        That is the function itself, and how the bindings it reads look from
+        outside it: mutable globals, and the values of constants.
+        """
+        context: list[tuple[int, bool, Interval]] = []
+        for binding_id in sorted({
+            node.binding_id
+            for node in hir_walk.walk(function)
+            if isinstance(node, hir.ExpressedIdentifier) and node.binding_id is not None
+        }):
+            fallback = self._fallback(binding_id)
+            assert isinstance(fallback, _Leaf)
+            context.append(
+                (binding_id, binding_id in self.mutable_globals, fallback.fixed)
+            )
+        return sha256(
+            hir_walk.fingerprint(function)
+            + pickle.dumps(context, protocol=pickle.HIGHEST_PROTOCOL)
+        ).digest()
 
-    def validate(self, root: hir.Block) -> None:
-        self._analyze(root, {}, validate=True)
+    @staticmethod
+    def _unit_facts(function: hir.FunctionLiteral, intervals: Intervals) -> UnitFacts:
+        nodes = list(hir_walk.walk(function))
+        return UnitFacts(
+            tuple(
+                (position, intervals[id(node)])
+                for position, node in enumerate(nodes)
+                if id(node) in intervals
+            ),
+            tuple(
+                (position, node.constant_index)
+                for position, node in enumerate(nodes)
+                if isinstance(node, (hir.Index, hir.StringIndex))
+                and node.constant_index is not None
+            ),
+        )
 
-    def _analyze(
+    def _intervals(self) -> Intervals:
+        """The proven interval of every expression evaluated in reachable code."""
+        intervals: Intervals = {}
+        unknown: set[int] = set()
+        for node, value in self.evaluated:
+            key = id(node)
+            interval = value.interval
+            # a node shared by several places holds the join of its values
+            if interval is None or interval.is_empty or key in unknown:
+                continue
+            if interval == UNKNOWN_INTERVAL:
+                unknown.add(key)
+                intervals.pop(key, None)
+                continue
+            previous = intervals.get(key)
+            intervals[key] = (
+                interval if previous is None else previous.union(interval)
+            )
+        return intervals
+
+    # value graph construction
+
+    def _leaf(self, interval: Interval | None) -> _Value:
+        interval = _interval(interval)
+        key = (interval.lower, interval.upper)
+        value = self.leaves.get(key)
+        if value is None:
+            value = self.leaves[key] = _Leaf(next(self.orders), interval)
+            self.values.append(value)
+        return value
+
+    def _exact(self, interval: Interval | None) -> _Value:
+        return self.unknown if interval is None else self._leaf(interval)
+
+    def _expr(
         self,
-        node: hir.AST,
-        state: State,
+        operands: list[_Value],
+        compute: Callable[..., Interval],
+    ) -> _Value:
+        operands = [_resolve(operand) for operand in operands]
+        if all(isinstance(operand, _Leaf) for operand in operands):
+            return self._leaf(
+                compute(*(operand.fixed for operand in operands))  # type: ignore[attr-defined]
+            )
+        value = _Expr(next(self.orders), operands, compute)
+        self.values.append(value)
+        return value
+
+    def _new_block(
+        self,
+        preds: list[_Block],
         *,
-        validate: bool,
-    ) -> State:
-        current = dict(state)
-        if isinstance(node, hir.Block):
-            local_ids = {
-                item.binding_id
-                for item in node.items
-                if isinstance(item, hir.Declare) and item.binding_id is not None
-            }
-            for item in node.items:
-                current = self._analyze(item, current, validate=validate)
-            if node.scoped:
-                for binding_id in local_ids:
-                    current.pop(binding_id, None)
-            return current
+        sealed: bool = True,
+    ) -> _Block:
+        block = _Block(next(self.orders), preds, sealed=sealed)
+        self.blocks.append(block)
+        return block
+
+    def _seal(self, block: _Block) -> None:
+        block.sealed = True
+        pending = block.incomplete
+        block.incomplete = []
+        self._complete(pending)
+
+    def _read(self, binding_id: int) -> _Value:
+        assert self.block is not None
+        if binding_id not in self.written:
+            # a parameter, a capture, or a global: unknown here unless const.
+            # (A binding only written further down a loop body also lands
+            # here; for a `let` that is the same unknown its phi would be.)
+            return self._fallback(binding_id)
+        value = self.block.defs.get(binding_id)
+        if value is None:
+            pending: list[_Phi] = []
+            value = self._lookup(self.block, binding_id, pending)
+            if pending:
+                self._complete(pending)
+        return _resolve(value)
+
+    def _complete(self, pending: list[_Phi]) -> None:
+        """Look up the operands of new phis, forwarding the trivial ones."""
+        while pending:
+            phi = pending.pop()
+            phi.operands = [
+                self._lookup(pred, phi.binding_id, pending)
+                for pred in phi.block.preds
+            ]
+            self._forward_if_trivial(phi)
+
+    def _forward_if_trivial(self, phi: _Phi) -> bool:
+        """Replace a phi that joins a single value (besides itself) by it."""
+        same: _Value | None = None
+        for operand in phi.operands:
+            operand = _resolve(operand)
+            if operand is phi or operand is same:
+                continue
+            if same is not None:
+                return False
+            same = operand
+        phi.forward = same if same is not None else self._fallback(phi.binding_id)
+        if phi.block.defs.get(phi.binding_id) is phi:
+            phi.block.defs[phi.binding_id] = phi.forward
+        return True
+
+    def _lookup(
+        self,
+        block: _Block,
+        binding_id: int,
+        pending: list[_Phi],
+    ) -> _Value:
+        """The value of a binding at the end of `block`.
+
+        Phis created on the way are appended to `pending` for their operands
+        to be looked up by the caller, so the search never recurses.
+        """
+        path: list[_Block] = []
+        while True:
+            value = block.defs.get(binding_id)
+            if value is not None:
+                break
+            if block.clobbers and binding_id in self.mutable_globals:
+                value = self.unknown
+                break
+            if len(block.preds) == 1 and block.sealed:
+                path.append(block)
+                block = block.preds[0]
+                continue
+            if not block.preds and block.sealed:
+                value = self._fallback(binding_id)
+                break
+            phi = _Phi(block, binding_id)
+            self.phis.append(phi)
+            block.phis.append(phi)
+            block.defs[binding_id] = phi
+            if block.sealed:
+                pending.append(phi)
+            else:
+                block.incomplete.append(phi)
+            value = phi
+            break
+        for visited in path:
+            visited.defs[binding_id] = value
+        return value
+
+    def _fallback(self, binding_id: int | None) -> _Value:
+        value = self.fallbacks.get(binding_id)
+        if value is None:
+            value = self.fallbacks[binding_id] = self._exact(
+                self._constant_binding(binding_id, set())
+            )
+        return value
+
+    def _write(self, binding_id: int, value: _Value) -> None:
+        assert self.block is not None
+        self.block.defs[binding_id] = value
+        self.written.add(binding_id)
+        if binding_id in self.mutable_globals:
+            self.written_globals.add(binding_id)
+
+    def _clobber_globals(self) -> None:
+        assert self.block is not None
+        if self.written_globals:
+            self.block = self._new_block([self.block])
+            self.block.clobbers = True
+
+    def _analyze(self, node: hir.AST) -> None:
         if isinstance(node, hir.Declare):
-            interval = self._eval(node.expr, current, validate=validate)
-            if isinstance(node.expr, hir.FunctionLiteral):
-                self._analyze_function(node.expr, validate=validate)
-            elif isinstance(node.expr, hir.OverloadedFunction):
-                for alternate in node.expr.alternates:
-                    if isinstance(alternate, hir.FunctionLiteral):
-                        self._analyze_function(alternate, validate=validate)
+            value = self._eval(node.expr, record=True)
             if node.binding_id is not None:
-                self._set_interval(current, node.binding_id, interval)
-            return current
+                constant = self._fallback(node.binding_id)
+                if constant is not self.unknown:
+                    # an unknown constant reads as its declaration again
+                    value = self._expr(
+                        [value, constant],
+                        lambda interval, fallback: (
+                            fallback if interval == UNKNOWN_INTERVAL else interval
+                        ),
+                    )
+                self._write(node.binding_id, value)
+            return
         if isinstance(node, hir.Assign):
-            value = self._eval(node.value, current, validate=validate)
+            value = self._eval(node.value, record=True)
             binding_id = node.target.binding_id
             if binding_id is None:
-                return current
-            if node.op == '+=':
-                value = self._binary_interval(
-                    '__add__',
-                    current.get(binding_id),
-                    value,
-                    node.target.type,
-                )
-            elif node.op == '-=':
-                value = self._binary_interval(
-                    '__sub__',
-                    current.get(binding_id),
-                    value,
-                    node.target.type,
+                return
+            if node.op in {'+=', '-='}:
+                name = '__add__' if node.op == '+=' else '__sub__'
+                result_type = node.target.type
+                value = self._expr(
+                    [self._read(binding_id), value],
+                    lambda left, right: _interval(
+                        self._binary_interval(
+                            name,
+                            left,
+                            right,
+                            result_type,
+                        )
+                    ),
                 )
             elif node.op != '=':
-                value = None
-            self._set_interval(current, binding_id, value)
-            return current
+                value = self.unknown
+            self._write(binding_id, value)
+            return
         if isinstance(node, hir.IndexAssign):
-            self._eval(node.target, current, validate=validate)
-            self._eval(node.value, current, validate=validate)
-            return current
-        if isinstance(node, hir.Flow):
-            return self._analyze_flow(node, current, validate=validate)
+            self._eval(node.target, record=True)
+            self._eval(node.value, record=True)
+            return
         if isinstance(node, hir.Return):
             if node.item is not None:
-                self._eval(node.item, current, validate=validate)
-            return current
-        self._eval(node, current, validate=validate)
-        return current
+                self._eval(node.item, record=True)
+            return
+        self._eval(node, record=True)
 
-    def _analyze_function(
-        self,
-        function: hir.FunctionLiteral,
-        *,
-        validate: bool,
-    ) -> None:
+    def _analyze_function(self, function: hir.FunctionLiteral) -> None:
         function_id = id(function)
         if function_id in self.checked_functions:
             return
         self.checked_functions.add(function_id)
-        state: State = {}
+        outer = self.block
+        written, written_globals = self.written, self.written_globals
+        self.block = self.function_entries[function_id] = self._new_block([])
+        self.block.parent = outer
+        self.written, self.written_globals = set(), set()
         for param in [
             *function.pos_or_kw_args,
             *function.kw_only_args,
             *([function.rest_args] if function.rest_args is not None else []),
         ]:
             if isinstance(param, hir.BoundParam):
-                self._eval(param.value, state, validate=validate)
-        self._analyze(function.body, state, validate=validate)
-
-    def _analyze_flow(
-        self,
-        node: hir.Flow,
-        state: State,
-        *,
-        validate: bool,
-    ) -> State:
-        if len(node.arms) == 1 and isinstance(node.arms[0], hir.LoopArm):
-            arm = node.arms[0]
-            if isinstance(arm.condition, hir.IteratorExpression):
-                return self._analyze_iterator_loop(
-                    arm.condition,
-                    arm.body,
-                    state,
-                    validate=validate,
+                self._eval(param.value, record=True)
+        self._analyze_graph(cfg.build(function.body))
+        self.block = outer
+        self.written, self.written_globals = written, written_globals
+
+    def _analyze_graph(self, graph: cfg.Graph) -> None:
+        """Add the blocks of `graph`, entered from the current block."""
+        entries: list[_Block] = []
+        # the blocks each basic block is entered from, and whether no other
+        # basic block is entered from the same one
+        incoming: list[list[tuple[_Block, bool]]] = [[] for _ in graph.blocks]
+        back_edges = [
+            sum(edge.is_back for edge in block.preds)
+            for block in graph.blocks
+        ]
+        for block in graph.blocks:
+            preds = incoming[block.index]
+            if block is graph.entry:
+                assert self.block is not None
+                entry = self.block
+            elif (
+                len(preds) == 1
+                and preds[0][1]
+                and preds[0][0].sealed
+                and not back_edges[block.index]
+            ):
+                entry = preds[0][0]
+            else:
+                entry = self._new_block(
+                    [pred for pred, _exclusive in preds],
+                    sealed=not back_edges[block.index],
                 )
-            if isinstance(arm.condition, hir.MultiIteratorExpression):
-                return self._analyze_multi_iterator_loop(
-                    arm.condition,
-                    arm.body,
-                    state,
-                    validate=validate,
+                entry.loop_head = block.loop_head
+            entries.append(entry)
+            self.block = entry
+            for item in block.items:
+                self._analyze(item)
+            tail = self.block
+            for edge in block.succs:
+                followed = self._follow(tail, edge)
+                target = edge.target.index
+                if not edge.is_back:
+                    exclusive = followed is not tail or len(block.succs) == 1
+                    incoming[target].append((followed, exclusive))
+                    continue
+                head = entries[target]
+                head.preds.append(followed)
+                back_edges[target] -= 1
+                if not back_edges[target]:
+                    self._seal(head)
+
+    def _follow(self, block: _Block, edge: cfg.Edge) -> _Block:
+        """The block control is in after taking `edge` from the end of `block`."""
+        if edge.condition is None:
+            return block
+        iterators = cfg.loop_iterators(edge.condition)
+        if iterators is None:
+            return self._branch(block, edge.condition, truth=edge.truth)
+        if not edge.truth:
+            return block
+        self.block = self._new_block([block])
+        for iterator in iterators:
+            if iterator.count != 0 and iterator.target.binding_id is not None:
+                self._write(
+                    iterator.target.binding_id,
+                    self._leaf(self._iterator_interval(iterator)),
                 )
-            return self._analyze_while_loop(
-                arm.condition,
-                arm.body,
-                state,
-                validate=validate,
-            )
+        return self.block
 
-        remaining: State | None = dict(state)
-        exits: list[State] = []
-        for arm in node.arms:
-            if remaining is None:
-                break
-            self._eval(arm.condition, remaining, validate=validate)
-            true_state = self._refine(remaining, arm.condition, truth=True)
-            if true_state is not None:
-                exits.append(self._analyze(arm.body, true_state, validate=validate))
-            false_state = self._refine(remaining, arm.condition, truth=False)
-            if false_state is None:
-                remaining = None
-                break
-            remaining = false_state
-        if node.default is not None and remaining is not None:
-            exits.append(self._analyze(node.default, remaining, validate=validate))
-        elif node.default is None and remaining is not None:
-            exits.append(remaining)
-        return dict(state) if not exits else self._join_states(exits)
-
-    def _analyze_while_loop(
+    def _branch(
         self,
+        block: _Block,
         condition: hir.AST,
-        body: hir.AST,
-        state: State,
         *,
-        validate: bool,
-    ) -> State:
-        head = dict(state)
-        for _ in range(8):
-            true_state = self._refine(head, condition, truth=True)
-            if true_state is None:
-                break
-            transfer = self._loop_transfer(body, true_state, validate=False)
-            backedges = [
-                *([transfer.normal] if transfer.normal is not None else []),
-                *transfer.continues.get(0, []),
-            ]
-            candidate = self._join_states([state, *backedges])
-            widened = self._widen_states(head, candidate)
-            if widened == head:
-                break
-            head = widened
-
-        self._eval(condition, head, validate=validate)
-        true_state = self._refine(head, condition, truth=True)
-        break_exits: list[State] = []
-        if true_state is not None:
-            transfer = self._loop_transfer(body, true_state, validate=validate)
-            break_exits.extend(transfer.breaks.get(0, []))
-        false_state = self._refine(head, condition, truth=False)
-        exits = [*break_exits]
-        if false_state is not None:
-            exits.append(false_state)
-        return dict(state) if not exits else self._join_states(exits)
-
-    def _analyze_iterator_loop(
-        self,
-        iterator: hir.IteratorExpression,
-        body: hir.AST,
-        state: State,
-        *,
-        validate: bool,
-    ) -> State:
-        self._eval(iterator.iterable, state, validate=validate)
-        if iterator.count == 0:
-            return dict(state)
-        body_state = dict(state)
-        if iterator.target.binding_id is not None:
-            body_state[iterator.target.binding_id] = self._iterator_interval(
-                iterator
-            )
-        transfer = self._loop_transfer(body, body_state, validate=validate)
-        exits = [
-            *([transfer.normal] if transfer.normal is not None else []),
-            *transfer.breaks.get(0, []),
-        ]
-        for exit_state in exits:
-            if iterator.target.binding_id is not None:
-                exit_state.pop(iterator.target.binding_id, None)
-        return self._join_states([state, *exits])
-
-    def _analyze_multi_iterator_loop(
-        self,
-        condition: hir.MultiIteratorExpression,
-        body: hir.AST,
-        state: State,
-        *,
-        validate: bool,
-    ) -> State:
-        body_state = dict(state)
-        for iterator in condition.iterators:
-            self._eval(iterator.iterable, body_state, validate=validate)
-            if (
-                iterator.count != 0
-                and iterator.target.binding_id is not None
-            ):
-                body_state[iterator.target.binding_id] = self._iterator_interval(
-                    iterator
-                )
-        transfer = self._loop_transfer(body, body_state, validate=validate)
-        exits = [
-            *([transfer.normal] if transfer.normal is not None else []),
-            *transfer.breaks.get(0, []),
-        ]
-        target_ids = {
-            iterator.target.binding_id
-            for iterator in condition.iterators
-            if iterator.target.binding_id is not None
-        }
-        for exit_state in exits:
-            for binding_id in target_ids:
-                exit_state.pop(binding_id, None)
-        return self._join_states([state, *exits])
+        truth: bool,
+    ) -> _Block:
+        """The block entered from `block` when `condition` is `truth`."""
+        edge = self.block = self._new_block([block])
+        self._refine(condition, truth=truth)
+        if self.block is edge and edge.feasible and not edge.defs:
+            # nothing was learned on this edge
+            self.blocks.pop()
+            self.block = block
+        return self.block
 
     @staticmethod
     def _iterator_interval(iterator: hir.IteratorExpression) -> Interval:
@@ -399,243 +770,157 @@ class _BoundsValidator:
             max(iterator.first, iterator.last),
         )
 
-    def _loop_transfer(
+    def _eval(
         self,
         node: hir.AST,
-        state: State,
         *,
-        validate: bool,
-    ) -> _LoopTransfer:
-        if isinstance(node, hir.Block):
-            current: State | None = dict(state)
-            breaks: dict[int, list[State]] = {}
-            continues: dict[int, list[State]] = {}
-            local_ids = {
-                item.binding_id
-                for item in node.items
-                if isinstance(item, hir.Declare) and item.binding_id is not None
-            }
-            for item in node.items:
-                if current is None:
-                    break
-                transfer = self._loop_transfer(item, current, validate=validate)
-                current = transfer.normal
-                self._merge_exit_maps(breaks, transfer.breaks)
-                self._merge_exit_maps(continues, transfer.continues)
-            if node.scoped:
-                for exit_state in [
-                    *([current] if current is not None else []),
-                    *(state for states in breaks.values() for state in states),
-                    *(state for states in continues.values() for state in states),
-                ]:
-                    for binding_id in local_ids:
-                        exit_state.pop(binding_id, None)
-            return _LoopTransfer(current, breaks, continues)
-        if isinstance(node, hir.Break):
-            return _LoopTransfer(None, {node.loop_levels: [dict(state)]}, {})
-        if isinstance(node, hir.Continue):
-            return _LoopTransfer(None, {}, {node.loop_levels: [dict(state)]})
-        if isinstance(node, hir.Flow) and not any(
-            isinstance(arm, hir.LoopArm) for arm in node.arms
-        ):
-            return self._conditional_transfer(node, state, validate=validate)
-        return _LoopTransfer(
-            self._analyze(node, state, validate=validate),
-            {},
-            {},
-        )
-
-    def _conditional_transfer(
-        self,
-        node: hir.Flow,
-        state: State,
-        *,
-        validate: bool,
-    ) -> _LoopTransfer:
-        remaining: State | None = dict(state)
-        normal_exits: list[State] = []
-        breaks: dict[int, list[State]] = {}
-        continues: dict[int, list[State]] = {}
-        for arm in node.arms:
-            if remaining is None:
-                break
-            self._eval(arm.condition, remaining, validate=validate)
-            true_state = self._refine(remaining, arm.condition, truth=True)
-            if true_state is not None:
-                transfer = self._loop_transfer(
-                    arm.body,
-                    true_state,
-                    validate=validate,
-                )
-                if transfer.normal is not None:
-                    normal_exits.append(transfer.normal)
-                self._merge_exit_maps(breaks, transfer.breaks)
-                self._merge_exit_maps(continues, transfer.continues)
-            false_state = self._refine(remaining, arm.condition, truth=False)
-            if false_state is None:
-                remaining = None
-                break
-            remaining = false_state
-        if node.default is not None and remaining is not None:
-            transfer = self._loop_transfer(
-                node.default,
-                remaining,
-                validate=validate,
-            )
-            if transfer.normal is not None:
-                normal_exits.append(transfer.normal)
-            self._merge_exit_maps(breaks, transfer.breaks)
-            self._merge_exit_maps(continues, transfer.continues)
-        elif node.default is None and remaining is not None:
-            normal_exits.append(remaining)
-        normal = self._join_states(normal_exits) if normal_exits else None
-        return _LoopTransfer(normal, breaks, continues)
-
-    @staticmethod
-    def _merge_exit_maps(
-        target: dict[int, list[State]],
-        source: dict[int, list[State]],
-    ) -> None:
-        for level, states in source.items():
-            target.setdefault(level, []).extend(states)
-
-    def _eval(
+        record: bool,
+    ) -> _Value:
+        """The value of an expression; index checks and the value are collected if `record`."""
+        value = self._eval_node(node, record=record)
+        if record:
+            self.evaluated.append((node, value))
+        return value
+
+    def _eval_node(
         self,
         node: hir.AST,
-        state: State,
         *,
-        validate: bool,
-    ) -> Interval | None:
+        record: bool,
+    ) -> _Value:
         if isinstance(node, hir.Suppress):
-            self._eval(node.item, state, validate=validate)
-            return None
+            self._eval(node.item, record=record)
+            return self.unknown
         if isinstance(node.type, ty.IntegerLiteralType):
-            return Interval.exact(node.type.value)
+            return self._leaf(Interval.exact(node.type.value))
         if isinstance(node, hir.Integer):
-            return Interval.exact(node.value)
+            return self._leaf(Interval.exact(node.value))
         if isinstance(node, hir.ExpressedIdentifier):
-            interval = (
-                state.get(node.binding_id)
-                if node.binding_id is not None
+            if node.binding_id is None:
+                return self._fallback(None)
+            return self._read(node.binding_id)
+        if isinstance(node, hir.FunctionCall):
+            self._eval(node.func, record=record)
+            arguments = [
+                self._eval(arg, record=record)
+                for arg in node.pos_args
+            ]
+            for arg in node.kw_args.values():
+                self._eval(arg, record=record)
+            name = (
+                node.func.name
+                if isinstance(node.func, hir.ExpressedIdentifier)
                 else None
             )
-            if interval is not None:
-                return interval
-            return self._constant_binding(node.binding_id, set())
+            if (
+                isinstance(node.func, hir.ExpressedIdentifier)
+                and node.func.binding_id is not None
+            ):
+                self._clobber_globals()
+            result_type = node.type
+            if name == '__unary_sub__' and len(arguments) == 1:
+                return self._expr(arguments, lambda value: self._negate(value, result_type))
+            if len(arguments) == 2 and name in _BINARY_OPERATORS:
+                return self._expr(
+                    arguments,
+                    lambda left, right: _interval(
+                        self._binary_interval(
+                            name,
+                            left,
+                            right,
+                            result_type,
+                        )
+                    ),
+                )
+            return self.unknown
+        if isinstance(node, hir.FunctionLiteral):
+            if record:
+                self._analyze_function(node)
+            return self.unknown
+        if isinstance(node, hir.Block) and not node.scoped and len(node.items) == 1:
+            # a parenthesized expression
+            return self._eval(node.items[0], record=record)
+        if isinstance(node, _OPAQUE_LEAVES):
+            return self.unknown
         if isinstance(node, hir.ValueCast):
-            return self._fit_type(
-                self._eval(node.expr, state, validate=validate),
-                node.type,
+            result_type = node.type
+            return self._expr(
+                [self._eval(node.expr, record=record)],
+                lambda value: _interval(self._fit_type(value, result_type)),
             )
         if isinstance(node, hir.RepresentationCast):
-            self._eval(node.expr, state, validate=validate)
-            return None
+            self._eval(node.expr, record=record)
+            return self.unknown
         if isinstance(node, hir.Transmute):
-            self._eval(node.expr, state, validate=validate)
-            return None
+            self._eval(node.expr, record=record)
+            return self.unknown
         if isinstance(node, hir.ArrayLength):
-            self._eval(node.array, state, validate=validate)
+            self._eval(node.array, record=record)
             if isinstance(node.array.type, ty.ArrayType):
                 length = node.array.type.length
-                return None if length is None else Interval.exact(length)
-            return None
+                return self._exact(None if length is None else Interval.exact(length))
+            return self.unknown
         if isinstance(node, hir.StringLength):
-            self._eval(node.string, state, validate=validate)
+            self._eval(node.string, record=record)
             length = self._string_length(node.string.type)
-            return None if length is None else Interval.exact(length)
+            return self._exact(None if length is None else Interval.exact(length))
         if isinstance(node, hir.Index):
-            self._eval(node.array, state, validate=validate)
-            interval = self._eval(node.index, state, validate=validate)
-            if validate:
-                self._validate_index(node, interval)
-            return None
+            self._eval(node.array, record=record)
+            index = self._eval(node.index, record=record)
+            if record:
+                self._record(node, [index])
+            return self.unknown
         if isinstance(node, hir.IndexAssign):
-            self._eval(node.target, state, validate=validate)
-            self._eval(node.value, state, validate=validate)
-            return None
+            self._eval(node.target, record=record)
+            self._eval(node.value, record=record)
+            return self.unknown
         if isinstance(node, hir.StringIndex):
-            self._eval(node.string, state, validate=validate)
-            interval = self._eval(node.index, state, validate=validate)
-            if validate:
-                self._validate_index(node, interval)
-            return None
+            self._eval(node.string, record=record)
+            index = self._eval(node.index, record=record)
+            if record:
+                self._record(node, [index])
+            return self.unknown
         if isinstance(node, hir.StringSlice):
-            self._eval(node.string, state, validate=validate)
+            self._eval(node.string, record=record)
             left = (
-                Interval.exact(0)
+                self._leaf(Interval.exact(0))
                 if node.range.left is None
-                else self._eval(node.range.left, state, validate=validate)
+                else self._eval(node.range.left, record=record)
             )
             length = self._string_length(node.string.type)
             if node.range.right is None:
-                right = None if length is None else Interval.exact(length - 1)
+                right = self._exact(
+                    None if length is None else Interval.exact(length - 1)
+                )
             else:
-                right = self._eval(node.range.right, state, validate=validate)
-            if validate:
-                self._validate_string_slice(node, left, right, length)
-            return None
+                right = self._eval(node.range.right, record=record)
+            if record:
+                self._record(node, [left, right], length)
+            return self.unknown
         if isinstance(node, hir.StringEqual):
-            self._eval(node.left, state, validate=validate)
-            self._eval(node.right, state, validate=validate)
-            return None
+            self._eval(node.left, record=record)
+            self._eval(node.right, record=record)
+            return self.unknown
         if isinstance(node, hir.StringConcat):
-            self._eval(node.left, state, validate=validate)
-            self._eval(node.right, state, validate=validate)
-            return None
+            self._eval(node.left, record=record)
+            self._eval(node.right, record=record)
+            return self.unknown
         if isinstance(node, hir.InterpolatedString):
             for part in node.parts:
-                self._eval(part, state, validate=validate)
-            return None
+                self._eval(part, record=record)
+            return self.unknown
         if isinstance(node, hir.ArrayLiteral):
             for item in node.items:
-                self._eval(item, state, validate=validate)
-            return None
-        if isinstance(node, hir.FunctionCall):
-            self._eval(node.func, state, validate=validate)
-            arguments = [
-                self._eval(arg, state, validate=validate)
-                for arg in node.pos_args
-            ]
-            for arg in node.kw_args.values():
-                self._eval(arg, state, validate=validate)
-            name = (
-                node.func.name
-                if isinstance(node.func, hir.ExpressedIdentifier)
-                else None
-            )
-            if (
-                isinstance(node.func, hir.ExpressedIdentifier)
-                and node.func.binding_id is not None
-            ):
-                for binding_id in self.mutable_globals:
-                    state.pop(binding_id, None)
-            if name == '__unary_sub__' and len(arguments) == 1:
-                value = arguments[0]
-                if value is None:
-                    return None
-                return self._fit_type(
-                    Interval(
-                        None if value.upper is None else -value.upper,
-                        None if value.lower is None else -value.lower,
-                    ),
-                    node.type,
-                )
-            if len(arguments) == 2 and name is not None:
-                return self._binary_interval(
-                    name,
-                    arguments[0],
-                    arguments[1],
-                    node.type,
-                )
-            return None
+                self._eval(item, record=record)
+            return self.unknown
         if isinstance(node, hir.ShortCircuit):
-            self._eval(node.left, state, validate=validate)
-            self._eval(node.right, state, validate=validate)
-            return None
+            self._eval(node.left, record=record)
+            self._eval(node.right, record=record)
+            return self.unknown
         if isinstance(node, hir.RangeMembership):
-            self._eval(node.value, state, validate=validate)
-            self._eval(node.range, state, validate=validate)
-            return None
+            self._eval(node.value, record=record)
+            self._eval(node.range, record=record)
+            return self.unknown
         if isinstance(node, hir.Range):
             items = [
                 *([] if node.step_pair is None else node.step_pair),
@@ -647,44 +932,60 @@ class _BoundsValidator:
                 if id(item) in seen:
                     continue
                 seen.add(id(item))
-                self._eval(item, state, validate=validate)
-            return None
+                self._eval(item, record=record)
+            return self.unknown
         if isinstance(node, hir.IteratorExpression):
-            self._eval(node.iterable, state, validate=validate)
-            return None
+            self._eval(node.iterable, record=record)
+            return self.unknown
         if isinstance(node, hir.MultiIteratorExpression):
             for iterator in node.iterators:
-                self._eval(iterator.iterable, state, validate=validate)
-            return None
+                self._eval(iterator.iterable, record=record)
+            return self.unknown
         if isinstance(node, hir.TypeTest):
-            self._eval(node.value, state, validate=validate)
-            return None
+            self._eval(node.value, record=record)
+            return self.unknown
         if isinstance(node, hir.TypeBlock):
             for item in node.items:
-                self._eval(item, state, validate=validate)
-            return None
+                self._eval(item, record=record)
+            return self.unknown
         if isinstance(node, hir.OverloadedFunction):
-            for alternate in node.alternates:
-                if isinstance(alternate, hir.FunctionLiteral):
-                    self._analyze_function(alternate, validate=validate)
-            return None
-        if isinstance(node, hir.FunctionLiteral):
-            self._analyze_function(node, validate=validate)
-            return None
+            if record:
+                for alternate in node.alternates:
+                    if isinstance(alternate, hir.FunctionLiteral):
+                        self._analyze_function(alternate)
+            return self.unknown
         if isinstance(node, hir.ObjectLiteral):
             for field in node.fields:
-                self._eval(field.value, state, validate=validate)
-            return None
+                self._eval(field.value, record=record)
+            return self.unknown
         if isinstance(node, hir.MemberAccess):
-            self._eval(node.value, state, validate=validate)
-            return None
+            self._eval(node.value, record=record)
+            return self.unknown
         if isinstance(node, hir.MemberAssign):
-            self._eval(node.target, state, validate=validate)
-            self._eval(node.value, state, validate=validate)
-            return None
-        if isinstance(node, hir.TypeValue):
-            return None
-        return None
+            self._eval(node.target, record=record)
+            self._eval(node.value, record=record)
+            return self.unknown
+        return self.unknown
+
+    def _record(
+        self,
+        node: hir.Index | hir.StringIndex | hir.StringSlice,
+        values: list[_Value],
+        length: int | None = None,
+    ) -> None:
+        assert self.block is not None
+        self.checks.append(_Check(self.block, node, values, length))
+
+    def _negate(self, value: Interval, result_type: ty.Type) -> Interval:
+        return _interval(
+            self._fit_type(
+                Interval(
+                    None if value.upper is None else -value.upper,
+                    None if value.lower is None else -value.lower,
+                ),
+                result_type,
+            )
+        )
 
     def _constant_binding(
         self,
@@ -729,9 +1030,15 @@ class _BoundsValidator:
         arguments = [self._constant_expr(arg, seen) for arg in node.pos_args]
         if len(arguments) == 1 and name == '__unary_sub__':
             value = arguments[0]
-            if value is None or value.lower is None:
+            if value is None:
                 return None
-            return Interval.exact(-value.lower)
+            return self._fit_type(
+                Interval(
+                    None if value.upper is None else -value.upper,
+                    None if value.lower is None else -value.lower,
+                ),
+                node.type,
+            )
         if len(arguments) == 2 and name is not None:
             return self._binary_interval(name, arguments[0], arguments[1], node.type)
         return None
@@ -763,7 +1070,39 @@ class _BoundsValidator:
             and right.lower > 0
             and right.upper is not None
         ):
-            result = Interval(0, right.upper - 1)
+            # `%` truncates, so a negative dividend leaves a negative remainder
+            dividend = left.intersect(_type_range(result_type))
+            if dividend.lower is not None and dividend.lower >= 0:
+                result = Interval(0, right.upper - 1)
+            else:
+                result = Interval(-(right.upper - 1), right.upper - 1)
+        elif (
+            name in {'__lshift__', '__rshift__'}
+            and left.lower is not None
+            and left.lower >= 0
+            and right.lower is not None
+            and right.lower >= 0
+        ):
+            if name == '__rshift__':
+                result = Interval(
+                    0
+                    if right.upper is None or right.upper > _MAX_SHIFT
+                    else left.lower >> right.upper,
+                    None
+                    if left.upper is None
+                    else left.upper >> min(right.lower, _MAX_SHIFT),
+                )
+            elif right.lower > _MAX_SHIFT:
+                return None
+            else:
+                result = Interval(
+                    left.lower << right.lower,
+                    None
+                    if left.upper is None
+                    or right.upper is None
+                    or right.upper > _MAX_SHIFT
+                    else left.upper << right.upper,
+                )
         else:
             return None
         return self._fit_type(result, result_type)
@@ -777,17 +1116,14 @@ class _BoundsValidator:
             return None
         if not isinstance(result_type, str):
             return interval
-        layout = ty.fixed_integer_layout(result_type)
-        if layout is None:
+        bounds = _type_range(result_type)
+        if bounds == UNKNOWN_INTERVAL:
             return interval
-        width, signed = layout
-        minimum = -(1 << (width - 1)) if signed else 0
-        maximum = (1 << (width - (1 if signed else 0))) - 1
         if (
             interval.lower is None
             or interval.upper is None
-            or interval.lower < minimum
-            or interval.upper > maximum
+            or interval.lower < bounds.lower
+            or interval.upper > bounds.upper
         ):
             return None
         return interval
@@ -904,71 +1240,81 @@ class _BoundsValidator:
 
     def _refine(
         self,
-        state: State,
         condition: hir.AST,
         *,
         truth: bool,
-    ) -> State | None:
-        refined = dict(state)
+    ) -> None:
+        """Narrow the bindings compared by `condition` in the current block."""
+        assert self.block is not None
         if isinstance(condition, hir.Bool):
-            return refined if condition.value == truth else None
+            if condition.value != truth:
+                self.block.feasible = False
+            return
         if isinstance(condition, hir.ShortCircuit):
             if condition.op in {'and', 'nand'}:
                 effective_truth = truth if condition.op == 'and' else not truth
                 if effective_truth:
-                    left = self._refine(refined, condition.left, truth=True)
-                    if left is None:
-                        return None
-                    return self._refine(left, condition.right, truth=True)
+                    self._refine(condition.left, truth=True)
+                    self._refine(condition.right, truth=True)
             if condition.op in {'or', 'nor'}:
                 effective_truth = truth if condition.op == 'or' else not truth
                 if not effective_truth:
-                    left = self._refine(refined, condition.left, truth=False)
-                    if left is None:
-                        return None
-                    return self._refine(left, condition.right, truth=False)
-            return refined
+                    self._refine(condition.left, truth=False)
+                    self._refine(condition.right, truth=False)
+            return
         if not (
             isinstance(condition, hir.FunctionCall)
             and isinstance(condition.func, hir.ExpressedIdentifier)
             and len(condition.pos_args) == 2
         ):
-            return refined
+            return
         name = condition.func.name
         left, right = condition.pos_args
         left_binding = self._binding_id(left)
-        right_interval = self._eval(right, refined, validate=False)
-        if left_binding is not None and right_interval is not None:
-            constraint = self._comparison_constraint(name, right_interval, truth)
-            if constraint is not None:
-                previous = refined.get(left_binding, UNKNOWN_INTERVAL)
-                narrowed = previous.intersect(constraint)
-                if narrowed.is_empty:
-                    return None
-                refined[left_binding] = narrowed
+        right_value = self._eval(right, record=False)
+        if left_binding is not None:
+            self._constrain(left_binding, name, right_value, truth, left.type)
 
         right_binding = self._binding_id(right)
-        left_interval = self._eval(left, refined, validate=False)
+        left_value = self._eval(left, record=False)
         inverse = {
             '__lt__': '__gt__',
             '__le__': '__ge__',
             '__gt__': '__lt__',
             '__ge__': '__le__',
             '__eq__': '__eq__',
+            '__ne__': '__ne__',
         }.get(name)
-        if (
-            right_binding is not None
-            and left_interval is not None
-            and inverse is not None
-        ):
-            constraint = self._comparison_constraint(inverse, left_interval, truth)
-            if constraint is not None:
-                previous = refined.get(right_binding, UNKNOWN_INTERVAL)
-                narrowed = previous.intersect(constraint)
-                if narrowed.is_empty:
-                    return None
-                refined[right_binding] = narrowed
-        return refined
+        if right_binding is not None and inverse is not None:
+            self._constrain(right_binding, inverse, left_value, truth, right.type)
+
+    def _constrain(
+        self,
+        binding_id: int,
+        name: str,
+        other: _Value,
+        truth: bool,
+        type_: ty.Type,
+    ) -> None:
+        """Add a pi narrowing `binding_id` to satisfy `binding <name> other`."""
+        assert self.block is not None
+        if (name, truth) in {('__eq__', False), ('__ne__', True)}:
+            # unequal to one end of its interval, the binding loses that end
+            def narrow(previous: Interval, bound: Interval) -> Interval:
+                return _exclude(previous.intersect(_type_range(type_)), bound)
+        elif self._comparison_constraint(name, UNKNOWN_INTERVAL, truth) is None:
+            return
+        else:
+            def narrow(previous: Interval, bound: Interval) -> Interval:
+                constraint = self._comparison_constraint(name, bound, truth)
+                assert constraint is not None
+                return _narrow(previous, constraint)
+
+        pi = self._expr([self._read(binding_id), other], narrow)
+        self._write(binding_id, pi)
+        self.block.guards.append(pi)
+        # order the block after its guards, for the first sweep of _solve
+        self.block.order = next(self.orders)
 
     @staticmethod
     def _binding_id(node: hir.AST) -> int | None:
@@ -1023,52 +1369,125 @@ class _BoundsValidator:
             return other
         return None
 
-    @staticmethod
-    def _set_interval(
-        state: State,
-        binding_id: int,
-        interval: Interval | None,
-    ) -> None:
-        if interval is None or interval == UNKNOWN_INTERVAL:
-            state.pop(binding_id, None)
-        else:
-            state[binding_id] = interval
+    # propagation
+
+    def _link(self) -> None:
+        """Drop trivial phis and record the users of every node."""
+        for phi in self.phis:
+            for operand in phi.operands:
+                if isinstance(operand, _Phi):
+                    operand.phi_users.append(phi)
+        pending = list(self.phis)
+        while pending:
+            phi = pending.pop()
+            if phi.forward is None and self._forward_if_trivial(phi):
+                pending.extend(phi.phi_users)
+
+        for phi in self.phis:
+            if phi.forward is None:
+                phi.operands = [_resolve(operand) for operand in phi.operands]
+                for operand in phi.operands:
+                    operand.users.append(phi)
+        for value in self.values:
+            if isinstance(value, _Expr):
+                value.operands = [_resolve(operand) for operand in value.operands]
+                for operand in value.operands:
+                    operand.users.append(value)
+        for check in self.checks:
+            check.values = [_resolve(value) for value in check.values]
+        for block in self.blocks:
+            block.phis = [phi for phi in block.phis if phi.forward is None]
+            for pred in block.preds:
+                pred.succs.append(block)
+            if block.parent is not None:
+                block.parent.succs.append(block)
+            for guard in block.guards:
+                guard.users.append(block)
+
+    def _solve(self) -> None:
+        """Propagate intervals and reachability until they are stable.
+
+        Operands are created before their users except around loop back
+        edges (and pis after the block they guard), so a sweep in creation
+        order settles most of the graph; see `dataflow.propagate`.
+        """
+
+        def visit(
+            item: _Value | _Block,
+            push: Callable[[_Value | _Block], None],
+        ) -> None:
+            if isinstance(item, _Block):
+                if item.executable or not self._reachable(item):
+                    return
+                item.executable = True
+                for successor in item.succs:
+                    push(successor)
+                    for phi in successor.phis:
+                        push(phi)
+                return
+            interval = self._transfer(item)
+            if interval == item.interval:
+                return
+            item.interval = interval
+            for user in item.users:
+                push(user)
+
+        nodes: list[_Value | _Block] = [*self.blocks, *self.values]
+        nodes += [phi for phi in self.phis if phi.forward is None]
+        nodes.sort(key=lambda item: item.order)
+        dataflow.propagate(nodes, lambda item: item.order, visit)
 
     @staticmethod
-    def _join_states(states: list[State]) -> State:
-        if not states:
-            return {}
-        common = set(states[0])
-        for state in states[1:]:
-            common &= state.keys()
-        return {
-            binding_id: _union_intervals(
-                [state[binding_id] for state in states]
+    def _reachable(block: _Block) -> bool:
+        if block.parent is not None:
+            return block.parent.executable
+        return (
+            block.feasible
+            and any(pred.executable for pred in block.preds)
+            and all(
+                guard.interval is not None and not guard.interval.is_empty
+                for guard in block.guards
             )
-            for binding_id in common
-        }
+        )
 
     @staticmethod
-    def _widen_states(previous: State, current: State) -> State:
-        common = previous.keys() & current.keys()
-        return {
-            binding_id: previous[binding_id].widen(current[binding_id])
-            for binding_id in common
-        }
+    def _transfer(value: _Value) -> Interval | None:
+        if isinstance(value, _Leaf):
+            return value.fixed
+        if isinstance(value, _Expr):
+            operands = [operand.interval for operand in value.operands]
+            if any(operand is None for operand in operands):
+                return None
+            return value.compute(*operands)
+        assert isinstance(value, _Phi)
+        joined: Interval | None = None
+        for pred, operand in zip(value.block.preds, value.operands):
+            interval = operand.interval
+            if not pred.executable or interval is None or interval.is_empty:
+                continue
+            joined = interval if joined is None else joined.union(interval)
+        if joined is None or value.interval is None or not value.block.loop_head:
+            return joined
+        return value.interval.widen(value.interval.union(joined))
 
 
-def _union_intervals(intervals: list[Interval]) -> Interval:
-    result = intervals[0]
-    for interval in intervals[1:]:
-        result = result.union(interval)
-    return result
+def _resolve(value: _Value) -> _Value:
+    while isinstance(value, _Phi) and value.forward is not None:
+        value = value.forward
+    return value
 
 
 def validate_bounds(
     root: hir.Block,
     registry: sb.BindingRegistry,
     srcfile: SrcFile,
-) -> None:
-    """Validate every dynamic array index against its source-position facts."""
+    units: UnitCache | None = None,
+) -> Intervals:
+    """Validate every dynamic array index against its source-position facts.
+
+    Returns the intervals proven for the integer expressions of `root`. With
+    `units`, top-level functions found there are not validated again, and it
+    is left holding the facts of the functions of `root`.
+    """
 
-    _BoundsValidator(registry, srcfile, root).validate(root)
+    return _BoundsValidator(registry, srcfile, root).validate(root, units)
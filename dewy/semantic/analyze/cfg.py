@@ -0,0 +1,244 @@
+"""
+Control flow graphs over checked HIR.
+
+A graph is built for one body: a function's, the module's, or an expression
+with control flow of its own. Statement-level control flow (blocks, `if` and
+`loop` chains, `break`, `continue` and `return`) becomes edges between basic
+blocks; everything else stays whole as the items of a block, to be evaluated
+in order. The condition deciding an edge is kept on it, so an analysis can
+learn from the branch taken. Edges a literal condition rules out, and the
+body of an iterator loop that runs zero times, are left out, and so are
+empty blocks that only pass control on.
+
+Blocks are numbered in source order. Every edge goes to a later block, except
+the back edges into loop heads, so visiting blocks by index sees the
+predecessors of a block before it wherever that is possible.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from .. import hir
+
+
+@dataclass(eq=False, slots=True)
+class BasicBlock:
+    """Items evaluated in order; control only leaves at the end."""
+
+    index: int = -1
+    items: list[hir.AST] = field(default_factory=list)
+    preds: list[Edge] = field(default_factory=list)
+    succs: list[Edge] = field(default_factory=list)
+    loop_head: bool = False
+
+
+@dataclass(eq=False, slots=True)
+class Edge:
+    """Control passing to `target`; if `condition` is given, when it is `truth`.
+
+    Iterator conditions are true on the edge into the loop body, where their
+    targets hold the next element.
+    """
+
+    source: BasicBlock
+    target: BasicBlock
+    condition: hir.AST | None = None
+    truth: bool = True
+
+    @property
+    def is_back(self) -> bool:
+        return self.target.index <= self.source.index
+
+
+@dataclass
+class Graph:
+    """The basic blocks of one body, by index; `exit` is the last of them."""
+
+    blocks: list[BasicBlock]
+    entry: BasicBlock
+    exit: BasicBlock
+
+
+@dataclass
+class _Loop:
+    head: BasicBlock
+    after: BasicBlock
+
+
+def loop_iterators(
+    condition: hir.AST,
+) -> list[hir.IteratorExpression] | None:
+    """The iterators a loop condition advances, or None for a boolean one."""
+    if isinstance(condition, hir.IteratorExpression):
+        return [condition]
+    if isinstance(condition, hir.MultiIteratorExpression):
+        return condition.iterators
+    return None
+
+
+class _Builder:
+    def __init__(self) -> None:
+        self.blocks: list[BasicBlock] = []
+        self.exit = BasicBlock()
+        self.loops: list[_Loop] = []
+        # the block being extended; None after a jump, until something follows
+        self.block: BasicBlock | None = None
+
+    def build(self, body: hir.AST) -> Graph:
+        entry = self._start(BasicBlock())
+        self._statement(body)
+        self._jump(self.exit)
+        self._start(self.exit)
+        blocks = [block for block in self.blocks if not self._bypass(block)]
+        for index, block in enumerate(blocks):
+            block.index = index
+        return Graph(blocks, entry, self.exit)
+
+    def _bypass(self, block: BasicBlock) -> bool:
+        """Send the edges into an empty block that only passes control on past it."""
+        if (
+            block.items
+            or block.loop_head
+            or block is self.blocks[0]
+            or block is self.exit
+            or len(block.succs) != 1
+            or block.succs[0].condition is not None
+        ):
+            return False
+        [out] = block.succs
+        target = out.target
+        target.preds.remove(out)
+        for edge in block.preds:
+            edge.target = target
+            target.preds.append(edge)
+        return True
+
+    def _start(self, block: BasicBlock) -> BasicBlock:
+        block.index = len(self.blocks)
+        self.blocks.append(block)
+        self.block = block
+        return block
+
+    def _current(self) -> BasicBlock:
+        if self.block is None:
+            # code after a jump: kept, but never reached
+            self._start(BasicBlock())
+        assert self.block is not None
+        return self.block
+
+    def _edge(
+        self,
+        source: BasicBlock,
+        target: BasicBlock,
+        condition: hir.AST | None = None,
+        truth: bool = True,
+    ) -> None:
+        edge = Edge(source, target, condition, truth)
+        source.succs.append(edge)
+        target.preds.append(edge)
+
+    def _jump(self, target: BasicBlock) -> None:
+        if self.block is not None:
+            self._edge(self.block, target)
+            self.block = None
+
+    def _branch(
+        self,
+        source: BasicBlock,
+        condition: hir.AST,
+        *,
+        truth: bool,
+    ) -> BasicBlock | None:
+        """The block entered from `source` when `condition` is `truth`, if it can be."""
+        if isinstance(condition, hir.Bool) and condition.value != truth:
+            return None
+        target = BasicBlock()
+        self._edge(source, target, condition, truth)
+        return target
+
+    def _statement(self, node: hir.AST) -> None:
+        if isinstance(node, hir.Suppress) and isinstance(node.item, (hir.Block, hir.Flow)):
+            node = node.item
+        if isinstance(node, hir.Block):
+            for item in node.items:
+                self._statement(item)
+            return
+        if isinstance(node, hir.Flow):
+            self._flow(node)
+            return
+        if isinstance(node, hir.Return):
+            self._current().items.append(node)
+            self._jump(self.exit)
+            return
+        if isinstance(node, (hir.Break, hir.Continue)):
+            if node.loop_levels < len(self.loops):
+                loop = self.loops[-1 - node.loop_levels]
+                self._jump(loop.after if isinstance(node, hir.Break) else loop.head)
+            else:
+                # the loop is outside this graph
+                self._jump(self.exit)
+            return
+        self._current().items.append(node)
+
+    def _flow(self, node: hir.Flow) -> None:
+        after = BasicBlock()
+        for index, arm in enumerate(node.arms):
+            if isinstance(arm, hir.LoopArm):
+                self._loop(arm, after)
+                if self.block is not None and (
+                    index < len(node.arms) - 1 or node.default is not None
+                ):
+                    # the loop ran, then its condition stopped holding; or it
+                    # never ran, and the chain goes on
+                    rest = BasicBlock()
+                    self._edge(self.block, after)
+                    self._edge(self.block, rest)
+                    self._start(rest)
+                continue
+            self._current().items.append(arm.condition)
+            test = self._current()
+            body = self._branch(test, arm.condition, truth=True)
+            rest = self._branch(test, arm.condition, truth=False)
+            self.block = None
+            if body is not None:
+                self._start(body)
+                self._statement(arm.body)
+                self._jump(after)
+            if rest is not None:
+                self._start(rest)
+        if node.default is not None:
+            self._statement(node.default)
+        self._jump(after)
+        self._start(after)
+
+    def _loop(self, arm: hir.LoopArm, after: BasicBlock) -> None:
+        """Add one loop arm, ending in the block where its condition fails."""
+        condition = arm.condition
+        iterators = loop_iterators(condition)
+        if iterators is not None:
+            for iterator in iterators:
+                self._current().items.append(iterator.iterable)
+            if isinstance(condition, hir.IteratorExpression) and condition.count == 0:
+                return
+        head = BasicBlock(loop_head=True)
+        self._edge(self._current(), head)
+        self._start(head)
+        if iterators is None:
+            head.items.append(condition)
+        body = self._branch(head, condition, truth=True)
+        done = self._branch(head, condition, truth=False)
+        self.block = None
+        if body is not None:
+            self.loops.append(_Loop(head, after))
+            self._start(body)
+            self._statement(arm.body)
+            self._jump(head)
+            self.loops.pop()
+        if done is not None:
+            self._start(done)
+
+
+def build(body: hir.AST) -> Graph:
+    """The control flow graph of evaluating `body`."""
+    return _Builder().build(body)
@@ -0,0 +1,111 @@
+"""
+Worklist dataflow over control flow graphs.
+
+`propagate` is the engine: it sweeps items once in program order, and
+anything already swept that changes is revisited, in order, before the sweep
+moves past it. Since only a loop's back edge reaches backwards, a loop is
+iterated to its fixpoint in place, and code after it is visited once the loop
+is stable. Dense analyses use it through `solve_forward`, with a state per
+basic block and a pluggable `Lattice`; sparse ones hand it the nodes of their
+own def-use graph.
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections.abc import Callable, Iterable
+from itertools import count
+from typing import Protocol
+
+from .cfg import BasicBlock, Edge, Graph
+
+
+def propagate[T](
+    items: Iterable[T],
+    order: Callable[[T], int],
+    visit: Callable[[T, Callable[[T], None]], None],
+) -> None:
+    """Call `visit(item, push)` for every item, then again for each pushed item.
+
+    `items` must be sorted by `order`. Pushing an item the sweep has not
+    reached yet does nothing: it will be visited in turn anyway.
+    """
+    worklist: list[tuple[int, int, T]] = []
+    queued: set[int] = set()
+    sequence = count()
+    swept = -1
+
+    def push(item: T) -> None:
+        position = order(item)
+        if position <= swept and id(item) not in queued:
+            queued.add(id(item))
+            heapq.heappush(worklist, (position, next(sequence), item))
+
+    def revisit(limit: int | None) -> None:
+        while worklist and (limit is None or worklist[0][0] < limit):
+            item = heapq.heappop(worklist)[2]
+            queued.discard(id(item))
+            visit(item, push)
+
+    for item in items:
+        position = order(item)
+        revisit(position)
+        swept = position
+        visit(item, push)
+    revisit(None)
+
+
+class Lattice[S](Protocol):
+    """The states of a dense analysis; a block that is not reached has none."""
+
+    def join(self, left: S, right: S) -> S:
+        """The state where control from both `left` and `right` meets."""
+        ...
+
+    def widen(self, previous: S, current: S) -> S:
+        """The state of a loop head that held `previous` and now joins to `current`.
+
+        Lattices of finite height can return `current`.
+        """
+        ...
+
+
+def solve_forward[S](
+    graph: Graph,
+    lattice: Lattice[S],
+    entry: S,
+    transfer: Callable[[BasicBlock, S], S],
+    refine: Callable[[Edge, S], S | None] | None = None,
+) -> list[S | None]:
+    """The state on entry to every block of `graph`, by index; None if unreached.
+
+    `transfer` maps the state on entry to a block to the state at its end,
+    and `refine` the state at the end of a block to the state along one of
+    its edges, or None if the edge cannot be taken.
+    """
+    states: list[S | None] = [None] * len(graph.blocks)
+    states[graph.entry.index] = entry
+
+    def visit(block: BasicBlock, push: Callable[[BasicBlock], None]) -> None:
+        state = states[block.index]
+        if state is None:
+            return
+        state = transfer(block, state)
+        for edge in block.succs:
+            along = state if refine is None else refine(edge, state)
+            if along is None:
+                continue
+            target = edge.target
+            previous = states[target.index]
+            if previous is None:
+                joined = along
+            else:
+                joined = lattice.join(previous, along)
+                if target.loop_head:
+                    joined = lattice.widen(previous, joined)
+            if joined != previous:
+                states[target.index] = joined
+                push(target)
+
+    propagate(graph.blocks, lambda block: block.index, visit)
+    return states
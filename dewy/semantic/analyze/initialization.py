@@ -1,4 +1,10 @@
-"""Validate source-order binding initialization on checked HIR."""
+"""
+Validate source-order binding initialization on checked HIR.
+
+Each body is checked over its control flow graph: the bindings initialized on
+every path into a block are solved for with the shared dataflow worklist, and
+calls check the bodies they can reach with the state at the call.
+"""
 
 from __future__ import annotations
 
@@ -6,10 +12,11 @@ from dataclasses import dataclass
 from typing import NoReturn
 
 from ...reporting import Error, Pointer, SrcFile
-from .. import hir, ty
+from .. import hir, hir_walk, ty
 from ..bindings import BindingRegistry
 from ..errors import NotImplementedYet, UserError
 from ..hir_display import type_to_dewy
+from . import cfg, dataflow
 
 
 @dataclass(frozen=True)
@@ -19,6 +26,37 @@ class CallableEffect:
     targets: tuple[hir.FunctionLiteral, ...]
 
 
+class _Initialized:
+    """Sets of bindings initialized on every path; paths meet in their intersection."""
+
+    @staticmethod
+    def join(left: frozenset[int], right: frozenset[int]) -> frozenset[int]:
+        return left & right
+
+    @staticmethod
+    def widen(previous: frozenset[int], current: frozenset[int]) -> frozenset[int]:
+        return current
+
+
+_INITIALIZED = _Initialized()
+
+
+def _enter_edge(edge: cfg.Edge, state: frozenset[int]) -> frozenset[int]:
+    """Loop iterator targets are initialized on the edge into the body."""
+    iterators = (
+        cfg.loop_iterators(edge.condition)
+        if edge.condition is not None and edge.truth
+        else None
+    )
+    if not iterators:
+        return state
+    return state | {
+        iterator.target.binding_id
+        for iterator in iterators
+        if iterator.target.binding_id is not None
+    }
+
+
 class _InitializationChecker:
     def __init__(
         self,
@@ -32,97 +70,28 @@ class _InitializationChecker:
         self.reassigned_callables: set[int] = set()
         self.reassigned_objects: set[int] = set()
         self.reassigned_members: set[tuple[int, tuple[str, ...]]] = set()
+        self.graphs: dict[int, cfg.Graph] = {}
+        self.summaries: dict[
+            tuple[int, tuple[tuple[int, tuple[int, ...]], ...]],
+            frozenset[int] | None,
+        ] = {}
+        # uses that fail while a summary is collected (see _requirements)
+        self.missing: set[int] | None = None
+        # functions on the call stack that a call was not followed into
+        self.cut: set[int] = set()
         self._collect_reassigned_callables(root)
 
-    def _collect_reassigned_callables(self, node: hir.AST) -> None:
-        if isinstance(node, hir.Assign):
-            if (
-                node.target.binding_id is not None
-                and isinstance(node.target.type, (ty.FunctionType, ty.OverloadType))
-            ):
-                self.reassigned_callables.add(node.target.binding_id)
-            if (
-                node.target.binding_id is not None
-                and isinstance(node.target.type, ty.ObjectType)
-            ):
-                self.reassigned_objects.add(node.target.binding_id)
-            self._collect_reassigned_callables(node.value)
-            return
-        if isinstance(node, hir.Block):
-            for item in node.items:
-                self._collect_reassigned_callables(item)
-            return
-        if isinstance(node, hir.Declare):
-            self._collect_reassigned_callables(node.expr)
-            return
-        if isinstance(node, hir.FunctionLiteral):
-            self._collect_reassigned_callables(node.body)
-            return
-        if isinstance(node, hir.OverloadedFunction):
-            for alternate in node.alternates:
-                self._collect_reassigned_callables(alternate)
-            return
-        if isinstance(node, hir.FunctionCall):
-            self._collect_reassigned_callables(node.func)
-            for arg in node.pos_args:
-                self._collect_reassigned_callables(arg)
-            for arg in node.kw_args.values():
-                self._collect_reassigned_callables(arg)
-            return
-        if isinstance(node, hir.Flow):
-            for arm in node.arms:
-                self._collect_reassigned_callables(arm.condition)
-                self._collect_reassigned_callables(arm.body)
-            if node.default is not None:
-                self._collect_reassigned_callables(node.default)
-            return
-        if isinstance(node, hir.ShortCircuit):
-            self._collect_reassigned_callables(node.left)
-            self._collect_reassigned_callables(node.right)
-            return
-        if isinstance(node, hir.StringLength):
-            self._collect_reassigned_callables(node.string)
-            return
-        if isinstance(node, hir.StringIndex):
-            self._collect_reassigned_callables(node.string)
-            self._collect_reassigned_callables(node.index)
-            return
-        if isinstance(node, hir.StringSlice):
-            self._collect_reassigned_callables(node.string)
-            self._collect_reassigned_callables(node.range)
-            return
-        if isinstance(node, hir.StringEqual):
-            self._collect_reassigned_callables(node.left)
-            self._collect_reassigned_callables(node.right)
-            return
-        if isinstance(node, hir.StringConcat):
-            self._collect_reassigned_callables(node.left)
-            self._collect_reassigned_callables(node.right)
-            return
-        if isinstance(node, hir.InterpolatedString):
-            for part in node.parts:
-                self._collect_reassigned_callables(part)
-            return
-        if isinstance(node, hir.Return) and node.item is not None:
-            self._collect_reassigned_callables(node.item)
-            return
-        if isinstance(node, (hir.ValueCast, hir.RepresentationCast, hir.Transmute)):
-            self._collect_reassigned_callables(node.expr)
-            return
-        if isinstance(node, hir.ObjectLiteral):
-            for field in node.fields:
-                self._collect_reassigned_callables(field.value)
-            return
-        if isinstance(node, hir.MemberAccess):
-            self._collect_reassigned_callables(node.value)
-            return
-        if isinstance(node, hir.MemberAssign):
-            key = self._member_key(node.target)
-            if key is not None:
-                self.reassigned_members.add(key)
-            self._collect_reassigned_callables(node.target)
-            self._collect_reassigned_callables(node.value)
-            return
+    def _collect_reassigned_callables(self, root: hir.AST) -> None:
+        for node in hir_walk.walk(root):
+            if isinstance(node, hir.Assign) and node.target.binding_id is not None:
+                if isinstance(node.target.type, (ty.FunctionType, ty.OverloadType)):
+                    self.reassigned_callables.add(node.target.binding_id)
+                if isinstance(node.target.type, ty.ObjectType):
+                    self.reassigned_objects.add(node.target.binding_id)
+            elif isinstance(node, hir.MemberAssign):
+                key = self._member_key(node.target)
+                if key is not None:
+                    self.reassigned_members.add(key)
 
     @staticmethod
     def _member_key(
@@ -151,7 +120,7 @@ class _InitializationChecker:
         )
 
     def check(self) -> None:
-        initialized = self._check_block(self.root, set(), {}, set())
+        initialized = self._check_graph(self.root, set(), {}, set())
         main = next(
             (
                 item
@@ -166,35 +135,37 @@ class _InitializationChecker:
         assert isinstance(main.expr, hir.FunctionLiteral)
         self._check_function(main.expr, initialized, (), {}, {}, set())
 
-    def _check_block(
+    def _graph(self, node: hir.AST) -> cfg.Graph:
+        graph = self.graphs.get(id(node))
+        if graph is None:
+            graph = self.graphs[id(node)] = cfg.build(node)
+        return graph
+
+    def _check_graph(
         self,
-        block: hir.Block,
+        node: hir.AST,
         initialized: set[int],
         parameters: dict[int, CallableEffect],
         call_stack: set[int],
     ) -> set[int]:
-        current = set(initialized) if block.scoped else initialized
-        for item in block.items:
-            if isinstance(item, hir.Declare):
-                if isinstance(item.expr, hir.FunctionLiteral):
-                    current = self._check_function_defaults(
-                        item.expr,
-                        current,
-                        parameters,
-                        call_stack,
-                    )
-                else:
-                    current = self._check_eager(
-                        item.expr,
-                        current,
-                        parameters,
-                        call_stack,
-                    )
-                if item.binding_id is not None:
-                    current.add(item.binding_id)
-                continue
-            current = self._check_eager(item, current, parameters, call_stack)
-        return current
+        """Check the control flow of `node`; returns what is initialized after it."""
+        graph = self._graph(node)
+
+        def transfer(block: cfg.BasicBlock, state: frozenset[int]) -> frozenset[int]:
+            current = set(state)
+            for item in block.items:
+                current = self._check_eager(item, current, parameters, call_stack)
+            return frozenset(current)
+
+        states = dataflow.solve_forward(
+            graph,
+            _INITIALIZED,
+            frozenset(initialized),
+            transfer,
+            _enter_edge,
+        )
+        after = states[graph.exit.index]
+        return initialized if after is None else set(after)
 
     def _check_eager(
         self,
@@ -231,7 +202,7 @@ class _InitializationChecker:
                 )
             return current
         if isinstance(node, hir.Block):
-            current = self._check_block(node, initialized, parameters, call_stack)
+            current = self._check_graph(node, initialized, parameters, call_stack)
             return initialized if node.scoped else current
         if isinstance(node, hir.Declare):
             current = self._check_eager(node.expr, initialized, parameters, call_stack)
@@ -264,61 +235,7 @@ class _InitializationChecker:
                 else initialized
             )
         if isinstance(node, hir.Flow):
-            current = initialized
-            reached_known_arm = False
-            for arm in node.arms:
-                if isinstance(
-                    arm.condition,
-                    (hir.IteratorExpression, hir.MultiIteratorExpression),
-                ):
-                    iterators = (
-                        [arm.condition]
-                        if isinstance(arm.condition, hir.IteratorExpression)
-                        else arm.condition.iterators
-                    )
-                    for iterator in iterators:
-                        current = self._check_eager(
-                            iterator.iterable,
-                            current,
-                            parameters,
-                            call_stack,
-                        )
-                    body_initialized = set(current)
-                    for iterator in iterators:
-                        if iterator.target.binding_id is not None:
-                            body_initialized.add(iterator.target.binding_id)
-                    self._check_eager(
-                        arm.body,
-                        body_initialized,
-                        parameters,
-                        call_stack,
-                    )
-                    continue
-                current = self._check_eager(
-                    arm.condition,
-                    current,
-                    parameters,
-                    call_stack,
-                )
-                if isinstance(arm.condition, hir.Bool) and not arm.condition.value:
-                    continue
-                self._check_eager(
-                    arm.body,
-                    set(current),
-                    parameters,
-                    call_stack,
-                )
-                if isinstance(arm.condition, hir.Bool) and arm.condition.value:
-                    reached_known_arm = True
-                    break
-            if node.default is not None and not reached_known_arm:
-                self._check_eager(
-                    node.default,
-                    set(current),
-                    parameters,
-                    call_stack,
-                )
-            return current
+            return self._check_graph(node, initialized, parameters, call_stack)
         if isinstance(node, hir.ShortCircuit):
             current = self._check_eager(
                 node.left,
@@ -589,8 +506,10 @@ class _InitializationChecker:
         call_stack: set[int],
     ) -> None:
         if id(function) in call_stack:
+            self.cut.add(id(function))
             return
-        available = set(initialized)
+        # what the function provides itself: its parameters and fields
+        available: set[int] = set()
         for binding_id, _name in function.object_fields:
             available.add(binding_id)
         parameter_effects: dict[int, CallableEffect] = {}
@@ -645,12 +564,62 @@ class _InitializationChecker:
                         )
         if function.rest_args is not None and function.rest_args.binding_id is not None:
             available.add(function.rest_args.binding_id)
-        body = function.body
         stack = {*call_stack, id(function)}
-        if isinstance(body, hir.Block):
-            self._check_block(body, available, parameter_effects, stack)
-        else:
-            self._check_eager(body, available, parameter_effects, stack)
+        required = self._requirements(function, available, parameter_effects, stack)
+        if required is not None:
+            missing = required - initialized
+            if not missing:
+                return
+            if self.missing is not None:
+                self.missing |= missing
+                return
+        # check the body again at this call, to report the use that fails
+        self._check_graph(
+            function.body,
+            initialized | available,
+            parameter_effects,
+            stack,
+        )
+
+    def _requirements(
+        self,
+        function: hir.FunctionLiteral,
+        available: set[int],
+        parameters: dict[int, CallableEffect],
+        call_stack: set[int],
+    ) -> frozenset[int] | None:
+        """The bindings a call of `function` needs initialized beforehand.
+
+        Found by checking the body with nothing else initialized, and collecting
+        the uses that fail instead of reporting them. The summary is kept per
+        function and callable parameter effects, unless it was cut short by
+        recursion into a function further up the call stack. None if the body
+        has a callable whose effect is not resolved.
+        """
+        key = (
+            id(function),
+            tuple(sorted(
+                (binding_id, tuple(id(target) for target in effect.targets))
+                for binding_id, effect in parameters.items()
+            )),
+        )
+        if key in self.summaries:
+            return self.summaries[key]
+        outer_missing, outer_cut = self.missing, self.cut
+        self.missing, self.cut = set(), set()
+        try:
+            self._check_graph(function.body, available, parameters, call_stack)
+            required: frozenset[int] | None = frozenset(self.missing)
+        except NotImplementedYet:
+            if outer_missing is not None:
+                raise
+            required = None
+        finally:
+            cut = self.cut - {id(function)}
+            self.missing, self.cut = outer_missing, outer_cut | cut
+        if not cut:
+            self.summaries[key] = required
+        return required
 
     def _callable_targets(
         self,
@@ -829,6 +798,9 @@ class _InitializationChecker:
     ) -> None:
         if node.binding_id is None or node.binding_id in initialized:
             return
+        if self.missing is not None:
+            self.missing.add(node.binding_id)
+            return
         binding = self.registry.by_id[node.binding_id]
         pointers = [
             Pointer(
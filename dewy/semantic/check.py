@@ -6,7 +6,7 @@ semantic analysis pass 0:
 from dataclasses import dataclass, replace, field
 from collections import ChainMap
 from typing import Literal, cast
-from ..parser import p0, t2, t1, t0
+from ..parser import cache, p0, t2, t1, t0
 from . import bindings as sb
 from . import builtins, hir, ty
 from .errors import TypeCheckError, UserError, NotImplementedYet, type_error, user_error, not_implemented, require_valued
@@ -60,6 +60,7 @@ def typecheck_and_resolve(
     srcfile: SrcFile,
     *,
     include_prelude: bool | None = None,
+    jobs: int = 1,
 ) -> hir.AST:
     from .modules import typecheck_program
 
@@ -70,11 +71,12 @@ def typecheck_and_resolve(
             if include_prelude is None
             else include_prelude
         ),
+        jobs=jobs,
     )
 
 
-def _parse_module(srcfile: SrcFile) -> tuple[p0.Block, bool]:
-    block = p0.parse(srcfile)
+def _parse_module(srcfile: SrcFile, *, cached: bool = False) -> tuple[p0.Block, bool]:
+    block = cache.parse(srcfile) if cached else p0.parse(srcfile)
     no_prelude: bool | None = None
     items: list[p0.AST] = []
     for item in block.inner:
@@ -216,6 +218,12 @@ def typecheck_and_resolve_inner(ast: p0.AST, *, ctx: Context, type_block:bool=Fa
         case p0.KeywordExpr():
             raise ValueError(f'INTERNAL ERROR: unrecognized keyword expression structure: {ast=}')
 
+        case p0.BinOp(op=t1.Operator(symbol=':='|'='|'::')|t2.CombinedAssignmentOp(), left=left) if isinstance(target := p0.hoist_ambiguity(left), p0.Ambiguous):
+            # the parser leaves ambiguity local to where it occurs, but a target is destructured
+            # rather than evaluated, so pick between whole readings of the target instead
+            candidates = [replace(ast, left=candidate) for candidate in target.candidates]
+            return typecheck_and_resolve_inner(p0.Ambiguous(ast.loc, candidates), ctx=ctx, type_block=type_block, expected=expected)
+
         case p0.BinOp(op=t1.Operator(symbol=':='|'='|'::')):
             return tcr_assign(ast, ctx=ctx)
 
@@ -703,42 +711,14 @@ def tcr_import(ast: p0.KeywordExpr, *, ctx: Context, expected: ty.Type|None=None
             Pointer(span=ast.loc, message='no module loader is available here'),
         )
 
-    path_ast: p0.AST
-    names_ast: p0.AST | None = None
-    namespace_name: str | None = None
-    splat = False
-    match ast.parts:
-        case [
-            t1.Keyword(name='from'),
-            p0.AST() as source,
-            t1.Keyword(name='import'),
-            p0.AST() as names,
-        ]:
-            path_ast, names_ast = source, names
-        case [
-            t1.Keyword(name='import'),
-            p0.AST() as names,
-            t1.Keyword(name='from'),
-            p0.AST() as source,
-        ]:
-            path_ast, names_ast = source, names
-        case [
-            t1.Keyword(name='import'),
-            p0.BinOp(
-                op=t1.Operator(symbol='as'),
-                left=p0.AST() as source,
-                right=p0.Atom(item=t1.Identifier(name=alias)),
-            ),
-        ]:
-            path_ast, namespace_name = source, alias
-        case [t1.Keyword(name='import'), p0.AST() as source]:
-            path_ast, splat = source, True
-        case _:
-            user_error(
-                ctx.srcfile,
-                'invalid import syntax',
-                Pointer(span=ast.loc, message='cannot interpret this import'),
-            )
+    parts = split_import(ast)
+    if parts is None:
+        user_error(
+            ctx.srcfile,
+            'invalid import syntax',
+            Pointer(span=ast.loc, message='cannot interpret this import'),
+        )
+    path_ast, names_ast, namespace_name, splat = parts
 
     path_text = _literal_import_path(path_ast, ctx=ctx)
     loader = ctx.module_loader
@@ -779,6 +759,37 @@ def tcr_import(ast: p0.KeywordExpr, *, ctx: Context, expected: ty.Type|None=None
     return hir.Void(ast.loc, ty.VOID_TYPE)
 
 
+def split_import(ast: p0.KeywordExpr) -> tuple[p0.AST, p0.AST | None, str | None, bool] | None:
+    """(source, selected names, namespace alias, splat) of an import statement, or None if it isn't one"""
+    match ast.parts:
+        case [
+            t1.Keyword(name='from'),
+            p0.AST() as source,
+            t1.Keyword(name='import'),
+            p0.AST() as names,
+        ]:
+            return source, names, None, False
+        case [
+            t1.Keyword(name='import'),
+            p0.AST() as names,
+            t1.Keyword(name='from'),
+            p0.AST() as source,
+        ]:
+            return source, names, None, False
+        case [
+            t1.Keyword(name='import'),
+            p0.BinOp(
+                op=t1.Operator(symbol='as'),
+                left=p0.AST() as source,
+                right=p0.Atom(item=t1.Identifier(name=alias)),
+            ),
+        ]:
+            return source, None, alias, False
+        case [t1.Keyword(name='import'), p0.AST() as source]:
+            return source, None, None, True
+    return None
+
+
 def _literal_import_path(ast: p0.AST, *, ctx: Context) -> str:
     value = typecheck_and_resolve_inner(ast, ctx=ctx)
     value = _unwrap_literal_value(value)
@@ -3837,7 +3848,7 @@ def tcr_bare_range(ast: p0.Flat, *, ctx: Context, expected: ty.Type|None=None) -
     scalar_range_context = (
         isinstance(expected, ty.TypeParameterize)
         and expected.t == 'range'
-        and expected.args == ['uint32']
+        and expected.args == ('uint32',)
     )
     if scalar_range_context:
         converted: dict[int, hir.AST] = {}
@@ -4493,22 +4504,22 @@ def ast_to_type(ast: p0.AST, *, ctx: Context) -> ty.Type:
             left = ast_to_type(ast.left, ctx=ctx)
             right = ast_to_type(ast.right, ctx=ctx)
             if isinstance(left, ty.TypeOr) and isinstance(right, ty.TypeOr):
-                return ty.TypeOr(left.items + right.items)
+                return ty.TypeOr([*left.items, *right.items])
             elif isinstance(left, ty.TypeOr):
-                return ty.TypeOr(left.items + [right])
+                return ty.TypeOr([*left.items, right])
             elif isinstance(right, ty.TypeOr):
-                return ty.TypeOr([left] + right.items)
+                return ty.TypeOr([left, *right.items])
             return ty.TypeOr([left, right])
         
         case p0.BinOp(op=t1.Operator(symbol='and'|'&')):
             left = ast_to_type(ast.left, ctx=ctx)
             right = ast_to_type(ast.right, ctx=ctx)
             if isinstance(left, ty.TypeAnd) and isinstance(right, ty.TypeAnd):
-                return ty.TypeAnd(left.items + right.items)
+                return ty.TypeAnd([*left.items, *right.items])
             elif isinstance(left, ty.TypeAnd):
-                return ty.TypeAnd(left.items + [right])
+                return ty.TypeAnd([*left.items, right])
             elif isinstance(right, ty.TypeAnd):
-                return ty.TypeAnd([left] + right.items)
+                return ty.TypeAnd([left, *right.items])
             return ty.TypeAnd([left, right])
         
         case p0.Prefix(op=t1.Operator(symbol='not'|'~')):
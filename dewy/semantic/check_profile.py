@@ -0,0 +1,256 @@
+"""
+Opt-in profiling of the type checker
+
+`enable()` swaps every `tcr_*` handler in `check`, and the top level `TypeSystem` queries, for wrappers that record
+wall time, call counts and query counts, both per handler and per (handler, source span). `disable()` puts the
+original functions back, so when profiling is off the checker runs exactly the code it always does.
+
+Turned on by `dewy --profile-check [--profile-check-out PATH]`, or by running `dewy` with the `DEWY_PROFILE_CHECK`
+environment variable set: `1` prints the report to stderr, any other value is also used as the path to write the
+profile to. `dewy` then checks with `-j 1` and the caches off (see `parser.cache`), since modules checked in worker
+processes or loaded from a cache never reach the wrapped handlers. Other entry points (tests, scripts) wrap the code
+to profile in `profiling()`. Profiles are written in speedscope's evented format
+(https://www.speedscope.app), with one frame per handler and source location.
+"""
+import sys
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from json import dumps
+from os import environ
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any
+
+from ..reporting import Span
+from . import check, ty
+
+ENV_VAR = 'DEWY_PROFILE_CHECK'
+QUERIES = (
+    'is_subtype',
+    'is_empty',
+    'match_best_function',
+    'promote_type',
+    'infer_type_args',
+    'call_accepted',
+    'function_subtype',
+    'callable_subtype',
+)
+
+
+def _handler_names() -> list[str]:
+    return [name for name, value in vars(check).items() if name.lstrip('_').startswith('tcr_') and callable(value)]
+
+
+@dataclass
+class HandlerStats:
+    calls: int = 0
+    total_ns: int = 0  # including nested handlers. Recursive activations are only counted once
+    self_ns: int = 0
+    queries: int = 0   # TypeSystem queries issued by the handler itself
+
+
+@dataclass
+class _Frame:
+    handler: str
+    location: str | None
+    frame_id: int
+    start: int
+    outermost: bool
+    child_ns: int = 0
+    queries: int = 0
+
+
+@dataclass
+class CheckProfile:
+    handlers: dict[str, HandlerStats] = field(default_factory=dict)
+    spans: dict[tuple[str, str], HandlerStats] = field(default_factory=dict)  # (location, handler) -> stats
+    queries: dict[str, int] = field(default_factory=dict)
+    # speedscope frames (handler, file, line, col) and open/close events (type, frame, ns since the profile started)
+    frames: dict[tuple[str, str | None, int | None, int | None], int] = field(default_factory=dict)
+    events: list[tuple[str, int, int]] = field(default_factory=list)
+    _start: int = field(default_factory=perf_counter_ns)
+    _end: int | None = None
+    _stack: list[_Frame] = field(default_factory=list)
+    _active: dict[str, int] = field(default_factory=dict)
+    _query_depth: int = 0
+    _paths: dict[object, str] = field(default_factory=dict)
+
+    def _display_path(self, path: object) -> str:
+        shown = self._paths.get(path)
+        if shown is None:
+            if path is None:
+                shown = '<string>'
+            else:
+                try:
+                    shown = str(Path(path).resolve().relative_to(Path.cwd()))
+                except ValueError:
+                    shown = str(path)
+            self._paths[path] = shown
+        return shown
+
+    def _frame_id(self, handler: str, args: tuple, kwargs: dict[str, Any]) -> tuple[int, str | None]:
+        span = next((arg.loc for arg in args if isinstance(getattr(arg, 'loc', None), Span)), None)
+        ctx = kwargs.get('ctx')
+        if span is None or not isinstance(ctx, check.Context):
+            key: tuple[str, str | None, int | None, int | None] = (handler, None, None, None)
+        else:
+            row, col = ctx.srcfile.offset_to_row_col(span.start)
+            key = (handler, self._display_path(ctx.srcfile.path), row + 1, col + 1)
+        frame_id = self.frames.get(key)
+        if frame_id is None:
+            frame_id = self.frames[key] = len(self.frames)
+        location = None if key[1] is None else f'{key[1]}:{key[2]}:{key[3]}'
+        return frame_id, location
+
+    def _call(self, handler: str, func: Callable[..., Any], args: tuple, kwargs: dict[str, Any]) -> Any:
+        frame_id, location = self._frame_id(handler, args, kwargs)
+        active = self._active.get(handler, 0)
+        self._active[handler] = active + 1
+        start = perf_counter_ns()
+        frame = _Frame(handler, location, frame_id, start, outermost=active == 0)
+        self._stack.append(frame)
+        self.events.append(('O', frame_id, start - self._start))
+        try:
+            return func(*args, **kwargs)
+        finally:
+            end = perf_counter_ns()
+            self.events.append(('C', frame_id, end - self._start))
+            self._stack.pop()
+            self._active[handler] = active
+            elapsed = end - start
+            if self._stack:
+                self._stack[-1].child_ns += elapsed
+            records = [self.handlers.setdefault(handler, HandlerStats())]
+            if location is not None:
+                records.append(self.spans.setdefault((location, handler), HandlerStats()))
+            for stats in records:
+                stats.calls += 1
+                stats.self_ns += elapsed - frame.child_ns
+                stats.queries += frame.queries
+                if frame.outermost:
+                    stats.total_ns += elapsed
+
+    def _query(self, name: str, func: Callable[..., Any], args: tuple, kwargs: dict[str, Any]) -> Any:
+        # queries made while answering another query (e.g. is_subtype inside match_best_function) aren't counted
+        if self._query_depth:
+            return func(*args, **kwargs)
+        self.queries[name] = self.queries.get(name, 0) + 1
+        if self._stack:
+            self._stack[-1].queries += 1
+        self._query_depth += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._query_depth -= 1
+
+    def report(self, limit: int = 20) -> str:
+        """handlers and source spans, sorted by self time"""
+        total_ns = (self._end or perf_counter_ns()) - self._start
+        calls = sum(stats.calls for stats in self.handlers.values())
+        lines = [
+            (f'type check profile: {total_ns / 1e6:.1f} ms profiled, {calls} handler calls, '
+             f'{sum(self.queries.values())} TypeSystem queries'),
+            '',
+            f'{"handler":<28} {"calls":>8} {"self ms":>9} {"total ms":>9} {"queries":>8}',
+        ]
+        for name, stats in sorted(self.handlers.items(), key=lambda item: -item[1].self_ns):
+            lines.append(f'{name:<28} {stats.calls:>8} {stats.self_ns / 1e6:>9.2f} {stats.total_ns / 1e6:>9.2f} {stats.queries:>8}')
+        spans = sorted(self.spans.items(), key=lambda item: -item[1].self_ns)
+        width = max((len(location) for (location, _), _ in spans[:limit]), default=0)
+        lines += ['', f'{"source span":<{width}} {"handler":<28} {"calls":>6} {"self ms":>9} {"queries":>8}']
+        for (location, name), stats in spans[:limit]:
+            lines.append(f'{location:<{width}} {name:<28} {stats.calls:>6} {stats.self_ns / 1e6:>9.2f} {stats.queries:>8}')
+        if len(spans) > limit:
+            lines.append(f'... {len(spans) - limit} more spans')
+        if self.queries:
+            lines += ['', ', '.join(f'{name}: {count}' for name, count in sorted(self.queries.items(), key=lambda item: -item[1]))]
+        return '\n'.join(lines)
+
+    def to_speedscope(self, name: str = 'dewy type check') -> dict[str, Any]:
+        frames: list[dict[str, Any]] = []
+        for handler, file, line, col in self.frames:
+            if file is None:
+                frames.append({'name': handler})
+            else:
+                frames.append({'name': f'{handler} {file}:{line}:{col}', 'file': file, 'line': line, 'col': col})
+        end_value = max((at for _, _, at in self.events), default=0)
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'evented',
+                'name': name,
+                'unit': 'nanoseconds',
+                'startValue': 0,
+                'endValue': end_value,
+                'events': [{'type': kind, 'frame': frame, 'at': at} for kind, frame, at in self.events],
+            }],
+            'exporter': 'dewy --profile-check',
+        }
+
+    def write(self, path: Path) -> None:
+        """write the profile as a speedscope JSON file"""
+        path.write_text(dumps(self.to_speedscope()))
+
+
+_profile: CheckProfile | None = None
+_originals: dict[tuple[object, str], Callable[..., Any]] = {}
+
+
+def _patch(owner: object, name: str, record: Callable[[str, Callable[..., Any], tuple, dict[str, Any]], Any]) -> None:
+    func = _originals[(owner, name)] = getattr(owner, name)
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return record(name, func, args, kwargs)
+    setattr(owner, name, wrapper)
+
+
+def enable() -> CheckProfile:
+    """start profiling the type checker. The returned profile accumulates until `disable()`"""
+    global _profile
+    if _profile is None:
+        _profile = CheckProfile()
+        for name in _handler_names():
+            _patch(check, name, _profile._call)
+        for name in QUERIES:
+            _patch(ty.TypeSystem, name, _profile._query)
+    return _profile
+
+
+def disable() -> CheckProfile | None:
+    """stop profiling and restore the unwrapped checker. Returns the finished profile, if one was running"""
+    global _profile
+    profile, _profile = _profile, None
+    for (owner, name), func in _originals.items():
+        setattr(owner, name, func)
+    _originals.clear()
+    if profile is not None:
+        profile._end = perf_counter_ns()
+    return profile
+
+
+@contextmanager
+def profiling() -> Iterator[CheckProfile]:
+    profile = enable()
+    try:
+        yield profile
+    finally:
+        disable()
+
+
+def finish(profile: CheckProfile | None, out: Path | None = None) -> None:
+    """print the report of a finished profile to stderr, and write it to `out` if given"""
+    if profile is None:
+        return
+    print(profile.report(), file=sys.stderr)
+    if out is not None:
+        profile.write(out)
+        print(f'type check profile written to {out}', file=sys.stderr)
+
+
+def requested_by_env() -> tuple[bool, Path | None]:
+    """whether DEWY_PROFILE_CHECK asks for a profile, and the path it gives to write it to"""
+    value = environ.get(ENV_VAR, '')
+    return value not in ('', '0'), None if value in ('', '0', '1') else Path(value)
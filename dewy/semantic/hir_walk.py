@@ -0,0 +1,269 @@
+"""
+Generic HIR traversal and rewriting
+
+For every HIR node class, the fields that can hold other nodes are found once from its annotations, and functions
+are made for it from them: one listing its children, one rebuilding it from mapped children, and one listing its
+other fields for `fingerprint`. Rebuilding is copy on write: a node (or list, tuple, dict of nodes) comes back as the
+same object when none of its children changed, so rewriting a tree only allocates along the paths that actually change.
+With `in_place=True` nodes and their containers are updated instead of copied.
+
+Nodes are `hir.AST`s, plus the `Param`s and `ObjectField`s that hang off function and object literals. `loc`, `type`
+and scalar fields are never visited.
+"""
+import pickle
+from collections.abc import Callable, Iterator
+from dataclasses import fields
+from hashlib import sha256
+from io import BytesIO
+from operator import attrgetter
+from types import NoneType, UnionType
+from typing import Any, Union, get_args, get_origin, get_type_hints
+
+from . import hir, ty
+
+Node = hir.AST | hir.Param | hir.ObjectField
+NODE_TYPES = (hir.AST, hir.Param, hir.ObjectField)
+
+type _Children = Callable[[Node], list[Node]]
+type _MapChildren = Callable[[Node, Callable[[Node], Node], bool], Node]
+type _Scalars = Callable[[Node], tuple]
+
+_generated: dict[type, tuple[_Children, _MapChildren, _Scalars]] = {}
+
+
+def children(node: Node) -> list[Node]:
+    """the direct children of `node`, in field order"""
+    return _functions(type(node))[0](node)
+
+
+def walk(root: Node) -> Iterator[Node]:
+    """`root` and every node below it, in pre-order"""
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        found = _functions(type(node))[0](node)
+        found.reverse()
+        stack.extend(found)
+
+
+def map_children[N: Node](node: N, func: Callable[[Node], Node], *, in_place: bool = False) -> N:
+    """`node` with each direct child replaced by `func(child)`. The same object if nothing changed, or with `in_place`"""
+    return _functions(type(node))[1](node, func, in_place)  # type: ignore[return-value]
+
+
+def transform[N: Node](root: N, func: Callable[[Node], Node], *, in_place: bool = False) -> N:
+    """bottom-up rewrite: `func` is called on every node once its children have been rewritten"""
+    def visit(node: Node) -> Node:
+        return func(_functions(type(node))[1](node, visit, in_place))
+    return visit(root)  # type: ignore[return-value]
+
+
+def fingerprint(root: Node) -> bytes:
+    """digest of the tree below `root`: its shape, node classes, types and other fields, but not `loc`"""
+    stream: list[object] = []
+    types: dict[ty.TypeNode, int] = {}  # types are hash-consed, so each distinct one is pickled once
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        cls = type(node)
+        children, _map, scalars = _functions(cls)
+        stream.append(cls.__qualname__)
+        for value in scalars(node):
+            if isinstance(value, ty.TypeNode):
+                value = types.setdefault(value, len(types))
+            stream.append(value)
+        found = children(node)
+        stream.append(len(found))
+        found.reverse()
+        stack.extend(found)
+    # without the memo, equal values pickle the same however they are shared
+    buffer = BytesIO()
+    pickler = pickle.Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL)
+    pickler.fast = True
+    pickler.dump((stream, list(types)))
+    return sha256(buffer.getbuffer()).digest()
+
+
+def _functions(cls: type) -> tuple[_Children, _MapChildren, _Scalars]:
+    generated = _generated.get(cls)
+    if generated is None:
+        generated = _generated[cls] = _generate(cls)
+    return generated
+
+
+# generation
+
+def _is_node_type(annotation: object) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, NODE_TYPES)
+
+
+def _field_kind(annotation: object) -> str | None:
+    """how a field with this annotation holds nodes: 'node', 'optional', 'list', 'tuple', 'dict', or None if it can't"""
+    optional = False
+    if get_origin(annotation) in (Union, UnionType):
+        members = [member for member in get_args(annotation) if member is not NoneType]
+        optional = len(members) < len(get_args(annotation))
+        if all(_is_node_type(member) for member in members):
+            return 'optional' if optional else 'node'
+        if len(members) > 1:
+            if any(_field_kind(member) is not None for member in members):
+                raise TypeError(f'unsupported HIR field annotation `{annotation}`')
+            return None
+        annotation = members[0]
+    if _is_node_type(annotation):
+        return 'optional' if optional else 'node'
+    origin, args = get_origin(annotation), get_args(annotation)
+    kind = None
+    if origin is list and _field_kind(args[0]) == 'node':
+        kind = 'list'
+    elif origin is tuple and args and all(_field_kind(arg) == 'node' for arg in args if arg is not Ellipsis):
+        kind = 'tuple'
+    elif origin is dict and _field_kind(args[1]) == 'node':
+        kind = 'dict'
+    elif origin in (list, tuple, dict) and any(_field_kind(arg) is not None for arg in args if arg is not Ellipsis):
+        raise TypeError(f'unsupported HIR field annotation `{annotation}`')
+    if kind is not None and optional:
+        kind = f'optional {kind}'
+    return kind
+
+
+def _copy[N: Node](node: N) -> N:
+    copied = object.__new__(type(node))
+    copied.__dict__.update(node.__dict__)
+    return copied
+
+
+def _map_list(items: list[Node], func: Callable[[Node], Node], in_place: bool) -> list[Node]:
+    if in_place:
+        items[:] = [func(item) for item in items]
+        return items
+    mapped = [func(item) for item in items]
+    return items if all(new is old for new, old in zip(mapped, items)) else mapped
+
+
+def _map_tuple(items: tuple[Node, ...], func: Callable[[Node], Node], in_place: bool) -> tuple[Node, ...]:
+    mapped = tuple(func(item) for item in items)
+    return items if all(new is old for new, old in zip(mapped, items)) else mapped
+
+
+def _map_dict(items: dict[str, Node], func: Callable[[Node], Node], in_place: bool) -> dict[str, Node]:
+    mapped = {key: func(item) for key, item in items.items()}
+    if in_place:
+        items.update(mapped)
+        return items
+    return items if all(mapped[key] is item for key, item in items.items()) else mapped
+
+
+def _add_node(out: list[Node], value: Node) -> None:
+    out.append(value)
+
+
+def _add_items(out: list[Node], value: list[Node] | tuple[Node, ...]) -> None:
+    out.extend(value)
+
+
+def _add_values(out: list[Node], value: dict[str, Node]) -> None:
+    out.extend(value.values())
+
+
+def _map_node(node: Node, func: Callable[[Node], Node], in_place: bool) -> Node:
+    return func(node)
+
+
+type _ChildField = tuple[str, bool, Callable[[list[Node], Any], None], Callable[[Any, Callable[[Node], Node], bool], Any]]
+
+# per field kind: how to add the nodes it holds to a list of children, and how to map them
+_ACCESSORS = {
+    'node': (_add_node, _map_node),
+    'list': (_add_items, _map_list),
+    'tuple': (_add_items, _map_tuple),
+    'dict': (_add_values, _map_dict),
+}
+
+
+def _generate(cls: type) -> tuple[_Children, _MapChildren, _Scalars]:
+    if not issubclass(cls, NODE_TYPES):
+        raise TypeError(f'`{cls.__name__}` is not an HIR node')
+    hints = get_type_hints(cls)
+    child_fields: tuple[_ChildField, ...] = tuple(
+        # plain `optional` is an optional single node
+        (field.name, kind.startswith('optional'), *_ACCESSORS[kind.removeprefix('optional').strip() or 'node'])
+        for field in fields(cls)
+        if field.name not in ('loc', 'type') and (kind := _field_kind(hints[field.name])) is not None
+    )
+    child_names = tuple(name for name, *_ in child_fields)
+    scalar_fields = tuple(field.name for field in fields(cls) if field.name != 'loc' and field.name not in child_names)
+    if not child_fields:
+        return _no_children, _map_no_children, _scalars_function(scalar_fields)
+    if all(add is _add_node and not optional for _, optional, add, _ in child_fields):
+        children = _single_nodes_function(child_names)
+    elif len(child_fields) == 1 and not child_fields[0][1]:
+        children = _container_function(*child_fields[0][::2])
+    else:
+        children = _children_function(child_fields)
+    return children, _map_children_function(child_fields), _scalars_function(scalar_fields)
+
+
+def _no_children(node: Node) -> list[Node]:
+    return []
+
+
+def _map_no_children(node: Node, func: Callable[[Node], Node], in_place: bool) -> Node:
+    return node
+
+
+def _single_nodes_function(names: tuple[str, ...]) -> _Children:
+    """children of a node whose child fields each hold exactly one node (the common case, so no loop over the fields)"""
+    get = attrgetter(*names)
+    if len(names) > 1:
+        return lambda node: list(get(node))
+    return lambda node: [get(node)]
+
+
+def _container_function(name: str, add: Callable[[list[Node], Any], None]) -> _Children:
+    """children of a node with a single child field, holding a list, tuple or dict of nodes"""
+    get = attrgetter(name)
+    if add is _add_values:
+        return lambda node: list(get(node).values())
+    return lambda node: list(get(node))
+
+
+def _children_function(child_fields: tuple[_ChildField, ...]) -> _Children:
+    def children(node: Node) -> list[Node]:
+        out: list[Node] = []
+        for name, optional, add, _ in child_fields:
+            value = getattr(node, name)
+            if value is not None or not optional:
+                add(out, value)
+        return out
+    return children
+
+
+def _map_children_function(child_fields: tuple[_ChildField, ...]) -> _MapChildren:
+    def map_children(node: Node, func: Callable[[Node], Node], in_place: bool) -> Node:
+        changed: list[tuple[str, Any]] = []
+        for name, optional, _, map_field in child_fields:
+            old = getattr(node, name)
+            if old is None and optional:
+                continue
+            new = map_field(old, func, in_place)
+            if new is not old:
+                changed.append((name, new))
+        if not changed:
+            return node
+        if not in_place:
+            node = _copy(node)
+        for name, new in changed:
+            setattr(node, name, new)
+        return node
+    return map_children
+
+
+def _scalars_function(names: tuple[str, ...]) -> _Scalars:
+    if len(names) > 1:
+        return attrgetter(*names)  # returns the values as a tuple
+    if names:
+        get = attrgetter(names[0])
+        return lambda node: (get(node),)
+    return lambda node: ()
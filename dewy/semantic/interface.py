@@ -0,0 +1,112 @@
+"""
+Module interface files (`.dewyi`)
+
+A checked module is saved as `__dewycache__/<name>.dewyi` next to its source: a header holding the module's key, the
+digest of its source and the modules it imports, followed by its checked HIR, exported names and bindings. The
+source digest covers the file contents and the compiler itself (prelude sources included), and the key combines it
+with the keys of the imported modules, so editing a module invalidates the interfaces of everything that imports it,
+directly or not. Keys only depend on sources, so they can be computed before anything is checked.
+
+Interfaces are only valid because non-prelude modules allocate binding ids from a range chosen by their path (see
+`modules.id_range_start`): a module loaded from its interface keeps the ids its importers refer to.
+"""
+import pickle
+from dataclasses import dataclass
+from hashlib import sha256
+from pathlib import Path
+
+from ..parser.cache import LOAD_ERRORS, cache_dir, write_pickles
+from ..reporting import SrcFile
+from . import bindings as sb
+from . import hir
+from .prelude import PRELUDE_FILES
+
+SUFFIX = '.dewyi'
+
+_compiler_digest: bytes | None = None
+
+
+def compiler_fingerprint() -> bytes:
+    """hash of the compiler version, the front end and semantic passes, and the prelude"""
+    global _compiler_digest
+    if _compiler_digest is None:
+        package_root = Path(__file__).parents[1]
+        hasher = sha256((package_root.parent / 'VERSION').read_bytes())
+        sources = [
+            *(package_root / 'parser').glob('*.py'),
+            *(package_root / 'semantic').rglob('*.py'),
+            package_root / 'reporting.py',
+        ]
+        for path in [*sorted(sources), *PRELUDE_FILES]:
+            hasher.update(path.read_bytes())
+        _compiler_digest = hasher.digest()
+    return _compiler_digest
+
+
+def source_digest(srcfile: SrcFile) -> bytes:
+    return sha256(compiler_fingerprint() + str(srcfile.path).encode() + b'\0' + srcfile.body.encode()).digest()
+
+
+def module_key(digest: bytes, import_keys: list[bytes]) -> bytes:
+    return sha256(digest + b''.join(import_keys)).digest()
+
+
+@dataclass
+class InterfaceHeader:
+    key: bytes
+    digest: bytes
+    imports: list[Path]
+    no_prelude: bool
+
+
+@dataclass
+class ModuleInterface:
+    root: hir.Block
+    exports: dict[str, int]          # name -> binding id
+    bindings: dict[int, sb.Binding]  # every binding allocated by the module
+
+
+def interface_path(path: Path) -> Path | None:
+    directory = cache_dir(path.parent)
+    return directory / (path.name + SUFFIX) if directory is not None else None
+
+
+def load_header(srcfile: SrcFile) -> InterfaceHeader | None:
+    """the header of the interface of `srcfile`, or None if there is none for its current contents"""
+    assert srcfile.path is not None, 'INTERNAL ERROR: only files on disk have interfaces'
+    path = interface_path(Path(srcfile.path))
+    if path is None:
+        return None
+    try:
+        with path.open('rb') as f:
+            header = pickle.load(f)
+    except LOAD_ERRORS:
+        return None  # missing, truncated or written by an incompatible compiler
+    if not isinstance(header, InterfaceHeader) or header.digest != source_digest(srcfile):
+        return None
+    return header
+
+
+def load(srcfile: SrcFile, key: bytes) -> ModuleInterface | None:
+    """the interface of `srcfile` if it was stored under `key`"""
+    assert srcfile.path is not None, 'INTERNAL ERROR: only files on disk have interfaces'
+    path = interface_path(Path(srcfile.path))
+    if path is None:
+        return None
+    try:
+        with path.open('rb') as f:
+            header = pickle.load(f)
+            if not isinstance(header, InterfaceHeader) or header.key != key:
+                return None
+            interface = pickle.load(f)
+    except LOAD_ERRORS:
+        return None
+    return interface if isinstance(interface, ModuleInterface) else None
+
+
+def store(srcfile: SrcFile, header: InterfaceHeader, interface: ModuleInterface) -> None:
+    """write the interface of `srcfile`. Failures just leave it to be checked again next time"""
+    assert srcfile.path is not None, 'INTERNAL ERROR: only files on disk have interfaces'
+    path = interface_path(Path(srcfile.path))
+    if path is not None:
+        write_pickles(path, header, interface)
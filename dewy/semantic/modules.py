@@ -3,18 +3,30 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass, fields, is_dataclass, replace
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, fields, replace
+from hashlib import sha256
 from os import PathLike
 from pathlib import Path
 from typing import Any
 
-from ..reporting import Pointer, Span, SrcFile
+from ..parser import p0, t1, t2
+from ..reporting import Pointer, ReportException, Span, SrcFile
+from . import analysis_cache, builtins, hir, hir_walk, interface, prelude_snapshot, ty
 from . import bindings as sb
-from . import builtins, hir, ty
 from .analyze import bounds, initialization
 from .errors import user_error
 from .prelude import PRELUDE_FILES
 
+# Imported modules allocate binding ids from a range chosen by their path (the prelude, then the entry, allocate from
+# 1), so a module's ids are the same whichever program imports it, in whatever order. This is what lets modules be loaded from
+# their interface files or checked in another process.
+ID_RANGE = 1 << 20
+
+
+def id_range_start(path: Path) -> int:
+    return (int.from_bytes(sha256(str(path).encode()).digest()[:5]) + 1) * ID_RANGE
+
 
 @dataclass
 class ModuleRecord:
@@ -27,6 +39,7 @@ class ModuleRecord:
     index: int
     entry: bool = False
     prelude: bool = False
+    key: bytes | None = None  # interface key, see interface.py
 
 
 class ModuleCompiler:
@@ -43,22 +56,63 @@ class ModuleCompiler:
         self.prelude_bindings: dict[str, sb.Binding] = {}
         self.prelude_loaded = False
         self.finished_roots: dict[int, hir.Block] = {}
+        self.intervals: bounds.Intervals = {}  # proven for the merged root, see finish
+        self.imports: dict[Path, list[Path]] = {}  # modules imported by each module, in import order
+        self.id_ranges: dict[int, Path] = {}
 
     def _ensure_prelude(self) -> None:
         if self.prelude_loaded:
             return
         self.prelude_loaded = True
+        # the prelude allocates the same ids in every compile, which checked modules and their interfaces refer to
+        self.registry.next_id = 1
+        # compiling a prelude file itself checks the rest of the prelude around it, so only a whole prelude is
+        # snapshotted
+        whole = not any(path.resolve() in self.stack for path in PRELUDE_FILES)
+        snapshot = prelude_snapshot.load() if whole else None
+        if snapshot is not None:
+            self.type_system = snapshot.type_system
+            for path, module in zip(PRELUDE_FILES, snapshot.modules, strict=True):
+                path = path.resolve()
+                self.registry.by_id.update(module.bindings)
+                record = ModuleRecord(
+                    path,
+                    SrcFile.from_path(path),
+                    None,
+                    module.root,
+                    {name: self.registry.by_id[binding_id] for name, binding_id in module.exports.items()},
+                    sum(not record.prelude for record in self.order),
+                    prelude=True,
+                )
+                self.records[path] = record
+                self.order.append(record)
+                self._add_prelude_bindings(record)
+            self.registry.next_id = snapshot.next_id
+            return
+
+        modules: list[interface.ModuleInterface] = []
         for path in PRELUDE_FILES:
             resolved = path.resolve()
             if resolved in self.stack:
                 continue
+            id_start = self.registry.next_id
             record = self.load(resolved, prelude=True)
-            for name, binding in record.exports.items():
-                if name in self.prelude_bindings:
-                    raise ValueError(
-                        f'prelude binding `{name}` is defined by more than one file'
-                    )
-                self.prelude_bindings[name] = binding
+            self._add_prelude_bindings(record)
+            modules.append(interface.ModuleInterface(
+                record.root,
+                {name: binding.id for name, binding in record.exports.items()},
+                {i: self.registry.by_id[i] for i in range(id_start, self.registry.next_id)},
+            ))
+        if whole:
+            prelude_snapshot.store(prelude_snapshot.PreludeSnapshot(self.type_system, modules, self.registry.next_id))
+
+    def _add_prelude_bindings(self, record: ModuleRecord) -> None:
+        for name, binding in record.exports.items():
+            if name in self.prelude_bindings:
+                raise ValueError(
+                    f'prelude binding `{name}` is defined by more than one file'
+                )
+            self.prelude_bindings[name] = binding
 
     def load(
         self,
@@ -70,6 +124,10 @@ class ModuleCompiler:
         prelude: bool = False,
     ) -> ModuleRecord:
         path = Path(path).resolve()
+        if self.stack and not prelude:
+            imports = self.imports.setdefault(self.stack[-1], [])
+            if path not in imports:
+                imports.append(path)
         cached = self.records.get(path)
         if cached is not None:
             return cached
@@ -96,12 +154,33 @@ class ModuleCompiler:
                 ),
             )
         self.stack.append(path)
+        outer_next_id = self.registry.next_id
         srcfile = self.entry if entry else SrcFile.from_path(path)
+        record = None if entry or prelude else self._load_interface(path, srcfile)
+        if record is None:
+            record = self._check(path, srcfile, entry=entry, prelude=prelude)
+        self.records[path] = record
+        self.order.append(record)
+        self.stack.pop()
+        if self.stack and not prelude:
+            # resume allocating in the range of the importing module
+            self.registry.next_id = outer_next_id
+        return record
+
+    def _id_range_start(self, path: Path) -> int:
+        start = id_range_start(path)
+        if self.id_ranges.setdefault(start, path) != path:
+            raise ValueError(f'INTERNAL ERROR: `{path}` and `{self.id_ranges[start]}` have the same binding id range')
+        return start
+
+    def _check(self, path: Path, srcfile: SrcFile, *, entry: bool, prelude: bool) -> ModuleRecord:
         from . import check
 
-        block, no_prelude = check._parse_module(srcfile)
+        block, no_prelude = check._parse_module(srcfile, cached=True)
         if not prelude and not no_prelude:
             self._ensure_prelude()
+        if not prelude and not entry:
+            id_start = self.registry.next_id = self._id_range_start(path)
         root, ctx = check._typecheck_module(
             srcfile,
             block=block,
@@ -130,11 +209,49 @@ class ModuleCompiler:
             entry,
             prelude,
         )
-        self.records[path] = record
-        self.order.append(record)
-        self.stack.pop()
+        if entry or prelude:
+            return record
+        imports = self.imports.get(path, [])
+        import_keys = [self.records[dependency].key for dependency in imports]
+        if all(key is not None for key in import_keys):
+            digest = interface.source_digest(srcfile)
+            record.key = interface.module_key(digest, import_keys)  # type: ignore[arg-type]
+            interface.store(
+                srcfile,
+                interface.InterfaceHeader(record.key, digest, imports, no_prelude),
+                interface.ModuleInterface(
+                    root,
+                    {name: binding.id for name, binding in exports.items()},
+                    {i: self.registry.by_id[i] for i in range(id_start, self.registry.next_id)},
+                ),
+            )
         return record
 
+    def _load_interface(self, path: Path, srcfile: SrcFile) -> ModuleRecord | None:
+        """the module from its interface file, if there is one that is up to date with it and all of its imports"""
+        header = interface.load_header(srcfile)
+        if header is None or not all(dependency.exists() for dependency in header.imports):
+            return None
+        import_keys = [self.load(dependency, importer=srcfile).key for dependency in header.imports]
+        if None in import_keys or interface.module_key(header.digest, import_keys) != header.key:  # type: ignore[arg-type]
+            return None
+        loaded = interface.load(srcfile, header.key)
+        if loaded is None:
+            return None
+        if not header.no_prelude:
+            self._ensure_prelude()
+        self._id_range_start(path)
+        self.registry.by_id.update(loaded.bindings)
+        return ModuleRecord(
+            path,
+            srcfile,
+            None,
+            loaded.root,
+            {name: self.registry.by_id[binding_id] for name, binding_id in loaded.exports.items()},
+            sum(not record.prelude for record in self.order),
+            key=header.key,
+        )
+
     def import_module(
         self,
         path_text: str,
@@ -154,6 +271,100 @@ class ModuleCompiler:
             loc=loc,
         )
 
+    def load_parallel(self, jobs: int) -> ModuleRecord | None:
+        """
+        Check the entry's module graph with up to `jobs` worker processes: the imports without an up to date
+        interface are checked in the workers as soon as their own imports are done, and the entry in this process
+        once all of them are. None if the graph can't be planned statically or has nothing to run side by side; the
+        caller then loads serially
+        """
+        # imported here: the process pool machinery costs every serial compile ~20ms of startup
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+
+        assert self.entry.path is not None, 'INTERNAL ERROR: parallel loading requires a file-backed entry'
+        plan = plan_module_graph(self.entry)
+        if plan is None:
+            return None
+        *modules, entry = plan
+
+        keys: dict[Path, bytes] = {}
+        headers: dict[Path, interface.InterfaceHeader] = {}
+        summaries: dict[Path, _ModuleSummary] = {}
+        for module in modules:
+            digest = interface.source_digest(module.srcfile)
+            keys[module.path] = interface.module_key(digest, [keys[path] for path in module.imports])
+            headers[module.path] = interface.InterfaceHeader(keys[module.path], digest, module.imports, module.no_prelude)
+            loaded = interface.load(module.srcfile, keys[module.path])
+            if loaded is not None:
+                summaries[module.path] = _ModuleSummary(loaded.root, loaded.exports, loaded.bindings, from_interface=True)
+        if len(modules) - len(summaries) < 2:
+            return None
+        if any(not module.no_prelude for module in plan):
+            self._ensure_prelude()
+
+        failures: dict[int, ReportException] = {}
+        try:
+            with ProcessPoolExecutor(
+                max_workers=jobs,
+                initializer=_init_worker,
+                initargs=(self.prelude_loaded, self.registry.next_id),
+            ) as pool:
+                waiting = [module for module in modules if module.path not in summaries]
+                running: dict[Future[_ModuleSummary], PlannedModule] = {}
+                while waiting or running:
+                    ready = [] if failures else [
+                        module for module in waiting
+                        if all(path in summaries for path in module.imports)
+                    ]
+                    for module in ready:
+                        waiting.remove(module)
+                        task = _ModuleTask(
+                            module.srcfile,
+                            self._id_range_start(module.path),
+                            module.imports,
+                            {path: summaries[path].exported_bindings() for path in module.imports},
+                        )
+                        running[pool.submit(_check_in_worker, task)] = module
+                    if not running:
+                        break
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        module = running.pop(future)
+                        try:
+                            summaries[module.path] = future.result()
+                        except ReportException as e:
+                            failures[module.index] = e
+        except (PlanMismatch, BrokenProcessPool):
+            return None
+        if failures:
+            # the module that comes first in load order, which is the error the serial loader reports
+            raise failures[min(failures)]
+
+        for module in modules:
+            summary = summaries[module.path]
+            if not summary.from_interface:
+                interface.store(
+                    module.srcfile,
+                    headers[module.path],
+                    interface.ModuleInterface(summary.root, summary.exports, summary.bindings),
+                )
+            self._id_range_start(module.path)
+            self.registry.by_id.update(summary.bindings)
+            record = ModuleRecord(
+                module.path,
+                module.srcfile,
+                module.syntax,
+                summary.root,
+                {name: self.registry.by_id[binding_id] for name, binding_id in summary.exports.items()},
+                module.index,
+                key=keys[module.path],
+            )
+            self.records[module.path] = record
+            self.order.append(record)
+            self.imports[module.path] = module.imports
+        return self.load(entry.path, entry=True)
+
     @staticmethod
     def _module_slug(record: ModuleRecord) -> str:
         stem = re.sub(
@@ -177,62 +388,21 @@ class ModuleCompiler:
                 )
         return names
 
-    def _rename(self, value: Any, names: dict[int, str]) -> Any:
-        if isinstance(value, hir.Declare):
-            renamed = names.get(value.binding_id, value.name)
-            return replace(
-                value,
-                name=renamed,
-                expr=self._rename(value.expr, names),
-            )
-        if isinstance(value, hir.ExpressedIdentifier):
-            return replace(value, name=names.get(value.binding_id, value.name))
-        if isinstance(value, list):
-            return [self._rename(item, names) for item in value]
-        if isinstance(value, tuple):
-            return tuple(self._rename(item, names) for item in value)
-        if isinstance(value, dict):
-            return {
-                key: self._rename(item, names)
-                for key, item in value.items()
-            }
-        if is_dataclass(value) and (
-            isinstance(value, hir.AST)
-            or isinstance(value, (hir.ObjectField, hir.Param))
-        ):
-            updates = {
-                field.name: self._rename(getattr(value, field.name), names)
-                for field in fields(value)
-                if field.name not in {'loc', 'type', 'binding_id', 'name'}
-            }
-            return replace(value, **updates)
-        return value
-
-    def _collect_referenced_binding_ids(self, value: Any, found: set[int]) -> None:
-        if isinstance(value, hir.ExpressedIdentifier):
-            if value.binding_id is not None:
-                found.add(value.binding_id)
-            return
-        if isinstance(value, list):
-            for item in value:
-                self._collect_referenced_binding_ids(item, found)
-            return
-        if isinstance(value, tuple):
-            for item in value:
-                self._collect_referenced_binding_ids(item, found)
-            return
-        if isinstance(value, dict):
-            for item in value.values():
-                self._collect_referenced_binding_ids(item, found)
-            return
-        if is_dataclass(value) and (
-            isinstance(value, hir.AST)
-            or isinstance(value, (hir.ObjectField, hir.Param))
-        ):
-            for field in fields(value):
-                if field.name in {'loc', 'type', 'binding_id', 'name'}:
-                    continue
-                self._collect_referenced_binding_ids(getattr(value, field.name), found)
+    @staticmethod
+    def _rename[N: hir_walk.Node](root: N, names: dict[int, str]) -> N:
+        def rename(node: hir_walk.Node) -> hir_walk.Node:
+            if isinstance(node, (hir.Declare, hir.ExpressedIdentifier)) and node.binding_id is not None:
+                renamed = names.get(node.binding_id, node.name)
+                if renamed != node.name:
+                    return replace(node, name=renamed)
+            return node
+        return hir_walk.transform(root, rename)
+
+    @staticmethod
+    def _collect_referenced_binding_ids(root: hir_walk.Node, found: set[int]) -> None:
+        for node in hir_walk.walk(root):
+            if isinstance(node, hir.ExpressedIdentifier) and node.binding_id is not None:
+                found.add(node.binding_id)
 
     def _needed_prelude_binding_ids(self) -> set[int]:
         needed: set[int] = set()
@@ -240,22 +410,22 @@ class ModuleCompiler:
             if not record.prelude:
                 self._collect_referenced_binding_ids(record.root, needed)
 
-        prelude_items = [
-            item
+        prelude_items = {
+            item.binding_id: item
             for record in self.order
             if record.prelude
             for item in record.root.items
             if isinstance(item, hir.Declare) and item.binding_id is not None
-        ]
-        changed = True
-        while changed:
-            changed = False
-            for item in prelude_items:
-                if item.binding_id not in needed:
-                    continue
-                before = len(needed)
-                self._collect_referenced_binding_ids(item.expr, needed)
-                changed = changed or len(needed) > before
+        }
+        # a needed prelude declaration needs everything its initializer references
+        pending = [binding_id for binding_id in needed if binding_id in prelude_items]
+        while pending:
+            references: set[int] = set()
+            self._collect_referenced_binding_ids(prelude_items[pending.pop()].expr, references)
+            for binding_id in references - needed:
+                needed.add(binding_id)
+                if binding_id in prelude_items:
+                    pending.append(binding_id)
         return needed
 
     def finish(self, entry: ModuleRecord) -> hir.Block:
@@ -288,21 +458,225 @@ class ModuleCompiler:
             items,
             True,
         )
-        bounds.validate_bounds(root, self.registry, entry.srcfile)
+        units = analysis_cache.load(entry.srcfile)
+        stored = set(units)
+        self.intervals = bounds.validate_bounds(root, self.registry, entry.srcfile, units)
+        if units.keys() != stored:
+            analysis_cache.store(entry.srcfile, units)
         initialization.validate_initialization(root, self.registry, entry.srcfile)
         return root
 
 
-def typecheck_program(
-    srcfile: SrcFile,
-    *,
-    include_prelude: bool = True,
-) -> hir.Block:
+# Parallel checking
+#
+# The import graph is planned up front by parsing every reachable module. Workers check the prelude once, which
+# allocates the same ids as in the parent, and receive the exports of a module's imports along with it. Since every
+# module allocates from its own id range, ids don't depend on which process checks a module or when. A module that
+# imports anything the plan didn't predict (e.g. through a path the pre-pass can't evaluate) aborts the parallel
+# check, and the program is loaded serially instead.
+
+
+class PlanMismatch(Exception):
+    """A module imported something the planned import graph doesn't have"""
+
+
+@dataclass
+class PlannedModule:
+    path: Path
+    srcfile: SrcFile
+    syntax: p0.Block
+    no_prelude: bool
+    imports: list[Path]  # resolved, in the order they are first imported
+    index: int           # load order among the non-prelude modules
+
+
+def _walk(ast: p0.AST):
+    yield ast
+    for field in fields(ast):
+        value = getattr(ast, field.name)
+        for item in value if isinstance(value, list) else (value,):
+            if isinstance(item, p0.AST):
+                yield from _walk(item)
+
+
+def _static_path(ast: p0.AST, bound: dict[str, p0.AST]) -> str | None:
+    """the path an import source evaluates to, for literal paths and top-level names bound to one"""
+    match ast:
+        case p0.BinOp(
+            op=t2.CallJuxtapose(),
+            left=p0.Atom(item=t1.Identifier(name='p')),
+            right=p0.Atom(item=t1.String(content=text)),
+        ):
+            return text
+        case p0.Block(
+            kind='[]',
+            inner=[p0.BinOp(
+                op=t1.Operator(symbol='='),
+                left=p0.Atom(item=t1.Identifier(name='path')),
+                right=p0.Atom(item=t1.String(content=text)),
+            )],
+        ):
+            return text
+        case p0.Atom(item=t1.Identifier(name=name)) if name in bound:
+            return _static_path(bound[name], {})
+    return None
+
+
+def _static_imports(block: p0.Block) -> list[str] | None:
+    """relative paths imported by a module in source order, or None if any of them isn't known before checking"""
+    from .check import split_import
+
+    bound: dict[str, p0.AST] = {}
+    for item in block.inner:
+        match item:
+            case p0.KeywordExpr(parts=[
+                t1.Keyword(name='let' | 'const'),
+                p0.BinOp(op=t1.Operator(symbol='='), left=p0.Atom(item=t1.Identifier(name=name)), right=value),
+            ]):
+                bound[name] = value
+    paths: list[str] = []
+    for ast in _walk(block):
+        if not isinstance(ast, p0.KeywordExpr) or not any(
+            isinstance(part, t1.Keyword) and part.name == 'import' for part in ast.parts
+        ):
+            continue
+        parts = split_import(ast)
+        path = None if parts is None else _static_path(parts[0], bound)
+        if path is None:
+            return None
+        paths.append(path)
+    return paths
+
+
+def plan_module_graph(entry: SrcFile) -> list[PlannedModule] | None:
+    """
+    Parse every module reachable from `entry`, in the order `ModuleCompiler.load` checks them (imports first).
+    None if the graph can't be planned statically or is invalid (missing files, cycles, parse errors), which the
+    serial loader then reports
+    """
+    from . import check
+
+    assert entry.path is not None, 'INTERNAL ERROR: only file-backed programs have a module graph'
+    prelude_paths = {path.resolve() for path in PRELUDE_FILES}
+    planned: dict[Path, PlannedModule] = {}
+    visiting: set[Path] = set()
+
+    def visit(path: Path, srcfile: SrcFile | None) -> bool:
+        if path in planned:
+            return True
+        if path in visiting or path in prelude_paths or not path.exists():
+            return False
+        visiting.add(path)
+        srcfile = srcfile or SrcFile.from_path(path)
+        try:
+            block, no_prelude = check._parse_module(srcfile, cached=True)
+        except ReportException:
+            return False
+        relative = _static_imports(block)
+        if relative is None:
+            return False
+        imports = list(dict.fromkeys((path.parent / item).resolve() for item in relative))
+        if not all(visit(dependency, None) for dependency in imports):
+            return False
+        visiting.remove(path)
+        planned[path] = PlannedModule(path, srcfile, block, no_prelude, imports, len(planned))
+        return True
+
+    if not visit(Path(entry.path).resolve(), entry):
+        return None
+    return list(planned.values())
+
+
+@dataclass
+class _ModuleTask:
+    srcfile: SrcFile
+    id_start: int
+    imports: list[Path]
+    dependencies: dict[Path, dict[str, sb.Binding]]  # exports of each import
+
+
+@dataclass
+class _ModuleSummary:
+    root: hir.Block
+    exports: dict[str, int]
+    bindings: dict[int, sb.Binding]  # every binding the module allocated
+    from_interface: bool = False
+
+    def exported_bindings(self) -> dict[str, sb.Binding]:
+        return {name: self.bindings[binding_id] for name, binding_id in self.exports.items()}
+
+
+class _WorkerCompiler(ModuleCompiler):
+    """Checks one planned module against the exports of its imports"""
+
+    def __init__(self, task: _ModuleTask, base: ModuleCompiler):
+        super().__init__(task.srcfile)
+        self.type_system = base.type_system
+        self.registry = sb.BindingRegistry(task.id_start, dict(base.registry.by_id))
+        self.records = dict(base.records)
+        self.prelude_bindings = base.prelude_bindings
+        self.prelude_loaded = base.prelude_loaded
+        empty = hir.Block(Span(0, 0), ty.VOID_TYPE, [], True)
+        for path, exports in task.dependencies.items():
+            self.registry.by_id.update((binding.id, binding) for binding in exports.values())
+            # only the exports of an import are consulted when checking the importer
+            self.records[path] = ModuleRecord(path, SrcFile(path, ''), None, empty, exports, -1)
+        self.imported: list[Path] = []
+
+    def load(
+        self,
+        path: PathLike[str],
+        *,
+        importer: SrcFile | None = None,
+        loc: Span | None = None,
+        entry: bool = False,
+        prelude: bool = False,
+    ) -> ModuleRecord:
+        if not entry:
+            resolved = Path(path).resolve()
+            if resolved not in self.records:
+                raise PlanMismatch(resolved)
+            if resolved not in self.imported:
+                self.imported.append(resolved)
+        return super().load(path, importer=importer, loc=loc, entry=entry, prelude=prelude)
+
+
+_worker_base: ModuleCompiler | None = None
+
+
+def _init_worker(load_prelude: bool, next_id: int) -> None:
+    global _worker_base
+    _worker_base = ModuleCompiler(SrcFile(None, ''))
+    if load_prelude:
+        _worker_base._ensure_prelude()
+    if _worker_base.registry.next_id != next_id:
+        raise RuntimeError('INTERNAL ERROR: the prelude allocated different binding ids in a worker process')
+
+
+def _check_in_worker(task: _ModuleTask) -> _ModuleSummary:
+    assert _worker_base is not None and task.srcfile.path is not None
+    compiler = _WorkerCompiler(task, _worker_base)
+    record = compiler.load(task.srcfile.path, entry=True)
+    if compiler.imported != task.imports:
+        raise PlanMismatch(task.srcfile.path)
+    if compiler.registry.next_id > task.id_start + ID_RANGE:
+        raise ValueError(f'INTERNAL ERROR: `{task.srcfile.path}` allocated more than {ID_RANGE} bindings')
+    return _ModuleSummary(
+        record.root,
+        {name: binding.id for name, binding in record.exports.items()},
+        {i: compiler.registry.by_id[i] for i in range(task.id_start, compiler.registry.next_id)},
+    )
+
+
+def _check_program(srcfile: SrcFile, jobs: int) -> tuple[ModuleCompiler, ModuleRecord, hir.Block]:
+    """Check a program and merge it with its imports and the prelude"""
     compiler = ModuleCompiler(srcfile)
     if srcfile.path is not None:
-        entry = compiler.load(srcfile.path, entry=True)
-        merged = compiler.finish(entry)
-        return merged if include_prelude else compiler.finished_roots[id(entry)]
+        entry = compiler.load_parallel(jobs) if jobs > 1 else None
+        if entry is None:
+            compiler = ModuleCompiler(srcfile)
+            entry = compiler.load(srcfile.path, entry=True)
+        return compiler, entry, compiler.finish(entry)
 
     from . import check
 
@@ -332,5 +706,25 @@ def typecheck_program(
         entry=True,
     )
     compiler.order.append(entry)
-    merged = compiler.finish(entry)
+    return compiler, entry, compiler.finish(entry)
+
+
+def typecheck_program(
+    srcfile: SrcFile,
+    *,
+    include_prelude: bool = True,
+    jobs: int = 1,
+) -> hir.Block:
+    """Check a program and the modules it imports, using up to `jobs` processes for independent modules"""
+    compiler, entry, merged = _check_program(srcfile, jobs)
     return merged if include_prelude else compiler.finished_roots[id(entry)]
+
+
+def typecheck_program_with_intervals(
+    srcfile: SrcFile,
+    *,
+    jobs: int = 1,
+) -> tuple[hir.Block, bounds.Intervals]:
+    """`typecheck_program` including the prelude, along with the integer intervals proven for its expressions"""
+    compiler, _entry, merged = _check_program(srcfile, jobs)
+    return merged, compiler.intervals
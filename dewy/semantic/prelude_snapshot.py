@@ -0,0 +1,79 @@
+"""
+Snapshot of the checked prelude (`__dewycache__/prelude.snapshot` next to the prelude sources, or wherever
+`DEWY_CACHE_DIR` puts their parse cache)
+
+Every compile that uses the prelude would otherwise check all of `PRELUDE_FILES` from source. The first compile that
+does so saves the result, and later ones load it instead: the type system (nominal lattice, promote rules and the
+memos the prelude warmed up) and per prelude file its checked HIR, exports and bindings. The snapshot is keyed on
+`FORMAT` and the same compiler fingerprint as module interfaces (VERSION, front end, semantic passes and the prelude
+sources), so after any change to those the prelude is checked from source again, which replaces the snapshot.
+
+Build it ahead of time (e.g. when installing) with:
+    python -m dewy.semantic.prelude_snapshot
+"""
+import pickle
+from dataclasses import dataclass
+from hashlib import sha256
+from pathlib import Path
+
+from ..parser.cache import LOAD_ERRORS, cache_dir, write_pickles
+from . import interface, ty
+from .prelude import PRELUDE_FILES
+
+FORMAT = 1
+
+
+@dataclass
+class PreludeSnapshot:
+    type_system: ty.TypeSystem
+    modules: list[interface.ModuleInterface]  # one per PRELUDE_FILES entry, in order
+    next_id: int                              # first binding id after the prelude
+
+
+def snapshot_key() -> bytes:
+    return sha256(FORMAT.to_bytes(4) + interface.compiler_fingerprint()).digest()
+
+
+def snapshot_path() -> Path | None:
+    directory = cache_dir(PRELUDE_FILES[0].parent)
+    return directory / 'prelude.snapshot' if directory is not None else None
+
+
+def load() -> PreludeSnapshot | None:
+    """the snapshot, if there is one for the current compiler and prelude"""
+    path = snapshot_path()
+    if path is None:
+        return None
+    try:
+        with path.open('rb') as f:
+            if pickle.load(f) != snapshot_key():
+                return None
+            snapshot = pickle.load(f)
+    except LOAD_ERRORS:
+        return None  # missing, truncated or written by an incompatible interpreter
+    return snapshot if isinstance(snapshot, PreludeSnapshot) else None
+
+
+def store(snapshot: PreludeSnapshot) -> bool:
+    """save `snapshot`. False if it can't be written (e.g. a read-only install) or caching is turned off"""
+    path = snapshot_path()
+    return path is not None and write_pickles(path, snapshot_key(), snapshot)
+
+
+def main() -> None:
+    from ..reporting import SrcFile
+    from .modules import ModuleCompiler
+
+    path = snapshot_path()
+    if path is None:
+        raise SystemExit('caching is turned off (DEWY_CACHE_DIR=off)')
+    path.unlink(missing_ok=True)
+    compiler = ModuleCompiler(SrcFile(None, ''))
+    compiler._ensure_prelude()
+    if not path.exists():
+        raise SystemExit(f'could not write {path}')
+    print(f'wrote {path} ({path.stat().st_size / 1024:.0f} KiB)')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,9 @@
-from dataclasses import dataclass, field
-from collections import defaultdict
-from typing import Literal
+from dataclasses import dataclass, fields
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterator
+from itertools import count
+from weakref import WeakValueDictionary
+from typing import Any, Literal
 
 """
 Candidate type names:
@@ -53,42 +56,125 @@ INFERRED_TYPE: InferredType = 'untyped'
 type Primitive = str   # has to be in the _named_types set
 
 
-@dataclass
-class TypeAnd:
+class _HashConsed(type):
+    """Constructing a node returns the canonical instance of its structure (see `TypeNode`)."""
+    def __call__(cls, *args, **kwargs):
+        # fast path: when every field is given positionally, the canonical node can be found without building a new one
+        if not kwargs and len(args) == len(_field_names(cls)) and cls.__dataclass_params__.init:
+            canonical = _interned.get((cls, *[tuple(arg) if type(arg) is list else arg for arg in args]))
+            if canonical is not None:
+                return canonical
+        return _intern(super().__call__(*args, **kwargs))
+
+
+class TypeNode(metaclass=_HashConsed):
+    """Base of every type expression node, and of the signature pieces they are built from.
+
+    Nodes are hash-consed: building a node that is structurally equal to a live one returns that one instead,
+    so structural equality is identity (node classes are declared with `eq=False`), hashing is O(1), and
+    caches can key on nodes directly or on their `type_id` (e.g. `to_nnf`). Nodes are immutable; list fields are stored as
+    tuples, which print like the lists they replace. The intern table only holds nodes weakly, so a node (and its id) is
+    only kept while something references it.
+    """
+    def __reduce__(self):
+        # unpickled/copied nodes are interned again rather than duplicated
+        return _unintern, (type(self), tuple(getattr(self, name) for name in _field_names(type(self))))
+
+
+_interned: WeakValueDictionary[tuple, TypeNode] = WeakValueDictionary()
+_next_type_id = count()
+_primitive_ids: dict[Primitive, int] = {}
+_node_field_names: dict[type, tuple[str, ...]] = {}
+
+
+def _field_names(cls: type) -> tuple[str, ...]:
+    names = _node_field_names.get(cls)
+    if names is None:
+        names = _node_field_names[cls] = tuple(f.name for f in fields(cls))
+    return names
+
+
+class _ListFields(tuple):
+    """The tuple a list field is stored as, printing like the list (so reprs in error messages read as they did)"""
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+# fields that used to be lists. Other tuple fields (e.g. `ObjectType.fields`) print as tuples
+_LIST_FIELDS = frozenset({'items', 'args', 'params', 'pos_or_kw', 'kw_only', 'type_params', 'methods'})
+
+
+def _intern[T: TypeNode](node: T) -> T:
+    values: list[Any] = []
+    for name in _field_names(type(node)):
+        value = getattr(node, name)
+        if type(value) is list or (type(value) is tuple and name in _LIST_FIELDS):
+            value = _ListFields(value)
+            object.__setattr__(node, name, value)
+        values.append(value)
+    key = (type(node), *values)
+    canonical = _interned.get(key)
+    if canonical is None:
+        object.__setattr__(node, '_type_id', next(_next_type_id))
+        _interned[key] = canonical = node
+    return canonical
+
+
+def _unintern[T: TypeNode](cls: type[T], values: tuple) -> T:
+    node = object.__new__(cls)
+    for name, value in zip(_field_names(cls), values):
+        object.__setattr__(node, name, value)
+    return _intern(node)
+
+
+def type_id(t: TypeExpr | TypeNode) -> int:
+    """Integer id of a type expression, never reused. Structurally equal types share an id while either is alive"""
+    if isinstance(t, str):
+        id_ = _primitive_ids.get(t)
+        if id_ is None:
+            id_ = _primitive_ids[t] = next(_next_type_id)
+        return id_
+    return t._type_id
+
+
+@dataclass(frozen=True, eq=False)
+class TypeAnd(TypeNode):
     """type intersection: T1 & T2"""
-    items: list[TypeExpr]
+    items: tuple[TypeExpr, ...]
     def __post_init__(self):
         assert len(self.items) > 1, f'TypeAnd must have at least two items, got {len(self.items)}'
 
-@dataclass
-class TypeOr:
+@dataclass(frozen=True, eq=False)
+class TypeOr(TypeNode):
     """type union: T1 | T2"""
-    items: list[TypeExpr]
+    items: tuple[TypeExpr, ...]
     def __post_init__(self):
         assert len(self.items) > 1, f'TypeOr must have at least two items, got {len(self.items)}'
 
-@dataclass
-class TypeNot:
+@dataclass(frozen=True, eq=False)
+class TypeNot(TypeNode):
     """type negation: ~T"""
     type: TypeExpr
 
-@dataclass
-class TypeParameterize:
+@dataclass(frozen=True, eq=False)
+class TypeParameterize(TypeNode):
     """type parameterization: T<A1 A2 ...>"""
     t: TypeExpr
-    args: list[TypeExpr] #TODO: other stuff can be set here, though perhaps it doesn't affect the typing?
+    args: tuple[TypeExpr, ...] #TODO: other stuff can be set here, though perhaps it doesn't affect the typing?
 
 
-@dataclass(frozen=True)
-class TypeVariable:
+@dataclass(frozen=True, eq=False)
+class TypeVariable(TypeNode):
     """A symbolic type inside a generic type-alias body."""
 
     name: str
     bound: 'TypeExpr' = TOP_TYPE
 
 
-@dataclass(frozen=True)
-class DimensionType:
+@dataclass(frozen=True, eq=False)
+class DimensionType(TypeNode):
     """A normalized physical dimension used only during type checking.
 
     Entries are sorted ``(base_dimension, exponent)`` pairs with zero
@@ -98,8 +184,8 @@ class DimensionType:
     powers: tuple[tuple[str, int], ...]
 
 
-@dataclass(frozen=True)
-class QuantityType:
+@dataclass(frozen=True, eq=False)
+class QuantityType(TypeNode):
     """A numeric runtime representation tagged with a physical dimension."""
 
     number: 'TypeExpr'
@@ -108,8 +194,8 @@ class QuantityType:
 
 # Building blocks for FunctionType / OverloadType (not HIR params, not standalone types)
 
-@dataclass
-class PosOrKwArg:
+@dataclass(frozen=True, eq=False)
+class PosOrKwArg(TypeNode):
     """One positional slot in a FunctionType, optionally addressable by name.
 
     ``required=False`` means the function supplies a default when a completed
@@ -121,8 +207,8 @@ class PosOrKwArg:
     type: TypeExpr
     required: bool = True
 
-@dataclass
-class KwOnlyArg:
+@dataclass(frozen=True, eq=False)
+class KwOnlyArg(TypeNode):
     """One keyword-only slot in a FunctionType.
 
     Part of the function-type representation: name + accepted argument type +
@@ -133,8 +219,8 @@ class KwOnlyArg:
     type: TypeExpr
     required: bool
 
-@dataclass
-class GenericParam:
+@dataclass(frozen=True, eq=False)
+class GenericParam(TypeNode):
     """A generic type variable declared on a FunctionType (e.g. T in `<T of number>`).
 
     Part of the function-type representation, not a TypeExpr by itself and not
@@ -145,83 +231,83 @@ class GenericParam:
     bound: TypeExpr = TOP_TYPE
 
 
-@dataclass
-class GenericTypeAlias:
+@dataclass(frozen=True, eq=False)
+class GenericTypeAlias(TypeNode):
     """A compile-time type constructor expanded by ``Alias<args...>``."""
 
-    params: list[GenericParam]
+    params: tuple[GenericParam, ...]
     body: 'TypeExpr'
 
-@dataclass
-class FunctionType:
+@dataclass(frozen=True, eq=False)
+class FunctionType(TypeNode):
     """Type of a single callable: signature shape + return type.
 
     Built from PosOrKwArg / KwOnlyArg / GenericParam slots (and optional rest).
     This is a TypeExpr atom used in subtyping and dispatch, not an HIR function value.
     """
-    pos_or_kw: list[PosOrKwArg]
-    kw_only: list[KwOnlyArg]
+    pos_or_kw: tuple[PosOrKwArg, ...]
+    kw_only: tuple[KwOnlyArg, ...]
     rest: str | None  # rest param name, or None
     ret: TypeExpr
-    type_params: list[GenericParam] = field(default_factory=list)
+    type_params: tuple[GenericParam, ...] = ()
 
-@dataclass
-class OverloadType:
+@dataclass(frozen=True, eq=False)
+class OverloadType(TypeNode):
     """Type of an overloaded callable: an ordered set of FunctionType alternatives.
 
     Produced by combining callables with `and`/`&` (i.e. function overloading). Still a
     TypeExpr atom; dispatch picks one method at each call site.
     """
-    methods: list[FunctionType]
+    methods: tuple[FunctionType, ...]
     # def __post_init__(self):
     #     assert len(self.methods) >= 1, 'OverloadType must have at least one method'
 
 
-@dataclass
-class SequenceType:
+@dataclass(frozen=True, eq=False)
+class SequenceType(TypeNode):
     """Multiple values in a sequence: (T1 T2 ... Tn). Use the sequence() smart constructor to build these."""
-    items: list[TypeExpr]
+    items: tuple[TypeExpr, ...]
     def __post_init__(self):
         assert len(self.items) > 1, f'SequenceType must have at least two items, got {len(self.items)}. 0/1-item sequences collapse to void/the item via sequence()'
 
 
-@dataclass(frozen=True)
-class IntegerLiteralType:
+@dataclass(frozen=True, eq=False)
+class IntegerLiteralType(TypeNode):
     """The singleton type inhabited by exactly one mathematical integer value."""
     value: int
 
 
-@dataclass(frozen=True)
-class StringLiteralType:
+@dataclass(frozen=True, eq=False)
+class StringLiteralType(TypeNode):
     """The singleton type inhabited by one exact Unicode scalar sequence."""
 
     value: str
 
 
-@dataclass(frozen=True)
-class BinaryLiteralType:
+@dataclass(frozen=True, eq=False)
+class BinaryLiteralType(TypeNode):
     """The singleton type inhabited by one exact byte sequence."""
 
     value: bytes
 
 
-@dataclass(frozen=True)
-class StringType:
+@dataclass(frozen=True, eq=False)
+class StringType(TypeNode):
     """An immutable grapheme sequence, optionally refined to an exact length."""
 
     length: int | None = None
 
 
-@dataclass(frozen=True)
-class ArrayType:
+@dataclass(frozen=True, eq=False)
+class ArrayType(TypeNode):
     """A homogeneous mutable array, optionally refined to an exact length."""
 
     element: 'TypeExpr'
     length: int | None = None
 
 
-@dataclass(frozen=True)
-class ObjectField:
+@dataclass(frozen=True, eq=False)
+class ObjectField(TypeNode):
     """One named field in source order."""
 
     name: str
@@ -229,8 +315,8 @@ class ObjectField:
     mutable: bool = True
 
 
-@dataclass(frozen=True)
-class ObjectType:
+@dataclass(frozen=True, eq=False)
+class ObjectType(TypeNode):
     """A structural object whose field order is part of the type."""
 
     fields: tuple[ObjectField, ...]
@@ -242,12 +328,12 @@ class ObjectType:
         return None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class PathType(ObjectType):
     """A thin path object containing its lexical text."""
 
 
-@dataclass(frozen=True, init=False)
+@dataclass(frozen=True, eq=False, init=False)
 class PathLiteralType(PathType):
     """The singleton type inhabited by one exact lexical path."""
 
@@ -265,8 +351,8 @@ class PathLiteralType(PathType):
 PATH_TYPE = PathType((ObjectField('path', StringType()),))
 
 
-@dataclass(frozen=True)
-class ModuleField:
+@dataclass(frozen=True, eq=False)
+class ModuleField(TypeNode):
     """One compile-time member exported by a source module."""
 
     name: str
@@ -275,8 +361,8 @@ class ModuleField:
     type_value: 'TypeAliasValue | None' = None
 
 
-@dataclass(frozen=True)
-class ModuleType:
+@dataclass(frozen=True, eq=False)
+class ModuleType(TypeNode):
     """A compile-time namespace; it has no runtime representation."""
 
     fields: tuple[ModuleField, ...]
@@ -470,13 +556,70 @@ def multiply_dimensions(left: DimensionType, right: DimensionType) -> DimensionT
     return dimension(*left.powers, *right.powers)
 
 
+@dataclass
+class MemoStats:
+    """Hit/miss counters of one of the TypeSystem's memo tables, for tuning its size."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+    maxsize: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _LruMemo[K, V]:
+    """Bounded memo table that evicts the least recently used entry once `maxsize` entries are stored."""
+    def __init__(self, maxsize: int):
+        self._table: OrderedDict[K, V] = OrderedDict()
+        self.stats = MemoStats(maxsize=maxsize)
+
+    def get(self, key: K) -> V | None:
+        value = self._table.get(key)
+        if value is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        self._table.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: V) -> V:
+        self._table[key] = value
+        if len(self._table) > self.stats.maxsize:
+            self._table.popitem(last=False)
+            self.stats.evictions += 1
+        self.stats.size = len(self._table)
+        return value
+
+    def clear(self) -> None:
+        self._table.clear()
+        self.stats.size = 0
+
+
 class TypeSystem:
-    def __init__(self, system_types: list[Primitive|tuple[Primitive, Primitive]] = _default_system_types):
+    def __init__(self, system_types: list[Primitive|tuple[Primitive, Primitive]] = _default_system_types, *, memo_size: int = 4096):
+        # memoized results of is_subtype (keyed on interned type pairs) and clause_is_empty. Both depend on the
+        # nominal lattice, so any change to it clears them
+        self._subtype_memo: _LruMemo[tuple[TypeExpr, TypeExpr], bool] = _LruMemo(memo_size)
+        self._clause_memo: _LruMemo[DnfClause, bool] = _LruMemo(memo_size)
+        # overload dispatch: an index per overload set, and the outcome (result or error message) per call signature
+        self._dispatch_indexes: _LruMemo[tuple[FunctionType, ...], _DispatchIndex] = _LruMemo(memo_size)
+        self._dispatch_memo: _LruMemo[tuple, DispatchResult | str] = _LruMemo(memo_size)
         self._named_types: set[str] = {TOP_TYPE, BOTTOM_TYPE, EXCEPTION_TYPE, TYPE_TYPE} # void and inferred don't participate in type expressions
         self._type_parents: dict[str, set[str]] = defaultdict(set, {BOTTOM_TYPE: {TOP_TYPE}, EXCEPTION_TYPE: {TOP_TYPE}, TYPE_TYPE: {TOP_TYPE}})
         self._type_children: dict[str, set[str]] = defaultdict(set, {TOP_TYPE: {BOTTOM_TYPE, EXCEPTION_TYPE, TYPE_TYPE}})
         # order-independent keys via sorted (a, b); separate from the subtype graph
         self._promote_rules: dict[tuple[str, str], str] = {}
+        # reachability in the subtype graph: one bit per named type, and per type the bits of itself and all of its
+        # (transitive) parents, kept up to date as links are added. `a` is a nominal subtype of `b` iff it has b's bit
+        self._type_bits: dict[str, int] = {}
+        self._ancestor_bits: dict[str, int] = {}
+        for name in (TOP_TYPE, BOTTOM_TYPE, EXCEPTION_TYPE, TYPE_TYPE):
+            self._type_bits[name] = 1 << len(self._type_bits)
+            self._ancestor_bits[name] = self._type_bits[name] | self._type_bits[TOP_TYPE]
 
         for t in system_types:
             if isinstance(t, tuple): self.add_type(*t) 
@@ -486,6 +629,7 @@ class TypeSystem:
         if name in self._named_types:
             raise ValueError(f'Type {name} already defined')
         self._named_types.add(name)
+        self._type_bits[name] = self._ancestor_bits[name] = 1 << len(self._type_bits)
         self.add_type_link(name, parent)
 
     def add_type_link(self, child: str, parent: str) -> None:
@@ -496,6 +640,17 @@ class TypeSystem:
         self._type_parents[child].add(parent)
         self._type_children[parent].add(child)
 
+        # the child and everything below it gain the parent's ancestors
+        inherited = self._ancestor_bits[parent]
+        frontier = [child]
+        while frontier:
+            cur = frontier.pop()
+            if self._ancestor_bits[cur] & inherited == inherited:
+                continue
+            self._ancestor_bits[cur] |= inherited
+            frontier.extend(self._type_children[cur])
+        self._invalidate_memos()
+
     def add_promote_rule(self, a: str, b: str, result: str) -> None:
         """Register promote_type(a, b) == result (order-independent). Extensible for user types."""
         if a not in self._named_types:
@@ -505,6 +660,21 @@ class TypeSystem:
         if result not in self._named_types:
             raise ValueError(f'Type {result} not defined')
         self._promote_rules[tuple(sorted((a, b)))] = result
+        self._invalidate_memos()
+
+    def _invalidate_memos(self) -> None:
+        self._subtype_memo.clear()
+        self._clause_memo.clear()
+        self._dispatch_indexes.clear()
+        self._dispatch_memo.clear()
+
+    def memo_stats(self) -> dict[str, MemoStats]:
+        """Hit/miss statistics of the `is_subtype`, `clause_is_empty` and `match_best_function` memo tables"""
+        return {
+            'is_subtype': self._subtype_memo.stats,
+            'clause_is_empty': self._clause_memo.stats,
+            'match_best_function': self._dispatch_memo.stats,
+        }
 
     def promote_type(self, a: TypeExpr, b: TypeExpr) -> Primitive | None:
         """Common concrete type for heterogeneous arithmetic, or None if none exists.
@@ -528,30 +698,28 @@ class TypeSystem:
 
     def is_subtype(self, s: TypeExpr, t: TypeExpr) -> bool:
         """Top-level type checking function. `s of? t` => `is_empty(s & ~t)`"""
-        return self.is_empty(intersect(s, negate(t)))
+        result = self._subtype_memo.get((s, t))
+        if result is None:
+            result = self._subtype_memo.put((s, t), self.is_empty(intersect(s, negate(t))))
+        return result
 
 
     def _is_nom_subtype(self, a: Primitive, b: Primitive) -> bool:
         if a == b:
             return True
-        frontier = [a]
-        seen = {a}
-        while frontier:
-            cur = frontier.pop()
-            for parent in self._type_parents[cur]:
-                if parent == b:
-                    return True
-                if parent not in seen:
-                    seen.add(parent)
-                    frontier.append(parent)
-        return False
+        return bool(self._ancestor_bits.get(a, 0) & self._type_bits.get(b, 0))
 
 
     def _meet_prim(self, a: Primitive, b: Primitive) -> Primitive | None:
         """GLB for tree-ish nominal DAG. None => disjoint / uninhabited."""
-        if self._is_nom_subtype(a, b):
+        if a == b:
             return a
-        if self._is_nom_subtype(b, a):
+        # the shared ancestors are all of b's iff a is below b (and vice versa)
+        a_ancestors, b_ancestors = self._ancestor_bits.get(a, 0), self._ancestor_bits.get(b, 0)
+        shared = a_ancestors & b_ancestors
+        if b_ancestors and shared == b_ancestors:
+            return a
+        if a_ancestors and shared == a_ancestors:
             return b
         return None  # unrelated => empty (v1)
 
@@ -868,6 +1036,12 @@ class TypeSystem:
         Empty iff the positive meet is uninhabited, or it is implied by some ~Ni
         (i.e. meet of? Ni).
         """
+        result = self._clause_memo.get(clause)
+        if result is None:
+            result = self._clause_memo.put(clause, self._clause_is_empty(clause))
+        return result
+
+    def _clause_is_empty(self, clause: DnfClause) -> bool:
         pos = [atom for pol, atom in clause if pol]
         neg = [atom for pol, atom in clause if not pol]
 
@@ -899,9 +1073,34 @@ class TypeSystem:
 
     def is_empty(self, t: TypeExpr) -> bool:
         """True iff t is uninhabited."""
-        dnf = normalize(t)
-        # prune as we go; all clauses empty => empty type
-        return all(self.clause_is_empty(c) for c in dnf)
+        # all clauses empty => empty type. Stops at the first inhabited clause without expanding the rest of the DNF
+        for _ in self._inhabited_clauses((), (to_nnf(t),)):
+            return False
+        return True
+
+    def _inhabited_clauses(self, prefix: DnfClause, pending: tuple[TypeExpr, ...]) -> Iterator[DnfClause]:
+        """
+        Lazily distribute `prefix & pending[0] & pending[1] & …` (all in NNF) into DNF, yielding only the non-empty
+        clauses. Conjuncts can only narrow a clause, so an empty prefix prunes every clause that would extend it.
+        """
+        if not pending:
+            yield prefix
+            return
+        t, rest = pending[0], pending[1:]
+        if t == BOTTOM_TYPE:
+            return
+        if t == TOP_TYPE:
+            yield from self._inhabited_clauses(prefix, rest)
+        elif isinstance(t, TypeOr):
+            for x in t.items:
+                yield from self._inhabited_clauses(prefix, (x, *rest))
+        elif isinstance(t, TypeAnd):
+            yield from self._inhabited_clauses(prefix, (*t.items, *rest))
+        else:
+            literal = _dnf_literal(t)
+            clause = prefix if literal in prefix else (*prefix, literal)
+            if not self.clause_is_empty(clause):
+                yield from self._inhabited_clauses(clause, rest)
 
 
 
@@ -1190,9 +1389,39 @@ class TypeSystem:
         kw_types: dict[str, TypeExpr] | None = None,
         expected_return: TypeExpr | None = None,
     ) -> 'DispatchResult':
-        """Julia-style: unique most-specific applicable method, with promote-and-redispatch fallback."""
+        """Julia-style: unique most-specific applicable method, with promote-and-redispatch fallback.
+
+        Outcomes are memoized per overload set and call signature, so repeated calls (e.g. of prelude operators)
+        are dispatched once. The returned result is shared between those calls and must not be modified
+        """
         kw_types = kw_types or {}
-        apps = self._applicable_indexed(methods, pos_types, kw_types, expected_return)
+        methods = tuple(methods)
+        key = (methods, tuple(pos_types), tuple(kw_types.items()), expected_return)
+        result = self._dispatch_memo.get(key)
+        if result is None:
+            try:
+                result = self._match_best_function(self._dispatch_index(methods), pos_types, kw_types, expected_return)
+            except DispatchError as e:
+                result = str(e)
+            self._dispatch_memo.put(key, result)
+        if isinstance(result, str):
+            raise DispatchError(result)
+        return result
+
+    def _dispatch_index(self, methods: tuple[FunctionType, ...]) -> _DispatchIndex:
+        index = self._dispatch_indexes.get(methods)
+        if index is None:
+            index = self._dispatch_indexes.put(methods, _DispatchIndex(self, methods))
+        return index
+
+    def _match_best_function(
+        self,
+        index: _DispatchIndex,
+        pos_types: list[TypeExpr],
+        kw_types: dict[str, TypeExpr],
+        expected_return: TypeExpr | None,
+    ) -> DispatchResult:
+        apps = index.applicable(pos_types, kw_types, expected_return)
         promote_pos: list[TypeExpr | None] = [None] * len(pos_types)
 
         if not apps and pos_types and all(isinstance(t, str) for t in pos_types):
@@ -1204,19 +1433,19 @@ class TypeSystem:
                     break
             if common is not None:
                 promoted_pos = [common] * len(pos_types)
-                apps = self._applicable_indexed(methods, promoted_pos, kw_types, expected_return)
+                apps = index.applicable(promoted_pos, kw_types, expected_return)
                 if apps:
                     promote_pos = [None if t == common else common for t in pos_types]
 
         if not apps:
             raise DispatchError(f'no matching method for pos={pos_types!r} kw={kw_types!r}')
         winners = [
-            (index, method)
-            for index, method in apps
+            (method_index, method)
+            for method_index, method in apps
             if not any(
-                self.more_specific(other, method)
+                index.more_specific(other, method)
                 for other_index, other in apps
-                if other_index != index
+                if other_index != method_index
             )
         ]
         if len(winners) != 1:
@@ -1225,6 +1454,67 @@ class TypeSystem:
         return DispatchResult(method, method_index, promote_pos)
 
 
+class _DispatchIndex:
+    """Dispatch tables for one overload set, built up lazily as calls are dispatched.
+
+    - per argument count, the methods that can take that many positional arguments
+    - per (position, argument type), the methods whose parameter there accepts the argument. Only generic methods
+      are always kept, since their parameters are only known once the call's type arguments are inferred
+    - the specificity order between (instantiated) methods
+    """
+    def __init__(self, type_system: TypeSystem, methods: tuple[FunctionType, ...]):
+        self.type_system = type_system
+        self.methods = methods
+        self._generic = sum(1 << i for i, m in enumerate(methods) if m.type_params)
+        self._arity_masks: dict[int, int] = {}
+        self._position_masks: dict[tuple[int, TypeExpr], int] = {}
+        self._specificity: dict[tuple[FunctionType, FunctionType], bool] = {}
+
+    def _arity_mask(self, num_pos: int) -> int:
+        mask = self._arity_masks.get(num_pos)
+        if mask is None:
+            mask = self._arity_masks[num_pos] = sum(
+                1 << i for i, m in enumerate(self.methods)
+                if num_pos <= len(m.pos_or_kw) or m.rest is not None
+            )
+        return mask
+
+    def _position_mask(self, position: int, arg_type: TypeExpr) -> int:
+        mask = self._position_masks.get((position, arg_type))
+        if mask is None:
+            mask = self._position_masks[(position, arg_type)] = self._generic | sum(
+                1 << i for i, m in enumerate(self.methods)
+                if position >= len(m.pos_or_kw) or self.type_system.is_subtype(arg_type, m.pos_or_kw[position].type)
+            )
+        return mask
+
+    def applicable(
+        self,
+        pos_types: list[TypeExpr],
+        kw_types: dict[str, TypeExpr],
+        expected_return: TypeExpr | None,
+    ) -> list[tuple[int, FunctionType]]:
+        """Same as `TypeSystem._applicable_indexed`, skipping methods the tables rule out"""
+        candidates = self._arity_mask(len(pos_types))
+        for position, arg_type in enumerate(pos_types):
+            if not candidates:
+                break
+            candidates &= self._position_mask(position, arg_type)
+        out: list[tuple[int, FunctionType]] = []
+        for i, method in enumerate(self.methods):
+            if candidates >> i & 1:
+                inst = self.type_system.try_instantiate_for_call(method, pos_types, kw_types, expected_return)
+                if inst is not None:
+                    out.append((i, inst))
+        return out
+
+    def more_specific(self, m1: FunctionType, m2: FunctionType) -> bool:
+        result = self._specificity.get((m1, m2))
+        if result is None:
+            result = self._specificity[(m1, m2)] = self.type_system.more_specific(m1, m2)
+        return result
+
+
 
 
 
@@ -1371,7 +1661,19 @@ def negate(t: TypeExpr) -> TypeExpr:
     return TypeNot(t)
 
 
+# structural, so shared by every TypeSystem, but bounded like the TypeSystem memos
+_nnf_memo: _LruMemo[TypeNode, TypeExpr] = _LruMemo(4096)
+
 def to_nnf(t: TypeExpr) -> TypeExpr:
+    if isinstance(t, str):
+        return t
+    nnf = _nnf_memo.get(t)
+    if nnf is None:
+        nnf = _nnf_memo.put(t, _to_nnf(t))
+    return nnf
+
+
+def _to_nnf(t: TypeExpr) -> TypeExpr:
     if isinstance(t, TypeNot):
         return negate(t.type)
     if isinstance(t, TypeOr):
@@ -1410,31 +1712,49 @@ def to_nnf(t: TypeExpr) -> TypeExpr:
 # Normalize → DNF of signed atoms
 # ---------------------------------------------------------------------------
 
+_ATOM_TYPES = (str, TypeParameterize, TypeVariable, DimensionType, QuantityType, FunctionType, OverloadType, SequenceType, IntegerLiteralType, StringLiteralType, BinaryLiteralType, StringType, ArrayType, ObjectType, PathType, PathLiteralType, ModuleType)
+
+_dnf_memo: _LruMemo[TypeNode, Dnf] = _LruMemo(4096)
+
+
 def normalize(t: TypeExpr) -> Dnf:
+    """Full DNF of t. `TypeSystem.is_empty` builds the DNF lazily instead, pruning empty clauses as it goes"""
     return _dnf(to_nnf(t))
 
 
+def _dnf_literal(t: TypeExpr) -> tuple[bool, LiteralAtom]:
+    if isinstance(t, TypeNot):
+        # NNF: inner is atom
+        return (False, t.type)
+    if isinstance(t, _ATOM_TYPES):
+        return (True, t)
+    raise TypeError(f'normalize: unhandled {t!r}')
+
+
 def _dnf(t: TypeExpr) -> Dnf:
     if t == BOTTOM_TYPE:
         return ()
     if t == TOP_TYPE:
         return ((),)  # true
-    if isinstance(t, TypeNot):
-        # NNF: inner is atom
-        return (((False, t.type),),)
-    if isinstance(t, (str, TypeParameterize, TypeVariable, DimensionType, QuantityType, FunctionType, OverloadType, SequenceType, IntegerLiteralType, StringLiteralType, BinaryLiteralType, StringType, ArrayType, ObjectType, PathType, PathLiteralType, ModuleType)):
-        return (((True, t),),)
+    if not isinstance(t, (TypeOr, TypeAnd)):
+        return ((_dnf_literal(t),),)
+    # shared subterms are only expanded once
+    dnf = _dnf_memo.get(t)
+    if dnf is None:
+        dnf = _dnf_memo.put(t, _dnf_compound(t))
+    return dnf
+
+
+def _dnf_compound(t: TypeOr | TypeAnd) -> Dnf:
     if isinstance(t, TypeOr):
         clauses: list[DnfClause] = []
         for x in t.items:
             clauses.extend(_dnf(x))
         return tuple(clauses)
-    if isinstance(t, TypeAnd):
-        acc: Dnf = ((),)
-        for x in t.items:
-            acc = _distribute(acc, _dnf(x))
-        return acc
-    raise TypeError(f'normalize: unhandled {t!r}')
+    acc: Dnf = ((),)
+    for x in t.items:
+        acc = _distribute(acc, _dnf(x))
+    return acc
 
 
 def _distribute(left: Dnf, right: Dnf) -> Dnf:
@@ -0,0 +1,80 @@
+"""
+Cost of the whole-program analyses with and without the unit cache (`.dewya`).
+
+The program is `functions` synthetic functions from `bench_bounds`, written to a temporary directory. Each row times
+`ModuleCompiler.finish` (the bounds and initialization analyses of the merged program) when nothing is cached, when
+the previous compile cached everything, and after editing one of the functions.
+
+Run from the repository root:
+    python -m tests.benchmarks.bench_analysis_cache [--functions 1 10 40] [--locals 200]
+"""
+
+import shutil
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from dewy.parser.cache import cache_dir
+from dewy.reporting import SrcFile
+from dewy.semantic import analysis_cache, modules
+from tests.benchmarks.bench_bounds import synthetic_function
+
+
+def synthetic_program(num_functions: int, num_locals: int, edited: int | None = None) -> str:
+    parts = []
+    for n in range(num_functions):
+        source = synthetic_function(num_locals, 2, True).replace('let f =', f'let f{n} =')
+        if n == edited:
+            source = source.replace('let total:int64 = 0', 'let total:int64 = 1')
+        parts.append(source)
+    calls = ' + '.join(f'f{n}({n})' for n in range(num_functions))
+    return ''.join(parts) + f'let main = ():>int64 => {{\n    return {calls}\n}}\n'
+
+
+def finish_time(path: Path) -> float:
+    """seconds spent in `ModuleCompiler.finish` checking the program at `path`"""
+    elapsed = 0.0
+    finish = modules.ModuleCompiler.finish
+
+    def timed(compiler: modules.ModuleCompiler, entry: modules.ModuleRecord):
+        nonlocal elapsed
+        t0 = perf_counter()
+        try:
+            return finish(compiler, entry)
+        finally:
+            elapsed += perf_counter() - t0
+
+    modules.ModuleCompiler.finish = timed  # type: ignore[method-assign]
+    try:
+        modules.typecheck_program(SrcFile.from_path(path))
+    finally:
+        modules.ModuleCompiler.finish = finish  # type: ignore[method-assign]
+    return elapsed
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--functions', type=int, nargs='*', default=[1, 10, 40], help='functions in the program')
+    parser.add_argument('--locals', type=int, default=200, help='integer locals per function')
+    args = parser.parse_args()
+    if cache_dir(Path()) is None:
+        raise SystemExit('the caches are turned off (DEWY_CACHE_DIR=off)')
+
+    print(f'{"functions":>9} {"cold (ms)":>10} {"warm (ms)":>10} {"edited (ms)":>12}')
+    for num_functions in args.functions:
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / 'program.dewy'
+            path.write_text(synthetic_program(num_functions, args.locals))
+            finish_time(path)  # parse and interface caches
+            analysis_cache.cache_path(path).unlink(missing_ok=True)
+            cold = finish_time(path)
+            warm = finish_time(path)
+            path.write_text(synthetic_program(num_functions, args.locals, edited=num_functions // 2))
+            edited = finish_time(path)
+            shutil.rmtree(cache_dir(path.parent), ignore_errors=True)
+        print(f'{num_functions:>9} {cold * 1e3:>10.1f} {warm * 1e3:>10.1f} {edited * 1e3:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Cost of the bounds analysis on large functions.
+
+Each synthetic function declares `locals` integer locals (chains of arithmetic on a parameter, most of them never
+flowing into an index), then runs `depth` nested counting loops whose innermost body indexes an array with the loop
+counters. The `indexed` shape additionally reads every local through a guarded index, so that all of them matter to
+the analysis. Programs are checked once up front; only `bounds.validate_bounds` is timed.
+
+Run from the repository root:
+    python -m tests.benchmarks.bench_bounds [--locals 250 1000 2000] [--depths 2 8]
+"""
+
+from argparse import ArgumentParser
+
+from dewy.reporting import SrcFile
+from dewy.semantic import modules
+from dewy.semantic.analyze import bounds
+from tests.benchmarks.synthetic import best_time
+
+
+def synthetic_function(num_locals: int, depth: int, indexed: bool) -> str:
+    lines = ['let f = (seed:int64):>int64 => {', '    let values:array<int64> = [1 2 3 4 5 6 7 8]', '    let total:int64 = 0']
+    lines.append('    let v0:int64 = seed')
+    for k in range(1, num_locals):
+        lines.append(f'    let v{k}:int64 = v{k - 1} * 3 + {k % 7}')
+        if indexed:
+            lines.append(f'    if 0 <=? v{k} and v{k} <? values.length {{ total += values[v{k}] }}')
+    indent = '    '
+    for level in range(depth):
+        lines += [f'{indent}let i{level}:int64 = 0', f'{indent}loop i{level} <? values.length {{']
+        indent += '    '
+    lines.append(f'{indent}total += ' + ' + '.join(f'values[i{level}]' for level in range(depth)))
+    for level in reversed(range(depth)):
+        lines.append(f'{indent}i{level} += 1')
+        indent = indent[:-4]
+        lines.append(f'{indent}}}')
+    lines += ['    return total', '}']
+    return '\n'.join(lines) + '\n'
+
+
+def checked(srcfile: SrcFile) -> tuple:
+    """the arguments `validate_bounds` is called with when checking `srcfile`, without the unit cache"""
+    captured = []
+    validate = bounds.validate_bounds
+    bounds.validate_bounds = lambda *args: (captured.append(args[:3]), validate(*args))[1]
+    try:
+        modules.typecheck_program(srcfile)
+    finally:
+        bounds.validate_bounds = validate
+    return captured[0]
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--locals', type=int, nargs='*', default=[250, 1000, 2000], help='integer locals per function')
+    parser.add_argument('--depths', type=int, nargs='*', default=[2, 8], help='nesting depth of the counting loops')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timing runs (best is kept)')
+    args = parser.parse_args()
+
+    print(f'{"shape":<8} {"locals":>7} {"depth":>6} {"time (ms)":>10}')
+    for indexed in (False, True):
+        for num_locals in args.locals:
+            for depth in args.depths:
+                arguments = checked(SrcFile(None, synthetic_function(num_locals, depth, indexed)))
+                elapsed = best_time(lambda arguments=arguments: bounds.validate_bounds(*arguments), args.repeat)
+                shape = 'indexed' if indexed else 'sparse'
+                print(f'{shape:<8} {num_locals:>7} {depth:>6} {elapsed * 1e3:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
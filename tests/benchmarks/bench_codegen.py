@@ -0,0 +1,83 @@
+"""
+End-to-end udewy `codegen` time over the programs in `dewy/tests/`.
+
+Each program is checked and emitted once to warm the parse, interface and analysis caches, then timed through
+`codegen` as a whole, split into checking (`typecheck_program_with_intervals`), lowering (`lower_for_udewy`) and
+emission (everything else). Programs that don't compile are skipped.
+
+Run from the repository root:
+    python -m tests.benchmarks.bench_codegen [--repeat 3]
+"""
+
+import sys
+from argparse import ArgumentParser
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+from pathlib import Path
+from time import perf_counter
+
+from dewy.backend.udewy import codegen, lower
+from dewy.reporting import ReportException, SrcFile
+from dewy.semantic import modules
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def corpus() -> list[SrcFile]:
+    srcfiles = []
+    for path in sorted((REPO_ROOT / 'dewy' / 'tests').glob('*.dewy')):
+        srcfile = SrcFile.from_path(path)
+        try:
+            with redirect_stdout(StringIO()), redirect_stderr(StringIO()):
+                codegen(srcfile)
+        except (SystemExit, ReportException) as e:
+            reason = e.report.title if isinstance(e, ReportException) else 'exited with an error'
+            print(f'skipping {path.name}: {reason}', file=sys.stderr)
+            continue
+        srcfiles.append(srcfile)
+    return srcfiles
+
+
+def phase_times(srcfiles: list[SrcFile]) -> dict[str, float]:
+    """seconds spent in each phase of compiling every program in `srcfiles` once"""
+    times = {'check': 0.0, 'lower': 0.0}
+    check, lower_for_udewy = modules.typecheck_program_with_intervals, lower.lower_for_udewy
+
+    def timed(phase: str, func):
+        def run(*args, **kwargs):
+            t0 = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                times[phase] += perf_counter() - t0
+        return run
+
+    modules.typecheck_program_with_intervals = timed('check', check)  # type: ignore[assignment]
+    lower.lower_for_udewy = timed('lower', lower_for_udewy)  # type: ignore[assignment]
+    try:
+        t0 = perf_counter()
+        for srcfile in srcfiles:
+            codegen(srcfile)
+        times['total'] = perf_counter() - t0
+    finally:
+        modules.typecheck_program_with_intervals = check  # type: ignore[assignment]
+        lower.lower_for_udewy = lower_for_udewy  # type: ignore[assignment]
+    times['emit'] = times['total'] - times['check'] - times['lower']
+    return times
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='number of timing runs (best is kept)')
+    args = parser.parse_args()
+
+    srcfiles = corpus()
+    runs = [phase_times(srcfiles) for _ in range(args.repeat)]
+    best = min(runs, key=lambda times: times['total'])
+    print(f'{len(srcfiles)} programs')
+    for phase in ('check', 'lower', 'emit', 'total'):
+        print(f'{phase:<6} {best[phase] * 1e3:>9.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Peak RSS of the front end (`p0.parse`, i.e. t0 -> t1 -> t2 -> p0) while the parse tree is alive.
+
+Each input is parsed in a fresh interpreter, and the reported number is how much the peak resident
+set size grew over the interpreter that had already imported the parser and read the source. Runs
+the largest Dewy sources in the repository plus synthetic sources (see `synthetic.py`).
+
+Run from the repository root:
+    python -m tests.benchmarks.bench_frontend_rss [--sizes 1M 4M]
+"""
+
+import gc
+import resource
+import subprocess
+import sys
+from argparse import ArgumentParser
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from tests.benchmarks.bench_t1_memory import parse_size
+from tests.benchmarks.synthetic import fmt_size, synthetic_source
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def largest_sources(n: int) -> list[str]:
+    paths = [*(REPO_ROOT / 'tests').rglob('*.dewy'), *(REPO_ROOT / 'examples').rglob('*.dewy')]
+    paths.sort(key=lambda path: path.stat().st_size, reverse=True)
+    return [path.relative_to(REPO_ROOT).as_posix() for path in paths[:n]]
+
+
+def peak_rss() -> int:
+    """peak resident set size of this process in bytes"""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def child(source: str) -> None:
+    """parse `source` (a path, or `synthetic:<size>`) and print the source length and peak RSS growth"""
+    from dewy.parser import p0
+    from dewy.reporting import ReportException, SrcFile
+
+    if source.startswith('synthetic:'):
+        srcfile = SrcFile('<synthetic>', synthetic_source(parse_size(source.removeprefix('synthetic:'))))
+    else:
+        srcfile = SrcFile(Path(source), (REPO_ROOT / source).read_text())
+    gc.collect()
+    before = peak_rss()
+    try:
+        with redirect_stdout(StringIO()), redirect_stderr(StringIO()):
+            tree = p0.parse(srcfile)
+    except (SystemExit, ReportException) as e:
+        # some of the test sources are intentionally malformed. The parent reports them as skipped
+        print(e.report.title if isinstance(e, ReportException) else 'exited with an error', file=sys.stderr)
+        return
+    print(len(srcfile.body), peak_rss() - before)
+    del tree
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=5, help='number of (largest) repository sources to try parsing')
+    parser.add_argument('--sizes', nargs='*', default=['1M', '4M'], help='synthetic source sizes')
+    parser.add_argument('--child', help=None)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        child(args.child)
+        return
+
+    print(f'{"source":<50} {"size":>10} {"peak RSS growth":>16} {"bytes/char":>10}')
+    for source in [*largest_sources(args.files), *(f'synthetic:{size}' for size in args.sizes)]:
+        result = subprocess.run([sys.executable, '-m', 'tests.benchmarks.bench_frontend_rss', '--child', source], cwd=REPO_ROOT, capture_output=True, text=True, check=False)
+        if result.returncode != 0:
+            # a crash in the front end, rather than an error it reports
+            print(f'{source:<50} failed: {result.stderr.strip().splitlines()[-1]}')
+            continue
+        if not result.stdout:
+            print(f'{source:<50} skipped: {result.stderr.strip()}')
+            continue
+        size, growth = map(int, result.stdout.split())
+        print(f'{source:<50} {fmt_size(size):>10} {fmt_size(growth):>16} {growth / size:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
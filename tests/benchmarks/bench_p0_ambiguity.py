@@ -0,0 +1,61 @@
+"""
+Cost of parsing (`p0.parse_chain`) expressions with ambiguous juxtaposes into packed parse forests.
+
+Runs the repository's ambiguity test sources, plus `a(b0)(b1)...(bn)^z`, where every juxtapose could be
+a call/index or a multiply and the `^` makes each of those choices change the shape of the parse (the
+number of parses grows exponentially in n). Only p0 is timed; the t2 chains are built up front.
+
+Run from the repository root:
+    python -m tests.benchmarks.bench_p0_ambiguity [--sizes 4 8 12 16 24]
+"""
+
+from argparse import ArgumentParser
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from dewy.parser import p0, t2
+from dewy.reporting import SrcFile
+from tests.benchmarks.synthetic import best_time
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SOURCES = ['tests/tokenizer/pathological_test.dewy', 'tests/tokenizer/ambiguous_warnings.dewy', 'tests/tokenizer/ambiguous.dewy']
+
+
+def juxtapose_chain(n: int) -> SrcFile:
+    return SrcFile(f'<{n} juxtaposes>', 'a' + ''.join(f'(b{i})' for i in range(n)) + '^z\n')
+
+
+def time_parse(srcfile: SrcFile, repeat: int) -> tuple[float, int]:
+    """best time to parse every chain of the source, and the number of parses reported for it (if it warned)"""
+    with redirect_stdout(StringIO()), redirect_stderr(StringIO()):
+        chains = t2.postok(srcfile)
+    def parse() -> None:
+        ctx = p0.Context(srcfile)
+        for chain in chains:
+            p0.parse_chain(chain, ctx)
+    stderr = StringIO()
+    with redirect_stdout(StringIO()), redirect_stderr(stderr):
+        elapsed = best_time(parse, repeat)
+    num_parses = [int(line.split('has ')[1].split()[0]) for line in stderr.getvalue().splitlines() if 'possible parses' in line]
+    return elapsed, max(num_parses, default=0)
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='*', default=[4, 8, 12, 16, 24], help='number of juxtaposes in the synthetic chains')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timing runs (best is kept)')
+    args = parser.parse_args()
+
+    cases = [
+        *(SrcFile(Path(path), (REPO_ROOT / path).read_text()) for path in SOURCES),
+        *(juxtapose_chain(n) for n in args.sizes),
+    ]
+    print(f'{"source":<42} {"parses":>8} {"p0 (ms)":>10}')
+    for srcfile in cases:
+        elapsed, num_parses = time_parse(srcfile, args.repeat)
+        print(f'{srcfile.path!s:<42} {num_parses or "":>8} {elapsed * 1e3:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
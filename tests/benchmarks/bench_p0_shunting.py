@@ -0,0 +1,72 @@
+"""
+Cost of shunting (`p0.parse_chain`) long operator chains.
+
+Each synthetic source is a single chain of n operators: left associative arithmetic (`x0 + x1 + ...`, which
+reduces one operator at a time), mixed precedence arithmetic (`x0 + x1 * x2 ^ x3 - ...`), a pipe chain
+(`x |> f0 |> f1 ...`), and a comma list whose elements are themselves small expressions. The repository's
+`tests/general/complex_pipe.dewy` is included as a real world pipe chain. Only p0 is timed; the t2 chains are
+built up front.
+
+Run from the repository root:
+    python -m tests.benchmarks.bench_p0_shunting [--sizes 10 100 1000 10000]
+"""
+
+from argparse import ArgumentParser
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from dewy.parser import p0, t2
+from dewy.reporting import SrcFile
+from tests.benchmarks.synthetic import best_time
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SOURCES = ['tests/general/complex_pipe.dewy']
+MIXED_OPS = ['+', '*', '^', '-', '/', '%']
+
+
+def left_assoc_chain(n: int) -> str:
+    return ' + '.join(f'x{i}' for i in range(n + 1))
+
+def mixed_chain(n: int) -> str:
+    return 'x0' + ''.join(f' {MIXED_OPS[i % len(MIXED_OPS)]} x{i + 1}' for i in range(n))
+
+def pipe_chain(n: int) -> str:
+    return 'x' + ''.join(f' |> f{i}' for i in range(n))
+
+def comma_chain(n: int) -> str:
+    # each element contributes a comma and a multiply
+    return ', '.join(f'a{i} * b{i}' for i in range(n // 2 + 1))
+
+CHAINS = {'left assoc': left_assoc_chain, 'mixed': mixed_chain, 'pipe': pipe_chain, 'comma list': comma_chain}
+
+
+def time_parse(srcfile: SrcFile, repeat: int) -> float:
+    """best time to parse every chain of the source"""
+    with redirect_stdout(StringIO()):
+        chains = t2.postok(srcfile)
+    def parse() -> None:
+        ctx = p0.Context(srcfile)
+        for chain in chains:
+            p0.parse_chain(chain, ctx)
+    return best_time(parse, repeat)
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='*', default=[10, 100, 1000, 10000], help='number of operators in the synthetic chains')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timing runs (best is kept)')
+    args = parser.parse_args()
+
+    print(f'{"source":<36} {"p0 (ms)":>10} {"us/op":>8}')
+    for path in SOURCES:
+        elapsed = time_parse(SrcFile(Path(path), (REPO_ROOT / path).read_text()), args.repeat)
+        print(f'{path:<36} {elapsed * 1e3:>10.2f}')
+    for name, make in CHAINS.items():
+        for n in args.sizes:
+            elapsed = time_parse(SrcFile(f'<{name} x{n}>', make(n) + '\n'), args.repeat)
+            print(f'{f"{name} x{n}":<36} {elapsed * 1e3:>10.2f} {elapsed * 1e6 / n:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
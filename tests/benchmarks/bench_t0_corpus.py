@@ -0,0 +1,75 @@
+"""
+Tokenizer benchmark over the real Dewy sources in `tests/tokenizer/` and `examples/`.
+
+Compares the per-context dispatch tables (`t0.get_dispatch_table`) against an
+exhaustive table that tries every token class allowed in the context at every
+position (i.e. the tokenizer's matching strategy before the dispatch tables),
+and the regex-backed `fast_eat` paths against the reference `eat` implementations.
+
+Run from the repository root:
+    python -m tests.benchmarks.bench_t0_corpus
+"""
+
+import sys
+from argparse import ArgumentParser
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from dewy.parser import t0
+from dewy.reporting import ReportException, SrcFile
+from tests.benchmarks.synthetic import best_time
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def corpus() -> list[SrcFile]:
+    paths = sorted([*(REPO_ROOT / 'tests' / 'tokenizer').glob('*.dewy'), *(REPO_ROOT / 'examples').rglob('*.dewy')])
+    return [SrcFile(path, path.read_text()) for path in paths]
+
+
+def tokenize_all(srcfiles: list[SrcFile], fast_eat: bool = True) -> list[tuple[SrcFile, str]]:
+    """tokenize every source. Returns the ones that didn't make it to the end, with what stopped them"""
+    failed: list[tuple[SrcFile, str]] = []
+    for srcfile in srcfiles:
+        try:
+            with redirect_stdout(StringIO()):
+                t0.tokenize(srcfile, fast_eat=fast_eat)
+        except (SystemExit, ReportException) as e:
+            # some of the tokenizer tests are intentionally malformed
+            failed.append((srcfile, e.report.title if isinstance(e, ReportException) else 'exited with an error'))
+    return failed
+
+
+def exhaustive_dispatch_table(ctx_type: type[t0.Context], base: t0.BasePrefix, fast_eat: bool = True) -> t0.DispatchTable:
+    """every allowed token is a candidate for every character"""
+    return t0.DispatchTable({}, t0.DispatchEntry.from_candidates(t0.get_allowed_tokens(ctx_type), fast_eat))
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='number of timing runs (best is kept)')
+    args = parser.parse_args()
+
+    srcfiles = corpus()
+    print(f'{len(srcfiles)} files, {sum(len(s.body) for s in srcfiles)} characters')
+    for srcfile, reason in tokenize_all(srcfiles):
+        print(f'stops early (still timed): {Path(srcfile.path).relative_to(REPO_ROOT)}: {reason}', file=sys.stderr)
+
+    dispatch_time = best_time(lambda: tokenize_all(srcfiles), args.repeat)
+    reference_time = best_time(lambda: tokenize_all(srcfiles, fast_eat=False), args.repeat)
+
+    get_dispatch_table = t0.get_dispatch_table
+    t0.get_dispatch_table = exhaustive_dispatch_table
+    try:
+        exhaustive_time = best_time(lambda: tokenize_all(srcfiles), args.repeat)
+    finally:
+        t0.get_dispatch_table = get_dispatch_table
+
+    print(f'exhaustive: {exhaustive_time:.4f}s')
+    print(f'dispatch:   {dispatch_time:.4f}s ({exhaustive_time / dispatch_time:.1f}x)')
+    print(f'reference eat (fast_eat=False): {reference_time:.4f}s ({reference_time / dispatch_time:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
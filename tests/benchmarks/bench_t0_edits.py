@@ -0,0 +1,53 @@
+"""
+Per-edit cost of incremental re-tokenization (`t0.retokenize`) vs tokenizing the whole file again.
+
+Simulates typing: inserts a character into a random identifier and then deletes it again, on
+synthetic sources of increasing size. Re-tokenizing should stay roughly flat as the file
+grows (only the old tokens after the edit are moved, which is cheap compared to eating them).
+
+Run from the repository root:
+    python -m tests.benchmarks.bench_t0_edits
+"""
+
+from argparse import ArgumentParser
+from random import Random
+from time import perf_counter
+
+from dewy.parser import t0
+from dewy.reporting import Span, SrcFile
+from tests.benchmarks.synthetic import best_time, fmt_size, synthetic_source
+
+SIZES = [16 << 10, 256 << 10, 1 << 20]
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--edits', type=int, default=200, help='number of edits per size')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = Random(args.seed)
+    print(f'{"size":>8} {"full (ms)":>10} {"edit (ms)":>10} {"relexed":>8} {"speedup":>8}')
+    for size in SIZES:
+        src = synthetic_source(size)
+        full_time = best_time(lambda src=src: t0.tokenize(SrcFile('<synthetic>', src)), 1)
+
+        tokenization = t0.tokenize_editable(SrcFile('<synthetic>', src))
+        identifiers = [token.loc for token in tokenization.tokens if isinstance(token, t0.Identifier)]
+        edit_time = 0.0
+        relexed = 0
+        for _ in range(args.edits):
+            loc = rng.choice(identifiers)
+            i = rng.randrange(loc.start, loc.stop + 1)
+            for edit in (t0.TextEdit(Span(i, i), 'x'), t0.TextEdit(Span(i, i+1), '')):
+                t = perf_counter()
+                changed = t0.retokenize(tokenization, edit)
+                edit_time += perf_counter() - t
+                relexed += len(changed)
+        n = 2 * args.edits
+        assert tokenization.srcfile.body == src
+        print(f'{fmt_size(size):>8} {full_time * 1e3:>10.2f} {edit_time / n * 1e3:>10.3f} {relexed / n:>8.1f} {full_time / (edit_time / n):>7.0f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Scaling benchmark for the t0 tokenizer.
+
+Tokenizes synthetic sources from 1 KB through 1 MB and fits the growth exponent
+on a log-log scale. Linear tokenization gives an exponent close to 1; the old
+`eat(src[i:], ctx)` protocol (which copied the rest of the file at every step) was quadratic.
+
+Run from the repository root:
+    python -m tests.benchmarks.bench_t0_scaling
+"""
+
+from argparse import ArgumentParser
+from math import log
+
+from dewy.parser import t0
+from dewy.reporting import SrcFile
+from tests.benchmarks.synthetic import best_time, fmt_size, synthetic_source
+
+SIZES = [1 << 10, 4 << 10, 16 << 10, 64 << 10, 256 << 10, 1 << 20]
+MAX_EXPONENT = 1.25  # leave room for noise. Quadratic growth would be ~2
+
+
+def growth_exponent(sizes: list[int], times: list[float]) -> float:
+    """least squares slope of log(time) vs log(size)"""
+    xs = [log(s) for s in sizes]
+    ys = [log(t) for t in times]
+    x_mean = sum(xs) / len(xs)
+    y_mean = sum(ys) / len(ys)
+    num = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys))
+    den = sum((x - x_mean) ** 2 for x in xs)
+    return num / den
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='number of timing runs per size (best is kept)')
+    args = parser.parse_args()
+
+    times: list[float] = []
+    print(f'{"size":>8} {"tokens":>8} {"time (s)":>10} {"us/KB":>8}')
+    for size in SIZES:
+        srcfile = SrcFile('<synthetic>', synthetic_source(size))
+        n_tokens = len(t0.tokenize(srcfile))
+        t = best_time(lambda srcfile=srcfile: t0.tokenize(srcfile), args.repeat)
+        times.append(t)
+        print(f'{fmt_size(size):>8} {n_tokens:>8} {t:>10.4f} {t / (size / 1024) * 1e6:>8.1f}')
+
+    exponent = growth_exponent(SIZES, times)
+    print(f'growth exponent: {exponent:.2f} (linear=1, quadratic=2)')
+    if exponent > MAX_EXPONENT:
+        raise SystemExit(f'tokenizer runtime grew faster than linear (exponent {exponent:.2f} > {MAX_EXPONENT})')
+
+
+if __name__ == '__main__':
+    main()
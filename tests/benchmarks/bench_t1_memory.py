@@ -0,0 +1,62 @@
+"""
+Peak memory of the t0 -> t1 tokenizer pipeline: `t1.tokenize` with the whole list of t0 tokens made first
+(`stream=False`) or pulled through a window (`stream=True`, the default for long sources), and `t1.tokenize_iter`.
+
+Measured with `tracemalloc` on a synthetic source (50 MB by default). The source text itself is allocated
+before tracing starts, so the numbers are just what tokenizing adds on top of it. The tokens from `tokenize_iter`
+are consumed and dropped one at a time, like a consumer that only needs to look at each top level token once.
+
+Run from the repository root:
+    python -m tests.benchmarks.bench_t1_memory [--size 50M]
+"""
+
+import gc
+import tracemalloc
+from argparse import ArgumentParser
+from collections import deque
+from time import perf_counter
+
+from dewy.parser import t1
+from dewy.reporting import SrcFile
+from tests.benchmarks.synthetic import fmt_size, synthetic_source
+
+
+def parse_size(size: str) -> int:
+    units = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+    if size[-1].upper() in units:
+        return int(float(size[:-1]) * units[size[-1].upper()])
+    return int(size)
+
+
+def traced_peak(func) -> tuple[int, float]:
+    """peak traced memory (bytes) and wall time while running `func`"""
+    gc.collect()
+    tracemalloc.start()
+    t = perf_counter()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1], perf_counter() - t
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', type=parse_size, default='50M', help='size of the synthetic source, e.g. 512K, 50M')
+    parser.add_argument('--streaming-only', action='store_true', help='only run `tokenize_iter`. The `tokenize` runs keep every t1 token, which needs over 50 bytes of memory per source character')
+    args = parser.parse_args()
+
+    srcfile = SrcFile('<synthetic>', synthetic_source(args.size))
+    print(f'source: {fmt_size(len(srcfile.body))}')
+
+    if not args.streaming_only:
+        for stream in (False, True):
+            peak, seconds = traced_peak(lambda stream=stream: t1.tokenize(srcfile, stream=stream))
+            print(f'{f"tokenize(stream={stream}):":<24}peak {fmt_size(peak):>10} ({peak / len(srcfile.body):.1f} bytes/char) in {seconds:.1f}s')
+
+    peak, seconds = traced_peak(lambda: deque(t1.tokenize_iter(srcfile), maxlen=0))
+    print(f'{"tokenize_iter:":<24}peak {fmt_size(peak):>10} ({peak / len(srcfile.body):.3f} bytes/char) in {seconds:.1f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Cost of the t2 token post processing (`t2.postok_inner`) on already tokenized sources.
+
+Runs over the real Dewy sources in `tests/` and `examples/`, a synthetic source, and a single
+large flat array literal (one long token list, which is where per-token list inserts and slice
+assignments in the rewriting stages used to go quadratic). Only the post processing is timed;
+each run gets a fresh copy of the t1 tokens.
+
+Run from the repository root:
+    python -m tests.benchmarks.bench_t2_postok
+"""
+
+import sys
+from argparse import ArgumentParser
+from contextlib import redirect_stderr, redirect_stdout
+from copy import deepcopy
+from io import StringIO
+from pathlib import Path
+from time import perf_counter
+
+from dewy.parser import t1, t2
+from dewy.reporting import ReportException, SrcFile
+from tests.benchmarks.synthetic import fmt_size, synthetic_source
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def corpus() -> list[SrcFile]:
+    paths = sorted([*(REPO_ROOT / 'tests').rglob('*.dewy'), *(REPO_ROOT / 'examples').rglob('*.dewy')])
+    return [SrcFile(path, path.read_text()) for path in paths]
+
+
+def flat_array(n: int) -> SrcFile:
+    """`[0, -1, 2 .+ x, ...]`: commas, broadcast and combined operators and juxtapositions all in one list"""
+    items = ', '.join(f'{i}' if i % 3 else f'-{i} .+ x{i}(y)' for i in range(n))
+    return SrcFile('<flat array>', f'arr = [{items},,]\n')
+
+
+def tokenized(srcfiles: list[SrcFile]) -> list[tuple[SrcFile, list[t1.Token]]]:
+    """t1 tokens of each source that makes it through the tokenizer and the post processing"""
+    result = []
+    for srcfile in srcfiles:
+        try:
+            with redirect_stdout(StringIO()), redirect_stderr(StringIO()):
+                tokens = t1.tokenize(srcfile)
+                t2.postok_inner(deepcopy(tokens), ctx=t2.Context(srcfile))
+        except (SystemExit, ReportException) as e:
+            # some of the test sources are intentionally malformed
+            reason = e.report.title if isinstance(e, ReportException) else 'exited with an error'
+            print(f'skipping {Path(srcfile.path).relative_to(REPO_ROOT)}: {reason}', file=sys.stderr)
+            continue
+        result.append((srcfile, tokens))
+    return result
+
+
+def time_postok(sources: list[tuple[SrcFile, list[t1.Token]]], repeat: int) -> float:
+    """best total time to post process every source"""
+    best = float('inf')
+    for _ in range(repeat):
+        copies = [(srcfile, deepcopy(tokens)) for srcfile, tokens in sources]
+        with redirect_stdout(StringIO()), redirect_stderr(StringIO()):
+            t = perf_counter()
+            for srcfile, tokens in copies:
+                t2.postok_inner(tokens, ctx=t2.Context(srcfile))
+            best = min(best, perf_counter() - t)
+    return best
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='number of timing runs (best is kept)')
+    args = parser.parse_args()
+
+    cases = [
+        ('corpus', corpus()),
+        ('synthetic', [SrcFile('<synthetic>', synthetic_source(256 << 10))]),
+        *((f'flat array {n}', [flat_array(n)]) for n in (1_000, 10_000, 50_000)),
+    ]
+    print(f'{"case":<18} {"files":>5} {"source":>10} {"postok (ms)":>12}')
+    for name, srcfiles in cases:
+        sources = tokenized(srcfiles)
+        size = sum(len(srcfile.body) for srcfile, _ in sources)
+        print(f'{name:<18} {len(sources):>5} {fmt_size(size):>10} {time_postok(sources, args.repeat) * 1e3:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Cost of emptiness and subtype queries whose DNF is wide.
+
+The synthetic types mimic what the checker builds for optional layouts and refinement: unions of integer and string
+literal types made optional with `undefined`, intersected with each other (k factors of width w expand to w^k DNF
+clauses, almost all of them empty) and tested against wide unions and their negations. Each query runs on a fresh
+`TypeSystem` so the memo tables start cold.
+
+Run from the repository root:
+    python -m tests.benchmarks.bench_type_dnf [--widths 4 8 16] [--factors 2 3 4]
+"""
+
+from argparse import ArgumentParser
+from collections.abc import Callable
+
+from dewy.semantic import builtins, ty
+from tests.benchmarks.synthetic import best_time
+
+
+def _type_system() -> ty.TypeSystem:
+    ts = ty.TypeSystem()
+    builtins.apply_builtin_promote_rules(ts)
+    return ts
+
+
+def int_literals(start: int, width: int) -> ty.TypeExpr:
+    return ty.union(*(ty.IntegerLiteralType(i) for i in range(start, start + width)))
+
+def str_literals(start: int, width: int) -> ty.TypeExpr:
+    return ty.union(*(ty.StringLiteralType(f's{i}') for i in range(start, start + width)))
+
+def refinement(width: int, factors: int) -> ty.TypeExpr:
+    """(optional) literal unions that only overlap in a few members, alternating integer and string literals"""
+    literals = [int_literals, str_literals]
+    return ty.intersect(*(
+        ty.optional(ty.union(literals[k % 2](k, width), literals[(k + 1) % 2](k, width)))
+        for k in range(factors)
+    ))
+
+def query_empty(width: int, factors: int) -> Callable[[], object]:
+    t = refinement(width, factors)
+    return lambda: _type_system().is_empty(t)
+
+def query_subtype(width: int, factors: int) -> Callable[[], object]:
+    t = refinement(width, factors)
+    target = ty.union('int', 'string', 'undefined')
+    return lambda: _type_system().is_subtype(t, target)
+
+def query_not_subtype(width: int, factors: int) -> Callable[[], object]:
+    t = refinement(width, factors)
+    target = ty.optional(ty.intersect(ty.TypeNot(int_literals(0, width)), ty.TypeNot(str_literals(0, width))))
+    return lambda: _type_system().is_subtype(t, target)
+
+QUERIES = {'is_empty': query_empty, 'of? int|string|undefined': query_subtype, 'of? ~lits & ~lits': query_not_subtype}
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--widths', type=int, nargs='*', default=[4, 8, 16], help='literals per union')
+    parser.add_argument('--factors', type=int, nargs='*', default=[2, 3, 4], help='unions intersected together')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timing runs (best is kept)')
+    args = parser.parse_args()
+
+    print(f'{"query":<28} {"width":>6} {"factors":>8} {"clauses":>9} {"time (ms)":>10}')
+    for name, make in QUERIES.items():
+        for width in args.widths:
+            for factors in args.factors:
+                clauses = (2 * width + 1) ** factors
+                elapsed = best_time(make(width, factors), args.repeat)
+                print(f'{name:<28} {width:>6} {factors:>8} {clauses:>9} {elapsed * 1e3:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+Synthetic Dewy sources for the front end benchmarks.
+
+The generated code covers the common token classes (identifiers, numbers, strings,
+line/block comments, brackets, operators) and is valid all the way through `p0.parse`,
+so the same inputs can be used to benchmark every stage of the front end.
+"""
+
+from collections.abc import Callable
+from time import perf_counter
+
+chunk = '''# generated row {i}
+row{i} = [{i} {i}+1 'cell {i}' 3.14 0x1F]
+f{i} = (a:int b:int):>int => a * b + {i} #{{ block comment }}#
+total{i} = f{i}(row{i}[0] 2) |> printl
+'''
+
+
+def synthetic_source(size: int) -> str:
+    """Return a synthetic Dewy source of (roughly, whole chunks only) `size` characters"""
+    parts: list[str] = []
+    length = 0
+    i = 0
+    while length < size:
+        part = chunk.format(i=i)
+        parts.append(part)
+        length += len(part)
+        i += 1
+    return ''.join(parts)
+
+
+def best_time(func: Callable[[], object], repeat: int = 3) -> float:
+    """Run `func` `repeat` times and return the fastest wall time in seconds"""
+    times: list[float] = []
+    for _ in range(repeat):
+        t0 = perf_counter()
+        func()
+        times.append(perf_counter() - t0)
+    return min(times)
+
+
+def fmt_size(size: int) -> str:
+    if size >= 1 << 20: return f'{size / (1 << 20):g} MB'
+    if size >= 1 << 10: return f'{size / (1 << 10):g} KB'
+    return f'{size} B'
@@ -0,0 +1,18 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from dewy.parser import cache
+
+# compiling test sources would otherwise leave caches next to them (examples, library, ...) that later runs pick up.
+# Set before any test runs so subprocesses started by the tests inherit it too
+os.environ[cache.ENV_VAR] = 'off'
+
+
+@pytest.fixture
+def cache_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """turn the caches back on, keeping them under a fresh directory for the test"""
+    root = tmp_path / 'dewycache'
+    monkeypatch.setenv(cache.ENV_VAR, str(root))
+    return root
@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import pytest
+
+from dewy.backend.udewy import codegen
+from dewy.reporting import SrcFile
+from dewy.semantic import analysis_cache, hir, modules
+from dewy.semantic.analyze import bounds
+from dewy.semantic.errors import UserError
+
+pytestmark = pytest.mark.usefixtures('cache_root')
+
+SOURCE = '''
+const k:int64 = 4
+let get = (i:int64):>int64 => {
+    let values:array<int64> = [10 20 30 40]
+    let total:int64 = 0
+    let n:int64 = 0
+    loop n <? k { total += values[n] n += 1 }
+    if 0 <=? i and i <? values.length { return values[i] }
+    return total + values[2]
+}
+let twice = (j:int64):>int64 => j * 2
+let main = ():>int64 => get(1) + twice(2)
+'''
+
+
+def _analyzed_functions(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """names of the first parameter of every function validated from now on"""
+    analyzed: list[str] = []
+    analyze_function = bounds._BoundsValidator._analyze_function
+
+    def record(validator: bounds._BoundsValidator, function: hir.FunctionLiteral) -> None:
+        if function.pos_or_kw_args and id(function) not in validator.checked_functions:
+            analyzed.append(function.pos_or_kw_args[0].name)
+        analyze_function(validator, function)
+
+    monkeypatch.setattr(bounds._BoundsValidator, '_analyze_function', record)
+    return analyzed
+
+
+def test_unchanged_functions_are_not_validated_again(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    main = tmp_path / 'main.dewy'
+    main.write_text(SOURCE)
+    first = codegen(SrcFile.from_path(main))
+    assert analysis_cache.cache_path(main).exists()
+
+    analyzed = _analyzed_functions(monkeypatch)
+    assert codegen(SrcFile.from_path(main)) == first
+    # `main` has no parameters; the prelude functions it uses are cached as well
+    assert analyzed == []
+
+
+def test_editing_a_function_validates_only_it(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    main = tmp_path / 'main.dewy'
+    main.write_text(SOURCE)
+    modules.typecheck_program(SrcFile.from_path(main))
+    main.write_text(SOURCE.replace('j * 2', 'j * 3'))
+
+    analyzed = _analyzed_functions(monkeypatch)
+    edited = codegen(SrcFile.from_path(main))
+    assert analyzed == ['j']
+    analysis_cache.cache_path(main).unlink()
+    assert codegen(SrcFile.from_path(main)) == edited
+
+
+def test_changing_a_constant_validates_its_readers_again(tmp_path: Path) -> None:
+    main = tmp_path / 'main.dewy'
+    main.write_text(SOURCE)
+    modules.typecheck_program(SrcFile.from_path(main))
+    # `get` is the same tree, but `values[n]` is no longer in bounds
+    main.write_text(SOURCE.replace('const k:int64 = 4', 'const k:int64 = 5'))
+
+    with pytest.raises(UserError, match='not proven in bounds'):
+        modules.typecheck_program(SrcFile.from_path(main))
@@ -0,0 +1,162 @@
+import pytest
+
+from dewy.reporting import SrcFile
+from dewy.semantic import check, hir, hir_walk, modules
+from dewy.semantic.analyze.bounds import Interval
+from dewy.semantic.errors import UserError
+
+
+def _check(source: str) -> hir.Block:
+    root = check.typecheck_and_resolve(SrcFile(None, source))
+    assert isinstance(root, hir.Block)
+    return root
+
+
+def _nested_loops(depth: int) -> str:
+    lines = ['let sum = ():>int64 => {', 'let values:array<int64> = [1 2 3 4]', 'let total:int64 = 0']
+    for level in range(depth):
+        lines += [f'let i{level}:int64 = 0', f'loop i{level} <? values.length {{']
+    lines.append('total += ' + ' + '.join(f'values[i{level}]' for level in range(depth)))
+    for level in reversed(range(depth)):
+        lines += [f'i{level} += 1', '}']
+    lines += ['return total', '}']
+    return '\n'.join(lines)
+
+
+def test_deeply_nested_loops_keep_every_counter_in_bounds() -> None:
+    root = _check(_nested_loops(12))
+    indices = [node for node in hir_walk.walk(root) if isinstance(node, hir.Index)]
+    assert len(indices) == 12
+
+
+def test_exact_indices_after_branches_become_constant() -> None:
+    root = _check("""
+let get = (flag:bool):>int64 => {
+    let values:array<int64> = [10 20 30]
+    let i:int64 = 2
+    if flag { i = 2 }
+    loop k in 0..3 { i = 2 }
+    return values[i]
+}
+""")
+    [index] = [node for node in hir_walk.walk(root) if isinstance(node, hir.Index)]
+    assert index.constant_index == 2
+
+
+@pytest.mark.parametrize(
+    'source',
+    [
+        # the body of an iterator loop runs more than once
+        """
+let get = ():>int64 => {
+    let values:array<int64> = [10 20 30]
+    let i:int64 = 0
+    loop k in 0..2 { i += 1 }
+    return values[i]
+}
+""",
+        # a labeled break carries its state out of the outer loop
+        """
+let get = ():>int64 => {
+    let values:array<int64> = [10 20 30]
+    let i:int64 = 0
+    $outer
+    loop true {
+        loop true {
+            i = 7
+            break $outer
+        }
+    }
+    return values[i]
+}
+""",
+        # so does a labeled continue, into the next outer iteration
+        """
+let get = ():>int64 => {
+    let values:array<int64> = [10 20 30]
+    let i:int64 = 0
+    let n:int64 = 0
+    $outer
+    loop n <? 2 {
+        let read:int64 = values[i]
+        n += 1
+        loop true {
+            i = 7
+            continue $outer
+        }
+    }
+    return 0
+}
+""",
+    ],
+)
+def test_loop_exits_reach_every_iteration(source: str) -> None:
+    with pytest.raises(UserError, match='not proven in bounds'):
+        _check(source)
+
+
+def test_proven_intervals_are_returned_by_node() -> None:
+    root, intervals = modules.typecheck_program_with_intervals(SrcFile(None, """
+let scale = (value:uint8):>uint8 => {
+    let i:uint8 = 0
+    loop i <? 10 { i = i + 1 }
+    return (value % 16) << 2
+}
+"""))
+    calls = {
+        str(node): intervals.get(id(node))
+        for node in hir_walk.walk(root)
+        if isinstance(node, hir.FunctionCall)
+    }
+    assert calls['i + 1'] == Interval(1, 10)
+    assert calls['value % 16 << 2'] == Interval(0, 60)
+    # the parameter itself is unknown
+    assert not any(
+        node.name == 'value' and id(node) in intervals
+        for node in hir_walk.walk(root)
+        if isinstance(node, hir.ExpressedIdentifier)
+    )
+
+
+
+def test_remainder_takes_the_sign_of_its_dividend() -> None:
+    root, intervals = modules.typecheck_program_with_intervals(SrcFile(None, """
+let digit = (value:int64):>int64 => {
+    let low:int64 = value % 10
+    if value <? 0 {
+        if value =? -9223372036854775808 { return 0 }
+        value = -value
+    }
+    return low + value % 10
+}
+"""))
+    remainders = [
+        intervals.get(id(node))
+        for node in hir_walk.walk(root)
+        if isinstance(node, hir.FunctionCall) and str(node) == 'value % 10'
+    ]
+    # only once the negative values have been negated is the remainder a digit
+    assert remainders == [Interval(-9, 9), Interval(0, 9)]
+
+def test_branch_without_facts_keeps_its_writes_to_itself() -> None:
+    with pytest.raises(UserError, match='not proven in bounds'):
+        _check("""
+let get = (flag:bool):>int64 => {
+    let values:array<int64> = [10 20 30]
+    let i:int64 = 5
+    if flag { i = 2 }
+    return values[i]
+}
+""")
+
+
+def test_early_return_guards_the_code_after_it() -> None:
+    root = _check("""
+let get = (i:int64):>int64 => {
+    let values:array<int64> = [10 20 30]
+    if i <? 0 or i >=? values.length { return 0 }
+    return values[i]
+}
+""")
+    [index] = [node for node in hir_walk.walk(root) if isinstance(node, hir.Index)]
+    assert index.constant_index is None
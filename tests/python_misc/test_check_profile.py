@@ -0,0 +1,50 @@
+import json
+from pathlib import Path
+
+from dewy.reporting import SrcFile
+from dewy.semantic import check, check_profile, ty
+
+SOURCE = '''
+let add = (a:int b:int):>int => a + b
+let x = add(1 2) + 3
+'''
+
+
+def _check() -> None:
+    check.typecheck_and_resolve(SrcFile(None, SOURCE))
+
+
+def test_disabled_profiling_leaves_the_checker_untouched() -> None:
+    handlers = {name: getattr(check, name) for name in check_profile._handler_names()}
+    is_subtype = ty.TypeSystem.is_subtype
+    with check_profile.profiling():
+        assert check.tcr_block is not handlers['tcr_block']
+        _check()
+    assert {name: getattr(check, name) for name in handlers} == handlers
+    assert ty.TypeSystem.is_subtype is is_subtype
+
+
+def test_records_handlers_spans_and_queries(tmp_path: Path) -> None:
+    with check_profile.profiling() as profile:
+        _check()
+    assert profile.handlers['tcr_block'].calls >= 1
+    assert profile.queries['match_best_function'] >= 2
+    assert sum(stats.queries for stats in profile.handlers.values()) == sum(profile.queries.values())
+    assert profile.spans[('<string>:2:11', 'tcr_function_literal')].calls == 1
+    assert ('<string>:3:9', 'tcr_function_call') in profile.spans
+
+    report = profile.report().splitlines()
+    rows = report[3:3 + len(profile.handlers)]
+    self_ms = [float(row.split()[2]) for row in rows]
+    assert self_ms == sorted(self_ms, reverse=True)
+
+    out = tmp_path / 'check.speedscope.json'
+    profile.write(out)
+    data = json.loads(out.read_text())
+    events = data['profiles'][0]['events']
+    assert len(events) == 2 * sum(stats.calls for stats in profile.handlers.values())
+    depth = 0
+    for event in events:
+        depth += 1 if event['type'] == 'O' else -1
+        assert depth >= 0
+    assert depth == 0
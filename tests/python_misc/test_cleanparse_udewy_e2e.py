@@ -48,6 +48,8 @@ LOWERED_CASES = [
     ('top_level_callback.dewy', 42),
     ('array_local_sum.dewy', 42),
     ('array_narrow.dewy', 42),
+    ('array_narrow_checksum.dewy', 42),
+    ('narrow_negative_mod.dewy', 42),
     ('array_module_lookup.dewy', 42),
     ('array_fresh_local.dewy', 42),
     ('array_while_index.dewy', 42),
@@ -323,7 +325,7 @@ let main = ():>int64 => {
 
     emitted = codegen(SrcFile.from_path(path))
 
-    assert '= (__dewy_shift_value_1 >> __dewy_shift_count_2)' in emitted
+    assert '(__dewy_shift_value_1 >> __dewy_shift_count_2)' in emitted
     assert '__signed_shr__(__dewy_shift_value_3 __dewy_shift_count_4)' in emitted
 
 
@@ -361,10 +363,10 @@ def test_fixed_width_shifts_emit_explicit_width_guard(
     annotation: str,
     operator: str,
 ) -> None:
-    source = f"""let compute = (value:{annotation}):>{annotation} => {{
-    return value {operator} 1
+    source = f"""let compute = (value:{annotation} count:uint64):>{annotation} => {{
+    return value {operator} count
 }}
-let main = ():>{annotation} => compute(8)
+let main = ():>{annotation} => compute(8 1)
 """
     emitted = codegen(SrcFile(None, source))
 
@@ -375,6 +377,27 @@ let main = ():>{annotation} => compute(8)
     assert '= 0' in emitted
 
 
+@pytest.mark.parametrize('annotation', ['int8', 'uint8', 'int64', 'uint64'])
+def test_fixed_width_shift_by_proven_count_omits_width_guard(annotation: str) -> None:
+    emitted = codegen(SrcFile(None, f"""
+let compute = (value:{annotation}):>{annotation} => value >> 3
+"""))
+
+    assert '__dewy_shift_count_' in emitted
+    assert '__unsigned_gte__(' not in emitted
+    assert '__dewy_flow_' not in emitted
+
+
+def test_narrow_operations_proven_in_range_omit_wrapping() -> None:
+    emitted = codegen(SrcFile.from_path(fixtures / 'array_narrow_checksum.dewy'))
+
+    assert 'i = i + 1' in emitted
+    assert '(__dewy_shift_value_1 << __dewy_shift_count_2))' in emitted
+    assert '__unsigned_gte__(' not in emitted
+    # the final subtraction may leave the byte range
+    assert 'return (checksum - 54) and 255' in emitted
+
+
 def test_fixed_width_shift_operands_are_each_evaluated_once() -> None:
     emitted = codegen(SrcFile(None, '''
 let next_value = ():>uint8 => 1
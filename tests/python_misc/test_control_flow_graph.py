@@ -0,0 +1,102 @@
+from collections import Counter
+
+from dewy.reporting import SrcFile
+from dewy.semantic import check, hir
+from dewy.semantic.analyze import cfg, dataflow
+
+
+def _body(source: str) -> hir.AST:
+    root = check.typecheck_and_resolve(SrcFile(None, source))
+    assert isinstance(root, hir.Block)
+    [function] = [
+        item.expr
+        for item in root.items
+        if isinstance(item, hir.Declare) and isinstance(item.expr, hir.FunctionLiteral)
+    ]
+    return function.body
+
+
+def _assigning(graph: cfg.Graph, source: str) -> list[cfg.BasicBlock]:
+    return [
+        block
+        for block in graph.blocks
+        for item in block.items
+        if isinstance(item, hir.Assign) and str(item.value) == source
+    ]
+
+
+def test_loops_break_and_continue_become_edges() -> None:
+    graph = cfg.build(_body("""
+let f = (n:int64):>int64 => {
+    let i:int64 = 0
+    let found:int64 = 0
+    loop i <? n {
+        i += 1
+        if i =? 3 { continue }
+        if i =? 5 { found = i break }
+        found = 0
+    }
+    return found
+}
+"""))
+    [head] = [block for block in graph.blocks if block.loop_head]
+    back = [edge for block in graph.blocks for edge in block.succs if edge.is_back]
+    assert back and all(edge.target is head for edge in back)
+    assert [edge.truth for edge in head.succs] == [True, False]
+    assert all(edge.condition is head.items[0] for edge in head.succs)
+
+    # the break skips the rest of the body, straight to the code after the loop
+    [breaking] = _assigning(graph, 'i')
+    [after_break] = breaking.succs
+    assert not after_break.is_back
+    assert any(isinstance(item, hir.Return) for item in after_break.target.items)
+    assert [edge.target for edge in after_break.target.succs] == [graph.exit]
+
+
+def test_literal_conditions_leave_their_dead_edges_out() -> None:
+    graph = cfg.build(_body("""
+let f = (n:int64):>int64 => {
+    let x:int64 = 0
+    if false { x = 1 }
+    loop true { x = 2 break }
+    return x
+}
+"""))
+    assert not _assigning(graph, '1')
+    [loop_body] = _assigning(graph, '2')
+    [head] = [block for block in graph.blocks if block.loop_head]
+    # the loop is only left by its break
+    assert [edge.target for edge in head.succs] == [loop_body]
+
+
+class _Union:
+    @staticmethod
+    def join(left: frozenset[str], right: frozenset[str]) -> frozenset[str]:
+        return left | right
+
+    @staticmethod
+    def widen(previous: frozenset[str], current: frozenset[str]) -> frozenset[str]:
+        return current
+
+
+def test_nested_loops_converge_in_a_few_passes() -> None:
+    depth = 6
+    lines = ['let f = ():>int64 => {']
+    for level in range(depth):
+        lines += [f'let i{level}:int64 = 0', f'loop i{level} <? 4 {{']
+    for level in reversed(range(depth)):
+        lines += [f'i{level} += 1', '}']
+    lines += ['return 0', '}']
+    graph = cfg.build(_body('\n'.join(lines)))
+
+    visits: Counter[int] = Counter()
+
+    def transfer(block: cfg.BasicBlock, state: frozenset[str]) -> frozenset[str]:
+        visits[block.index] += 1
+        names = {item.target.name for item in block.items if isinstance(item, hir.Assign)}
+        return state | names
+
+    states = dataflow.solve_forward(graph, _Union(), frozenset(), transfer)
+    assert states[graph.exit.index] == {f'i{level}' for level in range(depth)}
+    # the innermost body is visited once per enclosing loop, not once per path
+    assert max(visits.values()) <= depth + 1
@@ -61,7 +61,7 @@ def test_and_overload_bool_vs_int():
 
     r = ts.match_best_function(and_t.methods, ['bool', 'bool'])
     assert r.method.ret == 'bool'
-    assert r.method.type_params == []
+    assert r.method.type_params == ()
 
     r = ts.match_best_function(and_t.methods, ['int', 'int'])
     assert r.method.ret == 'int'
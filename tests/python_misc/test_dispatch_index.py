@@ -0,0 +1,66 @@
+from itertools import product
+
+import pytest
+
+from dewy.semantic import builtins, ty
+
+
+def _type_system() -> ty.TypeSystem:
+    ts = ty.TypeSystem()
+    builtins.apply_builtin_promote_rules(ts)
+    return ts
+
+
+def _brute_force(ts: ty.TypeSystem, methods, pos_types) -> tuple[int, list] | str:
+    """dispatch without the index: every method is tried, including the promote fallback"""
+    apps = ts._applicable_indexed(methods, pos_types, {}, None)
+    promote_pos = [None] * len(pos_types)
+    if not apps and all(isinstance(t, str) for t in pos_types):
+        common = pos_types[0]
+        for t in pos_types[1:]:
+            common = common and ts.promote_type(common, t)
+        if common is not None:
+            apps = ts._applicable_indexed(methods, [common] * len(pos_types), {}, None)
+            if apps:
+                promote_pos = [None if t == common else common for t in pos_types]
+    winners = [(i, m) for i, m in apps if not any(ts.more_specific(o, m) for j, o in apps if j != i)]
+    return (winners[0][0], promote_pos) if len(winners) == 1 else 'no unique winner'
+
+
+def test_index_agrees_with_trying_every_method() -> None:
+    ts = _type_system()
+    args = ['int', 'int8', 'uint8', 'float', 'float32', 'bool', 'string', ty.BOTTOM_TYPE]
+    for name in ('__add__', '__and__', '__xor__', '__mul__', '__lt__'):
+        ftype = builtins.builtin_types[name]
+        methods = ftype.methods if isinstance(ftype, ty.OverloadType) else (ftype,)
+        for pos_types in product(args, repeat=2):
+            expected = _brute_force(ts, methods, list(pos_types))
+            try:
+                result = ts.match_best_function(methods, list(pos_types))
+            except ty.DispatchError:
+                assert expected == 'no unique winner', (name, pos_types)
+            else:
+                assert (result.method_index, result.promote_pos) == expected, (name, pos_types)
+
+
+def test_outcomes_are_memoized() -> None:
+    ts = _type_system()
+    methods = builtins.builtin_types['__add__'].methods
+    first = ts.match_best_function(methods, ['int', 'float'])
+    assert ts.match_best_function(list(methods), ['int', 'float']) is first
+    for _ in range(2):
+        with pytest.raises(ty.DispatchError, match='no matching method'):
+            ts.match_best_function(methods, ['int', 'string'])
+    stats = ts.memo_stats()['match_best_function']
+    assert (stats.hits, stats.misses) == (2, 2)
+
+
+def test_lattice_changes_invalidate_dispatch() -> None:
+    ts = _type_system()
+    ts.add_type('shape')
+    ts.add_type('circle')
+    methods = [ty.FunctionType([ty.PosOrKwArg('s', 'shape')], [], None, 'int')]
+    with pytest.raises(ty.DispatchError):
+        ts.match_best_function(methods, ['circle'])
+    ts.add_type_link('circle', 'shape')
+    assert ts.match_best_function(methods, ['circle']).method_index == 0
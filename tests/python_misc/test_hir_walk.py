@@ -0,0 +1,67 @@
+import pickle
+from dataclasses import replace
+
+from dewy.reporting import SrcFile
+from dewy.semantic import check, hir, hir_walk
+
+SOURCE = '''
+let add = (a:int64 b:int64):>int64 => a + b
+let total = add(1 add(2 3))
+let unused = [1 2 3]
+'''
+
+
+def _checked() -> hir.Block:
+    root = check.typecheck_and_resolve(SrcFile(None, SOURCE), include_prelude=False)
+    assert isinstance(root, hir.Block)
+    return root
+
+
+def test_walk_visits_every_identifier() -> None:
+    root = _checked()
+    nodes = list(hir_walk.walk(root))
+    assert nodes[0] is root
+    names = [node.name for node in nodes if isinstance(node, hir.ExpressedIdentifier)]
+    assert names.count('add') == 2 and names.count('a') == 1 and names.count('b') == 1
+    assert sum(isinstance(node, hir.Param) for node in nodes) == 2
+
+
+def test_transform_copies_only_changed_paths() -> None:
+    root = _checked()
+    assert hir_walk.transform(root, lambda node: node) is root
+
+    def rename(node: hir_walk.Node) -> hir_walk.Node:
+        if isinstance(node, hir.ExpressedIdentifier) and node.name == 'a':
+            return replace(node, name='renamed')
+        return node
+
+    renamed = hir_walk.transform(root, rename)
+    assert renamed is not root
+    add, total, unused = renamed.items
+    assert add is not root.items[0] and total is root.items[1] and unused is root.items[2]
+    assert 'renamed' in str(renamed) and 'renamed' not in str(root)
+
+
+def test_in_place_mode_updates_the_tree() -> None:
+    root = _checked()
+    add = root.items[0]
+
+    def rename_unused(node: hir_walk.Node) -> hir_walk.Node:
+        if isinstance(node, hir.Declare) and node.name == 'unused':
+            return replace(node, name='kept')
+        return node
+
+    assert hir_walk.transform(root, rename_unused, in_place=True) is root
+    assert root.items[0] is add
+    assert isinstance(root.items[2], hir.Declare) and root.items[2].name == 'kept'
+
+
+def test_fingerprint_ignores_positions_and_sharing() -> None:
+    root = _checked()
+    add = root.items[0]
+    moved = check.typecheck_and_resolve(SrcFile(None, '\n\n' + SOURCE), include_prelude=False)
+    assert isinstance(moved, hir.Block)
+    assert hir_walk.fingerprint(moved.items[0]) == hir_walk.fingerprint(add)
+    # an unpickled tree shares its strings differently
+    assert hir_walk.fingerprint(pickle.loads(pickle.dumps(add))) == hir_walk.fingerprint(add)
+    assert hir_walk.fingerprint(root.items[1]) != hir_walk.fingerprint(add)
@@ -0,0 +1,60 @@
+from pathlib import Path
+
+import pytest
+
+from dewy.backend.udewy import codegen
+from dewy.reporting import SrcFile
+from dewy.semantic import check, interface, modules
+
+pytestmark = pytest.mark.usefixtures('cache_root')
+
+
+def _write_graph(root: Path) -> Path:
+    (root / 'base.dewy').write_text('const base:int64 = 7\nlet twice = (x:int64):>int64 => x * 2\n')
+    (root / 'lib.dewy').write_text(
+        'from p"base.dewy" import base, twice\n'
+        'const v:int64 = twice(base) + 1\n'
+        'let f = (x:int64):>int64 => x + v\n'
+    )
+    main = root / 'main.dewy'
+    main.write_text('from p"lib.dewy" import f\nlet main = ():>int64 => f(1)\n')
+    return main
+
+
+def _checked_modules(root: Path, monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """names of the modules under `root` checked from now on, in order"""
+    checked: list[str] = []
+    typecheck_module = check._typecheck_module
+
+    def record(srcfile: SrcFile, **kwargs):
+        if srcfile.path is not None and Path(srcfile.path).parent == root:
+            checked.append(Path(srcfile.path).name)
+        return typecheck_module(srcfile, **kwargs)
+
+    monkeypatch.setattr(check, '_typecheck_module', record)
+    return checked
+
+
+def test_imports_load_from_their_interfaces(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    main = _write_graph(tmp_path)
+    first = codegen(SrcFile.from_path(main))
+    assert interface.interface_path(tmp_path / 'lib.dewy').exists()
+    assert not interface.interface_path(main).exists()
+
+    checked = _checked_modules(tmp_path, monkeypatch)
+    assert codegen(SrcFile.from_path(main)) == first
+    assert checked == ['main.dewy']
+
+
+def test_editing_a_module_invalidates_its_importers(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    main = _write_graph(tmp_path)
+    modules.typecheck_program(SrcFile.from_path(main))
+    base = tmp_path / 'base.dewy'
+    base.write_text(base.read_text().replace('= 7', '= 8'))
+
+    checked = _checked_modules(tmp_path, monkeypatch)
+    edited = codegen(SrcFile.from_path(main))
+    assert sorted(checked) == ['base.dewy', 'lib.dewy', 'main.dewy']
+    for path in tmp_path.glob('*.dewy'):
+        interface.interface_path(path).unlink(missing_ok=True)
+    assert codegen(SrcFile.from_path(main)) == edited
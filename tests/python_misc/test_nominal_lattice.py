@@ -0,0 +1,22 @@
+from dewy.semantic import ty
+
+
+def test_links_added_later_reach_existing_descendants() -> None:
+    ts = ty.TypeSystem()
+    ts.add_type('shape')
+    ts.add_type('polygon')
+    ts.add_type('square', 'polygon')
+    assert not ts._is_nom_subtype('square', 'shape')
+    ts.add_type_link('polygon', 'shape')
+    assert ts._is_nom_subtype('square', 'shape') and ts._is_nom_subtype('polygon', 'shape')
+    assert not ts._is_nom_subtype('shape', 'square')
+    assert ts._meet_prim('square', 'shape') == ts._meet_prim('shape', 'square') == 'square'
+
+
+def test_unrelated_and_unknown_primitives() -> None:
+    ts = ty.TypeSystem()
+    assert ts._is_nom_subtype('int8', 'int') and ts._is_nom_subtype('int8', ty.TOP_TYPE)
+    assert ts._meet_prim('int', 'string') is None
+    assert not ts._is_nom_subtype('not_a_type', 'int') and not ts._is_nom_subtype('int', 'not_a_type')
+    assert ts._is_nom_subtype('not_a_type', 'not_a_type')
+    assert ts._meet_prim('not_a_type', 'int') is None
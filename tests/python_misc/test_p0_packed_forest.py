@@ -0,0 +1,130 @@
+from contextlib import redirect_stderr
+from io import StringIO
+from itertools import product
+from pathlib import Path
+
+import pytest
+
+from dewy.parser import p0, t2
+from dewy.reporting import SrcFile
+from dewy.semantic import check, hir
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _readings(ast: p0.AST, src: str) -> set[str]:
+    """every fully resolved reading packed in `ast`, juxtaposes shown by precedence (`H` for call/index, `M` for multiply)"""
+    match ast:
+        case p0.Ambiguous(candidates=candidates):
+            return {reading for candidate in candidates for reading in _readings(candidate, src)}
+        case p0.BinOp(op=op, left=left, right=right):
+            options = op.options if isinstance(op, t2.QJuxtapose) else [op]
+            labels = {'M' if isinstance(o, t2.MultiplyJuxtapose) else 'H' if isinstance(o, t2.Juxtapose) else p0._op_label(o) for o in options}
+            return {f'({l} {label} {r})' for label in labels for l in _readings(left, src) for r in _readings(right, src)}
+        case p0.Prefix(op=op, item=item):
+            return {f'({p0._op_label(op)}{i})' for i in _readings(item, src)}
+        case p0.Postfix(op=op, item=item):
+            return {f'({i}{p0._op_label(op)})' for i in _readings(item, src)}
+    return {src[ast.loc.start:ast.loc.stop]}
+
+
+def _parse_chain(src: str) -> tuple[t2.Chain, p0.Context]:
+    srcfile = SrcFile(None, src)
+    [chain] = t2.postok(srcfile)
+    return chain, p0.Context(srcfile)
+
+
+def _parse(src: str) -> p0.AST:
+    chain, ctx = _parse_chain(src)
+    with redirect_stderr(StringIO()):
+        return p0.parse_chain(chain, ctx)
+
+
+@pytest.mark.parametrize('src', [
+    'a(b)(c)^z',
+    'x = a(b)(c)(d)^z + 1',
+    'y = -f(x)^2 + g(h)(k)',
+    'w = not a(b)(c)?',
+    'v = a(b) * c(d)(e)^f',
+    't = a(b)[c](d)',
+    'u = a.b(c).d(e)^2',
+])
+def test_forest_packs_exactly_the_reading_of_each_juxtapose_assignment(src: str) -> None:
+    # parsing the chain with every ambiguous juxtapose narrowed to one precedence is unambiguous
+    chain, ctx = _parse_chain(src)
+    ambiguous_idxs = [i for i, item in enumerate(chain.items) if p0.is_ambiguous_juxtapose(item)]
+    expected: set[str] = set()
+    for tight_readings in product([True, False], repeat=len(ambiguous_idxs)):
+        items = list(chain.items)
+        for i, tight in zip(ambiguous_idxs, tight_readings):
+            options = [o for o in items[i].options if (p0.get_precedence(o) > p0.multiply_precedence) == tight]
+            items[i] = t2.QJuxtapose(items[i].loc, _option_types=list(map(type, options))) if len(options) > 1 else options[0]
+        expected |= _readings(p0.parse_chain(t2.Chain(chain.loc, items), ctx), src)
+
+    assert _readings(_parse(src), src) == expected
+
+
+def test_forest_only_splits_on_juxtaposes_that_change_the_shape() -> None:
+    assert _readings(_parse('a(b)(c)^z'), 'a(b)(c)^z') == {
+        '(((a H (b)) H (c)) ^ z)',
+        '((a M (b)) M ((c) ^ z))',
+        '((a H (b)) M ((c) ^ z))',
+        '(a M (((b) H (c)) ^ z))',
+    }
+    ast = _parse('a(b)(c)^z')
+    assert isinstance(ast, p0.Ambiguous) and len(ast.candidates) == 3    # the last two readings share a candidate
+
+
+@pytest.mark.parametrize('src', ['f(x) = x + 1', 'a.b(c)', 'f(x) + g(y)'])
+def test_unambiguous_shapes_keep_the_original_juxtapose(src: str) -> None:
+    chain, ctx = _parse_chain(src)
+    qjuxs = [item for item in chain.items if isinstance(item, t2.QJuxtapose)]
+    ast = p0.parse_chain(chain, ctx)
+
+    def binops(node: p0.AST) -> list[p0.BinOp]:
+        return [node, *binops(node.left), *binops(node.right)] if isinstance(node, p0.BinOp) else []
+    assert not any(isinstance(node.left, p0.Ambiguous) or isinstance(node.right, p0.Ambiguous) for node in binops(ast))
+    assert {id(node.op) for node in binops(ast)} >= set(map(id, qjuxs))
+
+
+def test_ambiguity_stays_local_to_its_operand() -> None:
+    ast = _parse('y = f(x)(y) + 1')
+    assert isinstance(ast, p0.BinOp) and isinstance(ast.right, p0.BinOp)
+    assert isinstance(ast.right.left, p0.Ambiguous)
+
+    hoisted = p0.hoist_ambiguity(ast)
+    assert isinstance(hoisted, p0.Ambiguous)
+    assert all(not isinstance(candidate.right.left, p0.Ambiguous) for candidate in hoisted.candidates)
+    assert {r for c in hoisted.candidates for r in _readings(c, 'y = f(x)(y) + 1')} == _readings(ast, 'y = f(x)(y) + 1')
+
+
+def test_long_ambiguous_chain_shares_subparses() -> None:
+    n = 16
+    src = 'a' + ''.join(f'(b{i})' for i in range(n)) + '^z'
+    srcfile = SrcFile(None, src)
+    stderr = StringIO()
+    with redirect_stderr(stderr):
+        ast = p0.parse(srcfile).inner[0]
+
+    nodes: set[int] = set()
+    def walk(node: p0.AST) -> None:
+        if id(node) in nodes: return
+        nodes.add(id(node))
+        for child in (node.candidates if isinstance(node, p0.Ambiguous) else [node.left, node.right] if isinstance(node, p0.BinOp) else []):
+            walk(child)
+    walk(ast)
+    assert len(nodes) < 20 * n * n
+    assert 'possible parses' in stderr.getvalue()
+
+
+@pytest.mark.parametrize('path', ['tests/tokenizer/pathological_test.dewy', 'tests/tokenizer/ambiguous_warnings.dewy'])
+def test_pathological_sources_parse(path: str) -> None:
+    with redirect_stderr(StringIO()):
+        p0.parse(SrcFile(Path(path), (REPO_ROOT / path).read_text()))
+
+
+def test_checker_picks_between_whole_readings_of_an_assignment_target() -> None:
+    root = check.typecheck_and_resolve(SrcFile(None, 'c = [[1 2] [3 4]]\nc[0][1] = 5'))
+    assignment = root.items[1]
+    assert isinstance(assignment, hir.IndexAssign)
+    assert isinstance(assignment.target, hir.Index) and isinstance(assignment.target.array, hir.Index)
@@ -0,0 +1,59 @@
+from dewy.parser import p0, t2
+from dewy.reporting import SrcFile
+
+
+def _parse(src: str) -> p0.AST:
+    srcfile = SrcFile(None, src)
+    [chain] = t2.postok(srcfile)
+    return p0.parse_chain(chain, p0.Context(srcfile))
+
+
+def _show(ast: p0.AST, src: str) -> str:
+    match ast:
+        case p0.BinOp(op=op, left=left, right=right):
+            return f'({_show(left, src)} {p0._op_label(op)} {_show(right, src)})'
+        case p0.Prefix(op=op, item=item):
+            return f'({p0._op_label(op)}{_show(item, src)})'
+        case p0.Postfix(op=op, item=item):
+            return f'({_show(item, src)}{p0._op_label(op)})'
+        case p0.Flat(op=op, items=items):
+            return '(' + f' {p0._op_label(op)} '.join(_show(item, src) for item in items) + ')'
+    return src[ast.loc.start:ast.loc.stop]
+
+
+def test_long_left_associative_chain() -> None:
+    n = 2000
+    src = ' - '.join(f'x{i}' for i in range(n + 1))
+    ast = _parse(src)
+    for i in reversed(range(1, n + 1)):
+        assert isinstance(ast, p0.BinOp) and _show(ast.right, src) == f'x{i}'
+        ast = ast.left
+    assert _show(ast, src) == 'x0'
+
+
+def test_long_pipe_chain() -> None:
+    n = 2000
+    src = 'x' + ''.join(f' |> f{i}' for i in range(n))
+    ast = _parse(src)
+    for i in reversed(range(n)):
+        assert isinstance(ast, p0.BinOp) and _show(ast.right, src) == f'f{i}'
+        ast = ast.left
+    assert _show(ast, src) == 'x'
+
+
+def test_mixed_precedence_chain() -> None:
+    src = 'a + b * c ^ d ^ e - f / g % h + not i'
+    assert _show(_parse(src), src) == '(((a + (b * (c ^ (d ^ e)))) - ((f / g) % h)) + (noti))'
+
+
+def test_flat_chain_waits_for_every_operand() -> None:
+    # operands far from the last comma reduce in different passes than the comma list itself
+    src = 'a * b, c, d, e ^ f * g, h'
+    assert _show(_parse(src), src) == '((a * b) , c , d , ((e ^ f) * g) , h)'
+    src = 'a * b, c, d'
+    assert _show(_parse(src), src) == '((a * b) , c , d)'
+
+
+def test_prefix_operators_after_a_reduced_operand() -> None:
+    src = 'a? - -b ^ c'
+    assert _show(_parse(src), src) == '((a?) - (-(b ^ c)))'
@@ -0,0 +1,67 @@
+import pickle
+from pathlib import Path
+
+import pytest
+
+from dewy.backend.udewy import codegen
+from dewy.reporting import SrcFile
+from dewy.semantic import modules
+from dewy.semantic.errors import TypeCheckError
+
+
+def _write_graph(root: Path) -> Path:
+    (root / 'base.dewy').write_text('const base:int64 = 7\nlet twice = (x:int64):>int64 => x * 2\n')
+    for i in range(1, 4):
+        (root / f'lib{i}.dewy').write_text(
+            f'from p"base.dewy" import base, twice\n'
+            f'const v{i}:int64 = twice(base) + {i}\n'
+            f'let f{i} = (x:int64):>int64 => x + v{i}\n'
+        )
+    main = root / 'main.dewy'
+    main.write_text(
+        'from p"lib1.dewy" import f1\n'
+        'let source = p"lib2.dewy"\n'
+        'from source import f2\n'
+        'import p"lib3.dewy" as three\n'
+        'let main = ():>int64 => three.f3(f2(f1(1)))\n'
+    )
+    return main
+
+
+def test_plan_follows_load_order(tmp_path: Path) -> None:
+    plan = modules.plan_module_graph(SrcFile.from_path(_write_graph(tmp_path)))
+    assert plan is not None
+    assert [module.path.name for module in plan] == ['base.dewy', 'lib1.dewy', 'lib2.dewy', 'lib3.dewy', 'main.dewy']
+    assert [path.name for path in plan[-1].imports] == ['lib1.dewy', 'lib2.dewy', 'lib3.dewy']
+
+
+def test_parallel_check_matches_serial(tmp_path: Path) -> None:
+    main = _write_graph(tmp_path)
+    compiler = modules.ModuleCompiler(SrcFile.from_path(main))
+    entry = compiler.load_parallel(jobs=2)
+    assert entry is not None and entry.index == 4
+    # every import allocates from its own id range
+    for record in compiler.order:
+        if not record.prelude and not record.entry:
+            start = modules.id_range_start(record.path)
+            assert all(start <= binding.id < start + modules.ID_RANGE for binding in record.exports.values())
+    assert codegen(SrcFile.from_path(main), jobs=2) == codegen(SrcFile.from_path(main))
+
+
+def test_errors_in_workers_keep_their_report(tmp_path: Path) -> None:
+    main = _write_graph(tmp_path)
+    with (tmp_path / 'lib2.dewy').open('a') as f:
+        f.write('let bad:int64 = "text"\n')
+    with pytest.raises(TypeCheckError) as serial:
+        modules.typecheck_program(SrcFile.from_path(main))
+    with pytest.raises(TypeCheckError) as parallel:
+        modules.typecheck_program(SrcFile.from_path(main), jobs=2)
+    assert parallel.value.report.srcfile.path == serial.value.report.srcfile.path == tmp_path / 'lib2.dewy'
+    assert str(pickle.loads(pickle.dumps(parallel.value))) == str(serial.value)
+
+
+def test_unplannable_imports_check_serially(tmp_path: Path) -> None:
+    main = _write_graph(tmp_path)
+    main.write_text(main.read_text().replace('from p"lib1.dewy" import f1', 'from (p"lib1.dewy") import f1'))
+    assert modules.plan_module_graph(SrcFile.from_path(main)) is None
+    assert codegen(SrcFile.from_path(main), jobs=2) == codegen(SrcFile.from_path(main))
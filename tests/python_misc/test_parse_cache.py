@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import pytest
+
+from dewy.parser import cache, p0
+from dewy.reporting import SrcFile, collect_warnings
+from dewy.semantic import check, hir
+
+pytestmark = pytest.mark.usefixtures('cache_root')
+
+
+def _fail_parse(srcfile: SrcFile) -> p0.Block:
+    raise AssertionError(f'{srcfile.path} was parsed instead of loaded from the cache')
+
+
+def test_cache_hit_skips_parsing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / 'main.dewy'
+    path.write_text('x = 1 + 2 * 3\ny = [x x]\n')
+    block = cache.parse(SrcFile.from_path(path))
+    assert cache.cache_path(path).exists()
+
+    monkeypatch.setattr(p0, 'parse', _fail_parse)
+    assert repr(cache.parse(SrcFile.from_path(path))) == repr(block)
+
+
+def test_edited_source_is_reparsed(tmp_path: Path) -> None:
+    path = tmp_path / 'main.dewy'
+    path.write_text('x = 1\n')
+    cache.parse(SrcFile.from_path(path))
+    path.write_text('x = 2\n')
+    assert cache.load(SrcFile.from_path(path)) is None
+    assert repr(cache.parse(SrcFile.from_path(path))) == repr(p0.parse(SrcFile.from_path(path)))
+    assert cache.load(SrcFile.from_path(path)) is not None
+
+
+def test_corrupt_entry_is_a_miss(tmp_path: Path) -> None:
+    path = tmp_path / 'main.dewy'
+    path.write_text('x = 1\n')
+    srcfile = SrcFile.from_path(path)
+    cache.parse(srcfile)
+    entry = cache.cache_path(path)
+    entry.write_bytes(entry.read_bytes()[:-10])
+    assert cache.load(srcfile) is None
+    assert repr(cache.parse(srcfile)) == repr(p0.parse(srcfile))
+
+
+def test_cache_hit_reports_the_parse_warnings_again(tmp_path: Path) -> None:
+    path = tmp_path / 'main.dewy'
+    path.write_text('\'apple\'"banana"\n')
+    with collect_warnings() as cold:
+        cache.parse(SrcFile.from_path(path))
+    with collect_warnings() as warm:
+        assert cache.load(SrcFile.from_path(path)) is not None
+        cache.parse(SrcFile.from_path(path))
+    assert [warning.title for warning in cold] == ['Invalid types for juxtaposition']
+    assert [str(warning) for warning in warm] == [str(warning) for warning in cold]
+
+
+def test_module_compiler_uses_the_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / 'lib.dewy').write_text('const answer:int64 = 42\n')
+    main = tmp_path / 'main.dewy'
+    main.write_text('import p"lib.dewy" as library\nlet x = library.answer\n')
+    cold = check.typecheck_and_resolve(SrcFile.from_path(main))
+    assert cache.cache_path(tmp_path / 'lib.dewy').exists() and cache.cache_path(main).exists()
+
+    # the prelude modules are loaded from the cache as well
+    monkeypatch.setattr(p0, 'parse', _fail_parse)
+    warm = check.typecheck_and_resolve(SrcFile.from_path(main))
+    assert isinstance(warm, hir.Block) and len(warm.items) == len(cold.items)
+
+
+def test_cache_can_be_turned_off(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / 'main.dewy'
+    path.write_text('x = 1\n')
+    monkeypatch.setenv(cache.ENV_VAR, 'off')
+    cache.parse(SrcFile.from_path(path))
+    assert cache.cache_path(path) is None and cache.load(SrcFile.from_path(path)) is None
+    assert list(tmp_path.iterdir()) == [path]
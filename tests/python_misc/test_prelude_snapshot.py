@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import pytest
+
+from dewy.backend.udewy import codegen
+from dewy.reporting import SrcFile
+from dewy.semantic import check, modules, prelude_snapshot
+from dewy.semantic.prelude import PRELUDE_FILES
+
+fixture = Path(__file__).parents[2] / 'examples' / 'hello.dewy'
+
+pytestmark = pytest.mark.usefixtures('cache_root')
+
+
+def _checked_prelude_files(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    checked: list[Path] = []
+    typecheck_module = check._typecheck_module
+    prelude = {path.resolve() for path in PRELUDE_FILES}
+
+    def record(srcfile: SrcFile, **kwargs):
+        if srcfile.path is not None and Path(srcfile.path).resolve() in prelude:
+            checked.append(Path(srcfile.path))
+        return typecheck_module(srcfile, **kwargs)
+
+    monkeypatch.setattr(check, '_typecheck_module', record)
+    return checked
+
+
+def test_snapshot_replaces_checking_the_prelude(monkeypatch: pytest.MonkeyPatch) -> None:
+    checked = _checked_prelude_files(monkeypatch)
+    from_source = codegen(SrcFile.from_path(fixture))
+    assert len(checked) == len(PRELUDE_FILES)
+    assert prelude_snapshot.snapshot_path().exists()
+
+    checked.clear()
+    compiler = modules.ModuleCompiler(SrcFile.from_path(fixture))
+    compiler._ensure_prelude()
+    assert checked == []
+    assert [record.path for record in compiler.order] == [path.resolve() for path in PRELUDE_FILES]
+    assert codegen(SrcFile.from_path(fixture)) == from_source
+
+
+def test_stale_snapshot_falls_back_to_checking(monkeypatch: pytest.MonkeyPatch) -> None:
+    modules.ModuleCompiler(SrcFile(None, ''))._ensure_prelude()
+    monkeypatch.setattr(prelude_snapshot, 'FORMAT', prelude_snapshot.FORMAT + 1)
+    assert prelude_snapshot.load() is None
+
+    checked = _checked_prelude_files(monkeypatch)
+    modules.ModuleCompiler(SrcFile(None, ''))._ensure_prelude()
+    assert len(checked) == len(PRELUDE_FILES)
+    assert prelude_snapshot.load() is not None  # rewritten for the new format
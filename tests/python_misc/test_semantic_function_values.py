@@ -52,7 +52,7 @@ def test_bare_function_type_identifier_is_a_parameter_name() -> None:
     assert isinstance(declaration.expr, hir.TypeValue)
     callback = declaration.expr.value
     assert isinstance(callback, ty.FunctionType)
-    assert callback.pos_or_kw == [ty.PosOrKwArg('x', ty.TOP_TYPE)]
+    assert callback.pos_or_kw == (ty.PosOrKwArg('x', ty.TOP_TYPE),)
 
 
 def test_callable_values_and_pipe_share_function_call_hir() -> None:
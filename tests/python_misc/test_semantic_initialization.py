@@ -44,6 +44,33 @@ let later = ():>int64 => 0
     _check(source)
 
 
+def test_code_after_a_return_does_not_require_initialization() -> None:
+    source = """
+let first = ():>int64 => {
+    return 42
+    later();
+}
+first()
+let later = ():>int64 => 0
+"""
+    _check(source)
+
+
+def test_loop_body_use_requires_initialization_on_every_iteration() -> None:
+    source = """
+let first = ():>int64 => {
+    loop i in 0..3 {
+        if i =? 2 { return later() }
+    }
+    return 0
+}
+first()
+let later = ():>int64 => 0
+"""
+    with pytest.raises(UserError, match='`later` used before initialization'):
+        _check(source)
+
+
 def test_potential_branch_use_requires_initialization() -> None:
     source = """
 let condition:bool = true
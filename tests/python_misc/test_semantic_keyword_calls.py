@@ -42,7 +42,7 @@ let result = increment(41)
     assert function.pos_or_kw_args[0].name == 'value'
     assert function.pos_or_kw_args[0].position_only
     assert isinstance(function.type, ty.FunctionType)
-    assert function.type.pos_or_kw == [ty.PosOrKwArg(None, 'int64')]
+    assert function.type.pos_or_kw == (ty.PosOrKwArg(None, 'int64'),)
 
     call = declarations['result']
     assert isinstance(call, hir.FunctionCall)
@@ -70,7 +70,7 @@ let supplied = increment(40)
     assert isinstance(default, hir.BoundParam)
     assert default.position_only
     assert isinstance(function.type, ty.FunctionType)
-    assert function.type.pos_or_kw == [ty.PosOrKwArg(None, 'int64', required=False)]
+    assert function.type.pos_or_kw == (ty.PosOrKwArg(None, 'int64', required=False),)
 
 
 @pytest.mark.parametrize(
@@ -0,0 +1,18 @@
+import gc
+
+import pytest
+
+from dewy.parser import p0, t0, t1
+from dewy.reporting import Span
+from dewy.utils import descendants
+
+
+def _classes(base: type) -> list[type]:
+    gc.collect() # @dataclass(slots=True) replaces the class it decorates, so drop the originals from __subclasses__
+    return [base, *descendants(base)]
+
+
+@pytest.mark.parametrize('cls', [*_classes(t0.Token), *_classes(t1.Token), *_classes(p0.AST), Span], ids=lambda cls: f'{cls.__module__}.{cls.__qualname__}')
+def test_token_and_ast_classes_have_no_instance_dict(cls: type) -> None:
+    # a single subclass without __slots__ gives all of its instances a __dict__ again
+    assert cls.__dictoffset__ == 0
@@ -43,7 +43,7 @@ def test_duration_is_a_bounded_generic_type_alias() -> None:
 
     assert isinstance(declaration.expr, hir.TypeValue)
     assert isinstance(declaration.expr.value, ty.GenericTypeAlias)
-    assert declaration.expr.value.params == [ty.GenericParam('T', 'real')]
+    assert declaration.expr.value.params == (ty.GenericParam('T', 'real'),)
     assert declaration.expr.value.body == ty.QuantityType(
         ty.TypeVariable('T', 'real'),
         ty.dimension(('Time', 1)),
@@ -0,0 +1,54 @@
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from dewy.parser import t0
+from dewy.reporting import ReportException, SrcFile
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SOURCES = sorted(
+    path.relative_to(REPO_ROOT).as_posix()
+    for folder in ('tests/tokenizer', 'examples', 'library')
+    for path in (REPO_ROOT / folder).rglob('*.dewy')
+)
+
+
+def _tokenize(path: str) -> list[tuple[str, str, int, int]] | str:
+    src = (REPO_ROOT / path).read_text()
+    try:
+        with redirect_stdout(StringIO()):
+            tokens = t0.tokenize(SrcFile(None, src))
+    except SystemExit:
+        return 'error'
+    except ReportException as e:
+        return e.report.title
+    return [(type(token).__name__, token.src, token.loc.start, token.loc.stop) for token in tokens]
+
+
+def _exhaustive_dispatch_table(ctx_type: type[t0.Context], base: t0.BasePrefix, fast_eat: bool = True) -> t0.DispatchTable:
+    return t0.DispatchTable({}, t0.DispatchEntry.from_candidates(t0.get_allowed_tokens(ctx_type), fast_eat))
+
+
+@pytest.mark.parametrize('path', SOURCES)
+def test_dispatch_tables_match_trying_every_allowed_token(path: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    dispatched = _tokenize(path)
+    monkeypatch.setattr(t0, 'get_dispatch_table', _exhaustive_dispatch_table)
+    assert dispatched == _tokenize(path)
+
+
+def test_number_is_only_a_candidate_for_letters_in_bases_that_use_them() -> None:
+    decimal = t0.get_dispatch_table(t0.BlockBody, '0d')
+    hexadecimal = t0.get_dispatch_table(t0.BlockBody, '0x')
+
+    assert t0.Number not in decimal['a'].candidates
+    assert t0.Number in hexadecimal['a'].candidates
+    assert t0.Number in decimal['7'].candidates
+
+
+def test_precedence_pairs_are_resolved_per_entry() -> None:
+    table = t0.get_dispatch_table(t0.Root, '0d')
+
+    assert table['e'].precedence == ((t0.ExponentMarker, t0.Identifier),)
+    assert table[' '].precedence == ()
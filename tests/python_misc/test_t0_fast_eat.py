@@ -0,0 +1,71 @@
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from dewy.parser import t0
+from dewy.reporting import ReportException, SrcFile
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SOURCES = sorted(
+    path.relative_to(REPO_ROOT).as_posix()
+    for folder in ('tests', 'examples')
+    for path in (REPO_ROOT / folder).rglob('*.dewy')
+)
+
+
+def _tokenize(src: str, fast_eat: bool) -> tuple[list[tuple[str, str, int, int]] | str, str]:
+    """token stream (or the title of the error that stopped tokenizing) along with any printed errors and warnings"""
+    out = StringIO()
+    try:
+        with redirect_stdout(out), redirect_stderr(out):
+            tokens = t0.tokenize(SrcFile(None, src), fast_eat=fast_eat)
+    except SystemExit:
+        return 'error', out.getvalue()
+    except ReportException as e:
+        return e.report.title, out.getvalue()
+    return [(type(token).__name__, token.src, token.loc.start, token.loc.stop) for token in tokens], out.getvalue()
+
+
+@pytest.mark.parametrize('path', SOURCES)
+def test_fast_eat_matches_reference_eat_on_file(path: str) -> None:
+    src = (REPO_ROOT / path).read_text()
+    assert _tokenize(src, fast_eat=True) == _tokenize(src, fast_eat=False)
+
+
+@pytest.mark.parametrize('src', [
+    'a\rb',                                  # lone carriage return warns
+    'a \r\n\t b\r',                          # carriage returns in and at the end of a run
+    '  \n\n    x',
+    "x' y'' z",                              # identifiers only made of/ending in decorations
+    'foo_bar2 _ __init__ a?',
+    '1_000_000 12 0 007 1e10 3.14',
+    '0x1F 0b1010 0o17 0xabc_def',
+    '[0x 1A ff]',                            # bare digits in a hex block
+    '"hello {name}! \\n \\u{41} bye"',
+    '"unterminated {',
+    '""',
+    "$'tmpl {not a block} ${x} $'",
+    '$"END" a "quote" {x} inside\nEND',     # heredoc with quotes and a block in the body
+    '$"\\{"abc {x} \\{',                     # heredoc delimiter starting with an escape (ambiguous, errors)
+    '$"{x"a {b} {x',                         # heredoc delimiter starting with a block opener
+    '$"a{b"c {d} a{b',                       # heredoc delimiter that string chars must stop at
+    '$"""rest of the file {with a block}',
+])
+def test_fast_eat_matches_reference_eat_on_edge_cases(src: str) -> None:
+    assert _tokenize(src, fast_eat=True) == _tokenize(src, fast_eat=False)
+
+
+@pytest.mark.parametrize('token_cls', [t0.Whitespace, t0.Identifier, t0.Number])
+def test_fast_eat_matches_eat_at_every_offset(token_cls: type[t0.Token]) -> None:
+    src = "ab_1' 0x1F 12_3  \t\r\n x''  9"
+    for ctx in (t0.Root(SrcFile(None, src), tokens_so_far=[]), t0.Root(SrcFile(None, src), tokens_so_far=[], default_base='0x')):
+        for start in range(len(src) + 1):
+            with redirect_stdout(StringIO()):
+                assert token_cls.fast_eat(src, ctx, start) == token_cls.eat(src, ctx, start), (start, ctx.default_base)
+
+
+def test_only_hot_token_classes_have_a_fast_path() -> None:
+    fast = {cls for cls in t0.descendants(t0.Token) if cls.fast_eat is not None}
+    assert fast == {t0.Whitespace, t0.Identifier, t0.Number, t0.StringChars}
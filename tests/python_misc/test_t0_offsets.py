@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import pytest
+
+from dewy.parser import t0
+from dewy.reporting import ReportException, Span, SrcFile
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _token_summary(tokens: list[t0.Token], shift: int = 0) -> list[tuple[str, str, int, int]]:
+    return [(type(token).__name__, token.src, token.loc.start - shift, token.loc.stop - shift) for token in tokens]
+
+
+@pytest.mark.parametrize('path', ['examples/hello.dewy', 'tests/tokenizer/strings.dewy', 'tests/tokenizer/reals.dewy'])
+def test_tokens_are_independent_of_their_offset_in_the_source(path: str) -> None:
+    src = (REPO_ROOT / path).read_text()
+    prefix = '#{ padding }#\n'
+    tokens = t0.tokenize(SrcFile(None, src))
+    shifted = t0.tokenize(SrcFile(None, prefix + src))
+
+    assert _token_summary(shifted[2:], shift=len(prefix)) == _token_summary(tokens)
+
+
+def test_eat_matches_from_start_without_slicing() -> None:
+    src = 'abc 0x1F "str" #comment\n'
+    ctx = t0.Root(SrcFile(None, src), tokens_so_far=[])
+
+    assert t0.Identifier.eat(src, ctx, 0) == 3
+    assert t0.Identifier.eat(src, ctx, 1) == 2
+    assert t0.Whitespace.eat(src, ctx, 3) == 1
+    assert t0.Number.eat(src, ctx, 4) == 4
+    assert t0.StringQuoteOpener.eat(src, ctx, 9) == 1
+    assert t0.LineComment.eat(src, ctx, 15) == len(src) - 15
+    assert t0.Identifier.eat(src, ctx, 4) is None
+
+
+def test_unterminated_block_comment_error_points_at_absolute_position() -> None:
+    src = 'x = 1\n#{ never closed'
+
+    with pytest.raises(ReportException) as exc_info:
+        t0.tokenize(SrcFile(None, src))
+
+    spans = [pointer.span for pointer in exc_info.value.report.pointer_messages]
+    assert spans[0] == [Span(6, 8)]
@@ -0,0 +1,120 @@
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from random import Random
+
+import pytest
+
+from dewy.parser import t0
+from dewy.reporting import ReportException, Span, SrcFile
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SNIPPETS = [' ', '\n', 'x', '1', 'e', '"', "'", '{', '}', '(', ')', '[', ']', '#', '#{', '}#', '\\', '0x', '1e5', '<', '>', '%', '$"END"', 'END"', '"""']
+
+
+def _summary(tokens: list[t0.Token]) -> list[tuple]:
+    """token kinds, positions, and which tokens delimiters are matched with"""
+    summary = []
+    for token in tokens:
+        links = tuple(getattr(token, attr).idx for attr in ('matching_left', 'matching_right', 'matching_quote') if getattr(token, attr, None) is not None)
+        summary.append((type(token).__name__, token.src, token.loc.start, token.loc.stop, token.idx, links))
+    return summary
+
+
+def _tokenize(src: str) -> t0.Tokenization | None:
+    try:
+        with redirect_stdout(StringIO()):
+            return t0.tokenize_editable(SrcFile(None, src))
+    except (SystemExit, ReportException, ValueError):
+        return None
+
+
+@pytest.mark.parametrize('path', ['examples/hello.dewy', 'examples/fizzbuzz0.dewy', 'tests/tokenizer/strings.dewy', 'tests/tokenizer/reals.dewy', 'tests/tokenizer/string_vs_template.dewy'])
+def test_retokenize_matches_tokenizing_from_scratch(path: str) -> None:
+    src = (REPO_ROOT / path).read_text()
+    rng = Random(path)
+    for _ in range(50):
+        start = rng.randrange(len(src) + 1)
+        stop = min(len(src), start + rng.choice([0, 0, 1, 3, 10]))
+        text = ''.join(rng.choice(SNIPPETS) for _ in range(rng.choice([0, 1, 2])))
+        expected = _tokenize(src[:start] + text + src[stop:])
+        if expected is None:
+            continue # edits that make the source invalid stop with an error just like tokenize
+        tokenization = _tokenize(src)
+        with redirect_stdout(StringIO()):
+            t0.retokenize(tokenization, t0.TextEdit(Span(start, stop), text))
+        assert _summary(tokenization.tokens) == _summary(expected.tokens), (start, stop, text)
+        assert [[type(ctx) for ctx in stack] for stack in tokenization.stacks] == [[type(ctx) for ctx in stack] for stack in expected.stacks]
+
+
+def test_retokenize_only_recreates_tokens_near_the_edit() -> None:
+    src = '\n'.join(f'x{i} = [{i} "s{i}" 1e{i}] # line {i}' for i in range(200))
+    tokenization = t0.tokenize_editable(SrcFile(None, src))
+    before = list(tokenization.tokens)
+    starts = [token.loc.start for token in before]
+    i = src.index('x100') + 1
+
+    changed = t0.retokenize(tokenization, t0.TextEdit(Span(i, i), 'yz'))
+
+    assert len(changed) <= 3
+    assert tokenization.tokens[changed.start-1] is before[changed.start-1]
+    assert all(new is old for new, old in zip(tokenization.tokens[changed.stop:], before[changed.stop:]))
+    assert tokenization.tokens[changed.stop].loc.start == starts[changed.stop] + 2
+    assert _summary(tokenization.tokens) == _summary(t0.tokenize(SrcFile(None, tokenization.srcfile.body)))
+
+
+def test_retokenize_continues_until_the_context_stack_converges() -> None:
+    src = 'a = "x and y} z" b = 2'
+    tokenization = t0.tokenize_editable(SrcFile(None, src))
+
+    # the inserted `{` opens a block that swallows string characters up to the (previously literal) `}`
+    changed = t0.retokenize(tokenization, t0.TextEdit(Span(6, 6), '{'))
+
+    expected = t0.tokenize(SrcFile(None, tokenization.srcfile.body))
+    assert _summary(tokenization.tokens) == _summary(expected)
+    assert [token.src for token in tokenization.tokens[changed.start:changed.stop]] == ['"', 'x', '{', ' ', 'and', ' ', 'y', '}', ' z', '"']
+
+
+
+def test_failed_retokenize_keeps_the_tokenization_from_before_the_edit() -> None:
+    src = 'a = "x"\nb = {1 2}'
+    tokenization = t0.tokenize_editable(SrcFile(None, src))
+    tokens, stacks, summary = list(tokenization.tokens), list(tokenization.stacks), _summary(tokenization.tokens)
+
+    # a lone opening quote leaves the rest of the source in an unterminated string
+    with pytest.raises(t0.TokenizeError):
+        t0.retokenize(tokenization, t0.TextEdit(Span(8, 8), '"'))
+
+    assert tokenization.srcfile.body == src
+    assert tokenization.srcfile.offset_to_row_col(len(src)) == (1, 9)
+    assert all(new is old for new, old in zip(tokenization.tokens, tokens, strict=True))
+    assert tokenization.stacks == stacks
+    assert _summary(tokenization.tokens) == summary
+
+    # typing on then works from the restored tokenization
+    t0.retokenize(tokenization, t0.TextEdit(Span(8, 8), '""'))
+    assert _summary(tokenization.tokens) == _summary(t0.tokenize(SrcFile(None, tokenization.srcfile.body)))
+
+def test_retokenize_moves_exponent_powers() -> None:
+    src = 'a = 1e5 + 2e10'
+    tokenization = t0.tokenize_editable(SrcFile(None, src))
+
+    t0.retokenize(tokenization, t0.TextEdit(Span(0, 1), 'abc'))
+
+    markers = [token for token in tokenization.tokens if isinstance(token, t0.ExponentMarker)]
+    assert [(m.power.src, m.power.loc.start, m.power.idx) for m in markers] == [('5', 8, 5), ('10', 14, 10)]
+
+
+@pytest.mark.parametrize('body,span,text', [
+    ('ab\ncd\nef', Span(1, 1), 'x\ny'),
+    ('ab\ncd\nef', Span(1, 5), ''),
+    ('ab\ncd\nef', Span(2, 3), ' '),
+    ('ab\ncd\nef\n', Span(8, 8), '\n\n'),
+    ('', Span(0, 0), 'a\nb'),
+])
+def test_srcfile_edit_updates_line_starts(body: str, span: Span, text: str) -> None:
+    srcfile = SrcFile(None, body)
+    srcfile.edit(span, text)
+    expected = SrcFile(None, body[:span.start] + text + body[span.stop:])
+    assert srcfile.body == expected.body
+    assert srcfile._line_starts == expected._line_starts
@@ -0,0 +1,83 @@
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from dewy.parser import t0, t1
+from dewy.reporting import ReportException, SrcFile
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SOURCES = sorted(
+    path.relative_to(REPO_ROOT).as_posix()
+    for folder in ('tests', 'examples')
+    for path in (REPO_ROOT / folder).rglob('*.dewy')
+)
+
+
+def _run(func) -> str:
+    try:
+        with redirect_stdout(StringIO()):
+            return repr(func())
+    except SystemExit:
+        return 'error'
+    except ReportException as e:
+        return e.report.title
+
+
+@pytest.mark.parametrize('path', SOURCES)
+def test_streaming_matches_materialized_tokenize(path: str) -> None:
+    src = (REPO_ROOT / path).read_text()
+    assert _run(lambda: t1.tokenize(SrcFile(None, src), stream=True)) == _run(lambda: t1.tokenize(SrcFile(None, src), stream=False))
+
+
+def test_long_sources_are_streamed(monkeypatch: pytest.MonkeyPatch) -> None:
+    src = 'a = [1 (2 "three {4}")]\nb = 1.5e3'
+    expected = repr(t1.tokenize(SrcFile(None, src)))
+
+    def whole_file(srcfile: SrcFile) -> list[t0.Token]:
+        raise AssertionError('the whole file was tokenized up front')
+
+    monkeypatch.setattr(t0, 'tokenize', whole_file)
+    monkeypatch.setattr(t1, 'STREAM_THRESHOLD', len(src))
+    assert repr(t1.tokenize(SrcFile(None, src))) == expected
+
+
+def test_t0_groups_are_self_contained() -> None:
+    src = 'a = [1 (2 "three {4}")] % comment\nb = 1.5e3 $"END"\nheredoc {b}\nEND\nc = $"""rest of\nthe file'
+    groups = list(t0.tokenize_groups(SrcFile(None, src)))
+
+    assert [token for group in groups for token in group] == t0.tokenize(SrcFile(None, src))
+    for group in groups:
+        ids = {id(token) for token in group}
+        for token in group:
+            for attr in ('matching_right', 'matching_quote'):
+                if (match := getattr(token, attr, None)) is not None:
+                    assert id(match) in ids
+    assert t0.RestOfFileStringQuote in map(type, groups[-1])
+
+
+def test_token_window_stays_bounded() -> None:
+    src = ''.join(f'x{i} = [{i} "s{i}" {i}.5]\n' for i in range(2000))
+    tokens = t1.TokenWindow(t0.tokenize_groups(SrcFile(None, src)))
+    ctx = t1.Context(SrcFile(None, src))
+    start = 0
+    largest = 0
+    while t1.has_token(tokens, start):
+        length, _ = t1.eat_next(tokens, ctx, start)
+        start += length
+        tokens.release(start)
+        largest = max(largest, len(tokens.tokens))
+
+    assert start == len(tokens) > 20000
+    assert largest < 64
+    with pytest.raises(IndexError):
+        tokens[0]
+
+
+def test_tokenize_iter_raises_instead_of_exiting() -> None:
+    tokens = t1.tokenize_iter(SrcFile(None, 'a = 1\nb = [2 3'))
+    assert repr(next(tokens)) == repr(t1.tokenize(SrcFile(None, 'a'))[0])
+    with pytest.raises(t0.TokenizeError) as e:
+        list(tokens)
+    assert e.value.consumed is not None
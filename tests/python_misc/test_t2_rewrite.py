@@ -0,0 +1,56 @@
+from contextlib import redirect_stdout
+from io import StringIO
+
+import pytest
+
+from dewy.parser import t1, t2
+from dewy.reporting import SrcFile
+
+
+def _rewrite(src: str) -> list[t1.Token]:
+    srcfile = SrcFile(None, src)
+    tokens = t1.tokenize(srcfile)
+    with redirect_stdout(StringIO()):
+        t2.rewrite_tokens(tokens, ctx=t2.Context(srcfile))
+    return tokens
+
+
+def _summary(tokens: list[t1.Token]) -> list[str]:
+    summary = []
+    for token in tokens:
+        name = type(token).__name__ if not isinstance(token, t2.QJuxtapose) else 'QJuxtapose'
+        if isinstance(token, t1.Operator): name += f' {token.symbol}'
+        if isinstance(token, t1.Identifier): name += f' {token.name}'
+        if isinstance(token, (t2.BroadcastOp, t2.CombinedAssignmentOp)): name += f' {_summary([token.op])[0]}'
+        if isinstance(token, t2.InvertedComparisonOp): name += f' {token.op}'
+        if isinstance(token, t1.Block): name += f' {_summary(token.inner)}'
+        summary.append(name)
+    return summary
+
+
+@pytest.mark.parametrize('src,expected', [
+    (',a,,', ['Identifier void', 'Operator ,', 'Identifier a', 'Operator ,', 'Identifier void', 'Operator ,', 'Identifier void']),
+    ('x not <? y', ['Identifier x', 'InvertedComparisonOp <?', 'Identifier y']),
+    ('x .+= 1', ['Identifier x', 'CombinedAssignmentOp BroadcastOp Operator +', 'Integer']),
+    ('(.+) (+=) (not)', ['OpFn', 'OpFn', 'OpFn']),
+    ('f($ + 1)', ['Identifier f', 'QJuxtapose', "Block ['Placeholder', 'Operator +', 'Integer']"]),
+    ('. . +', ['BroadcastOp Operator .', 'Operator +']),    # a merged token is not merged again
+])
+def test_rewrite_stages(src: str, expected: list[str]) -> None:
+    assert _summary(_rewrite(src)) == expected
+
+
+def test_rewrite_recurses_with_every_stage() -> None:
+    # inner tokens are fully rewritten before the outer stages look at the block (e.g. (.+) needs the inner broadcast)
+    [block] = _rewrite('[a,,(.+) [x += 1]]')
+    assert _summary(block.inner) == [
+        'Identifier a', 'Operator ,', 'Identifier void', 'Operator ,', 'OpFn',
+        "Block ['Identifier x', 'CombinedAssignmentOp Operator +', 'Integer']",
+    ]
+
+
+def test_rewrite_long_flat_list() -> None:
+    tokens = _rewrite('[' + ', '.join(f'{i}' for i in range(20000)) + ',,]')
+    [block] = tokens
+    assert len(block.inner) == 2 * 20000 + 3
+    assert _summary(block.inner[-3:]) == ['Identifier void', 'Operator ,', 'Identifier void']
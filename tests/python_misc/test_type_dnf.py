@@ -0,0 +1,34 @@
+from dewy.semantic import builtins, ty
+
+
+def _type_system() -> ty.TypeSystem:
+    ts = ty.TypeSystem()
+    builtins.apply_builtin_promote_rules(ts)
+    return ts
+
+
+def _literals(width: int, start: int = 0) -> ty.TypeExpr:
+    return ty.optional(ty.union(*(ty.IntegerLiteralType(i) for i in range(start, start + width))))
+
+
+def test_agrees_with_the_full_dnf() -> None:
+    ts = _type_system()
+    types = [
+        ty.intersect(_literals(3), _literals(3, start=2)),
+        ty.intersect(_literals(3), _literals(3, start=3), ty.TypeNot('undefined')),
+        ty.intersect(ty.union('int', 'string'), ty.TypeNot(ty.union('int8', 'string')), ty.union('int8', 'bool')),
+        ty.intersect(ty.union(ty.StringLiteralType('a'), 'int'), ty.TypeNot('string'), ty.TypeNot('int')),
+        ty.TypeNot(ty.TOP_TYPE),
+        ty.TOP_TYPE,
+    ]
+    for t in types:
+        assert ts.is_empty(t) == all(ts.clause_is_empty(c) for c in ty.normalize(t)), t
+
+
+def test_empty_prefixes_prune_the_expansion() -> None:
+    ts = _type_system()
+    # 21^4 clauses in full, but distinct literals are disjoint so only shared members (undefined) survive a prefix
+    t = ty.intersect(*(_literals(20, start=20 * k) for k in range(4)))
+    assert not ts.is_empty(t)
+    assert ts.is_empty(ty.intersect(t, ty.TypeNot('undefined')))
+    assert ts.memo_stats()['clause_is_empty'].misses < 1000
@@ -256,4 +256,4 @@ def test_instantiate_method_substitutes_params():
     inst = instantiate_method(m, {'T': 'int'})
     assert inst.pos_or_kw[0].type == 'int'
     assert inst.ret == 'int'
-    assert inst.type_params == []
+    assert inst.type_params == ()
@@ -0,0 +1,63 @@
+import copy
+import pickle
+from dataclasses import FrozenInstanceError, replace
+
+import pytest
+
+from dewy.semantic import ty
+
+
+def _signature(param: ty.TypeExpr) -> ty.FunctionType:
+    return ty.FunctionType([ty.PosOrKwArg('x', param)], [], None, ty.ArrayType(param), [ty.GenericParam('T', 'number')])
+
+
+def test_structurally_equal_types_are_the_same_node() -> None:
+    assert ty.TypeAnd(['int', ty.TypeNot('bool')]) is ty.TypeAnd(('int', ty.TypeNot('bool')))
+    assert _signature('int') is _signature('int')
+    assert _signature('int') is not _signature('string')
+    assert ty.union('int', 'string') is ty.union('int', 'string')
+    assert ty.PathLiteralType('a.dewy') is ty.PathLiteralType('a.dewy')
+    assert replace(ty.ArrayType('int', 3), length=None) is ty.ArrayType('int')
+
+
+def test_nodes_of_different_classes_stay_distinct() -> None:
+    fields = (ty.ObjectField('path', ty.StringType()),)
+    assert ty.PathType(fields) is not ty.ObjectType(fields)
+    assert ty.PathType(fields) is ty.PATH_TYPE
+
+
+def test_nodes_are_immutable_and_hashable() -> None:
+    signature = _signature('int')
+    assert isinstance(signature.pos_or_kw, tuple) and isinstance(signature.type_params, tuple)
+    with pytest.raises(FrozenInstanceError):
+        signature.ret = 'int'  # type: ignore[misc]
+    assert {signature: 1}[_signature('int')] == 1
+
+
+def test_type_ids() -> None:
+    signature = _signature('int')
+    assert ty.type_id(signature) == ty.type_id(_signature('int'))
+    assert ty.type_id(signature) != ty.type_id(_signature('string'))
+    assert ty.type_id('int') == ty.type_id('int') != ty.type_id('string')
+
+
+@pytest.mark.parametrize('roundtrip', [copy.copy, copy.deepcopy, lambda t: pickle.loads(pickle.dumps(t))], ids=['copy', 'deepcopy', 'pickle'])
+def test_copies_are_interned(roundtrip) -> None:
+    t = ty.OverloadType([_signature('int'), _signature(ty.PathLiteralType('b.dewy'))])
+    assert roundtrip(t) is t
+
+
+def test_nnf_is_memoized_per_node() -> None:
+    t = ty.TypeNot(ty.TypeOr(['int', ty.TypeNot('string')]))
+    assert ty.to_nnf(t) is ty.to_nnf(t) is ty.intersect(ty.TypeNot('int'), 'string')
+
+
+def test_unreferenced_nodes_are_released() -> None:
+    before = len(ty._interned)
+    ty.TypeAnd([ty.IntegerLiteralType(i) for i in range(1000, 1100)])
+    assert len(ty._interned) == before
+
+
+def test_list_fields_print_as_lists() -> None:
+    assert repr(ty.TypeOr(('int64', 'undefined'))) == "TypeOr(items=['int64', 'undefined'])"
+    assert repr(ty.DimensionType((('m', 1),))) == "DimensionType(powers=(('m', 1),))"
@@ -0,0 +1,40 @@
+from dewy.semantic import builtins, ty
+
+
+def _type_system(**kwargs) -> ty.TypeSystem:
+    ts = ty.TypeSystem(**kwargs)
+    builtins.apply_builtin_promote_rules(ts)
+    return ts
+
+
+def test_repeated_subtype_queries_hit_the_memo() -> None:
+    ts = _type_system()
+    stats = ts.memo_stats()['is_subtype']
+    assert ts.is_subtype('int8', ty.union('int', 'string'))
+    assert (stats.hits, stats.misses) == (0, 1)
+    assert ts.is_subtype('int8', ty.union('int', 'string'))
+    assert not ts.is_subtype('string', 'int')
+    assert (stats.hits, stats.misses) == (1, 2)
+    assert ts.memo_stats()['clause_is_empty'].misses > 0
+
+
+def test_lattice_changes_invalidate_the_memo() -> None:
+    ts = _type_system()
+    ts.add_type('shape')
+    ts.add_type('circle')
+    assert not ts.is_subtype('circle', 'shape')
+    ts.add_type_link('circle', 'shape')
+    assert ts.is_subtype('circle', 'shape')
+    assert ts.memo_stats()['is_subtype'].size == 1
+
+
+def test_memo_is_bounded() -> None:
+    ts = _type_system(memo_size=4)
+    names = ['int8', 'int16', 'int32', 'int64', 'uint8', 'uint16']
+    for name in names:
+        ts.is_subtype(name, 'int')
+    stats = ts.memo_stats()['is_subtype']
+    assert (stats.size, stats.evictions) == (4, 2)
+    ts.is_subtype('int8', 'int')   # evicted, least recently used
+    ts.is_subtype('uint16', 'int')
+    assert (stats.hits, stats.misses) == (1, 7)